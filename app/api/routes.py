@@ -1,65 +1,444 @@
 """Routes API FastAPI."""
 
+import secrets
 from logging import Logger
-from typing import Annotated
+from typing import Annotated, Any, Literal
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import PlainTextResponse
 
-from app.core import get_logger, get_settings
-from app.models import HealthResponse, SearchRequest, SearchResponse
+from app.core import Settings, get_logger, get_settings
+from app.exceptions import (
+    AdmissionRejectedError,
+    IdempotencyKeyReusedError,
+    WatchLimitReachedError,
+)
+from app.models import (
+    BatchSearchRequest,
+    BatchSearchResponse,
+    CrawlTimingStats,
+    HealthResponse,
+    HedgingStats,
+    PrefetchStats,
+    ProxyStats,
+    SearchEstimate,
+    SearchRequest,
+    SearchResponse,
+    TimeoutStats,
+    WatchEventsResponse,
+    WatchRequest,
+    WatchStatus,
+)
 from app.services import (
+    AdaptiveTimeouts,
+    AdmissionController,
     CombinationGenerator,
     CrawlerService,
+    CrawlStats,
     FlightParser,
+    ItineraryDrillDown,
+    PipelineMetrics,
+    Prefetcher,
+    PriceCalendarService,
     ProxyService,
+    ResponseCache,
+    ResultCache,
+    SearchEstimator,
+    SearchProfiler,
     SearchService,
+    SearchTrace,
+    TraceStore,
+    WatchService,
+    get_adaptive_timeouts,
+    get_admission_controller,
+    get_checkpoint_store,
+    get_crawl_coalescer,
+    get_crawl_slots,
+    get_crawl_stats,
+    get_pipeline_metrics,
+    get_prefetcher,
+    get_price_history,
+    get_proxy_service,
+    get_rate_limiter,
+    get_response_cache,
+    get_result_cache,
+    get_search_profiler,
+    get_session_pool,
+    get_trace_store,
+    get_watch_service,
+    tracing,
 )
+from app.utils import MetricsRegistry
 
 router = APIRouter()
 
 
 def get_search_service() -> SearchService:
     """Dependency injection pour SearchService."""
-    settings = get_settings()
-    proxy_service: ProxyService | None = None
-    if settings.proxy_config:
-        proxy_service = ProxyService(proxy_pool=[settings.proxy_config])
+    crawler_service = CrawlerService(
+        proxy_service=get_proxy_service(),
+        crawl_stats=get_crawl_stats(),
+        session_pool=get_session_pool(),
+        rate_limiter=get_rate_limiter(),
+        adaptive_timeouts=get_adaptive_timeouts(),
+        metrics=get_pipeline_metrics(),
+        crawl_slots=get_crawl_slots(),
+    )
+    flight_parser = FlightParser()
     return SearchService(
         combination_generator=CombinationGenerator(),
-        crawler_service=CrawlerService(proxy_service=proxy_service),
-        flight_parser=FlightParser(),
+        crawler_service=crawler_service,
+        flight_parser=flight_parser,
+        result_cache=get_result_cache(),
+        crawl_coalescer=get_crawl_coalescer(),
+        price_calendar=PriceCalendarService(
+            crawler_service=crawler_service, metrics=get_pipeline_metrics()
+        ),
+        price_history=get_price_history(),
+        itinerary_drilldown=ItineraryDrillDown(
+            crawler_service=crawler_service, flight_parser=flight_parser
+        ),
+        prefetcher=get_prefetcher(),
+        checkpoint_store=get_checkpoint_store(),
+        metrics=get_pipeline_metrics(),
+        crawl_slots=get_crawl_slots(),
+    )
+
+
+def get_search_estimator(
+    crawl_stats: Annotated[CrawlStats, Depends(get_crawl_stats)],
+    admission_controller: Annotated[
+        AdmissionController, Depends(get_admission_controller)
+    ],
+    result_cache: Annotated[ResultCache, Depends(get_result_cache)],
+) -> SearchEstimator:
+    """Dependency injection pour SearchEstimator."""
+    return SearchEstimator(
+        combination_generator=CombinationGenerator(),
+        crawl_stats=crawl_stats,
+        admission_controller=admission_controller,
+        result_cache=result_cache,
     )
 
 
+def get_authorized_profiler(
+    settings: Annotated[Settings, Depends(get_settings)],
+    search_profiler: Annotated[SearchProfiler | None, Depends(get_search_profiler)],
+    x_profile_token: Annotated[str | None, Header(max_length=255)] = None,
+) -> SearchProfiler | None:
+    """Profiler si X-Profile-Token est fourni et valide (None sans en-tête, 403 sinon)."""
+    if x_profile_token is None:
+        return None
+    expected = settings.PROFILING_TOKEN
+    if (
+        search_profiler is None
+        or expected is None
+        or not secrets.compare_digest(
+            x_profile_token.encode(), expected.get_secret_value().encode()
+        )
+    ):
+        raise HTTPException(status_code=403, detail="Invalid profiling token")
+    return search_profiler
+
+
 @router.get("/health")
 def health_check() -> HealthResponse:
     """Retourne le statut sante de l'application."""
     return HealthResponse(status="ok")
 
 
+@router.get("/metrics", tags=["monitoring"], response_class=PlainTextResponse)
+def metrics_endpoint(
+    metrics: Annotated[PipelineMetrics | None, Depends(get_pipeline_metrics)],
+    adaptive_timeouts: Annotated[
+        AdaptiveTimeouts | None, Depends(get_adaptive_timeouts)
+    ],
+) -> PlainTextResponse:
+    """Endpoint métriques du pipeline au format texte Prometheus."""
+    body = "" if metrics is None else metrics.render(adaptive_timeouts)
+    return PlainTextResponse(body, media_type=MetricsRegistry.CONTENT_TYPE)
+
+
 @router.post("/api/v1/search-flights", tags=["search"])
 async def search_flights_endpoint(
     request: SearchRequest,
+    http_response: Response,
     search_service: Annotated[SearchService, Depends(get_search_service)],
+    response_cache: Annotated[ResponseCache, Depends(get_response_cache)],
+    admission_controller: Annotated[
+        AdmissionController, Depends(get_admission_controller)
+    ],
+    prefetcher: Annotated[Prefetcher, Depends(get_prefetcher)],
+    metrics: Annotated[PipelineMetrics | None, Depends(get_pipeline_metrics)],
+    trace_store: Annotated[TraceStore, Depends(get_trace_store)],
+    search_profiler: Annotated[SearchProfiler | None, Depends(get_authorized_profiler)],
     logger: Annotated[Logger, Depends(get_logger)],
+    idempotency_key: Annotated[str | None, Header(max_length=255)] = None,
+    x_search_trace: Annotated[bool, Header()] = False,
+    trace: Annotated[bool, Query()] = False,
 ) -> SearchResponse:
-    """Endpoint recherche vols multi-city async."""
+    """Endpoint recherche vols multi-city async (admission contrôlée, réponses SWR).
+
+    Recherche tracée (?trace=true ou X-Search-Trace: 1) : calculée hors cache de
+    réponses, timeline disponible sur /api/v1/traces/{X-Search-Id}. Recherche
+    profilée (X-Profile-Token valide) : idem, profil sur /api/v1/profiles/{id}.
+    """
+    search_id = secrets.token_hex(8)
+    http_response.headers["X-Search-Id"] = search_id
+    search_trace = SearchTrace(search_id) if trace or x_search_trace else None
+    prefetcher.record_request(request)
     logger.info(
         "Flight search started",
         extra={
+            "search_id": search_id,
             "segments_count": len(request.segments_date_ranges),
         },
     )
 
-    response = await search_service.search_flights(request)
+    async def admitted_search() -> SearchResponse:
+        async with admission_controller.admit(request) as ticket:
+            with tracing(search_trace):
+                search = search_service.search_flights(
+                    request, interactive=ticket.interactive
+                )
+                if search_profiler is None:
+                    return await search
+                return await search_profiler.run(search_id, search)
+
+    try:
+        lookup = await response_cache.get_or_compute(
+            request,
+            admitted_search,
+            idempotency_key=idempotency_key,
+            bypass=search_trace is not None or search_profiler is not None,
+        )
+    except IdempotencyKeyReusedError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+    except AdmissionRejectedError as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(int(e.retry_after_s))},
+        ) from e
+    finally:
+        if search_trace is not None:
+            trace_store.save(search_trace)
+
+    response = lookup.response
+    http_response.headers["Age"] = str(int(lookup.age_s))
+    http_response.headers["Cache-Control"] = response_cache.cache_control_header()
+    http_response.headers["X-Cache"] = lookup.status.upper()
+    if metrics is not None and lookup.status in ("hit", "stale"):
+        metrics.cache_hits.inc("response")
 
     logger.info(
         "Flight search completed",
         extra={
+            "search_id": search_id,
             "segments_count": len(request.segments_date_ranges),
             "search_time_ms": response.search_stats.search_time_ms,
             "total_results": response.search_stats.total_results,
+            "response_cache": lookup.status,
         },
     )
 
     return response
+
+
+@router.get("/api/v1/traces/{search_id}", tags=["search"])
+def search_trace_endpoint(
+    search_id: str,
+    trace_store: Annotated[TraceStore, Depends(get_trace_store)],
+) -> dict[str, Any]:
+    """Endpoint timeline Chrome trace-event d'une recherche tracée (Perfetto)."""
+    search_trace = trace_store.get(search_id)
+    if search_trace is None:
+        raise HTTPException(status_code=404, detail="Trace not found")
+    return search_trace.to_chrome_trace()
+
+
+@router.get("/api/v1/profiles/{search_id}", tags=["search"])
+def search_profile_endpoint(
+    search_id: str,
+    search_profiler: Annotated[SearchProfiler | None, Depends(get_authorized_profiler)],
+    profile_format: Annotated[Literal["text", "pstats"], Query(alias="format")] = (
+        "text"
+    ),
+) -> Response:
+    """Endpoint profil d'une recherche profilée (rapport texte ou fichier pstats)."""
+    if search_profiler is None:
+        raise HTTPException(status_code=403, detail="X-Profile-Token required")
+    if profile_format == "pstats":
+        dump = search_profiler.pstats_dump(search_id)
+        if dump is None:
+            raise HTTPException(status_code=404, detail="Profile not found")
+        return Response(
+            dump,
+            media_type="application/octet-stream",
+            headers={
+                "Content-Disposition": f'attachment; filename="{search_id}.pstats"'
+            },
+        )
+    report = search_profiler.report(search_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(report)
+
+
+@router.post("/api/v1/search-flights/estimate", tags=["search"])
+async def estimate_search_endpoint(
+    request: SearchRequest,
+    search_estimator: Annotated[SearchEstimator, Depends(get_search_estimator)],
+    logger: Annotated[Logger, Depends(get_logger)],
+) -> SearchEstimate:
+    """Endpoint dry-run : crawls, volume, attente et ETA estimés (aucun crawl)."""
+    estimate = await search_estimator.estimate(request)
+
+    logger.info(
+        "Search estimate computed",
+        extra={
+            "combinations_total": estimate.combinations_total,
+            "expected_crawls": estimate.expected_crawls,
+            "eta_s": estimate.eta_s,
+        },
+    )
+
+    return estimate
+
+
+@router.post("/api/v1/search-flights/batch", tags=["search"])
+async def search_flights_batch_endpoint(
+    batch: BatchSearchRequest,
+    search_service: Annotated[SearchService, Depends(get_search_service)],
+    admission_controller: Annotated[
+        AdmissionController, Depends(get_admission_controller)
+    ],
+    logger: Annotated[Logger, Depends(get_logger)],
+) -> BatchSearchResponse:
+    """Endpoint lot de recherches : chaque URL distincte crawlée une seule fois."""
+    logger.info(
+        "Batch flight search started", extra={"requests_count": len(batch.requests)}
+    )
+
+    try:
+        async with admission_controller.admit_batch(batch.requests) as ticket:
+            response = await search_service.search_batch(
+                batch.requests, interactive=ticket.interactive
+            )
+    except AdmissionRejectedError as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(int(e.retry_after_s))},
+        ) from e
+
+    logger.info(
+        "Batch flight search completed",
+        extra={
+            "requests_count": response.batch_stats.requests_count,
+            "urls_unique": response.batch_stats.urls_unique,
+            "search_time_ms": response.batch_stats.search_time_ms,
+        },
+    )
+
+    return response
+
+
+@router.get("/api/v1/prefetch/stats", tags=["prefetch"])
+def prefetch_stats_endpoint(
+    prefetcher: Annotated[Prefetcher, Depends(get_prefetcher)],
+) -> PrefetchStats:
+    """Endpoint statistiques du préchargement (budgets du jour, hits attribués)."""
+    return prefetcher.stats()
+
+
+@router.get("/api/v1/crawls/timings", tags=["crawl"])
+def crawl_timings_endpoint(
+    crawl_stats: Annotated[CrawlStats, Depends(get_crawl_stats)],
+) -> CrawlTimingStats:
+    """Endpoint décomposition moyenne du temps des derniers crawls réussis."""
+    return crawl_stats.timing_stats()
+
+
+@router.get("/api/v1/hedging/stats", tags=["crawl"])
+def hedging_stats_endpoint(
+    crawl_stats: Annotated[CrawlStats, Depends(get_crawl_stats)],
+    settings: Annotated[Settings, Depends(get_settings)],
+) -> HedgingStats:
+    """Endpoint taux de doublons (hedging) et de victoires des doublons."""
+    return crawl_stats.hedging_stats(settings.HEDGE_MIN_SAMPLES)
+
+
+@router.get("/api/v1/timeouts/stats", tags=["crawl"])
+def timeout_stats_endpoint(
+    adaptive_timeouts: Annotated[
+        AdaptiveTimeouts | None, Depends(get_adaptive_timeouts)
+    ],
+) -> list[TimeoutStats]:
+    """Endpoint timeouts adaptatifs (percentile observé, timeout appliqué)."""
+    if adaptive_timeouts is None:
+        return []
+    return adaptive_timeouts.stats()
+
+
+@router.get("/api/v1/proxies/stats", tags=["proxy"])
+def proxy_stats_endpoint(
+    proxy_service: Annotated[ProxyService | None, Depends(get_proxy_service)],
+) -> list[ProxyStats]:
+    """Endpoint santé du pool de proxies (succès, latences, cooldowns, poids)."""
+    if proxy_service is None:
+        return []
+    return proxy_service.stats()
+
+
+@router.post("/api/v1/watches", status_code=201, tags=["watch"])
+async def create_watch_endpoint(
+    request: WatchRequest,
+    watch_service: Annotated[WatchService, Depends(get_watch_service)],
+) -> WatchStatus:
+    """Endpoint création d'une watch (première exécution au prochain passage)."""
+    try:
+        watch = watch_service.create(request)
+    except WatchLimitReachedError as e:
+        raise HTTPException(status_code=429, detail=str(e)) from e
+    return watch_service.status(watch)
+
+
+@router.get("/api/v1/watches/{watch_id}", tags=["watch"])
+async def get_watch_endpoint(
+    watch_id: str,
+    watch_service: Annotated[WatchService, Depends(get_watch_service)],
+) -> WatchStatus:
+    """Endpoint état d'une watch."""
+    watch = watch_service.get(watch_id)
+    if watch is None:
+        raise HTTPException(status_code=404, detail="Watch not found")
+    return watch_service.status(watch)
+
+
+@router.get("/api/v1/watches/{watch_id}/events", tags=["watch"])
+async def watch_events_endpoint(
+    watch_id: str,
+    watch_service: Annotated[WatchService, Depends(get_watch_service)],
+    after: Annotated[int, Query(ge=0)] = 0,
+) -> WatchEventsResponse:
+    """Endpoint polling des variations de prix postérieures à `after`."""
+    watch = watch_service.get(watch_id)
+    if watch is None:
+        raise HTTPException(status_code=404, detail="Watch not found")
+    events = watch_service.events_after(watch, after)
+    return WatchEventsResponse(
+        watch_id=watch_id,
+        events=events,
+        next_after=events[-1].seq if events else after,
+    )
+
+
+@router.delete("/api/v1/watches/{watch_id}", status_code=204, tags=["watch"])
+async def delete_watch_endpoint(
+    watch_id: str,
+    watch_service: Annotated[WatchService, Depends(get_watch_service)],
+) -> None:
+    """Endpoint suppression d'une watch."""
+    if not watch_service.delete(watch_id):
+        raise HTTPException(status_code=404, detail="Watch not found")
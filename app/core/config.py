@@ -48,6 +48,71 @@ class Settings(BaseSettings):
     DECODO_PROXY_ENABLED: bool = True
     PROXY_ROTATION_ENABLED: bool = True
     CAPTCHA_DETECTION_ENABLED: bool = True
+    DECODO_STICKY_SESSIONS: int = Field(default=0, ge=0)
+    DECODO_STICKY_SESSION_MINUTES: int = Field(default=10, ge=1, le=1440)
+    PROXY_POOL_FILE: str | None = None
+    PROXY_HEALTH_WINDOW: int = Field(default=100, gt=0)
+    PROXY_COOLDOWN_S: float = Field(default=60.0, ge=0)
+    PROXY_MAX_COOLDOWN_S: float = Field(default=900.0, ge=0)
+    SESSION_POOL_SIZE: int = Field(default=1, gt=0)
+    SESSION_MAX_FAILURES: int = Field(default=3, gt=0)
+    SESSION_MAX_AGE_S: float = Field(default=600.0, gt=0)
+    RATE_LIMIT_GLOBAL_PER_S: float = Field(default=5.0, gt=0)
+    RATE_LIMIT_GLOBAL_BURST: int = Field(default=10, gt=0)
+    RATE_LIMIT_PROXY_PER_S: float = Field(default=0.5, gt=0)
+    RATE_LIMIT_PROXY_BURST: int = Field(default=2, gt=0)
+    RATE_LIMIT_PROXY_MIN_PER_S: float = Field(default=0.05, gt=0)
+    RATE_LIMIT_PROXY_INCREASE_PER_S: float = Field(default=0.01, ge=0)
+    HEDGE_ENABLED: bool = False
+    HEDGE_MAX_RATIO: float = Field(default=0.05, ge=0, le=1)
+    HEDGE_MIN_SAMPLES: int = Field(default=20, gt=0)
+    ADAPTIVE_TIMEOUTS_ENABLED: bool = True
+    ADAPTIVE_TIMEOUT_PERCENTILE: float = Field(default=99.0, gt=0, le=100)
+    ADAPTIVE_TIMEOUT_FACTOR: float = Field(default=1.5, ge=1)
+    ADAPTIVE_TIMEOUT_FLOOR_S: float = Field(default=10.0, gt=0)
+    ADAPTIVE_TIMEOUT_CEILING_S: float = Field(default=60.0, gt=0)
+    ADAPTIVE_TIMEOUT_MIN_SAMPLES: int = Field(default=30, gt=0)
+    METRICS_ENABLED: bool = True
+    TRACE_MAX_STORED: int = Field(default=50, gt=0)
+    PROFILING_TOKEN: SecretStr | None = None
+    PROFILING_MAX_STORED: int = Field(default=20, gt=0)
+
+    REDIS_URL: str | None = None
+    RESULT_CACHE_TTL_S: int = Field(default=900, gt=0)
+    CRAWL_LEASE_TTL_S: float = Field(default=180.0, gt=0)
+    RESPONSE_CACHE_FRESH_S: float = Field(default=300.0, ge=0)
+    RESPONSE_CACHE_STALE_S: float = Field(default=1800.0, ge=0)
+    FRESHNESS_VERIFY_TOP_K: int = Field(default=10, ge=0)
+    FRESHNESS_MAX_AGE_S: float = Field(default=600.0, ge=0)
+    PRICE_CALENDAR_CRAWL_RATIO: float = Field(default=0.1, gt=0, le=1)
+    PRICE_CALENDAR_SAFETY_MARGIN: float = Field(default=0.15, ge=0)
+    PROGRESSIVE_CRAWL_BUDGET: int = Field(default=200, gt=0)
+    PROGRESSIVE_LATTICE_STRIDE: int = Field(default=3, ge=1)
+    PROGRESSIVE_REFINE_TOP_K: int = Field(default=5, gt=0)
+    ADMISSION_MAX_COMPLETION_S: float = Field(default=120.0, gt=0)
+    ADMISSION_INTERACTIVE_MAX_CRAWLS: int = Field(default=30, ge=0)
+    ADMISSION_INTERACTIVE_RESERVE: float = Field(default=0.2, ge=0, lt=1)
+    ADMISSION_MAX_INFLIGHT_CRAWLS: int = Field(default=5000, gt=0)
+    ADMISSION_DEFAULT_CRAWL_LATENCY_S: float = Field(default=10.0, gt=0)
+    ESTIMATE_DEFAULT_PAGE_BYTES: int = Field(default=1_500_000, gt=0)
+    CHECKPOINT_PATH: str | None = None
+    CHECKPOINT_FLUSH_INTERVAL_S: float = Field(default=1.0, gt=0)
+    CHECKPOINT_FLUSH_BATCH_SIZE: int = Field(default=50, gt=0)
+    CHECKPOINT_MAX_AGE_S: float = Field(default=3600.0, gt=0)
+    PREFETCH_TOP_ROUTES: int = Field(default=20, ge=0)
+    PREFETCH_DAILY_CRAWL_BUDGET: int = Field(default=2000, ge=0)
+    PREFETCH_DAILY_BYTES_BUDGET: int = Field(default=3_000_000_000, ge=0)
+    PREFETCH_CONCURRENCY: int = Field(default=2, gt=0)
+    PREFETCH_POLL_INTERVAL_S: float = Field(default=30.0, gt=0)
+    PREFETCH_POPULARITY_HALF_LIFE_S: float = Field(default=86400.0, gt=0)
+    WATCH_MAX_WATCHES: int = Field(default=1000, ge=0)
+    WATCH_MAX_EVENTS: int = Field(default=500, gt=0)
+    WATCH_POLL_INTERVAL_S: float = Field(default=60.0, gt=0)
+    WATCH_TTL_MIN_S: float = Field(default=1800.0, gt=0)
+    WATCH_TTL_MAX_S: float = Field(default=86400.0, gt=0)
+    WATCH_TTL_PER_DAY_S: float = Field(default=1800.0, gt=0)
+    WATCH_MIN_PRICE_CHANGE: float = Field(default=1.0, ge=0)
+    WATCH_WEBHOOK_TIMEOUT_S: float = Field(default=10.0, gt=0)
 
     crawler: CrawlerTimeouts = CrawlerTimeouts()
 
@@ -62,6 +127,14 @@ class Settings(BaseSettings):
             raise ValueError("DECODO_PROXY_HOST must follow format: host:port")
         return v
 
+    @field_validator("REDIS_URL", mode="after")
+    @classmethod
+    def validate_redis_url_scheme(cls, v: str | None) -> str | None:
+        """Valide REDIS_URL au format redis://host:port."""
+        if v is not None and not v.startswith("redis://"):
+            raise ValueError("REDIS_URL must follow format: redis://host:port")
+        return v
+
     @model_validator(mode="after")
     def build_proxy_config(self) -> Self:
         """Genere ProxyConfig depuis variables env si proxies actives."""
@@ -34,3 +34,32 @@ class NetworkError(Exception):
         if status_code:
             msg += f" (status: {status_code})"
         super().__init__(msg)
+
+
+class IdempotencyKeyReusedError(Exception):
+    """Levée quand une Idempotency-Key est réutilisée avec une requête différente."""
+
+    def __init__(self, idempotency_key: str) -> None:
+        self.idempotency_key = idempotency_key
+        super().__init__(
+            f"Idempotency-Key {idempotency_key} already used with a different request"
+        )
+
+
+class AdmissionRejectedError(Exception):
+    """Levée quand une recherche est refusée faute de capacité de crawl."""
+
+    def __init__(self, reason: str, retry_after_s: float) -> None:
+        self.reason = reason
+        self.retry_after_s = retry_after_s
+        super().__init__(
+            f"Search rejected ({reason}), retry after {retry_after_s:.0f}s"
+        )
+
+
+class WatchLimitReachedError(Exception):
+    """Levée quand le nombre maximal de watches actives est atteint."""
+
+    def __init__(self, max_watches: int) -> None:
+        self.max_watches = max_watches
+        super().__init__(f"Maximum {max_watches} active watches reached")
@@ -1,20 +1,54 @@
+import asyncio
+import contextlib
 import logging
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
-from app.api.routes import router
+from app.api.routes import get_search_service, router
 
 logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    from app.core import get_settings
     from app.core.logger import get_logger
+    from app.services import (
+        get_checkpoint_store,
+        get_prefetcher,
+        get_result_cache,
+        get_watch_service,
+    )
 
     get_logger()
+    settings = get_settings()
+
+    search_service = get_search_service()
+    watch_service = get_watch_service()
+    background_tasks = [
+        asyncio.create_task(
+            watch_service.run_scheduler(
+                search_service, poll_interval_s=settings.WATCH_POLL_INTERVAL_S
+            )
+        ),
+        asyncio.create_task(
+            get_prefetcher().run_scheduler(
+                search_service, poll_interval_s=settings.PREFETCH_POLL_INTERVAL_S
+            )
+        ),
+    ]
     yield
+    for task in background_tasks:
+        task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await asyncio.gather(*background_tasks)
+    await watch_service.close()
+    await get_result_cache().close()
+    checkpoint_store = get_checkpoint_store()
+    if checkpoint_store is not None:
+        await checkpoint_store.close()
 
 
 app = FastAPI(title="flight-search-api", version="0.7.0", lifespan=lifespan)
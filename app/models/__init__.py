@@ -1,27 +1,58 @@
+from app.models.cache import CachedFlight
 from app.models.google_flight_dto import GoogleFlightDTO
-from app.models.proxy import ProxyConfig
+from app.models.proxy import ProxyConfig, ProxyStats
 from app.models.request import (
+    BatchSearchRequest,
+    CombinationConstraints,
     CombinationResult,
     DateCombination,
     DateRange,
     SearchRequest,
 )
 from app.models.response import (
+    BatchSearchResponse,
+    BatchStats,
+    CrawlTimingStats,
     FlightCombinationResult,
     HealthResponse,
+    HedgingStats,
+    PrefetchStats,
+    SearchEstimate,
     SearchResponse,
     SearchStats,
+    TimeoutStats,
+)
+from app.models.watch import (
+    PriceChangeEvent,
+    WatchEventsResponse,
+    WatchRequest,
+    WatchStatus,
 )
 
 __all__ = [
+    "BatchSearchRequest",
+    "BatchSearchResponse",
+    "BatchStats",
+    "CachedFlight",
+    "CombinationConstraints",
     "CombinationResult",
+    "CrawlTimingStats",
     "DateCombination",
     "DateRange",
     "FlightCombinationResult",
     "GoogleFlightDTO",
     "HealthResponse",
+    "HedgingStats",
+    "PrefetchStats",
+    "PriceChangeEvent",
     "ProxyConfig",
+    "ProxyStats",
+    "SearchEstimate",
     "SearchRequest",
     "SearchResponse",
     "SearchStats",
+    "TimeoutStats",
+    "WatchEventsResponse",
+    "WatchRequest",
+    "WatchStatus",
 ]
@@ -0,0 +1,24 @@
+"""Modèles des entrées du cache de résultats parsés."""
+
+import time
+from typing import Annotated
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.models.google_flight_dto import GoogleFlightDTO
+
+
+class CachedFlight(BaseModel):
+    """Meilleur vol parsé pour une URL Google Flights, horodaté."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    best_flight: GoogleFlightDTO
+    cached_at: Annotated[float, Field(ge=0)]
+    lease_token: Annotated[
+        str | None, "Lease du crawl qui a produit l'entrée (version d'écriture)"
+    ] = None
+
+    def age_s(self, now: float | None = None) -> float:
+        """Retourne l'âge de l'entrée en secondes."""
+        return max(0.0, (now if now is not None else time.time()) - self.cached_at)
@@ -1,11 +1,15 @@
 import math
-from datetime import date, datetime
-from typing import Annotated, Self
+from datetime import date, datetime, timedelta
+from typing import Annotated, Literal, Self
 
-from pydantic import BaseModel, ConfigDict, field_validator, model_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
 
 from app.models.google_flight_dto import GoogleFlightDTO
 
+MAX_DAYS_PER_SEGMENT = 15
+PROGRESSIVE_MAX_DAYS_PER_SEGMENT = 60
+MAX_BATCH_REQUESTS = 50
+
 
 def validate_iso_date(value: str) -> str:
     """Valide format ISO 8601 (YYYY-MM-DD)."""
@@ -44,6 +48,98 @@ class DateRange(BaseModel):
 
         return self
 
+    def dates(self) -> list[date]:
+        """Liste les dates de la plage (bornes incluses)."""
+        start_date = date.fromisoformat(self.start)
+        end_date = date.fromisoformat(self.end)
+        return [
+            start_date + timedelta(days=offset)
+            for offset in range((end_date - start_date).days + 1)
+        ]
+
+
+class CombinationConstraints(BaseModel):
+    """Contraintes voyageur appliquées à la génération des combinaisons."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    min_nights_between: Annotated[
+        int | None, Field(ge=0), "Nuits min entre deux segments consécutifs"
+    ] = None
+    max_nights_between: Annotated[
+        int | None, Field(ge=0), "Nuits max entre deux segments consécutifs"
+    ] = None
+    departure_weekdays: Annotated[
+        list[int] | None,
+        "Jours de départ autorisés pour tous les segments (0=lundi ... 6=dimanche)",
+    ] = None
+    blackout_dates: Annotated[list[str], "Dates exclues (ISO 8601)"] = []
+
+    @field_validator("departure_weekdays", mode="after")
+    @classmethod
+    def validate_weekdays(cls, v: list[int] | None) -> list[int] | None:
+        """Valide jours de semaine entre 0 et 6, au moins un."""
+        if v is None:
+            return v
+        if not v:
+            raise ValueError("At least 1 departure weekday required")
+        if any(day < 0 or day > 6 for day in v):
+            raise ValueError("Departure weekdays must be between 0 and 6")
+        return v
+
+    @field_validator("blackout_dates", mode="after")
+    @classmethod
+    def validate_blackout_dates(cls, v: list[str]) -> list[str]:
+        """Valide format ISO 8601 des dates exclues."""
+        return [validate_iso_date(d) for d in v]
+
+    @model_validator(mode="after")
+    def validate_nights_bounds(self) -> Self:
+        """Valide min_nights_between <= max_nights_between."""
+        if (
+            self.min_nights_between is not None
+            and self.max_nights_between is not None
+            and self.min_nights_between > self.max_nights_between
+        ):
+            raise ValueError(
+                "min_nights_between must be lower than or equal to max_nights_between"
+            )
+        return self
+
+    def allows_date(self, day: date) -> bool:
+        """Indique si une date de segment respecte jours autorisés et exclusions."""
+        if self.departure_weekdays is not None and (
+            day.weekday() not in self.departure_weekdays
+        ):
+            return False
+        return day.isoformat() not in self.blackout_dates
+
+    def allows_gap(self, previous: date, current: date) -> bool:
+        """Indique si l'écart entre deux segments consécutifs est autorisé."""
+        nights = (current - previous).days
+        if self.min_nights_between is not None and nights < self.min_nights_between:
+            return False
+        return self.max_nights_between is None or nights <= self.max_nights_between
+
+    def count_combinations(self, segment_dates: list[list[date]]) -> int:
+        """Compte les combinaisons valides sans les matérialiser (prog. dynamique)."""
+        counts = (
+            {day: 1 for day in segment_dates[0] if self.allows_date(day)}
+            if segment_dates
+            else {}
+        )
+        for dates in segment_dates[1:]:
+            counts = {
+                day: sum(
+                    count
+                    for previous, count in counts.items()
+                    if self.allows_gap(previous, day)
+                )
+                for day in dates
+                if self.allows_date(day)
+            }
+        return sum(counts.values())
+
 
 class SearchRequest(BaseModel):
     """Requête recherche vols multi-city avec URL template Google Flights."""
@@ -56,6 +152,23 @@ class SearchRequest(BaseModel):
     segments_date_ranges: Annotated[
         list[DateRange], "Plages dates par segment (2-5 segments)"
     ]
+    mode: Annotated[
+        Literal["exhaustive", "calendar", "progressive"],
+        "exhaustive: crawl toutes combinaisons, calendar: pré-tri via grilles de prix, "
+        "progressive: treillis clairsemé puis raffinement sous budget de crawls",
+    ] = "exhaustive"
+    deadline_ms: Annotated[
+        int | None,
+        Field(gt=0, le=600_000),
+        "Délai max de recherche (ms) : au-delà, meilleurs résultats partiels retournés",
+    ] = None
+    constraints: Annotated[
+        CombinationConstraints | None,
+        "Contraintes appliquées avant crawl (nuits entre segments, jours, exclusions)",
+    ] = None
+    complete_itineraries: Annotated[
+        bool, "Compléter les top résultats avec le meilleur vol de chaque segment"
+    ] = False
 
     @field_validator("template_url", mode="after")
     @classmethod
@@ -79,16 +192,21 @@ class SearchRequest(BaseModel):
 
     @model_validator(mode="after")
     def validate_date_ranges_max_days(self) -> Self:
-        """Valide max 15 jours par segment."""
+        """Valide max 15 jours par segment (60 en mode progressive)."""
+        max_days = (
+            PROGRESSIVE_MAX_DAYS_PER_SEGMENT
+            if self.mode == "progressive"
+            else MAX_DAYS_PER_SEGMENT
+        )
         for idx, date_range in enumerate(self.segments_date_ranges):
             start_date = date.fromisoformat(date_range.start)
             end_date = date.fromisoformat(date_range.end)
             days_diff = (end_date - start_date).days
 
-            if days_diff > 15:
+            if days_diff > max_days:
                 raise ValueError(
                     f"Segment {idx + 1} date range too large: {days_diff} days. "
-                    f"Max 15 days per segment."
+                    f"Max {max_days} days per segment."
                 )
 
         return self
@@ -115,18 +233,21 @@ class SearchRequest(BaseModel):
 
     @model_validator(mode="after")
     def validate_explosion_combinatoire(self) -> Self:
-        """Valide max 1000 combinaisons totales avec message UX-friendly."""
-        days_per_segment = []
+        """Valide max 1000 combinaisons totales (après contraintes) avec message UX-friendly.
 
-        for date_range in self.segments_date_ranges:
-            start_date = date.fromisoformat(date_range.start)
-            end_date = date.fromisoformat(date_range.end)
-            days_diff = (end_date - start_date).days + 1
-            days_per_segment.append(days_diff)
+        Non applicable en mode progressive (coût borné par le budget de crawls).
+        """
+        if self.mode == "progressive" and self.constraints is None:
+            return self
 
-        total_combinations = math.prod(days_per_segment)
+        days_per_segment = [
+            len(date_range.dates()) for date_range in self.segments_date_ranges
+        ]
+        total_combinations = self.count_combinations()
+        if total_combinations == 0:
+            raise ValueError("No date combination satisfies the constraints")
 
-        if total_combinations > 1000:
+        if total_combinations > 1000 and self.mode != "progressive":
             max_days_index = days_per_segment.index(max(days_per_segment))
             max_days = days_per_segment[max_days_index]
 
@@ -138,6 +259,34 @@ class SearchRequest(BaseModel):
 
         return self
 
+    def count_combinations(self) -> int:
+        """Nombre de combinaisons de dates après contraintes (sans les générer)."""
+        segment_dates = [date_range.dates() for date_range in self.segments_date_ranges]
+        if self.constraints is None:
+            return math.prod(len(dates) for dates in segment_dates)
+        return self.constraints.count_combinations(segment_dates)
+
+
+class BatchSearchRequest(BaseModel):
+    """Lot de recherches dont les URLs identiques sont crawlées une seule fois."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    requests: Annotated[
+        list[SearchRequest], Field(min_length=1, max_length=MAX_BATCH_REQUESTS)
+    ]
+
+    @field_validator("requests", mode="after")
+    @classmethod
+    def validate_exhaustive_only(cls, v: list[SearchRequest]) -> list[SearchRequest]:
+        """Valide mode exhaustive (plan de crawl commun au lot)."""
+        for idx, request in enumerate(v):
+            if request.mode != "exhaustive":
+                raise ValueError(
+                    f"Request {idx + 1}: batch search supports exhaustive mode only"
+                )
+        return v
+
 
 class DateCombination(BaseModel):
     """Combinaison dates pour itineraire multi-city fixe."""
@@ -162,3 +311,6 @@ class CombinationResult(BaseModel):
 
     date_combination: DateCombination
     best_flight: GoogleFlightDTO
+    observed_at: Annotated[
+        float | None, "Horodatage Unix de l'observation du prix (crawl ou cache)"
+    ] = None
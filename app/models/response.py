@@ -21,7 +21,7 @@ class FlightCombinationResult(BaseModel):
     segment_dates: Annotated[list[str], "Dates par segment (ISO 8601)"]
     flights: Annotated[
         list[GoogleFlightDTO],
-        "Meilleurs vols pour cette combinaison (pour l'instant juste le segment 1)",
+        "Meilleur vol par segment (segment 1 seul sans complete_itineraries)",
     ]
 
     @field_validator("segment_dates", mode="after")
@@ -43,6 +43,23 @@ class FlightCombinationResult(BaseModel):
         return v
 
 
+class CrawlTimingStats(BaseModel):
+    """Décomposition moyenne du temps des crawls réussis (secondes)."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    crawls: Annotated[int, "Crawls réussis mesurés"]
+    queue_wait_s: Annotated[float, "Attente d'un slot de concurrence et du cadencement"]
+    browser_start_s: Annotated[float, "Démarrage du navigateur et du contexte"]
+    navigation_s: Annotated[float, "Navigation jusqu'à la réponse (goto)"]
+    selector_wait_s: Annotated[float, "Attente du sélecteur des résultats"]
+    settle_s: Annotated[float, "Délai fixe avant récupération du HTML"]
+    html_s: Annotated[float, "Récupération et post-traitement du HTML"]
+    captcha_check_s: Annotated[float, "Détection de captcha"]
+    parse_s: Annotated[float, "Parsing des vols"]
+    bytes_total: Annotated[int, "HTML reçu (octets)"]
+
+
 class SearchStats(BaseModel):
     """Statistiques métadonnées recherche."""
 
@@ -51,6 +68,52 @@ class SearchStats(BaseModel):
     total_results: int
     search_time_ms: int
     segments_count: int
+    cache_hits: Annotated[int, "Combinaisons servies depuis le cache de résultats"] = 0
+    coalesced_crawls: Annotated[
+        int, "Combinaisons servies par un crawl identique déjà en cours"
+    ] = 0
+    combinations_pruned: Annotated[
+        int, "Combinaisons écartées avant crawl (grilles de prix)"
+    ] = 0
+    verified_crawls: Annotated[
+        int, "Recrawls de vérification des top résultats issus d'un cache ancien"
+    ] = 0
+    combinations_total: Annotated[int, "Combinaisons générées pour la recherche"] = 0
+    combinations_crawled: Annotated[
+        int, "Combinaisons résolues (succès ou échec, cache inclus)"
+    ] = 0
+    crawls_cancelled: Annotated[
+        int, "Combinaisons annulées à l'expiration du deadline_ms"
+    ] = 0
+    crawls_failed: Annotated[int, "Combinaisons en échec (crawl ou parsing)"] = 0
+    refinement_rounds: Annotated[
+        int, "Rounds de crawl du mode progressive (treillis initial inclus)"
+    ] = 0
+    drilldown_crawls: Annotated[
+        int, "Crawls de sélection segment par segment (complete_itineraries)"
+    ] = 0
+    combinations_resumed: Annotated[
+        int, "Combinaisons reprises d'un point de reprise (recherche interrompue)"
+    ] = 0
+    crawl_timings: Annotated[
+        CrawlTimingStats | None, "Décomposition moyenne des crawls de la recherche"
+    ] = None
+
+
+class SearchEstimate(BaseModel):
+    """Estimation coût et durée d'une recherche (dry-run, aucun crawl)."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    combinations_total: Annotated[int, "Combinaisons après contraintes"]
+    cached_combinations: Annotated[
+        int, "Combinaisons déjà présentes dans le cache de résultats"
+    ]
+    expected_crawls: Annotated[int, "Crawls prévus (pré-crawls calendar inclus)"]
+    expected_bytes: Annotated[int, "Volume HTML attendu via proxy (octets)"]
+    queue_wait_s: Annotated[float, "Attente estimée due aux crawls en cours"]
+    eta_s: Annotated[float, "Durée totale estimée (attente incluse)"]
+    mean_crawl_latency_s: Annotated[float, "Latence moyenne observée d'un crawl"]
 
 
 class SearchResponse(BaseModel):
@@ -82,3 +145,71 @@ class SearchResponse(BaseModel):
         ):
             raise ValueError("Results must be sorted by price (ascending order)")
         return self
+
+
+class BatchStats(BaseModel):
+    """Statistiques du plan de crawl commun d'un lot de recherches."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    requests_count: int
+    urls_total: Annotated[int, "URLs générées par l'ensemble des requêtes"]
+    urls_unique: Annotated[int, "URLs distinctes résolues (une fois chacune)"]
+    cache_hits: Annotated[int, "URLs distinctes servies depuis le cache"] = 0
+    crawls_failed: Annotated[int, "URLs distinctes en échec"] = 0
+    search_time_ms: int
+
+
+class BatchSearchResponse(BaseModel):
+    """Réponses d'un lot, dans l'ordre des requêtes soumises."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    responses: list[SearchResponse]
+    batch_stats: BatchStats
+
+
+class HedgingStats(BaseModel):
+    """Requêtes dupliquées sur les crawls lents (depuis le démarrage)."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    crawls: Annotated[int, "Crawls terminés"]
+    hedges: Annotated[int, "Crawls dupliqués après dépassement du p90"]
+    hedge_rate: Annotated[float, "hedges / crawls"]
+    hedge_wins: Annotated[int, "Crawls dont le doublon a répondu en premier"]
+    win_rate: Annotated[float, "hedge_wins / hedges"]
+    hedge_after_s: Annotated[
+        float | None, "Délai avant doublon (p90 observé, None si trop peu de mesures)"
+    ]
+
+
+class TimeoutStats(BaseModel):
+    """Timeout adaptatif d'une étape de crawl pour un proxy (ou le pool)."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    proxy: Annotated[str, "Sortie proxy (hôte:port/session), 'pool' ou 'direct'"]
+    stage: Annotated[str, "navigation, selector_wait ou crawl"]
+    samples: Annotated[int, "Mesures dans la fenêtre glissante"]
+    observed_s: Annotated[float | None, "Percentile observé (s)"]
+    timeout_s: Annotated[float, "Timeout appliqué (s)"]
+
+
+class PrefetchStats(BaseModel):
+    """Activité du préchargement des itinéraires populaires (jour en cours)."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    routes_tracked: Annotated[int, "Itinéraires dont la fréquence est suivie"]
+    crawls_today: Annotated[int, "Crawls de préchargement du jour"]
+    crawl_budget: Annotated[int, "Budget quotidien de crawls"]
+    bytes_today: Annotated[int, "Volume estimé du jour (octets)"]
+    bytes_budget: Annotated[int, "Budget quotidien de volume (octets)"]
+    yields: Annotated[int, "Préchargements interrompus par une recherche"]
+    prefetched_total: Annotated[int, "Combinaisons préchargées depuis le démarrage"]
+    hits: Annotated[int, "Recherches servies par une combinaison préchargée"]
+    hit_rate: Annotated[float, "hits / prefetched_total"]
+    saved_latency_s: Annotated[
+        float, "Latence de crawl évitée aux recherches (latence moyenne par hit)"
+    ]
@@ -0,0 +1,108 @@
+import ipaddress
+from typing import Annotated, Literal
+
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl, field_validator
+
+from app.models.request import SearchRequest
+
+BLOCKED_WEBHOOK_HOST_SUFFIXES = (".localhost", ".local", ".internal")
+
+
+def is_public_address(address: str) -> bool:
+    """Adresse IP routable sur Internet (ni privée, ni loopback, ni link-local)."""
+    ip = ipaddress.ip_address(address)
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+def validate_webhook_url(url: HttpUrl) -> HttpUrl:
+    """Valide un webhook HTTPS vers un hôte public (protection SSRF).
+
+    Rejette loopback, réseaux privés, link-local (métadonnées cloud
+    169.254.169.254) et noms internes ; la résolution DNS est revérifiée à
+    l'envoi.
+    """
+    if url.scheme != "https":
+        raise ValueError("Webhook URL must use https")
+    host = (url.host or "").rstrip(".").lower()
+    if host == "localhost" or host.endswith(BLOCKED_WEBHOOK_HOST_SUFFIXES):
+        raise ValueError("Webhook host must be public")
+    try:
+        public = is_public_address(host.strip("[]"))
+    except ValueError:
+        return url
+    if not public:
+        raise ValueError("Webhook host must be public")
+    return url
+
+
+class WatchRequest(BaseModel):
+    """Abonnement de surveillance des prix d'une recherche."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    search: SearchRequest
+    webhook_url: Annotated[
+        HttpUrl | None, "URL notifiée (POST JSON) à chaque variation de prix"
+    ] = None
+    interval_s: Annotated[
+        int, Field(ge=300, le=7 * 86400), "Intervalle entre deux exécutions"
+    ] = 3600
+
+    @field_validator("webhook_url", mode="after")
+    @classmethod
+    def validate_public_webhook(cls, v: HttpUrl | None) -> HttpUrl | None:
+        """Valide webhook HTTPS vers un hôte public."""
+        return None if v is None else validate_webhook_url(v)
+
+    @field_validator("search", mode="after")
+    @classmethod
+    def validate_exhaustive_only(cls, v: SearchRequest) -> SearchRequest:
+        """Valide mode exhaustive (re-crawl incrémental par combinaison)."""
+        if v.mode != "exhaustive":
+            raise ValueError("Price watch supports exhaustive mode only")
+        return v
+
+
+class PriceChangeEvent(BaseModel):
+    """Variation du meilleur prix d'une combinaison entre deux exécutions."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    seq: Annotated[int, "Numéro d'ordre croissant dans le flux de la watch"]
+    watch_id: str
+    kind: Literal["price_drop", "price_rise"]
+    segment_dates: Annotated[list[str], "Dates par segment (ISO 8601)"]
+    previous_price: float
+    price: float
+    observed_at: Annotated[float, "Horodatage epoch du nouveau prix"]
+
+
+class WatchStatus(BaseModel):
+    """État d'une watch et coût de sa dernière exécution."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    watch_id: str
+    search: SearchRequest
+    webhook_url: HttpUrl | None = None
+    interval_s: int
+    runs: Annotated[int, "Exécutions terminées"] = 0
+    last_run_at: Annotated[float | None, "Horodatage epoch"] = None
+    next_run_at: Annotated[float, "Horodatage epoch"]
+    combinations_tracked: Annotated[int, "Combinaisons avec un prix connu"] = 0
+    last_run_recrawled: Annotated[
+        int, "Combinaisons recrawlées (TTL expiré ou prix inconnu)"
+    ] = 0
+    last_run_reused: Annotated[int, "Combinaisons encore fraîches non recrawlées"] = 0
+
+
+class WatchEventsResponse(BaseModel):
+    """Page du flux d'événements d'une watch (polling)."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    watch_id: str
+    events: list[PriceChangeEvent]
+    next_after: Annotated[int, "Valeur de `after` pour la page suivante"]
@@ -1,18 +1,88 @@
 """Exports services."""
 
+from app.services.adaptive_timeouts import AdaptiveTimeouts, get_adaptive_timeouts
+from app.services.admission_controller import (
+    AdmissionController,
+    get_admission_controller,
+)
+from app.services.checkpoint_store import CheckpointStore, get_checkpoint_store
 from app.services.combination_generator import CombinationGenerator
+from app.services.crawl_coalescer import CrawlCoalescer, get_crawl_coalescer
+from app.services.crawl_slots import CrawlSlots, get_crawl_slots
+from app.services.crawl_stats import CrawlStats, CrawlTimings, get_crawl_stats
 from app.services.crawler_service import CrawlerService, CrawlResult
 from app.services.flight_parser import FlightParser
-from app.services.proxy_service import ProxyService
+from app.services.itinerary_drilldown import ItineraryDrillDown
+from app.services.metrics import PipelineMetrics, get_pipeline_metrics
+from app.services.prefetcher import Prefetcher, get_prefetcher
+from app.services.price_calendar import PriceCalendarService
+from app.services.price_calendar_parser import PriceCalendarParser
+from app.services.price_history import PriceHistory, get_price_history
+from app.services.progressive_planner import ProgressivePlanner
+from app.services.proxy_service import ProxyService, get_proxy_service
+from app.services.rate_limiter import RateLimiter, get_rate_limiter
+from app.services.response_cache import ResponseCache, get_response_cache
+from app.services.result_cache import ResultCache, get_result_cache
 from app.services.retry_strategy import RetryStrategy
+from app.services.search_estimator import SearchEstimator
+from app.services.search_profiler import SearchProfiler, get_search_profiler
 from app.services.search_service import SearchService
+from app.services.search_trace import (
+    SearchTrace,
+    TraceStore,
+    get_trace_store,
+    tracing,
+)
+from app.services.session_pool import SessionPool, get_session_pool
+from app.services.watch_service import WatchService, get_watch_service
 
 __all__ = [
+    "AdaptiveTimeouts",
+    "AdmissionController",
+    "CheckpointStore",
     "CombinationGenerator",
+    "CrawlCoalescer",
     "CrawlResult",
+    "CrawlSlots",
+    "CrawlStats",
+    "CrawlTimings",
     "CrawlerService",
     "FlightParser",
+    "ItineraryDrillDown",
+    "PipelineMetrics",
+    "Prefetcher",
+    "PriceCalendarParser",
+    "PriceCalendarService",
+    "PriceHistory",
+    "ProgressivePlanner",
     "ProxyService",
+    "RateLimiter",
+    "ResponseCache",
+    "ResultCache",
     "RetryStrategy",
+    "SearchEstimator",
+    "SearchProfiler",
     "SearchService",
+    "SearchTrace",
+    "SessionPool",
+    "TraceStore",
+    "WatchService",
+    "get_adaptive_timeouts",
+    "get_admission_controller",
+    "get_checkpoint_store",
+    "get_crawl_coalescer",
+    "get_crawl_slots",
+    "get_crawl_stats",
+    "get_pipeline_metrics",
+    "get_prefetcher",
+    "get_price_history",
+    "get_proxy_service",
+    "get_rate_limiter",
+    "get_response_cache",
+    "get_result_cache",
+    "get_search_profiler",
+    "get_session_pool",
+    "get_trace_store",
+    "get_watch_service",
+    "tracing",
 ]
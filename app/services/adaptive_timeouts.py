@@ -0,0 +1,110 @@
+"""Timeouts de crawl dérivés des latences observées par proxy et par étape."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Literal
+
+from app.core import get_settings
+from app.models import TimeoutStats
+from app.utils import RollingWindow
+
+type TimeoutStage = Literal["navigation", "selector_wait", "crawl"]
+
+POOL_KEY = "pool"
+DIRECT_KEY = "direct"
+
+
+class AdaptiveTimeouts:
+    """Timeout d'une étape = percentile x factor, borné [floor_s, ceiling_s].
+
+    Étapes : navigation (goto) et attente du sélecteur, qui bornent le
+    page_timeout Crawl4AI, et crawl complet (timeout global). Fenêtre du proxy
+    si assez de mesures, sinon fenêtre du pool, sinon timeout statique. Les
+    timeouts atteints sont enregistrés comme mesures : un pool qui ralentit
+    fait remonter ses timeouts au lieu de les voir se resserrer.
+    """
+
+    def __init__(
+        self,
+        *,
+        defaults: Mapping[TimeoutStage, float],
+        factor: float,
+        floor_s: float,
+        ceiling_s: float,
+        min_samples: int,
+        percentile: float = 99.0,
+        window_size: int = 200,
+    ) -> None:
+        """Initialise fenêtres vides et timeouts statiques de repli."""
+        self._defaults = defaults
+        self._factor = factor
+        self._floor_s = floor_s
+        self._ceiling_s = ceiling_s
+        self._min_samples = min_samples
+        self._percentile = percentile
+        self._window_size = window_size
+        self._windows: dict[tuple[str, TimeoutStage], RollingWindow] = {}
+
+    def record(
+        self, proxy_key: str | None, stage: TimeoutStage, duration_s: float
+    ) -> None:
+        """Enregistre la durée d'une étape pour le proxy et pour le pool."""
+        for key in (proxy_key or DIRECT_KEY, POOL_KEY):
+            window = self._windows.get((key, stage))
+            if window is None:
+                window = self._windows[(key, stage)] = RollingWindow(self._window_size)
+            window.add(duration_s)
+
+    def timeout_s(self, proxy_key: str | None, stage: TimeoutStage) -> float:
+        """Timeout courant de l'étape pour ce proxy."""
+        for key in (proxy_key or DIRECT_KEY, POOL_KEY):
+            timeout_s = self._derived_timeout_s(key, stage)
+            if timeout_s is not None:
+                return timeout_s
+        return self._defaults[stage]
+
+    def stats(self) -> list[TimeoutStats]:
+        """Percentile observé et timeout appliqué par proxy et par étape."""
+        return [
+            TimeoutStats(
+                proxy=key,
+                stage=stage,
+                samples=len(window),
+                observed_s=window.percentile(self._percentile),
+                timeout_s=self._derived_timeout_s(key, stage) or self._defaults[stage],
+            )
+            for (key, stage), window in sorted(self._windows.items())
+        ]
+
+    def _derived_timeout_s(self, key: str, stage: TimeoutStage) -> float | None:
+        """Percentile x factor borné (None si moins de min_samples mesures)."""
+        window = self._windows.get((key, stage))
+        if window is None or len(window) < self._min_samples:
+            return None
+        observed = window.percentile(self._percentile) or 0.0
+        return round(
+            min(self._ceiling_s, max(self._floor_s, observed * self._factor)), 3
+        )
+
+
+@lru_cache
+def get_adaptive_timeouts() -> AdaptiveTimeouts | None:
+    """Retourne instance AdaptiveTimeouts partagée (None si désactivés)."""
+    settings = get_settings()
+    if not settings.ADAPTIVE_TIMEOUTS_ENABLED:
+        return None
+    page_timeout_s = settings.crawler.crawl_page_timeout_ms / 1000
+    return AdaptiveTimeouts(
+        defaults={
+            "navigation": page_timeout_s,
+            "selector_wait": page_timeout_s,
+            "crawl": settings.crawler.crawl_global_timeout_s,
+        },
+        factor=settings.ADAPTIVE_TIMEOUT_FACTOR,
+        floor_s=settings.ADAPTIVE_TIMEOUT_FLOOR_S,
+        ceiling_s=settings.ADAPTIVE_TIMEOUT_CEILING_S,
+        min_samples=settings.ADAPTIVE_TIMEOUT_MIN_SAMPLES,
+        percentile=settings.ADAPTIVE_TIMEOUT_PERCENTILE,
+    )
@@ -0,0 +1,183 @@
+"""Contrôle d'admission des recherches selon la capacité de crawl disponible."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+from collections.abc import AsyncIterator
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+
+from app.core import get_settings
+from app.exceptions import AdmissionRejectedError
+from app.models import SearchRequest
+from app.services.crawl_stats import CrawlStats, get_crawl_stats
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AdmissionTicket:
+    """Recherche admise : crawls réservés et durée projetée à l'admission."""
+
+    crawls: int
+    interactive: bool
+    projected_completion_s: float
+
+
+class AdmissionController:
+    """Admet ou rejette les recherches selon le coût estimé et la charge en cours.
+
+    Coût = crawls estimés x latence moyenne observée / capacité. Les grosses
+    recherches ne voient qu'une partie de la capacité, le reste étant réservé aux
+    petites recherches interactives. Le nombre total de crawls en cours (état en
+    mémoire) est plafonné. La réserve est appliquée à l'exécution par CrawlSlots,
+    partagé par toutes les recherches.
+    """
+
+    def __init__(
+        self,
+        crawl_stats: CrawlStats,
+        *,
+        capacity: int,
+        max_completion_s: float,
+        interactive_max_crawls: int,
+        interactive_reserve: float,
+        max_inflight_crawls: int,
+        progressive_budget: int,
+    ) -> None:
+        """Initialise contrôleur avec capacité (crawls parallèles) et limites."""
+        self._crawl_stats = crawl_stats
+        self._capacity = capacity
+        self._max_completion_s = max_completion_s
+        self._interactive_max_crawls = interactive_max_crawls
+        self._interactive_reserve = interactive_reserve
+        self._max_inflight_crawls = max_inflight_crawls
+        self._progressive_budget = progressive_budget
+        self.inflight_crawls = 0
+        self.inflight_searches = 0
+        self._busy = asyncio.Event()
+
+    def estimate_crawls(self, request: SearchRequest) -> int:
+        """Nombre de crawls prévus pour la requête (budget en mode progressive)."""
+        if request.mode == "progressive":
+            return min(request.count_combinations(), self._progressive_budget)
+        return request.count_combinations()
+
+    def is_interactive(self, crawls: int) -> bool:
+        """Petite recherche bénéficiant de la capacité réservée."""
+        return crawls <= self._interactive_max_crawls
+
+    @property
+    def capacity(self) -> int:
+        """Crawls parallèles disponibles."""
+        return self._capacity
+
+    @property
+    def is_idle(self) -> bool:
+        """Aucune recherche admise en cours."""
+        return self.inflight_searches == 0
+
+    async def wait_busy(self) -> None:
+        """Attend l'admission d'une recherche."""
+        await self._busy.wait()
+
+    def queue_wait_s(self) -> float:
+        """Attente estimée avant qu'un nouveau crawl obtienne un slot."""
+        return self.inflight_crawls * self._crawl_stats.mean_latency_s / self._capacity
+
+    def projected_completion_s(self, crawls: int) -> float:
+        """Durée projetée si admise maintenant (crawls en cours inclus)."""
+        capacity = float(self._capacity)
+        if not self.is_interactive(crawls):
+            capacity *= 1 - self._interactive_reserve
+        work_s = (self.inflight_crawls + crawls) * self._crawl_stats.mean_latency_s
+        return work_s / max(capacity, 1e-9)
+
+    def admit(
+        self, request: SearchRequest
+    ) -> AbstractAsyncContextManager[AdmissionTicket]:
+        """Réserve la capacité le temps de la recherche ou lève AdmissionRejectedError."""
+        return self.reserve(self.estimate_crawls(request))
+
+    def admit_batch(
+        self, requests: list[SearchRequest]
+    ) -> AbstractAsyncContextManager[AdmissionTicket]:
+        """Réserve la capacité d'un lot (borne haute : URLs non dédupliquées)."""
+        return self.reserve(sum(self.estimate_crawls(r) for r in requests))
+
+    @asynccontextmanager
+    async def reserve(self, crawls: int) -> AsyncIterator[AdmissionTicket]:
+        """Réserve `crawls` crawls jusqu'à la sortie du contexte."""
+        ticket = AdmissionTicket(
+            crawls=crawls,
+            interactive=self.is_interactive(crawls),
+            projected_completion_s=self.projected_completion_s(crawls),
+        )
+        self._check(ticket)
+
+        self.inflight_crawls += crawls
+        self.inflight_searches += 1
+        self._busy.set()
+        try:
+            yield ticket
+        finally:
+            self.inflight_crawls -= crawls
+            self.inflight_searches -= 1
+            if self.inflight_searches == 0:
+                self._busy.clear()
+
+    def _check(self, ticket: AdmissionTicket) -> None:
+        """Rejette si état en mémoire plafonné ou durée projetée trop longue.
+
+        Une recherche seule (aucune en cours) est toujours admise.
+        """
+        if self.inflight_searches == 0:
+            return
+
+        if self.inflight_crawls + ticket.crawls > self._max_inflight_crawls:
+            self._reject(ticket, "inflight_limit", self._drain_time_s(ticket))
+        if ticket.projected_completion_s > self._max_completion_s:
+            self._reject(
+                ticket,
+                "projected_completion",
+                ticket.projected_completion_s - self._max_completion_s,
+            )
+
+    def _drain_time_s(self, ticket: AdmissionTicket) -> float:
+        """Temps estimé pour libérer assez de crawls en cours."""
+        excess = self.inflight_crawls + ticket.crawls - self._max_inflight_crawls
+        return excess * self._crawl_stats.mean_latency_s / self._capacity
+
+    def _reject(self, ticket: AdmissionTicket, reason: str, wait_s: float) -> None:
+        """Journalise puis lève AdmissionRejectedError (Retry-After >= 1s)."""
+        retry_after_s = float(max(1, math.ceil(wait_s)))
+        logger.warning(
+            "Search rejected by admission control",
+            extra={
+                "reason": reason,
+                "crawls": ticket.crawls,
+                "interactive": ticket.interactive,
+                "projected_completion_s": round(ticket.projected_completion_s, 1),
+                "inflight_crawls": self.inflight_crawls,
+                "retry_after_s": retry_after_s,
+            },
+        )
+        raise AdmissionRejectedError(reason, retry_after_s)
+
+
+@lru_cache
+def get_admission_controller() -> AdmissionController:
+    """Retourne instance AdmissionController partagée (singleton via lru_cache)."""
+    settings = get_settings()
+    return AdmissionController(
+        get_crawl_stats(),
+        capacity=settings.MAX_CONCURRENCY,
+        max_completion_s=settings.ADMISSION_MAX_COMPLETION_S,
+        interactive_max_crawls=settings.ADMISSION_INTERACTIVE_MAX_CRAWLS,
+        interactive_reserve=settings.ADMISSION_INTERACTIVE_RESERVE,
+        max_inflight_crawls=settings.ADMISSION_MAX_INFLIGHT_CRAWLS,
+        progressive_budget=settings.PROGRESSIVE_CRAWL_BUDGET,
+    )
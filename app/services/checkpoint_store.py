@@ -0,0 +1,184 @@
+"""Points de reprise des recherches longues (SQLite local, écritures groupées)."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+
+from pydantic import ValidationError
+
+from app.core import get_settings
+from app.models import CachedFlight, DateCombination
+
+logger = logging.getLogger(__name__)
+
+type CheckpointRow = tuple[str, str, str, float]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    request_hash TEXT NOT NULL,
+    segment_dates TEXT NOT NULL,
+    observed TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    PRIMARY KEY (request_hash, segment_dates)
+)
+"""
+
+
+class CheckpointStore:
+    """Combinaisons résolues par recherche (clé : hash canonique de la requête).
+
+    Les résultats sont mis en tampon puis écrits par lots dans un thread
+    (`asyncio.to_thread`) : la boucle de crawl n'attend jamais le disque. Une
+    recherche interrompue (redémarrage, deadline) reprend avec les seules
+    combinaisons restantes.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        flush_interval_s: float = 1.0,
+        flush_batch_size: int = 50,
+        max_age_s: float = 3600.0,
+    ) -> None:
+        """Ouvre (ou crée) la base SQLite."""
+        self._flush_interval_s = flush_interval_s
+        self._flush_batch_size = flush_batch_size
+        self._max_age_s = max_age_s
+        self._lock = threading.Lock()
+        self._write_lock = asyncio.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(SCHEMA)
+        self._pending: list[CheckpointRow] = []
+        self._batch_full = asyncio.Event()
+        self._flush_task: asyncio.Task[None] | None = None
+
+    def record(
+        self, request_hash: str, combination: DateCombination, observed: CachedFlight
+    ) -> None:
+        """Met en tampon une combinaison résolue (écriture différée)."""
+        self._pending.append(
+            (
+                request_hash,
+                json.dumps(combination.segment_dates),
+                observed.model_dump_json(),
+                time.time(),
+            )
+        )
+        if len(self._pending) >= self._flush_batch_size:
+            self._batch_full.set()
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def load(self, request_hash: str) -> dict[tuple[str, ...], CachedFlight]:
+        """Résultats non expirés enregistrés pour la recherche (tampon inclus)."""
+        await self.flush()
+        try:
+            rows = await asyncio.to_thread(
+                self._select, request_hash, time.time() - self._max_age_s
+            )
+        except sqlite3.Error as e:
+            logger.warning("Checkpoint read failed", extra={"error": str(e)})
+            return {}
+        restored: dict[tuple[str, ...], CachedFlight] = {}
+        for segment_dates, observed in rows:
+            try:
+                restored[tuple(json.loads(segment_dates))] = (
+                    CachedFlight.model_validate_json(observed)
+                )
+            except (ValueError, ValidationError):
+                logger.warning(
+                    "Invalid checkpoint entry ignored",
+                    extra={"request_hash": request_hash},
+                )
+        return restored
+
+    async def clear(self, request_hash: str) -> None:
+        """Supprime les points de reprise d'une recherche terminée."""
+        await self.flush()
+        try:
+            async with self._write_lock:
+                await asyncio.to_thread(self._delete, request_hash)
+        except sqlite3.Error as e:
+            logger.warning("Checkpoint cleanup failed", extra={"error": str(e)})
+
+    async def flush(self) -> None:
+        """Écrit immédiatement le tampon (écritures sérialisées)."""
+        rows, self._pending = self._pending, []
+        self._batch_full.clear()
+        if not rows:
+            return
+        try:
+            async with self._write_lock:
+                await asyncio.to_thread(self._insert, rows)
+        except sqlite3.Error as e:
+            logger.warning(
+                "Checkpoint write failed", extra={"rows": len(rows), "error": str(e)}
+            )
+
+    async def close(self) -> None:
+        """Vide le tampon puis ferme la base."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flush_task
+        await self.flush()
+        with self._lock:
+            self._connection.close()
+
+    async def _flush_later(self) -> None:
+        """Écrit le tampon après flush_interval_s ou dès qu'un lot est complet."""
+        with contextlib.suppress(TimeoutError):
+            async with asyncio.timeout(self._flush_interval_s):
+                await self._batch_full.wait()
+        await self.flush()
+
+    def _insert(self, rows: list[CheckpointRow]) -> None:
+        """INSERT OR REPLACE d'un lot (thread)."""
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?)", rows
+            )
+
+    def _select(
+        self, request_hash: str, min_recorded_at: float
+    ) -> list[tuple[str, str]]:
+        """Lit les entrées non expirées d'une recherche (thread)."""
+        with self._lock:
+            cursor = self._connection.execute(
+                "SELECT segment_dates, observed FROM checkpoints"
+                " WHERE request_hash = ? AND recorded_at >= ?",
+                (request_hash, min_recorded_at),
+            )
+            return cursor.fetchall()
+
+    def _delete(self, request_hash: str) -> None:
+        """Supprime les entrées d'une recherche et celles expirées (thread)."""
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM checkpoints WHERE request_hash = ? OR recorded_at < ?",
+                (request_hash, time.time() - self._max_age_s),
+            )
+
+
+@lru_cache
+def get_checkpoint_store() -> CheckpointStore | None:
+    """Retourne instance CheckpointStore partagée (None si CHECKPOINT_PATH absent)."""
+    settings = get_settings()
+    if not settings.CHECKPOINT_PATH:
+        return None
+    return CheckpointStore(
+        settings.CHECKPOINT_PATH,
+        flush_interval_s=settings.CHECKPOINT_FLUSH_INTERVAL_S,
+        flush_batch_size=settings.CHECKPOINT_FLUSH_BATCH_SIZE,
+        max_age_s=settings.CHECKPOINT_MAX_AGE_S,
+    )
@@ -2,9 +2,9 @@
 
 import itertools
 import logging
-from datetime import date, timedelta
+from datetime import date
 
-from app.models import DateCombination, DateRange
+from app.models import CombinationConstraints, DateCombination, DateRange
 
 logger = logging.getLogger(__name__)
 
@@ -13,27 +13,29 @@ class CombinationGenerator:
     """Generateur de combinaisons multi-city (produit cartesien dates par segment)."""
 
     def generate_combinations(
-        self, date_ranges: list[DateRange]
+        self,
+        date_ranges: list[DateRange],
+        constraints: CombinationConstraints | None = None,
     ) -> list[DateCombination]:
-        """Genere produit cartesien dates pour N segments (ordre fixe)."""
-        all_dates: list[list[str]] = []
-        days_per_segment: list[int] = []
-
-        for date_range in date_ranges:
-            start = date.fromisoformat(date_range.start)
-            end = date.fromisoformat(date_range.end)
-            segment_dates = []
-            current = start
-            while current <= end:
-                segment_dates.append(current.isoformat())
-                current += timedelta(days=1)
-            all_dates.append(segment_dates)
-            days_per_segment.append(len(segment_dates))
-
-        combinations = [
-            DateCombination(segment_dates=list(combo))
-            for combo in itertools.product(*all_dates)
-        ]
+        """Genere produit cartesien dates pour N segments (ordre fixe).
+
+        Avec contraintes, les dates exclues sont filtrees par segment puis les
+        ecarts entre segments verifies pendant la construction (backtracking) :
+        les combinaisons ecartees ne sont jamais materialisees.
+        """
+        all_dates = self.segment_dates(date_ranges, constraints)
+        days_per_segment = [len(segment_dates) for segment_dates in all_dates]
+
+        if constraints is None:
+            combinations = [
+                DateCombination(segment_dates=list(combo))
+                for combo in itertools.product(*all_dates)
+            ]
+        else:
+            combinations = [
+                DateCombination(segment_dates=combo)
+                for combo in self._backtrack(all_dates, constraints)
+            ]
 
         logger.info(
             "Combinations generated",
@@ -54,3 +56,42 @@ class CombinationGenerator:
             )
 
         return combinations
+
+    def segment_dates(
+        self,
+        date_ranges: list[DateRange],
+        constraints: CombinationConstraints | None = None,
+    ) -> list[list[str]]:
+        """Liste les dates ISO autorisees de chaque segment (bornes incluses)."""
+        return [
+            [
+                day.isoformat()
+                for day in date_range.dates()
+                if constraints is None or constraints.allows_date(day)
+            ]
+            for date_range in date_ranges
+        ]
+
+    @staticmethod
+    def _backtrack(
+        all_dates: list[list[str]], constraints: CombinationConstraints
+    ) -> list[list[str]]:
+        """Construit les combinaisons segment par segment, ecarts verifies."""
+        combinations: list[list[str]] = []
+        prefix: list[str] = []
+
+        def extend(segment: int) -> None:
+            if segment == len(all_dates):
+                combinations.append(list(prefix))
+                return
+            for day in all_dates[segment]:
+                if prefix and not constraints.allows_gap(
+                    date.fromisoformat(prefix[-1]), date.fromisoformat(day)
+                ):
+                    continue
+                prefix.append(day)
+                extend(segment + 1)
+                prefix.pop()
+
+        extend(0)
+        return combinations
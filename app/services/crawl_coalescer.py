@@ -0,0 +1,87 @@
+"""Coalescence single-flight des crawls identiques en cours entre recherches."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from functools import lru_cache
+
+from app.models import CachedFlight
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class InflightCrawl[T]:
+    """Crawl partagé en cours et nombre de demandeurs qui l'attendent."""
+
+    task: asyncio.Task[T]
+    waiters: int = 0
+
+
+class CrawlCoalescer[T]:
+    """Registre in-process des crawls en cours indexé par URL générée.
+
+    Un second demandeur attend le même future au lieu de relancer un navigateur.
+    L'annulation est comptée par référence : le crawl partagé n'est annulé que
+    lorsque plus aucun demandeur ne l'attend. Le crawl partagé tourne dans un
+    contexte vierge : il n'hérite ni de la trace ni des variables de contexte du
+    premier demandeur.
+    """
+
+    def __init__(self) -> None:
+        """Initialise registre vide."""
+        self._inflight: dict[str, InflightCrawl[T]] = {}
+
+    @property
+    def inflight_count(self) -> int:
+        """Nombre de crawls partagés actuellement en cours."""
+        return len(self._inflight)
+
+    async def run(
+        self, key: str, factory: Callable[[], Awaitable[T]]
+    ) -> tuple[T, bool]:
+        """Exécute factory une seule fois par clé, retourne (résultat, coalescé)."""
+        inflight = self._inflight.get(key)
+        coalesced = inflight is not None
+
+        if inflight is None:
+            task = asyncio.get_running_loop().create_task(
+                self._as_coroutine(factory), context=contextvars.Context()
+            )
+            entry = InflightCrawl(task=task)
+            entry.task.add_done_callback(lambda _task: self._forget(key, entry))
+            self._inflight[key] = inflight = entry
+        else:
+            logger.debug("Crawl coalesced", extra={"url": key})
+
+        inflight.waiters += 1
+        try:
+            result = await asyncio.shield(inflight.task)
+        finally:
+            inflight.waiters -= 1
+            if inflight.waiters == 0 and not inflight.task.done():
+                inflight.task.cancel()
+                self._forget(key, inflight)
+                logger.debug("Shared crawl cancelled", extra={"url": key})
+
+        return result, coalesced
+
+    @staticmethod
+    async def _as_coroutine(factory: Callable[[], Awaitable[T]]) -> T:
+        """Appelle factory dans le contexte de la tâche partagée."""
+        return await factory()
+
+    def _forget(self, key: str, entry: InflightCrawl[T]) -> None:
+        """Retire l'entrée du registre si c'est toujours la même."""
+        if self._inflight.get(key) is entry:
+            del self._inflight[key]
+
+
+@lru_cache
+def get_crawl_coalescer() -> CrawlCoalescer[CachedFlight | None]:
+    """Retourne registre partagé entre recherches (singleton via lru_cache)."""
+    return CrawlCoalescer()
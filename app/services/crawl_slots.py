@@ -0,0 +1,145 @@
+"""Créneaux de crawl partagés par toutes les recherches du processus."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from functools import lru_cache
+from typing import TYPE_CHECKING, Literal
+
+from app.core import get_settings
+from app.services.search_trace import trace_span
+
+if TYPE_CHECKING:
+    from app.services.metrics import PipelineMetrics
+
+
+class CrawlSlots:
+    """Capacité de crawl globale (MAX_CONCURRENCY) avec réserve interactive.
+
+    Les petites recherches interactives peuvent occuper tous les créneaux ; les
+    recherches lourdes et le travail d'arrière-plan (surveillances,
+    préchargement) s'arrêtent à `capacity - interactive_reserved`. Un créneau
+    libéré est d'abord remis aux recherches interactives en attente.
+    """
+
+    def __init__(self, capacity: int, *, interactive_reserved: int = 0) -> None:
+        """Initialise capacité et créneaux réservés (au moins un non réservé)."""
+        self.capacity = capacity
+        self.interactive_reserved = min(interactive_reserved, capacity - 1)
+        self.in_use = 0
+        self._waiters: dict[bool, deque[asyncio.Future[None]]] = {
+            True: deque(),
+            False: deque(),
+        }
+
+    async def acquire(self, *, interactive: bool) -> None:
+        """Attend un créneau dans la limite de la classe de priorité."""
+        waiters = self._waiters[interactive]
+        if not waiters and self._has_room(interactive):
+            self.in_use += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+        finally:
+            if future in waiters:
+                waiters.remove(future)
+
+    def try_acquire(self, *, interactive: bool) -> bool:
+        """Prend un créneau sans attendre (False si saturé ou demandeurs en file)."""
+        if any(self._waiters.values()) or not self._has_room(interactive):
+            return False
+        self.in_use += 1
+        return True
+
+    def release(self) -> None:
+        """Libère un créneau et le remet au prochain demandeur éligible."""
+        self.in_use -= 1
+        for interactive in (True, False):
+            waiters = self._waiters[interactive]
+            while waiters and self._has_room(interactive):
+                future = waiters.popleft()
+                if not future.done():
+                    self.in_use += 1
+                    future.set_result(None)
+
+    def gate(self, *, interactive: bool, limit: int | None = None) -> CrawlGate:
+        """Sémaphore d'une recherche adossé aux créneaux partagés."""
+        return CrawlGate(self, interactive=interactive, limit=limit or self.capacity)
+
+    def _has_room(self, interactive: bool) -> bool:
+        """Créneau libre pour la classe (réserve exclue hors interactif)."""
+        limit = self.capacity
+        if not interactive:
+            limit -= self.interactive_reserved
+        return self.in_use < limit
+
+
+class CrawlGate(asyncio.Semaphore):
+    """Sémaphore par recherche : plafond local puis créneau global partagé.
+
+    Remplace l'asyncio.Semaphore créé par recherche : N recherches simultanées
+    se partagent MAX_CONCURRENCY crawls au lieu d'en obtenir chacune autant.
+    """
+
+    def __init__(self, slots: CrawlSlots, *, interactive: bool, limit: int) -> None:
+        """Initialise plafond local de la recherche."""
+        super().__init__(limit)
+        self._slots = slots
+        self._interactive = interactive
+
+    @property
+    def interactive(self) -> bool:
+        """Classe de priorité des créneaux partagés demandés."""
+        return self._interactive
+
+    async def acquire(self) -> Literal[True]:
+        """Attend le plafond local puis un créneau partagé."""
+        await super().acquire()
+        try:
+            await self._slots.acquire(interactive=self._interactive)
+        except BaseException:
+            super().release()
+            raise
+        return True
+
+    def release(self) -> None:
+        """Libère le créneau partagé puis le plafond local."""
+        self._slots.release()
+        super().release()
+
+
+async def wait_for_slot(
+    semaphore: asyncio.Semaphore, metrics: PipelineMetrics | None = None
+) -> float:
+    """Acquiert un créneau (jauge des crawls en file), retourne l'entrée en file."""
+    queued_at = time.monotonic()
+    if metrics is not None:
+        metrics.queued_combinations.inc()
+    try:
+        with trace_span("queued", "search"):
+            await semaphore.acquire()
+    finally:
+        if metrics is not None:
+            metrics.queued_combinations.dec()
+    return queued_at
+
+
+@lru_cache
+def get_crawl_slots() -> CrawlSlots:
+    """Retourne instance CrawlSlots partagée (singleton via lru_cache)."""
+    settings = get_settings()
+    return CrawlSlots(
+        settings.MAX_CONCURRENCY,
+        interactive_reserved=int(
+            settings.MAX_CONCURRENCY * settings.ADMISSION_INTERACTIVE_RESERVE
+        ),
+    )
@@ -0,0 +1,134 @@
+"""Statistiques glissantes des crawls (latence, volume transféré)."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Collection
+from dataclasses import dataclass, fields
+from functools import lru_cache
+
+from app.core import get_settings
+from app.models import CrawlTimingStats, HedgingStats
+from app.utils import RollingWindow
+
+
+@dataclass
+class CrawlTimings:
+    """Décomposition du temps d'un crawl réussi (secondes) et octets reçus."""
+
+    queue_wait_s: float = 0.0
+    browser_start_s: float = 0.0
+    navigation_s: float = 0.0
+    selector_wait_s: float = 0.0
+    settle_s: float = 0.0
+    html_s: float = 0.0
+    captcha_check_s: float = 0.0
+    parse_s: float = 0.0
+    bytes: int = 0
+
+
+TIMING_STAGES = tuple(f.name for f in fields(CrawlTimings) if f.name != "bytes")
+
+
+def summarize_timings(timings: Collection[CrawlTimings]) -> CrawlTimingStats:
+    """Moyenne par étape et volume total d'un ensemble de crawls."""
+    count = max(len(timings), 1)
+    means = {
+        stage: round(sum(getattr(t, stage) for t in timings) / count, 3)
+        for stage in TIMING_STAGES
+    }
+    return CrawlTimingStats(
+        crawls=len(timings),
+        bytes_total=sum(t.bytes for t in timings),
+        **means,
+    )
+
+
+class CrawlStats:
+    """Latences et tailles des derniers crawls, partagées entre recherches."""
+
+    def __init__(
+        self,
+        *,
+        default_latency_s: float,
+        default_size_bytes: int = 1_500_000,
+        window_size: int = 200,
+    ) -> None:
+        """Initialise fenêtres glissantes avec valeurs par défaut (sans mesure)."""
+        self._default_latency_s = default_latency_s
+        self._default_size_bytes = default_size_bytes
+        self.latency_s = RollingWindow(window_size)
+        self.size_bytes = RollingWindow(window_size)
+        self.timings: deque[CrawlTimings] = deque(maxlen=window_size)
+        self.crawls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def record(self, latency_s: float, *, size_bytes: int | None = None) -> None:
+        """Enregistre un crawl terminé (taille None si échec)."""
+        self.crawls += 1
+        self.latency_s.add(latency_s)
+        if size_bytes is not None:
+            self.size_bytes.add(size_bytes)
+
+    @property
+    def mean_latency_s(self) -> float:
+        """Latence moyenne d'un crawl (retries inclus), défaut si aucune mesure."""
+        mean = self.latency_s.mean()
+        return self._default_latency_s if mean is None else mean
+
+    @property
+    def mean_size_bytes(self) -> float:
+        """Taille HTML moyenne d'un crawl réussi, défaut si aucune mesure."""
+        mean = self.size_bytes.mean()
+        return self._default_size_bytes if mean is None else mean
+
+    def record_timings(self, timings: CrawlTimings) -> None:
+        """Retient la décomposition d'un crawl réussi.
+
+        L'objet est partagé avec le CrawlResult : le parsing, mesuré ensuite par
+        SearchService, y est reporté sans second enregistrement.
+        """
+        self.timings.append(timings)
+
+    def timing_stats(self) -> CrawlTimingStats:
+        """Décomposition moyenne des derniers crawls réussis."""
+        return summarize_timings(self.timings)
+
+    def hedge_after_s(self, min_samples: int) -> float | None:
+        """p90 des latences observées (None si moins de min_samples mesures)."""
+        if len(self.latency_s) < min_samples:
+            return None
+        return self.latency_s.percentile(90)
+
+    def try_hedge(self, max_ratio: float) -> bool:
+        """Compte un doublon si le plafond hedges / crawls le permet."""
+        if self.hedges + 1 > max_ratio * self.crawls:
+            return False
+        self.hedges += 1
+        return True
+
+    def record_hedge_win(self) -> None:
+        """Le doublon a répondu avant le crawl initial."""
+        self.hedge_wins += 1
+
+    def hedging_stats(self, min_samples: int) -> HedgingStats:
+        """Taux de doublons et de victoires exposés par l'API."""
+        return HedgingStats(
+            crawls=self.crawls,
+            hedges=self.hedges,
+            hedge_rate=round(self.hedges / max(self.crawls, 1), 3),
+            hedge_wins=self.hedge_wins,
+            win_rate=round(self.hedge_wins / max(self.hedges, 1), 3),
+            hedge_after_s=self.hedge_after_s(min_samples),
+        )
+
+
+@lru_cache
+def get_crawl_stats() -> CrawlStats:
+    """Retourne instance CrawlStats partagée (singleton via lru_cache)."""
+    settings = get_settings()
+    return CrawlStats(
+        default_latency_s=settings.ADMISSION_DEFAULT_CRAWL_LATENCY_S,
+        default_size_bytes=settings.ESTIMATE_DEFAULT_PAGE_BYTES,
+    )
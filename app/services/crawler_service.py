@@ -5,17 +5,29 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
-from dataclasses import dataclass
+from collections.abc import AsyncIterator, Awaitable, Callable, Collection
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
-from crawl4ai import AsyncWebCrawler, CacheMode, CrawlerRunConfig
+from crawl4ai import AsyncWebCrawler, BrowserConfig, CacheMode, CrawlerRunConfig
 from playwright.async_api import BrowserContext, Cookie, Page, Response
 from tenacity import retry
 
 from app.core import get_settings
 from app.exceptions import CaptchaDetectedError, NetworkError
 from app.models import ProxyConfig
+from app.services.crawl_slots import CrawlSlots
+from app.services.crawl_stats import CrawlTimings
+from app.services.proxy_service import BLOCKING_FAILURES, proxy_key
 from app.services.retry_strategy import RetryStrategy
+from app.services.search_trace import (
+    trace_instant,
+    trace_interval,
+    trace_lane,
+    trace_span,
+)
+from app.services.session_pool import CrawlSession, SessionPool
 from app.utils import (
     build_browser_config_from_fingerprint,
     get_base_browser_config,
@@ -23,11 +35,17 @@ from app.utils import (
 )
 
 if TYPE_CHECKING:
-    from app.services.proxy_service import ProxyService
+    from app.services.adaptive_timeouts import AdaptiveTimeouts
+    from app.services.crawl_stats import CrawlStats
+    from app.services.metrics import PipelineMetrics
+    from app.services.proxy_service import ProxyFailure, ProxyService
+    from app.services.rate_limiter import RateLimiter
 
 logger = logging.getLogger(__name__)
 
 GOOGLE_FLIGHTS_SESSION_ID = "google_flights_session"
+GOOGLE_FLIGHTS_HOME_URL = "https://www.google.com/travel/flights"
+FLIGHT_RESULTS_SELECTOR = "css:.pIav2d"
 CAPTCHA_PATTERNS = {
     "recaptcha": ["g-recaptcha", 'class="recaptcha"', "grecaptcha"],
     "hcaptcha": ["h-captcha", "hcaptcha"],
@@ -41,26 +59,71 @@ class CrawlResult:
     success: bool
     html: str
     status_code: int | None = None
+    timings: CrawlTimings = field(default_factory=CrawlTimings)
 
 
 class CrawlerService:
     """Service de crawling Google Flights avec stealth mode et proxy rotation."""
 
-    def __init__(self, proxy_service: ProxyService | None = None) -> None:
-        """Initialise service avec ProxyService optionnel."""
+    def __init__(
+        self,
+        proxy_service: ProxyService | None = None,
+        crawl_stats: CrawlStats | None = None,
+        session_pool: SessionPool | None = None,
+        rate_limiter: RateLimiter | None = None,
+        adaptive_timeouts: AdaptiveTimeouts | None = None,
+        metrics: PipelineMetrics | None = None,
+        crawl_slots: CrawlSlots | None = None,
+    ) -> None:
+        """Initialise service avec proxies, stats, sessions et cadencement optionnels.
+
+        crawl_slots : capacité partagée avec SearchService, un doublon hedgé
+        n'est lancé que sur un créneau libre (à défaut, propre à cette instance).
+        """
         self._proxy_service = proxy_service
+        self._metrics = metrics
+        self._rate_limiter = rate_limiter
+        self._adaptive_timeouts = adaptive_timeouts
+        self._crawl_stats = crawl_stats
         self._settings = get_settings()
+        self._session_pool = session_pool or SessionPool(
+            size=self._settings.SESSION_POOL_SIZE,
+            max_failures=self._settings.SESSION_MAX_FAILURES,
+            max_age_s=self._settings.SESSION_MAX_AGE_S,
+        )
+        self._crawl_slots = crawl_slots or CrawlSlots(self._settings.MAX_CONCURRENCY)
         self._captured_cookies: list[Cookie] = []
 
     async def get_google_session(
         self,
-        url: str = "https://www.google.com/travel/flights",
+        url: str = GOOGLE_FLIGHTS_HOME_URL,
         *,
         use_proxy: bool = True,
     ) -> None:
+        """Complète le pool de sessions (capture seulement les sessions manquantes).
+
+        Pool complet (recaptures en cours comprises) : retour immédiat, sans
+        attendre le verrou tenu par une recapture d'arrière-plan.
+        """
+        proxied = use_proxy and self._proxy_service is not None
+        if not self._session_pool.missing(proxied=proxied):
+            return
+        async with self._session_pool.capture_lock:
+            for _ in range(self._session_pool.missing(proxied=proxied)):
+                try:
+                    session = await self._capture_session(url, use_proxy=use_proxy)
+                except NetworkError:
+                    if not self._session_pool.available(proxied=proxied):
+                        raise
+                    logger.warning("Session capture failed, reusing existing sessions")
+                    return
+                self._session_pool.add(session)
+
+    async def _capture_session(self, url: str, *, use_proxy: bool) -> CrawlSession:
         """Capture session Google (headers + cookies) via Crawl4AI avec persistence."""
-        start_time = time.time()
         proxy_config, proxy = self._get_proxy_config(use_proxy)
+        await self._pace(proxy)
+        start_time = time.time()
         self._captured_cookies = []
 
         logger.info(
@@ -75,7 +138,7 @@ class CrawlerService:
         browser_config = get_base_browser_config(proxy_config=proxy_config)
 
         try:
-            async with AsyncWebCrawler(config=browser_config) as crawler:
+            async with self._open_browser(browser_config) as crawler:
                 crawler.crawler_strategy.set_hook("after_goto", self._after_goto_hook)
                 crawler.crawler_strategy.set_hook(
                     "before_return_html", self._extract_cookies_hook
@@ -120,23 +183,77 @@ class CrawlerService:
                 "cookies_captured": len(self._captured_cookies),
             },
         )
+        return CrawlSession.create(proxy, list(self._captured_cookies))
 
     async def crawl_google_flights(
         self,
         url: str,
         *,
         use_proxy: bool = True,
+        wait_for_selector: str = FLIGHT_RESULTS_SELECTOR,
+        js_code: list[str] | None = None,
     ) -> CrawlResult:
-        """Crawl une URL Google Flights avec proxy rotation et retry logic."""
-        attempt_count = 0
-
-        @retry(**RetryStrategy.get_crawler_retry())
-        async def _crawl_with_retry() -> CrawlResult:
-            nonlocal attempt_count
-            attempt_count += 1
-
+        """Crawl une URL Google Flights sur une session du pool avec retry logic.
+
+        Chaque tentative utilise la session la moins chargée (cookies envoyés via
+        le proxy qui les a capturés) ; sans session, proxy suivant du pool sans
+        cookies (ils ne sont jamais envoyés depuis une autre sortie).
+
+        wait_for_selector et js_code permettent de crawler d'autres vues de la
+        même page (ex: grille de prix du calendrier).
+        """
+
+        async def _crawl_branch(
+            own_sessions: set[str], exclude: Collection[str]
+        ) -> CrawlResult:
+            # Compteur propre à chaque branche : le doublon hedgé n'est pas un retry.
+            attempt_count = 0
+
+            @retry(**RetryStrategy.get_crawler_retry())
+            async def _crawl_with_retry() -> CrawlResult:
+                nonlocal attempt_count
+                attempt_count += 1
+                if attempt_count > 1:
+                    trace_instant("retry", "crawl", attempt=attempt_count)
+                    if self._metrics is not None:
+                        self._metrics.retries.inc()
+
+                session = self._session_pool.acquire(
+                    proxied=use_proxy and self._proxy_service is not None,
+                    exclude=exclude,
+                )
+                if session is not None:
+                    own_sessions.add(session.session_id)
+                try:
+                    with trace_span(
+                        "crawl_attempt",
+                        "crawl",
+                        attempt=attempt_count,
+                        session_id=session.session_id if session else None,
+                    ) as span:
+                        return await _crawl_attempt(session, span, attempt_count)
+                finally:
+                    if session is not None:
+                        own_sessions.discard(session.session_id)
+                        self._session_pool.release(session)
+                    self._schedule_recaptures()
+
+            return await _crawl_with_retry()
+
+        async def _crawl_attempt(
+            session: CrawlSession | None, span: dict[str, object], attempt: int
+        ) -> CrawlResult:
+            if session is None:
+                proxy_config, proxy = self._get_proxy_config(use_proxy)
+                cookies = []
+            else:
+                proxy = session.proxy
+                proxy_config = self._build_proxy_config(proxy)
+                cookies = session.cookies
+            span["proxy_host"] = proxy.host if proxy else "no_proxy"
+            with trace_span("pace", "crawl"):
+                queue_wait_s = await self._pace(proxy)
             start_time = time.time()
-            proxy_config, proxy = self._get_proxy_config(use_proxy)
 
             logger.info(
                 "Starting crawl",
@@ -144,48 +261,67 @@ class CrawlerService:
                     "url": url,
                     "proxy_host": proxy.host if proxy else "no_proxy",
                     "proxy_country": proxy.country if proxy else "N/A",
-                    "attempt": attempt_count,
+                    "session_id": session.session_id if session else None,
+                    "attempt": attempt,
                 },
             )
 
             config = build_browser_config_from_fingerprint(
                 url,
                 get_static_headers(),
-                self._captured_cookies,
+                cookies,
                 proxy_config,
             )
 
+            exit_key = proxy_key(proxy) if proxy is not None else None
+            page_timeout_s, global_timeout_s = self._crawl_timeouts(exit_key)
+            hook_marks: dict[str, float] = {}
+
             try:
-                async with AsyncWebCrawler(config=config) as crawler:
+                browser_start = time.monotonic()
+                async with self._open_browser(config) as crawler:
+                    browser_start_s = time.monotonic() - browser_start
+                    trace_interval(
+                        "browser_start", "crawl", browser_start, time.monotonic()
+                    )
+                    self._set_timing_hooks(crawler, hook_marks)
                     run_config = self._build_crawler_run_config(
-                        wait_for_selector="css:.pIav2d",
+                        wait_for_selector=wait_for_selector,
+                        js_code=js_code,
+                        page_timeout_ms=int(page_timeout_s * 1000),
                     )
 
+                    arun_start = time.monotonic()
                     result = await asyncio.wait_for(
                         crawler.arun(
                             url=url,
                             config=run_config,
                         ),
-                        timeout=self._settings.crawler.crawl_global_timeout_s,
+                        timeout=global_timeout_s,
                     )
+                    arun_end = time.monotonic()
             except TimeoutError as err:
+                span["status_code"] = "timeout"
+                self._count_response("timeout")
+                self._record_failure(session, proxy, "network")
+                if self._adaptive_timeouts is not None:
+                    self._adaptive_timeouts.record(exit_key, "crawl", global_timeout_s)
                 logger.error(
                     "Crawl timeout",
                     extra={
                         "url": url,
                         "proxy_host": proxy.host if proxy else "no_proxy",
+                        "timeout_s": global_timeout_s,
                     },
                 )
-                raise NetworkError(
-                    url=url, status_code=None, attempts=attempt_count
-                ) from err
+                raise NetworkError(url=url, status_code=None, attempts=attempt) from err
             except CaptchaDetectedError:
-                if use_proxy and self._proxy_service:
-                    self._proxy_service.get_next_proxy()
-                    logger.debug("Proxy rotation triggered after captcha")
+                self._record_failure(session, proxy, "captcha")
                 raise
 
             response_time_ms = int((time.time() - start_time) * 1000)
+            span["status_code"] = result.status_code
+            self._count_response(str(result.status_code))
 
             if not result.success and result.status_code == 404:
                 return CrawlResult(
@@ -203,13 +339,14 @@ class CrawlerService:
                 403,
             ):
                 error_msg = "Crawl failed"
-                if (
-                    result.status_code in (429, 403)
-                    and use_proxy
-                    and self._proxy_service
-                ):
-                    self._proxy_service.get_next_proxy()
-                    error_msg = "Rate limit/forbidden - proxy rotated"
+                if result.status_code == 429:
+                    self._record_failure(session, proxy, "rate_limited")
+                    error_msg = "Rate limit - proxy cooling down"
+                elif result.status_code == 403:
+                    self._record_failure(session, proxy, "forbidden")
+                    error_msg = "Forbidden - proxy cooling down"
+                else:
+                    self._record_failure(session, proxy, "network")
                 logger.error(
                     error_msg,
                     extra={
@@ -219,11 +356,36 @@ class CrawlerService:
                     },
                 )
                 raise NetworkError(
-                    url=url, status_code=result.status_code, attempts=attempt_count
+                    url=url, status_code=result.status_code, attempts=attempt
                 )
 
             html = result.html or ""
-            self._detect_captcha(html, url)
+            captcha_start = time.monotonic()
+            try:
+                self._detect_captcha(html, url)
+            except CaptchaDetectedError:
+                self._record_failure(session, proxy, "captcha")
+                raise
+
+            timings = self._build_timings(hook_marks, arun_start, arun_end)
+            self._trace_stages(hook_marks, arun_start, arun_end)
+            timings.queue_wait_s = queue_wait_s
+            timings.browser_start_s = browser_start_s
+            timings.captcha_check_s = time.monotonic() - captcha_start
+            timings.bytes = len(html)
+            self._record_stage_durations(
+                exit_key, timings, arun_end - arun_start, hook_marks
+            )
+            if session is not None:
+                self._session_pool.record_success(session)
+            if self._rate_limiter is not None:
+                self._rate_limiter.record_success(proxy)
+            if self._metrics is not None:
+                self._metrics.proxy_bytes.inc(
+                    proxy.host if proxy else "no_proxy", amount=len(html)
+                )
+            if proxy is not None and self._proxy_service is not None:
+                self._proxy_service.record_success(proxy, time.time() - start_time)
 
             logger.info(
                 "Crawl successful",
@@ -239,10 +401,114 @@ class CrawlerService:
                 success=True,
                 html=html,
                 status_code=result.status_code,
+                timings=timings,
+            )
+
+        crawl_start = time.monotonic()
+        size_bytes: int | None = None
+        outcome = "cancelled"
+        if self._metrics is not None:
+            self._metrics.inflight_crawls.inc()
+        try:
+            result: CrawlResult = await self._hedged(_crawl_branch, url)
+            size_bytes = len(result.html)
+            outcome = "success" if result.success else "not_found"
+            if result.success and self._crawl_stats is not None:
+                self._crawl_stats.record_timings(result.timings)
+            return result
+        except CaptchaDetectedError:
+            outcome = "captcha"
+            raise
+        except NetworkError:
+            outcome = "network_error"
+            raise
+        finally:
+            crawl_s = time.monotonic() - crawl_start
+            if self._crawl_stats is not None:
+                self._crawl_stats.record(crawl_s, size_bytes=size_bytes)
+            if self._metrics is not None:
+                self._metrics.inflight_crawls.dec()
+                self._metrics.crawl_duration.observe(crawl_s, outcome)
+
+    async def _hedged(
+        self,
+        crawl: Callable[[set[str], Collection[str]], Awaitable[CrawlResult]],
+        url: str,
+    ) -> CrawlResult:
+        """Duplique le crawl au-delà du p90 observé, le premier succès gagne.
+
+        Le doublon part sur une autre session que le crawl initial (ou le proxy
+        suivant) avec ses propres tentatives ; le perdant est annulé. Il n'est
+        lancé que sur un créneau de crawl libre, sans attente, et dans la limite
+        de HEDGE_MAX_RATIO des crawls.
+        """
+        primary_sessions: set[str] = set()
+        hedge_sessions: set[str] = set()
+        hedge_after_s = None
+        if self._settings.HEDGE_ENABLED and self._crawl_stats is not None:
+            hedge_after_s = self._crawl_stats.hedge_after_s(
+                self._settings.HEDGE_MIN_SAMPLES
             )
+        if hedge_after_s is None or self._crawl_stats is None:
+            return await crawl(primary_sessions, ())
 
-        result: CrawlResult = await _crawl_with_retry()
-        return result
+        primary = asyncio.ensure_future(crawl(primary_sessions, hedge_sessions))
+        tasks: set[asyncio.Future[CrawlResult]] = {primary}
+        slot_taken = False
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_after_s)
+            if done:
+                return await primary
+            slot_taken = self._crawl_slots.try_acquire(interactive=False)
+            if not slot_taken:
+                logger.debug("Hedge skipped, no free crawl slot", extra={"url": url})
+                return await primary
+            if not self._crawl_stats.try_hedge(self._settings.HEDGE_MAX_RATIO):
+                return await primary
+
+            logger.info(
+                "Crawl hedged", extra={"url": url, "hedge_after_s": hedge_after_s}
+            )
+            trace_instant("hedge", "crawl", hedge_after_s=hedge_after_s)
+            with trace_lane("hedge"):
+                hedge = asyncio.ensure_future(crawl(hedge_sessions, primary_sessions))
+            tasks.add(hedge)
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self._crawl_stats.record_hedge_win()
+                        return task.result()
+            return await primary
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if slot_taken:
+                self._crawl_slots.release()
+
+    @asynccontextmanager
+    async def _open_browser(
+        self, config: BrowserConfig
+    ) -> AsyncIterator[AsyncWebCrawler]:
+        """Navigateur Crawl4AI compté dans la jauge des navigateurs ouverts."""
+        if self._metrics is not None:
+            self._metrics.active_browsers.inc()
+        try:
+            async with AsyncWebCrawler(config=config) as crawler:
+                yield crawler
+        finally:
+            if self._metrics is not None:
+                self._metrics.active_browsers.dec()
+
+    def _count_response(self, status_code: str) -> None:
+        """Compte une tentative de crawl par code HTTP (ou timeout)."""
+        if self._metrics is not None:
+            self._metrics.crawl_responses.inc(status_code)
 
     async def _after_goto_hook(
         self,
@@ -282,6 +548,121 @@ class CrawlerService:
             extra={"cookies_count": len(cookies)},
         )
 
+    def _record_failure(
+        self,
+        session: CrawlSession | None,
+        proxy: ProxyConfig | None,
+        reason: ProxyFailure,
+    ) -> None:
+        """Signale l'échec à la session et au pool de proxies (cooldown si bloqué)."""
+        if session is not None:
+            self._session_pool.record_failure(
+                session, blocked=reason in BLOCKING_FAILURES
+            )
+        if reason == "rate_limited" and self._rate_limiter is not None:
+            self._rate_limiter.record_throttled(proxy)
+        if proxy is not None and self._proxy_service is not None:
+            self._proxy_service.record_failure(proxy, reason)
+
+    def _crawl_timeouts(self, exit_key: str | None) -> tuple[float, float]:
+        """page_timeout (navigation, sélecteur) et timeout global pour la sortie."""
+        if self._adaptive_timeouts is None:
+            return (
+                self._settings.crawler.crawl_page_timeout_ms / 1000,
+                self._settings.crawler.crawl_global_timeout_s,
+            )
+        page_timeout_s = max(
+            self._adaptive_timeouts.timeout_s(exit_key, "navigation"),
+            self._adaptive_timeouts.timeout_s(exit_key, "selector_wait"),
+        )
+        return page_timeout_s, self._adaptive_timeouts.timeout_s(exit_key, "crawl")
+
+    def _set_timing_hooks(
+        self, crawler: AsyncWebCrawler, hook_marks: dict[str, float]
+    ) -> None:
+        """Hooks horodatant la fin de la navigation et de l'attente du sélecteur."""
+
+        async def after_goto(page: Page, *args: object, **kwargs: object) -> Page:
+            hook_marks["after_goto"] = time.monotonic()
+            return page
+
+        async def before_return_html(*args: object, **kwargs: object) -> None:
+            hook_marks["before_return_html"] = time.monotonic()
+
+        crawler.crawler_strategy.set_hook("after_goto", after_goto)
+        crawler.crawler_strategy.set_hook("before_return_html", before_return_html)
+
+    def _build_timings(
+        self, hook_marks: dict[str, float], arun_start: float, arun_end: float
+    ) -> CrawlTimings:
+        """Découpe la durée de arun selon les hooks (étape sans hook : fusionnée)."""
+        after_goto = hook_marks.get("after_goto", arun_end)
+        before_html = max(after_goto, hook_marks.get("before_return_html", arun_end))
+        waited_s = before_html - after_goto
+        settle_s = min(waited_s, self._settings.crawler.crawl_delay_s)
+        return CrawlTimings(
+            navigation_s=after_goto - arun_start,
+            selector_wait_s=waited_s - settle_s,
+            settle_s=settle_s,
+            html_s=arun_end - before_html,
+        )
+
+    @staticmethod
+    def _trace_stages(
+        hook_marks: dict[str, float], arun_start: float, arun_end: float
+    ) -> None:
+        """Navigation, attente du sélecteur et extraction HTML dans la trace."""
+        after_goto = hook_marks.get("after_goto", arun_end)
+        before_html = max(after_goto, hook_marks.get("before_return_html", arun_end))
+        trace_interval("navigation", "crawl", arun_start, after_goto)
+        trace_interval("selector_wait", "crawl", after_goto, before_html)
+        trace_interval("html", "crawl", before_html, arun_end)
+
+    def _record_stage_durations(
+        self,
+        exit_key: str | None,
+        timings: CrawlTimings,
+        arun_s: float,
+        hook_marks: dict[str, float],
+    ) -> None:
+        """Enregistre les durées d'étapes d'un crawl réussi (timeouts adaptatifs)."""
+        if self._adaptive_timeouts is None:
+            return
+        self._adaptive_timeouts.record(exit_key, "crawl", arun_s)
+        if "after_goto" in hook_marks and "before_return_html" in hook_marks:
+            self._adaptive_timeouts.record(exit_key, "navigation", timings.navigation_s)
+            self._adaptive_timeouts.record(
+                exit_key, "selector_wait", timings.selector_wait_s
+            )
+
+    async def _pace(self, proxy: ProxyConfig | None) -> float:
+        """Attend un créneau des token buckets global et de la sortie proxy."""
+        if self._rate_limiter is None:
+            return 0.0
+        return await self._rate_limiter.acquire(proxy)
+
+    def _schedule_recaptures(self) -> None:
+        """Recapture en tâche de fond les sessions dégradées ou proches d'expirer."""
+        for session in self._session_pool.needs_recapture():
+            session.recapturing = True
+            self._session_pool.spawn(self._recapture(session))
+
+    async def _recapture(self, session: CrawlSession) -> None:
+        """Remplace la session par une capture neuve (retirée si la capture échoue)."""
+        async with self._session_pool.capture_lock:
+            try:
+                fresh = await self._capture_session(
+                    GOOGLE_FLIGHTS_HOME_URL, use_proxy=session.proxied
+                )
+            except Exception:
+                logger.exception(
+                    "Session recapture failed",
+                    extra={"session_id": session.session_id},
+                )
+                self._session_pool.remove(session)
+                return
+        self._session_pool.replace(session, fresh)
+
     def _get_proxy_config(
         self, use_proxy: bool
     ) -> tuple[dict[str, str] | None, ProxyConfig | None]:
@@ -290,25 +671,35 @@ class CrawlerService:
             return None, None
 
         proxy = self._proxy_service.get_next_proxy()
-        proxy_config = {
+        return self._build_proxy_config(proxy), proxy
+
+    @staticmethod
+    def _build_proxy_config(proxy: ProxyConfig | None) -> dict[str, str] | None:
+        """Config proxy Playwright (None sans proxy)."""
+        if proxy is None:
+            return None
+        return {
             "server": f"http://{proxy.host}:{proxy.port}",
             "username": proxy.username,
             "password": proxy.password.get_secret_value(),
         }
-        return proxy_config, proxy
 
     def _build_crawler_run_config(
         self,
         wait_for_selector: str,
+        js_code: list[str] | None = None,
+        page_timeout_ms: int | None = None,
     ) -> CrawlerRunConfig:
         """Construit CrawlerRunConfig avec paramètres communs."""
         return CrawlerRunConfig(
             cache_mode=CacheMode.DISABLED,
+            js_code=js_code,
             magic=False,
             simulate_user=True,
             override_navigator=True,
             wait_for=wait_for_selector,
-            page_timeout=self._settings.crawler.crawl_page_timeout_ms,
+            page_timeout=page_timeout_ms
+            or self._settings.crawler.crawl_page_timeout_ms,
             delay_before_return_html=self._settings.crawler.crawl_delay_s,
         )
 
@@ -319,6 +710,8 @@ class CrawlerService:
         for captcha_type, patterns in CAPTCHA_PATTERNS.items():
             for pattern in patterns:
                 if pattern.lower() in html_lower:
+                    if self._metrics is not None:
+                        self._metrics.captchas.inc(captcha_type)
                     logger.warning(
                         "Captcha detected",
                         extra={"url": url, "captcha_type": captcha_type},
@@ -0,0 +1,184 @@
+"""Complétion des itinéraires multi-city (vol par segment) via un trie de préfixes."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from app.exceptions import CaptchaDetectedError, NetworkError, ParsingError
+from app.utils import generate_google_flights_url
+
+if TYPE_CHECKING:
+    from app.models import CombinationResult, GoogleFlightDTO
+    from app.services.crawler_service import CrawlerService
+    from app.services.flight_parser import FlightParser
+
+logger = logging.getLogger(__name__)
+
+LEG_MARKER_ATTRIBUTE = "data-drilldown-leg"
+
+# js_code s'exécute avant wait_for : chaque sélection attend la liste du segment
+# précédent (marqueur), clique la première option puis attend son remplacement.
+SELECT_FLIGHT_JS_TEMPLATE = (
+    "const pause = (ms) => new Promise((resolve) => setTimeout(resolve, ms));"
+    "const deadline = Date.now() + {timeout_ms};"
+    "const leg = () => document.body.dataset.drilldownLeg || '1';"
+    "let options = document.querySelectorAll('li.pIav2d');"
+    "while (leg() === '{previous}' && !options[{index}] && Date.now() < deadline) {{"
+    "  await pause(100); options = document.querySelectorAll('li.pIav2d');"
+    "}}"
+    "if (leg() === '{previous}' && options[{index}]) {{"
+    "  const selected = options[{index}]; selected.click();"
+    "  while (selected.isConnected && Date.now() < deadline) {{ await pause(100); }}"
+    "  if (!selected.isConnected) {{ document.body.dataset.drilldownLeg = '{leg}'; }}"
+    "}}"
+)
+
+# Attente des options du segment k, une fois les k-1 sélections confirmées.
+LEG_READY_WAIT_TEMPLATE = (
+    "js:() => document.body.dataset.drilldownLeg === '{leg}'"
+    " && document.querySelector('li.pIav2d') !== null"
+)
+
+
+@dataclass
+class DrillDownNode:
+    """Nœud du trie : dates des segments 1..k et meilleur vol du segment k."""
+
+    prefix: tuple[str, ...]
+    representative: tuple[str, ...]
+    flight: GoogleFlightDTO | None = None
+    children: dict[str, DrillDownNode] = field(default_factory=dict)
+
+
+class ItineraryDrillDown:
+    """Sélectionne segment par segment le meilleur vol des top combinaisons.
+
+    Le segment k+1 n'est visible qu'après sélection des vols des segments 1..k :
+    chaque préfixe de dates (nœud du trie) est crawlé une seule fois avec ces
+    sélections, puis partagé par toutes les combinaisons qui le prolongent.
+    """
+
+    def __init__(
+        self,
+        crawler_service: CrawlerService,
+        flight_parser: FlightParser,
+        *,
+        selection_timeout_ms: int = 10000,
+    ) -> None:
+        """Initialise avec CrawlerService et FlightParser injectés."""
+        self._crawler_service = crawler_service
+        self._flight_parser = flight_parser
+        self._selection_timeout_ms = selection_timeout_ms
+
+    async def complete(
+        self,
+        template_url: str,
+        candidates: list[CombinationResult],
+        semaphore: asyncio.Semaphore,
+    ) -> tuple[dict[tuple[str, ...], list[GoogleFlightDTO]], int]:
+        """Retourne les vols par segment de chaque candidate et le nombre de crawls.
+
+        Le segment 1 reprend le meilleur vol déjà crawlé. Un segment introuvable
+        interrompt l'itinéraire (liste tronquée).
+        """
+        root = self._build_trie(candidates)
+
+        crawls = 0
+        level = list(root.children.values())
+        while level:
+            children = [child for node in level for child in node.children.values()]
+            crawls += len(children)
+            await asyncio.gather(
+                *(self._crawl_node(template_url, node, semaphore) for node in children)
+            )
+            level = [node for node in children if node.flight is not None]
+
+        itineraries = {
+            tuple(c.date_combination.segment_dates): self._collect(root, c)
+            for c in candidates
+        }
+        logger.info(
+            "Itinerary drill-down completed",
+            extra={
+                "candidates": len(candidates),
+                "drilldown_crawls": crawls,
+                "naive_crawls": sum(
+                    len(c.date_combination.segment_dates) - 1 for c in candidates
+                ),
+            },
+        )
+        return itineraries, crawls
+
+    def _build_trie(self, candidates: list[CombinationResult]) -> DrillDownNode:
+        """Insère chaque combinaison ; le segment 1 porte le vol déjà connu."""
+        root = DrillDownNode(prefix=(), representative=())
+        for candidate in candidates:
+            dates = tuple(candidate.date_combination.segment_dates)
+            node = root
+            for depth, day in enumerate(dates, start=1):
+                if day not in node.children:
+                    node.children[day] = DrillDownNode(
+                        prefix=dates[:depth], representative=dates
+                    )
+                node = node.children[day]
+                if depth == 1 and node.flight is None:
+                    node.flight = candidate.best_flight
+        return root
+
+    def _collect(
+        self, root: DrillDownNode, candidate: CombinationResult
+    ) -> list[GoogleFlightDTO]:
+        """Vols le long du chemin de la combinaison (segment 1 = son meilleur vol)."""
+        flights = [candidate.best_flight]
+        node = root.children[candidate.date_combination.segment_dates[0]]
+        for day in candidate.date_combination.segment_dates[1:]:
+            node = node.children[day]
+            if node.flight is None:
+                break
+            flights.append(node.flight)
+        return flights
+
+    async def _crawl_node(
+        self, template_url: str, node: DrillDownNode, semaphore: asyncio.Semaphore
+    ) -> None:
+        """Crawle la page du segment k après sélection des segments 1..k-1.
+
+        Le vol n'est retenu que si la page confirme les k-1 sélections (marqueur
+        posé par le JS) : sinon la liste parsée serait celle d'un autre segment.
+        """
+        leg = len(node.prefix)
+        url = generate_google_flights_url(template_url, list(node.representative))
+        js_code = [
+            SELECT_FLIGHT_JS_TEMPLATE.format(
+                index=0,
+                previous=selected,
+                leg=selected + 1,
+                timeout_ms=self._selection_timeout_ms,
+            )
+            for selected in range(1, leg)
+        ]
+        try:
+            async with semaphore:
+                result = await self._crawler_service.crawl_google_flights(
+                    url,
+                    use_proxy=True,
+                    wait_for_selector=LEG_READY_WAIT_TEMPLATE.format(leg=leg),
+                    js_code=js_code,
+                )
+            if result.success and f'{LEG_MARKER_ATTRIBUTE}="{leg}"' not in result.html:
+                logger.warning(
+                    "Drill-down selection not confirmed",
+                    extra={"url": url, "leg": leg},
+                )
+                return
+            flights = self._flight_parser.parse(result.html) if result.success else []
+        except (CaptchaDetectedError, NetworkError, ParsingError) as e:
+            logger.warning(
+                "Drill-down crawl failed",
+                extra={"url": url, "leg": leg, "error": str(e)},
+            )
+            return
+        node.flight = flights[0] if flights else None
@@ -0,0 +1,102 @@
+"""Métriques du pipeline de recherche exposées sur /metrics (format Prometheus)."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from app.core import get_settings
+from app.utils import MetricsRegistry
+
+if TYPE_CHECKING:
+    from app.services.adaptive_timeouts import AdaptiveTimeouts
+
+LATENCY_BUCKETS_S = (0.5, 1, 2.5, 5, 7.5, 10, 15, 20, 30, 45, 60, 90, 120)
+SEARCH_BUCKETS_S = (1, 2.5, 5, 10, 20, 30, 60, 120, 300, 600, 1200)
+PARSE_BUCKETS_S = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+QUEUE_BUCKETS_S = (0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+
+class PipelineMetrics:
+    """Compteurs, jauges et histogrammes alimentés par les services.
+
+    Chaque mesure est une mise à jour de dictionnaire (pas de verrou : un seul
+    thread d'event loop) ; le texte Prometheus n'est produit qu'à la collecte.
+    Labels à cardinalité bornée : outcome, code HTTP, type de captcha, hôte proxy.
+    """
+
+    def __init__(self) -> None:
+        """Déclare les métriques du pipeline."""
+        self.registry = registry = MetricsRegistry()
+        self.search_duration = registry.histogram(
+            "flight_search_duration_seconds",
+            "Duree d'une recherche complete.",
+            ("mode",),
+            buckets=SEARCH_BUCKETS_S,
+        )
+        self.crawl_duration = registry.histogram(
+            "flight_crawl_duration_seconds",
+            "Duree d'un crawl (retries inclus) par issue.",
+            ("outcome",),
+            buckets=LATENCY_BUCKETS_S,
+        )
+        self.parse_duration = registry.histogram(
+            "flight_parse_duration_seconds",
+            "Duree du parsing d'une page de resultats.",
+            buckets=PARSE_BUCKETS_S,
+        )
+        self.queue_wait = registry.histogram(
+            "flight_crawl_queue_wait_seconds",
+            "Attente avant crawl (semaphore de concurrence et cadencement).",
+            buckets=QUEUE_BUCKETS_S,
+        )
+        self.crawl_responses = registry.counter(
+            "flight_crawl_responses_total",
+            "Tentatives de crawl par code HTTP (timeout sans reponse).",
+            ("status_code",),
+        )
+        self.captchas = registry.counter(
+            "flight_captchas_total", "Captchas detectes par type.", ("captcha_type",)
+        )
+        self.retries = registry.counter(
+            "flight_crawl_retries_total", "Tentatives de crawl rejouees."
+        )
+        self.cache_hits = registry.counter(
+            "flight_cache_hits_total", "Resultats servis depuis un cache.", ("cache",)
+        )
+        self.proxy_bytes = registry.counter(
+            "flight_proxy_bytes_total",
+            "Octets HTML recus par sortie proxy.",
+            ("proxy_host",),
+        )
+        self.active_browsers = registry.gauge(
+            "flight_active_browsers", "Navigateurs Crawl4AI ouverts."
+        )
+        self.inflight_crawls = registry.gauge(
+            "flight_inflight_crawls", "Crawls en cours (retries inclus)."
+        )
+        self.queued_combinations = registry.gauge(
+            "flight_queued_combinations",
+            "Crawls (combinaisons, grilles de prix) en attente du semaphore de concurrence.",
+        )
+        self.crawl_timeout = registry.gauge(
+            "flight_crawl_timeout_seconds",
+            "Timeout adaptatif applique par sortie et par etape.",
+            ("proxy", "stage"),
+        )
+
+    def render(self, adaptive_timeouts: AdaptiveTimeouts | None = None) -> str:
+        """Texte d'exposition (timeouts adaptatifs relus à la collecte)."""
+        self.crawl_timeout.clear()
+        if adaptive_timeouts is not None:
+            for stats in adaptive_timeouts.stats():
+                self.crawl_timeout.set(stats.timeout_s, stats.proxy, stats.stage)
+        return self.registry.render()
+
+
+@lru_cache
+def get_pipeline_metrics() -> PipelineMetrics | None:
+    """Retourne instance PipelineMetrics partagée (None si désactivées)."""
+    if not get_settings().METRICS_ENABLED:
+        return None
+    return PipelineMetrics()
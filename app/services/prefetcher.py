@@ -0,0 +1,298 @@
+"""Préchargement en tâche de fond des itinéraires les plus demandés."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import itertools
+import logging
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from app.core import get_settings
+from app.models import DateCombination, PrefetchStats, SearchRequest
+from app.services.admission_controller import get_admission_controller
+from app.services.combination_generator import CombinationGenerator
+from app.services.crawl_stats import get_crawl_stats
+from app.services.result_cache import get_result_cache
+from app.utils import (
+    GoogleFlightsUrlError,
+    build_route_key,
+    generate_google_flights_url,
+)
+
+if TYPE_CHECKING:
+    from app.services.admission_controller import AdmissionController
+    from app.services.crawl_stats import CrawlStats
+    from app.services.result_cache import ResultCache
+    from app.services.search_service import SearchService
+
+logger = logging.getLogger(__name__)
+
+MAX_TRACKED_ROUTES = 1000
+MAX_TRACKED_URLS = 10000
+
+
+@dataclass
+class RoutePopularity:
+    """Score de fréquence à décroissance exponentielle et dernière requête vue."""
+
+    score: float
+    updated_at: float
+    request: SearchRequest
+
+    def decayed(self, now: float, half_life_s: float) -> float:
+        """Score ramené à l'instant `now`."""
+        return self.score * math.pow(0.5, (now - self.updated_at) / half_life_s)
+
+
+class Prefetcher:
+    """Garde en cache les combinaisons à venir des itinéraires populaires.
+
+    Ne crawle que lorsqu'aucune recherche n'est admise et s'interrompt dès qu'une
+    recherche arrive. Les budgets quotidiens (crawls et octets) plafonnent le
+    préchargement ; les hits attribués mesurent la latence épargnée.
+    """
+
+    def __init__(
+        self,
+        combination_generator: CombinationGenerator,
+        result_cache: ResultCache,
+        admission_controller: AdmissionController,
+        crawl_stats: CrawlStats,
+        *,
+        top_routes: int,
+        daily_crawl_budget: int,
+        daily_bytes_budget: int,
+        concurrency: int = 2,
+        half_life_s: float = 86400.0,
+    ) -> None:
+        """Initialise prefetcher avec dépendances injectées et budgets."""
+        self._combination_generator = combination_generator
+        self._result_cache = result_cache
+        self._admission_controller = admission_controller
+        self._crawl_stats = crawl_stats
+        self._top_routes = top_routes
+        self._daily_crawl_budget = daily_crawl_budget
+        self._daily_bytes_budget = daily_bytes_budget
+        self._concurrency = concurrency
+        self._half_life_s = half_life_s
+        self._routes: dict[str, RoutePopularity] = {}
+        self._prefetched: OrderedDict[str, None] = OrderedDict()
+        self._day = date.today()
+        self._crawls_today = 0
+        self._bytes_today = 0
+        self._yields = 0
+        self._prefetched_total = 0
+        self._hits = 0
+        self._saved_latency_s = 0.0
+
+    def record_request(self, request: SearchRequest) -> None:
+        """Comptabilise une recherche pour la popularité de son itinéraire."""
+        # Le mode progressive couvre jusqu'à 60 j/segment : trop large à précharger.
+        if request.mode == "progressive":
+            return
+        try:
+            route_key = build_route_key(request.template_url)
+        except GoogleFlightsUrlError:
+            return
+
+        now = time.time()
+        route = self._routes.get(route_key)
+        if route is None:
+            self._routes[route_key] = RoutePopularity(1.0, now, request)
+            if len(self._routes) > MAX_TRACKED_ROUTES:
+                least = min(
+                    self._routes,
+                    key=lambda k: self._routes[k].decayed(now, self._half_life_s),
+                )
+                del self._routes[least]
+            return
+        route.score = route.decayed(now, self._half_life_s) + 1.0
+        route.updated_at = now
+        route.request = request
+
+    def record_hit(self, url: str) -> None:
+        """Attribue un hit cache à une combinaison préchargée (une fois par crawl)."""
+        if url not in self._prefetched:
+            return
+        del self._prefetched[url]
+        self._hits += 1
+        self._saved_latency_s += self._crawl_stats.mean_latency_s
+
+    def popular_requests(self) -> list[SearchRequest]:
+        """Dernière requête des itinéraires les plus demandés (score décroissant)."""
+        now = time.time()
+        ranked = sorted(
+            self._routes.values(),
+            key=lambda r: r.decayed(now, self._half_life_s),
+            reverse=True,
+        )
+        return [route.request for route in ranked[: self._top_routes]]
+
+    def stats(self) -> PrefetchStats:
+        """Statistiques exposées par l'API."""
+        self._roll_day()
+        return PrefetchStats(
+            routes_tracked=len(self._routes),
+            crawls_today=self._crawls_today,
+            crawl_budget=self._daily_crawl_budget,
+            bytes_today=self._bytes_today,
+            bytes_budget=self._daily_bytes_budget,
+            yields=self._yields,
+            prefetched_total=self._prefetched_total,
+            hits=self._hits,
+            hit_rate=round(self._hits / max(self._prefetched_total, 1), 3),
+            saved_latency_s=round(self._saved_latency_s, 1),
+        )
+
+    async def run_once(self, search_service: SearchService) -> int:
+        """Précharge tant que capacité libre et budget, retourne les crawls lancés."""
+        crawled = 0
+        capture_session = True
+        for request in self.popular_requests():
+            combinations = await self._uncached_combinations(request)
+            for chunk in itertools.batched(
+                combinations, self._concurrency, strict=False
+            ):
+                if not self._admission_controller.is_idle:
+                    return crawled
+                if not self._charge_budget(len(chunk)):
+                    return crawled
+                crawled += len(chunk)
+                prefetched = await self._crawl_unless_busy(
+                    search_service, request, list(chunk), capture_session
+                )
+                capture_session = False
+                if prefetched is None:
+                    self._yields += 1
+                    logger.info("Prefetch yielded to search", extra={"crawls": crawled})
+                    return crawled
+                for combo in prefetched:
+                    self._mark_prefetched(self._url(request, combo))
+        return crawled
+
+    async def run_scheduler(
+        self, search_service: SearchService, *, poll_interval_s: float
+    ) -> None:
+        """Boucle de préchargement (tâche de fond du lifespan)."""
+        while True:
+            try:
+                crawled = await self.run_once(search_service)
+                if crawled:
+                    logger.info(
+                        "Prefetch cycle completed",
+                        extra={
+                            "crawls": crawled,
+                            "crawls_today": self._crawls_today,
+                            "bytes_today": self._bytes_today,
+                        },
+                    )
+            except Exception:
+                logger.exception("Prefetch cycle failed")
+            await asyncio.sleep(poll_interval_s)
+
+    async def _uncached_combinations(
+        self, request: SearchRequest
+    ) -> list[DateCombination]:
+        """Combinaisons à venir absentes du cache de résultats."""
+        today = date.today().isoformat()
+        combinations = [
+            combo
+            for combo in self._combination_generator.generate_combinations(
+                request.segments_date_ranges, request.constraints
+            )
+            if combo.segment_dates[0] >= today
+        ]
+        entries = await asyncio.gather(
+            *(self._result_cache.get(self._url(request, c)) for c in combinations)
+        )
+        return [
+            combo
+            for combo, entry in zip(combinations, entries, strict=True)
+            if entry is None
+        ]
+
+    async def _crawl_unless_busy(
+        self,
+        search_service: SearchService,
+        request: SearchRequest,
+        combinations: list[DateCombination],
+        capture_session: bool,
+    ) -> list[DateCombination] | None:
+        """Crawle les combinaisons, annule (None) si une recherche est admise."""
+        crawl = asyncio.create_task(
+            search_service.crawl_combinations(
+                request,
+                combinations,
+                concurrency=self._concurrency,
+                capture_session=capture_session,
+            )
+        )
+        busy = asyncio.create_task(self._admission_controller.wait_busy())
+        done, _ = await asyncio.wait({crawl, busy}, return_when=asyncio.FIRST_COMPLETED)
+        busy.cancel()
+        if crawl not in done:
+            crawl.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await crawl
+            return None
+        return [result.date_combination for result in crawl.result()]
+
+    def _charge_budget(self, crawls: int) -> bool:
+        """Réserve `crawls` sur les budgets du jour, False si épuisés."""
+        self._roll_day()
+        size_bytes = int(crawls * self._crawl_stats.mean_size_bytes)
+        if (
+            self._crawls_today + crawls > self._daily_crawl_budget
+            or self._bytes_today + size_bytes > self._daily_bytes_budget
+        ):
+            return False
+        self._crawls_today += crawls
+        self._bytes_today += size_bytes
+        return True
+
+    def _roll_day(self) -> None:
+        """Remet les budgets à zéro au changement de jour."""
+        today = date.today()
+        if today != self._day:
+            self._day = today
+            self._crawls_today = 0
+            self._bytes_today = 0
+
+    def _mark_prefetched(self, url: str) -> None:
+        """Retient l'URL préchargée pour l'attribution des hits (LRU borné)."""
+        self._prefetched_total += 1
+        self._prefetched[url] = None
+        self._prefetched.move_to_end(url)
+        while len(self._prefetched) > MAX_TRACKED_URLS:
+            self._prefetched.popitem(last=False)
+
+    @staticmethod
+    def _url(request: SearchRequest, combination: DateCombination) -> str:
+        """URL Google Flights d'une combinaison."""
+        return generate_google_flights_url(
+            request.template_url, combination.segment_dates
+        )
+
+
+@lru_cache
+def get_prefetcher() -> Prefetcher:
+    """Retourne instance Prefetcher partagée (singleton via lru_cache)."""
+    settings = get_settings()
+    return Prefetcher(
+        CombinationGenerator(),
+        get_result_cache(),
+        get_admission_controller(),
+        get_crawl_stats(),
+        top_routes=settings.PREFETCH_TOP_ROUTES,
+        daily_crawl_budget=settings.PREFETCH_DAILY_CRAWL_BUDGET,
+        daily_bytes_budget=settings.PREFETCH_DAILY_BYTES_BUDGET,
+        concurrency=settings.PREFETCH_CONCURRENCY,
+        half_life_s=settings.PREFETCH_POPULARITY_HALF_LIFE_S,
+    )
@@ -0,0 +1,167 @@
+"""Pré-crawl des grilles de prix Google Flights pour élaguer les combinaisons."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from typing import TYPE_CHECKING
+
+from app.core import get_settings
+from app.exceptions import CaptchaDetectedError, NetworkError, ParsingError
+from app.services.crawl_slots import wait_for_slot
+from app.services.price_calendar_parser import PriceCalendarParser
+from app.utils import generate_google_flights_url
+
+if TYPE_CHECKING:
+    from app.models import DateCombination
+    from app.services.crawler_service import CrawlerService
+    from app.services.metrics import PipelineMetrics
+
+logger = logging.getLogger(__name__)
+
+CALENDAR_GRID_SELECTOR = "css:div[data-iso]"
+DATE_GRID_JS_TEMPLATE = (
+    "const dateInputs = document.querySelectorAll("
+    '\'input[aria-label*="Départ"], input[aria-label*="Departure"]\');'
+    "if (dateInputs[{index}]) {{ dateInputs[{index}].click(); }}"
+)
+
+
+class PriceCalendarService:
+    """Estime le prix de chaque combinaison via les grilles de prix par segment.
+
+    Une grille (une page) donne un prix indicatif pour chaque date de départ d'un
+    segment ; l'estimation d'une combinaison est la somme des prix indicatifs de
+    ses dates. Seule la fraction la plus prometteuse est ensuite crawlée.
+    """
+
+    def __init__(
+        self,
+        crawler_service: CrawlerService,
+        parser: PriceCalendarParser | None = None,
+        metrics: PipelineMetrics | None = None,
+    ) -> None:
+        """Initialise service avec CrawlerService, parser et métriques injectés."""
+        self._crawler_service = crawler_service
+        self._parser = parser or PriceCalendarParser()
+        self._metrics = metrics
+        self._settings = get_settings()
+
+    async def select_promising(
+        self,
+        template_url: str,
+        combinations: list[DateCombination],
+        semaphore: asyncio.Semaphore,
+    ) -> list[DateCombination]:
+        """Retourne les combinaisons à crawler, les moins chères estimées en premier.
+
+        semaphore : créneaux de crawl de la recherche, partagés avec les
+        combinaisons.
+        """
+        if not combinations:
+            return combinations
+
+        segment_prices = await self.fetch_segment_prices(
+            template_url, combinations, semaphore
+        )
+        selected = self.filter_by_estimate(combinations, segment_prices)
+
+        logger.info(
+            "Price calendar pruning completed",
+            extra={
+                "priced_dates_per_segment": [len(p) for p in segment_prices],
+                "combinations_total": len(combinations),
+                "combinations_selected": len(selected),
+            },
+        )
+
+        return selected
+
+    async def fetch_segment_prices(
+        self,
+        template_url: str,
+        combinations: list[DateCombination],
+        semaphore: asyncio.Semaphore,
+    ) -> list[dict[str, float]]:
+        """Crawle une grille de prix par segment (dict vide si échec)."""
+        reference = combinations[0].segment_dates
+        url = generate_google_flights_url(template_url, reference)
+        return list(
+            await asyncio.gather(
+                *(
+                    self._fetch_grid(url, index, semaphore)
+                    for index in range(len(reference))
+                )
+            )
+        )
+
+    def filter_by_estimate(
+        self,
+        combinations: list[DateCombination],
+        segment_prices: list[dict[str, float]],
+    ) -> list[DateCombination]:
+        """Garde la fraction la moins chère (+ marge) et les non estimables."""
+        estimated: list[tuple[float, int, DateCombination]] = []
+        unestimated: list[DateCombination] = []
+        for index, combo in enumerate(combinations):
+            estimate = self.estimate_price(combo, segment_prices)
+            if estimate is None:
+                unestimated.append(combo)
+            else:
+                estimated.append((estimate, index, combo))
+
+        if not estimated:
+            return combinations
+
+        estimated.sort()
+        keep_count = max(
+            1, math.ceil(len(estimated) * self._settings.PRICE_CALENDAR_CRAWL_RATIO)
+        )
+        cutoff = estimated[keep_count - 1][0] * (
+            1 + self._settings.PRICE_CALENDAR_SAFETY_MARGIN
+        )
+
+        return [combo for price, _, combo in estimated if price <= cutoff] + unestimated
+
+    @staticmethod
+    def estimate_price(
+        combination: DateCombination, segment_prices: list[dict[str, float]]
+    ) -> float | None:
+        """Somme des prix indicatifs des dates (None si une date est inconnue)."""
+        total = 0.0
+        for segment_date, prices in zip(
+            combination.segment_dates, segment_prices, strict=False
+        ):
+            price = prices.get(segment_date)
+            if price is None:
+                return None
+            total += price
+        return total
+
+    async def _fetch_grid(
+        self, url: str, segment_index: int, semaphore: asyncio.Semaphore
+    ) -> dict[str, float]:
+        """Ouvre la grille de dates d'un segment et parse ses prix indicatifs."""
+        queued_at = await wait_for_slot(semaphore, self._metrics)
+        if self._metrics is not None:
+            self._metrics.queue_wait.observe(time.monotonic() - queued_at)
+        try:
+            result = await self._crawler_service.crawl_google_flights(
+                url,
+                use_proxy=True,
+                wait_for_selector=CALENDAR_GRID_SELECTOR,
+                js_code=[DATE_GRID_JS_TEMPLATE.format(index=segment_index)],
+            )
+            if not result.success:
+                return {}
+            return self._parser.parse(result.html)
+        except (CaptchaDetectedError, NetworkError, ParsingError) as e:
+            logger.warning(
+                "Price calendar unavailable",
+                extra={"segment_index": segment_index, "error": str(e)},
+            )
+            return {}
+        finally:
+            semaphore.release()
@@ -0,0 +1,86 @@
+"""Parser de la grille de prix (calendrier) Google Flights."""
+
+import logging
+import re
+
+from crawl4ai.extraction_strategy import JsonCssExtractionStrategy
+
+from app.exceptions import ParsingError
+from app.models.request import validate_iso_date
+
+logger = logging.getLogger(__name__)
+
+CALENDAR_PRICE_PATTERN = re.compile(r"(\d+(?:\s?\d{3})*)\s*(?:€|euros)")
+
+CALENDAR_SCHEMA = {
+    "name": "Google Flights Price Calendar",
+    "baseSelector": "div[data-iso]",
+    "fields": [
+        {
+            "name": "iso_date",
+            "type": "attribute",
+            "attribute": "data-iso",
+        },
+        {
+            "name": "texts",
+            "selector": "div, span",
+            "type": "list",
+            "fields": [{"name": "text", "type": "text"}],
+        },
+    ],
+}
+
+
+class PriceCalendarParser:
+    """Parser de la grille de prix (calendrier) Google Flights."""
+
+    def __init__(self) -> None:
+        """Initialise avec stratégie Crawl4AI."""
+        self._strategy = JsonCssExtractionStrategy(CALENDAR_SCHEMA)
+
+    def parse(self, html: str) -> dict[str, float]:
+        """Extrait les prix indicatifs par date ISO depuis le HTML du calendrier."""
+        raw_cells = self._strategy.extract(url="", html_content=html)
+
+        prices: dict[str, float] = {}
+        for cell in raw_cells:
+            iso_date = cell.get("iso_date")
+            price = self._extract_cell_price(cell.get("texts") or [])
+            if not iso_date or price is None:
+                continue
+            try:
+                prices[validate_iso_date(iso_date)] = price
+            except ValueError:
+                continue
+
+        logger.info(
+            "Price calendar parsed",
+            extra={"cells_found": len(raw_cells), "priced_dates": len(prices)},
+        )
+
+        if not prices:
+            raise ParsingError(
+                "No priced dates found in calendar HTML",
+                html_size=len(html),
+                flights_found=0,
+            )
+
+        return prices
+
+    def _extract_cell_price(self, texts: list[dict[str, str]]) -> float | None:
+        """Retourne le premier prix trouvé parmi les textes d'une cellule."""
+        for item in texts:
+            price = self._extract_price(item.get("text") or "")
+            if price is not None:
+                return price
+        return None
+
+    def _extract_price(self, text: str) -> float | None:
+        """Extrait prix depuis '523 €' ou '1 270 euros'."""
+        match = CALENDAR_PRICE_PATTERN.search(text)
+        if not match:
+            return None
+        try:
+            return float(re.sub(r"\D", "", match.group(1)))
+        except ValueError:
+            return None
@@ -0,0 +1,164 @@
+"""Historique des prix observés pour ordonnancer les crawls (moins cher d'abord)."""
+
+from __future__ import annotations
+
+import heapq
+import math
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+
+from app.models import DateCombination
+
+DAYS_TO_DEPARTURE_BUCKETS = (7, 14, 30, 60, 120)
+
+
+@dataclass
+class RunningMean:
+    """Moyenne incrémentale d'une série de prix."""
+
+    count: int = 0
+    mean: float = 0.0
+
+    def add(self, value: float) -> None:
+        """Ajoute une observation."""
+        self.count += 1
+        self.mean += (value - self.mean) / self.count
+
+
+@dataclass
+class RouteHistory:
+    """Observations d'un itinéraire : prix exacts et moyennes par caractéristique."""
+
+    baseline: RunningMean
+    exact: OrderedDict[tuple[str, ...], float]
+    weekday: dict[tuple[int, int], RunningMean]
+    departure: dict[int, RunningMean]
+    observed_at: dict[tuple[str, ...], float]
+
+
+class PriceHistory:
+    """Estime le prix attendu d'une combinaison depuis les recherches passées.
+
+    Prix exact si la combinaison a déjà été observée, sinon moyenne de
+    l'itinéraire corrigée par jour de semaine de chaque segment et par délai
+    avant départ.
+    """
+
+    def __init__(
+        self, *, max_routes: int = 1000, max_observations_per_route: int = 5000
+    ) -> None:
+        """Initialise historique borné en mémoire."""
+        self._max_routes = max_routes
+        self._max_observations = max_observations_per_route
+        self._routes: OrderedDict[str, RouteHistory] = OrderedDict()
+
+    def record(
+        self,
+        route_key: str,
+        combination: DateCombination,
+        price: float,
+        *,
+        observed_at: float | None = None,
+        today: date | None = None,
+    ) -> None:
+        """Enregistre un prix observé pour une combinaison de l'itinéraire.
+
+        observed_at : horodatage du crawl ; une observation déjà enregistrée
+        (resservie par un cache ou un crawl partagé) est ignorée.
+        """
+        dates = tuple(combination.segment_dates)
+        history = self._routes.get(route_key)
+        if (
+            history is not None
+            and observed_at is not None
+            and history.observed_at.get(dates) == observed_at
+        ):
+            return
+        if history is None:
+            history = RouteHistory(RunningMean(), OrderedDict(), {}, {}, {})
+            self._routes[route_key] = history
+            while len(self._routes) > self._max_routes:
+                self._routes.popitem(last=False)
+        self._routes.move_to_end(route_key)
+
+        history.baseline.add(price)
+        history.exact[dates] = price
+        history.exact.move_to_end(dates)
+        if observed_at is not None:
+            history.observed_at[dates] = observed_at
+        while len(history.exact) > self._max_observations:
+            evicted, _ = history.exact.popitem(last=False)
+            history.observed_at.pop(evicted, None)
+
+        for index, day in enumerate(dates):
+            weekday = date.fromisoformat(day).weekday()
+            history.weekday.setdefault((index, weekday), RunningMean()).add(price)
+        bucket = self._departure_bucket(dates[0], today)
+        history.departure.setdefault(bucket, RunningMean()).add(price)
+
+    def expected_price(
+        self,
+        route_key: str,
+        combination: DateCombination,
+        *,
+        today: date | None = None,
+    ) -> float | None:
+        """Retourne le prix attendu (None si itinéraire jamais observé)."""
+        history = self._routes.get(route_key)
+        if history is None or history.baseline.count == 0:
+            return None
+
+        dates = tuple(combination.segment_dates)
+        exact = history.exact.get(dates)
+        if exact is not None:
+            return exact
+
+        baseline = history.baseline.mean
+        if baseline <= 0:
+            return baseline
+        estimate = baseline
+        for index, day in enumerate(dates):
+            stats = history.weekday.get((index, date.fromisoformat(day).weekday()))
+            if stats is not None:
+                estimate *= stats.mean / baseline
+        departure = history.departure.get(self._departure_bucket(dates[0], today))
+        if departure is not None:
+            estimate *= departure.mean / baseline
+        return estimate
+
+    def prioritize(
+        self,
+        route_key: str,
+        combinations: list[DateCombination],
+        *,
+        today: date | None = None,
+    ) -> list[DateCombination]:
+        """Ordonne les combinaisons par prix attendu croissant.
+
+        Les combinaisons sans estimation gardent leur ordre relatif, en fin de file.
+        """
+        heap: list[tuple[float, int, DateCombination]] = []
+        for index, combination in enumerate(combinations):
+            expected = self.expected_price(route_key, combination, today=today)
+            heapq.heappush(
+                heap,
+                (math.inf if expected is None else expected, index, combination),
+            )
+        return [heapq.heappop(heap)[2] for _ in range(len(heap))]
+
+    @staticmethod
+    def _departure_bucket(first_date: str, today: date | None) -> int:
+        """Index de tranche du délai avant départ (jours)."""
+        days = (date.fromisoformat(first_date) - (today or date.today())).days
+        for index, limit in enumerate(DAYS_TO_DEPARTURE_BUCKETS):
+            if days <= limit:
+                return index
+        return len(DAYS_TO_DEPARTURE_BUCKETS)
+
+
+@lru_cache
+def get_price_history() -> PriceHistory:
+    """Retourne instance PriceHistory partagée (singleton via lru_cache)."""
+    return PriceHistory()
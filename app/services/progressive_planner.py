@@ -0,0 +1,175 @@
+"""Planification coarse-to-fine des combinaisons (mode progressive)."""
+
+from __future__ import annotations
+
+import itertools
+import math
+from collections.abc import Iterable
+from datetime import date
+
+from app.models import CombinationConstraints, CombinationResult, DateCombination
+
+type GridPoint = tuple[int, ...]
+
+
+class ProgressivePlanner:
+    """Planifie les rounds de crawl sur la grille des dates par segment.
+
+    Round initial : treillis clairsemé (une date sur `stride` par segment, bornes
+    incluses), chaque segment suivant recalé sur la date autorisée la plus proche
+    par les contraintes d'écart. Rounds suivants : voisinage des combinaisons les moins chères avec
+    un pas divisé par deux à chaque round, jusqu'à épuisement du budget de crawls.
+    Le produit cartésien complet n'est jamais matérialisé.
+    """
+
+    def __init__(
+        self,
+        segment_dates: list[list[str]],
+        *,
+        budget: int,
+        stride: int = 3,
+        refine_top_k: int = 5,
+        constraints: CombinationConstraints | None = None,
+    ) -> None:
+        """Initialise planner avec dates par segment et budget de crawls."""
+        self._segment_dates = segment_dates
+        self._constraints = constraints
+        self._budget = budget
+        self._refine_top_k = refine_top_k
+        self._planned: set[GridPoint] = set()
+        self._stride = self._fit_stride(max(1, stride))
+        self._step = self._stride
+        self.rounds = 0
+
+    @property
+    def total_combinations(self) -> int:
+        """Taille du produit cartésien complet (après contraintes)."""
+        if self._constraints is not None:
+            return self._constraints.count_combinations(
+                [
+                    [date.fromisoformat(d) for d in dates]
+                    for dates in self._segment_dates
+                ]
+            )
+        return math.prod(len(dates) for dates in self._segment_dates)
+
+    @property
+    def remaining_budget(self) -> int:
+        """Nombre de crawls encore planifiables."""
+        return self._budget - len(self._planned)
+
+    def initial_round(self) -> list[DateCombination]:
+        """Treillis clairsemé du premier round."""
+        axes = [
+            self._lattice_axis(len(dates), self._stride)
+            for dates in self._segment_dates
+        ]
+        snapped = (self._snap(point) for point in itertools.product(*axes))
+        return self._plan(point for point in snapped if point is not None)
+
+    def next_round(self, results: list[CombinationResult]) -> list[DateCombination]:
+        """Voisinage des meilleures combinaisons observées (vide si terminé)."""
+        if self.remaining_budget <= 0 or not results:
+            return []
+
+        centers = sorted(results, key=lambda r: r.best_flight.price)
+        while True:
+            self._step = max(1, self._step // 2)
+            candidates: list[GridPoint] = []
+            for result in centers[: self._refine_top_k]:
+                center = self._to_point(result.date_combination)
+                candidates.extend(self._neighbours(center, self._step))
+            planned = self._plan(candidates)
+            if planned or self._step == 1:
+                return planned
+
+    def _plan(self, points: Iterable[GridPoint]) -> list[DateCombination]:
+        """Retient les points inédits dans la limite du budget, marque planifiés."""
+        combinations: list[DateCombination] = []
+        for point in points:
+            if self.remaining_budget <= 0:
+                break
+            if point in self._planned:
+                continue
+            segment_dates = [
+                self._segment_dates[segment][index]
+                for segment, index in enumerate(point)
+            ]
+            if not self._allows(segment_dates):
+                continue
+            self._planned.add(point)
+            combinations.append(DateCombination(segment_dates=segment_dates))
+        if combinations:
+            self.rounds += 1
+        return combinations
+
+    def _allows(self, segment_dates: list[str]) -> bool:
+        """Vérifie les écarts entre segments consécutifs (contraintes)."""
+        if self._constraints is None:
+            return True
+        days = [date.fromisoformat(d) for d in segment_dates]
+        return all(
+            self._constraints.allows_gap(previous, current)
+            for previous, current in itertools.pairwise(days)
+        )
+
+    def _snap(self, point: GridPoint) -> GridPoint | None:
+        """Recale chaque segment sur l'indice autorisé le plus proche du treillis.
+
+        None si aucune date d'un segment ne respecte l'écart avec le précédent.
+        """
+        if self._constraints is None:
+            return point
+        snapped = [point[0]]
+        for segment in range(1, len(point)):
+            previous = date.fromisoformat(self._segment_dates[segment - 1][snapped[-1]])
+            allowed = [
+                index
+                for index, day in enumerate(self._segment_dates[segment])
+                if self._constraints.allows_gap(previous, date.fromisoformat(day))
+            ]
+            if not allowed:
+                return None
+            snapped.append(min(allowed, key=lambda i: abs(i - point[segment])))
+        return tuple(snapped)
+
+    def _neighbours(self, center: GridPoint, step: int) -> list[GridPoint]:
+        """Points à +/- step autour du centre, segment par segment, dans la grille."""
+        axes = [
+            sorted(
+                {
+                    index
+                    for index in (value - step, value, value + step)
+                    if 0 <= index < len(self._segment_dates[segment])
+                }
+            )
+            for segment, value in enumerate(center)
+        ]
+        return list(itertools.product(*axes))
+
+    def _to_point(self, combination: DateCombination) -> GridPoint:
+        """Indices de grille d'une combinaison."""
+        return tuple(
+            self._segment_dates[segment].index(day)
+            for segment, day in enumerate(combination.segment_dates)
+        )
+
+    def _fit_stride(self, stride: int) -> int:
+        """Élargit le pas jusqu'à ce que le treillis tienne dans la moitié du budget."""
+        longest = max(len(dates) for dates in self._segment_dates)
+        while stride < longest:
+            size = math.prod(
+                len(self._lattice_axis(len(dates), stride))
+                for dates in self._segment_dates
+            )
+            if size <= max(1, self._budget // 2):
+                break
+            stride += 1
+        return stride
+
+    @staticmethod
+    def _lattice_axis(length: int, stride: int) -> list[int]:
+        """Indices du treillis pour un segment (première et dernière dates incluses)."""
+        if length == 0:
+            return []
+        return sorted({*range(0, length, stride), length - 1})
@@ -0,0 +1,182 @@
+"""Cadencement des requêtes : token buckets global et par sortie proxy."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Collection
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from app.core import get_settings
+from app.services.proxy_service import proxy_key
+
+if TYPE_CHECKING:
+    from app.models import ProxyConfig
+
+logger = logging.getLogger(__name__)
+
+THROTTLE_DECREASE_FACTOR = 0.5
+
+
+class TokenBucket:
+    """Token bucket à réservation : un jeton pris peut rendre le solde négatif.
+
+    Le solde négatif représente les requêtes déjà planifiées : chaque appelant
+    attend le temps nécessaire pour rembourser sa place, sans verrou.
+    """
+
+    def __init__(self, rate_per_s: float, burst: int) -> None:
+        """Initialise bucket plein."""
+        self.rate_per_s = rate_per_s
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+
+    def reserve(self) -> float:
+        """Prend un jeton, retourne l'attente (s) avant de pouvoir l'utiliser."""
+        self._refill()
+        self._tokens -= 1.0
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate_per_s
+
+    def refund(self) -> None:
+        """Rend un jeton réservé mais non utilisé (attente annulée)."""
+        self._refill()
+        self._tokens = min(float(self._burst), self._tokens + 1.0)
+
+    def drain(self) -> None:
+        """Vide le bucket (plus de rafale après un throttling)."""
+        self._refill()
+        self._tokens = min(self._tokens, 0.0)
+
+    def _refill(self) -> None:
+        """Ajoute les jetons accumulés depuis la dernière mise à jour."""
+        now = time.monotonic()
+        self._tokens = min(
+            float(self._burst),
+            self._tokens + (now - self._updated_at) * self.rate_per_s,
+        )
+        self._updated_at = now
+
+
+class RateLimiter:
+    """Débit global + débit par sortie proxy, ajusté en AIMD sur les 429.
+
+    Chaque sortie démarre au débit configuré. Un throttling divise son débit par
+    deux (plancher min_proxy_rate_per_s) ; chaque succès le remonte de
+    increase_per_s jusqu'au débit configuré. Le débit se stabilise donc juste
+    sous le seuil qui déclenche le throttling.
+
+    Une passerelle rotative (nouvelle IP à chaque requête) n'est pas une sortie :
+    elle n'a pas de bucket propre et n'est limitée que par le débit global.
+    """
+
+    def __init__(
+        self,
+        *,
+        global_rate_per_s: float,
+        global_burst: int,
+        proxy_rate_per_s: float,
+        proxy_burst: int,
+        min_proxy_rate_per_s: float,
+        increase_per_s: float,
+        rotating_gateways: Collection[ProxyConfig] = (),
+    ) -> None:
+        """Initialise bucket global, buckets par proxy créés à la demande."""
+        self._global = TokenBucket(global_rate_per_s, global_burst)
+        self._proxy_rate_per_s = proxy_rate_per_s
+        self._proxy_burst = proxy_burst
+        self._min_proxy_rate_per_s = min_proxy_rate_per_s
+        self._increase_per_s = increase_per_s
+        self._buckets: dict[str, TokenBucket] = {}
+        self._rotating_keys = frozenset(proxy_key(p) for p in rotating_gateways)
+
+    async def acquire(self, proxy: ProxyConfig | None) -> float:
+        """Attend un jeton global et un jeton de la sortie, retourne l'attente.
+
+        Attente annulée : les jetons réservés sont rendus.
+        """
+        buckets = [self._global]
+        exit_bucket = self._bucket(proxy)
+        if exit_bucket is not None:
+            buckets.append(exit_bucket)
+        wait_s = max(bucket.reserve() for bucket in buckets)
+        if wait_s > 0:
+            logger.debug(
+                "Crawl paced",
+                extra={
+                    "wait_s": round(wait_s, 3),
+                    "proxy_host": proxy.host if proxy else "no_proxy",
+                },
+            )
+            try:
+                await asyncio.sleep(wait_s)
+            except asyncio.CancelledError:
+                for bucket in buckets:
+                    bucket.refund()
+                raise
+        return wait_s
+
+    def record_success(self, proxy: ProxyConfig | None) -> None:
+        """Augmentation additive du débit de la sortie."""
+        bucket = self._bucket(proxy)
+        if bucket is None:
+            return
+        bucket.rate_per_s = min(
+            self._proxy_rate_per_s, bucket.rate_per_s + self._increase_per_s
+        )
+
+    def record_throttled(self, proxy: ProxyConfig | None) -> None:
+        """Diminution multiplicative du débit de la sortie après un 429."""
+        bucket = self._bucket(proxy)
+        if proxy is None or bucket is None:
+            return
+        bucket.rate_per_s = max(
+            self._min_proxy_rate_per_s,
+            bucket.rate_per_s * THROTTLE_DECREASE_FACTOR,
+        )
+        bucket.drain()
+        logger.info(
+            "Proxy rate decreased after throttling",
+            extra={
+                "proxy_host": proxy.host,
+                "rate_per_s": round(bucket.rate_per_s, 3),
+            },
+        )
+
+    def proxy_rate_per_s(self, proxy: ProxyConfig) -> float | None:
+        """Débit courant autorisé pour la sortie (None : passerelle rotative)."""
+        bucket = self._bucket(proxy)
+        return None if bucket is None else bucket.rate_per_s
+
+    def _bucket(self, proxy: ProxyConfig | None) -> TokenBucket | None:
+        """Bucket de la sortie (username porte l'id de sticky session).
+
+        None sans proxy ou pour une passerelle rotative.
+        """
+        if proxy is None:
+            return None
+        key = proxy_key(proxy)
+        if key in self._rotating_keys:
+            return None
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(self._proxy_rate_per_s, self._proxy_burst)
+            self._buckets[key] = bucket
+        return bucket
+
+
+@lru_cache
+def get_rate_limiter() -> RateLimiter:
+    """Retourne instance RateLimiter partagée (singleton via lru_cache)."""
+    settings = get_settings()
+    return RateLimiter(
+        global_rate_per_s=settings.RATE_LIMIT_GLOBAL_PER_S,
+        global_burst=settings.RATE_LIMIT_GLOBAL_BURST,
+        proxy_rate_per_s=settings.RATE_LIMIT_PROXY_PER_S,
+        proxy_burst=settings.RATE_LIMIT_PROXY_BURST,
+        min_proxy_rate_per_s=settings.RATE_LIMIT_PROXY_MIN_PER_S,
+        increase_per_s=settings.RATE_LIMIT_PROXY_INCREASE_PER_S,
+        rotating_gateways=[settings.proxy_config] if settings.proxy_config else [],
+    )
@@ -0,0 +1,214 @@
+"""Mémoïsation des réponses de recherche avec stale-while-revalidate."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Literal
+
+from app.core import get_settings
+from app.exceptions import IdempotencyKeyReusedError
+from app.models import SearchRequest, SearchResponse
+
+logger = logging.getLogger(__name__)
+
+type CacheStatus = Literal["hit", "stale", "miss", "bypass"]
+
+
+@dataclass
+class CachedResponse:
+    """SearchResponse mémorisée avec empreinte de la requête d'origine."""
+
+    response: SearchResponse
+    request_hash: str
+    stored_at: float
+
+    def age_s(self, now: float | None = None) -> float:
+        """Retourne l'âge de l'entrée en secondes."""
+        return max(0.0, (now if now is not None else time.time()) - self.stored_at)
+
+
+@dataclass
+class ResponseLookup:
+    """Résultat d'une recherche mémoïsée (réponse, statut cache, âge)."""
+
+    response: SearchResponse
+    status: CacheStatus
+    age_s: float
+
+
+class ResponseCache:
+    """Cache de SearchResponse indexé par hash canonique de la requête.
+
+    Fenêtre fraîche : réponse stockée retournée directement. Fenêtre stale :
+    réponse stockée retournée et rafraîchissement lancé en arrière-plan.
+    Les misses concurrents d'une même clé partagent un seul calcul ; seules les
+    réponses complètes (aucun crawl annulé, au moins un résultat) sont stockées.
+    """
+
+    def __init__(
+        self, fresh_s: float, stale_s: float, *, max_entries: int = 1000
+    ) -> None:
+        """Initialise cache avec fenêtres de fraîcheur et de péremption."""
+        self.fresh_s = fresh_s
+        self.stale_s = stale_s
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._refreshing: dict[str, asyncio.Task[None]] = {}
+        self._computing: dict[str, tuple[str, asyncio.Task[SearchResponse]]] = {}
+
+    @staticmethod
+    def hash_request(request: SearchRequest) -> str:
+        """Hash SHA-256 du JSON canonique (clés triées) de la requête."""
+        canonical = json.dumps(
+            request.model_dump(mode="json"), sort_keys=True, separators=(",", ":")
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    @classmethod
+    def build_key(
+        cls, request: SearchRequest, idempotency_key: str | None = None
+    ) -> str:
+        """Clé cache : Idempotency-Key client si fournie, sinon hash requête."""
+        if idempotency_key:
+            return f"idem:{idempotency_key}"
+        return f"req:{cls.hash_request(request)}"
+
+    async def get_or_compute(
+        self,
+        request: SearchRequest,
+        compute: Callable[[], Awaitable[SearchResponse]],
+        *,
+        idempotency_key: str | None = None,
+        bypass: bool = False,
+    ) -> ResponseLookup:
+        """Retourne réponse mémorisée (hit/stale) ou calcule et stocke (miss).
+
+        bypass : calcule sans lire ni stocker (recherche tracée ou profilée).
+        """
+        if bypass:
+            return ResponseLookup(await compute(), "bypass", 0.0)
+        key = self.build_key(request, idempotency_key)
+        request_hash = self.hash_request(request)
+        entry = self._entries.get(key)
+        age_s = entry.age_s() if entry is not None else 0.0
+
+        if entry is not None and age_s >= self.fresh_s + self.stale_s:
+            del self._entries[key]
+            entry = None
+
+        if entry is not None and entry.request_hash != request_hash:
+            raise IdempotencyKeyReusedError(idempotency_key or key)
+
+        if entry is not None:
+            self._entries.move_to_end(key)
+            if age_s < self.fresh_s:
+                return ResponseLookup(entry.response, "hit", age_s)
+            self._schedule_refresh(key, request_hash, compute)
+            return ResponseLookup(entry.response, "stale", age_s)
+
+        return ResponseLookup(
+            await self._compute_once(key, request_hash, compute, idempotency_key),
+            "miss",
+            0.0,
+        )
+
+    def cache_control_header(self) -> str:
+        """Valeur Cache-Control décrivant les fenêtres de fraîcheur."""
+        return (
+            f"max-age={int(self.fresh_s)}, stale-while-revalidate={int(self.stale_s)}"
+        )
+
+    @staticmethod
+    def _is_complete(response: SearchResponse) -> bool:
+        """Réponse complète : aucun crawl annulé et au moins un résultat."""
+        return bool(response.results) and response.search_stats.crawls_cancelled == 0
+
+    async def _compute_once(
+        self,
+        key: str,
+        request_hash: str,
+        compute: Callable[[], Awaitable[SearchResponse]],
+        idempotency_key: str | None,
+    ) -> SearchResponse:
+        """Calcule et stocke la réponse (un seul calcul en cours par clé).
+
+        Le calcul est protégé par asyncio.shield : l'annulation d'un appelant
+        ne l'interrompt pas pour les autres appelants en attente.
+        """
+        computing = self._computing.get(key)
+        if computing is not None:
+            computing_hash, task = computing
+            if computing_hash != request_hash:
+                raise IdempotencyKeyReusedError(idempotency_key or key)
+            return await asyncio.shield(task)
+
+        async def compute_and_store() -> SearchResponse:
+            response = await compute()
+            self._store(key, request_hash, response)
+            return response
+
+        task = asyncio.create_task(compute_and_store())
+        self._computing[key] = (request_hash, task)
+        task.add_done_callback(lambda _: self._computing.pop(key, None))
+        return await asyncio.shield(task)
+
+    def _store(self, key: str, request_hash: str, response: SearchResponse) -> None:
+        """Stocke la réponse complète avec éviction LRU (partielle ignorée)."""
+        if not self._is_complete(response):
+            logger.info(
+                "Partial search response not cached",
+                extra={
+                    "key": key,
+                    "results": len(response.results),
+                    "crawls_cancelled": response.search_stats.crawls_cancelled,
+                },
+            )
+            return
+        self._entries[key] = CachedResponse(
+            response=response, request_hash=request_hash, stored_at=time.time()
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def _schedule_refresh(
+        self,
+        key: str,
+        request_hash: str,
+        compute: Callable[[], Awaitable[SearchResponse]],
+    ) -> None:
+        """Lance un rafraîchissement arrière-plan (un seul par clé)."""
+        if key in self._refreshing:
+            return
+
+        async def refresh() -> None:
+            try:
+                self._store(key, request_hash, await compute())
+                logger.info("Stale search response refreshed", extra={"key": key})
+            except Exception as e:
+                logger.warning(
+                    "Search response refresh failed",
+                    extra={"key": key, "error": str(e)},
+                )
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(refresh())
+
+
+@lru_cache
+def get_response_cache() -> ResponseCache:
+    """Retourne instance ResponseCache partagée (singleton via lru_cache)."""
+    settings = get_settings()
+    return ResponseCache(
+        fresh_s=settings.RESPONSE_CACHE_FRESH_S,
+        stale_s=settings.RESPONSE_CACHE_STALE_S,
+    )
@@ -0,0 +1,221 @@
+"""Cache des résultats parsés (local + backend Redis partagé optionnel)."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import secrets
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from functools import lru_cache
+
+from pydantic import ValidationError
+
+from app.core import get_settings
+from app.models import CachedFlight, GoogleFlightDTO
+from app.utils.resp_client import RespClient, RespError
+
+logger = logging.getLogger(__name__)
+
+RESULT_KEY_PREFIX = "fsa:result:"
+LEASE_KEY_PREFIX = "fsa:lease:"
+REMOTE_ERRORS = (OSError, ConnectionError, TimeoutError, RespError)
+
+
+class ResultCache:
+    """Cache des résultats parsés par URL avec verrou de crawl inter-réplicas.
+
+    Sans backend distant (ou backend injoignable), fonctionne en local uniquement :
+    les leases sont alors toujours accordés.
+    """
+
+    def __init__(
+        self,
+        ttl_s: float,
+        *,
+        remote: RespClient | None = None,
+        lease_ttl_s: float = 180.0,
+        remote_retry_after_s: float = 30.0,
+        max_local_entries: int = 10000,
+    ) -> None:
+        """Initialise cache avec TTL et backend RESP optionnel."""
+        self._ttl_s = ttl_s
+        self._remote = remote
+        self._lease_ttl_s = lease_ttl_s
+        self._remote_retry_after_s = remote_retry_after_s
+        self._max_local_entries = max_local_entries
+        self._local: OrderedDict[str, CachedFlight] = OrderedDict()
+        self._remote_down_until = 0.0
+
+    @property
+    def remote_available(self) -> bool:
+        """Indique si le backend distant est configuré et considéré joignable."""
+        return self._remote is not None and time.monotonic() >= self._remote_down_until
+
+    async def get(
+        self, url: str, *, lease_token: str | None = None
+    ) -> CachedFlight | None:
+        """Retourne l'entrée non expirée pour l'URL (local puis distant).
+
+        lease_token : seule l'entrée écrite sous ce lease compte (attente du
+        crawl d'un autre réplica, sans comparer d'horloges entre machines).
+        """
+        entry = self._local.get(url)
+        if entry is not None:
+            if entry.age_s() >= self._ttl_s:
+                del self._local[url]
+            elif lease_token is None or entry.lease_token == lease_token:
+                self._local.move_to_end(url)
+                return entry
+
+        raw = await self._remote_call(self._remote_get, url)
+        if raw is None:
+            return None
+        try:
+            entry = CachedFlight.model_validate_json(raw)
+        except ValidationError:
+            logger.warning("Invalid cache entry ignored", extra={"url": url})
+            return None
+        if entry.age_s() >= self._ttl_s:
+            return None
+        self._store_local(url, entry)
+        if lease_token is not None and entry.lease_token != lease_token:
+            return None
+        return entry
+
+    async def set(
+        self, url: str, flight: GoogleFlightDTO, *, lease_token: str | None = None
+    ) -> CachedFlight:
+        """Enregistre le meilleur vol parsé pour l'URL (local + distant).
+
+        lease_token : lease détenu pendant le crawl, identifie cette écriture.
+        """
+        entry = CachedFlight(
+            best_flight=flight, cached_at=time.time(), lease_token=lease_token
+        )
+        self._store_local(url, entry)
+        await self._remote_call(self._remote_set, url, entry)
+        return entry
+
+    async def acquire_lease(self, url: str) -> str | None:
+        """Tente de prendre le verrou "crawl en cours", retourne token ou None."""
+        token = secrets.token_hex(8)
+        acquired = await self._remote_call(self._remote_acquire, url, token)
+        if acquired is False:
+            return None
+        return token
+
+    async def release_lease(self, url: str, token: str) -> None:
+        """Libère le verrou si toujours détenu par ce token."""
+        await self._remote_call(self._remote_release, url, token)
+
+    async def wait_for_result(
+        self, url: str, *, timeout_s: float | None = None, poll_interval_s: float = 0.5
+    ) -> CachedFlight | None:
+        """Attend le résultat d'un crawl détenu par un autre réplica.
+
+        Seule l'entrée écrite sous le lease en cours compte : une entrée
+        antérieure (locale ou distante) est celle que le détenteur du verrou est
+        en train de rafraîchir. Retourne None si le verrou disparaît sans
+        résultat, si le backend devient injoignable ou si le délai expire.
+        """
+        holder = await self._remote_call(self._remote_lease_token, url)
+        if holder is None:
+            return None
+        deadline = time.monotonic() + (
+            timeout_s if timeout_s is not None else self._lease_ttl_s
+        )
+        while time.monotonic() < deadline:
+            await asyncio.sleep(poll_interval_s)
+            entry = await self.get(url, lease_token=holder)
+            if entry is not None:
+                return entry
+            if await self._remote_call(self._remote_lease_token, url) != holder:
+                # Résultat écrit avant la libération du verrou : dernière lecture.
+                return await self.get(url, lease_token=holder)
+        return None
+
+    async def close(self) -> None:
+        """Ferme la connexion au backend distant."""
+        if self._remote is not None:
+            await self._remote.close()
+
+    def _store_local(self, url: str, entry: CachedFlight) -> None:
+        """Stocke l'entrée localement avec éviction LRU."""
+        self._local[url] = entry
+        self._local.move_to_end(url)
+        while len(self._local) > self._max_local_entries:
+            self._local.popitem(last=False)
+
+    async def _remote_call[**P, T](
+        self,
+        func: Callable[P, Awaitable[T]],
+        *args: P.args,
+        **kwargs: P.kwargs,
+    ) -> T | None:
+        """Exécute un appel distant, bascule en local-only si backend injoignable."""
+        if not self.remote_available:
+            return None
+        try:
+            return await func(*args, **kwargs)
+        except REMOTE_ERRORS as e:
+            self._remote_down_until = time.monotonic() + self._remote_retry_after_s
+            logger.warning(
+                "Cache backend unreachable, falling back to local-only",
+                extra={
+                    "error": str(e) or type(e).__name__,
+                    "retry_after_s": self._remote_retry_after_s,
+                },
+            )
+            return None
+
+    def _client(self) -> RespClient:
+        """Retourne le client distant (appelé uniquement si configuré)."""
+        if self._remote is None:
+            raise RuntimeError("Remote cache backend not configured")
+        return self._remote
+
+    async def _remote_get(self, url: str) -> bytes | None:
+        """Lit l'entrée sérialisée depuis le backend."""
+        return await self._client().get(RESULT_KEY_PREFIX + url)
+
+    async def _remote_set(self, url: str, entry: CachedFlight) -> bool:
+        """Écrit l'entrée sérialisée avec expiration TTL."""
+        return await self._client().set(
+            RESULT_KEY_PREFIX + url,
+            entry.model_dump_json(),
+            px=int(self._ttl_s * 1000),
+        )
+
+    async def _remote_acquire(self, url: str, token: str) -> bool:
+        """SET NX PX du verrou de crawl."""
+        return await self._client().set(
+            LEASE_KEY_PREFIX + url, token, px=int(self._lease_ttl_s * 1000), nx=True
+        )
+
+    async def _remote_release(self, url: str, token: str) -> bool:
+        """Supprime le verrou s'il porte encore notre token."""
+        # GET puis DEL non atomique : au pire le lease d'un autre réplica est
+        # libéré juste avant son expiration, il recrawlera sans verrou.
+        client = self._client()
+        if await client.get(LEASE_KEY_PREFIX + url) == token.encode():
+            await client.delete(LEASE_KEY_PREFIX + url)
+        return True
+
+    async def _remote_lease_token(self, url: str) -> str | None:
+        """Token du verrou de crawl posé pour l'URL (None si libre)."""
+        token = await self._client().get(LEASE_KEY_PREFIX + url)
+        return token.decode() if token is not None else None
+
+
+@lru_cache
+def get_result_cache() -> ResultCache:
+    """Retourne instance ResultCache partagée (singleton via lru_cache)."""
+    settings = get_settings()
+    remote = RespClient(settings.REDIS_URL) if settings.REDIS_URL else None
+    return ResultCache(
+        ttl_s=settings.RESULT_CACHE_TTL_S,
+        remote=remote,
+        lease_ttl_s=settings.CRAWL_LEASE_TTL_S,
+    )
@@ -0,0 +1,92 @@
+"""Estimation dry-run du coût et de la durée d'une recherche."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+from typing import TYPE_CHECKING
+
+from app.core import get_settings
+from app.models import SearchEstimate, SearchRequest
+from app.utils import generate_google_flights_url
+
+if TYPE_CHECKING:
+    from app.services.admission_controller import AdmissionController
+    from app.services.combination_generator import CombinationGenerator
+    from app.services.crawl_stats import CrawlStats
+    from app.services.result_cache import ResultCache
+
+TOP_RESULTS = 10
+
+
+class SearchEstimator:
+    """Estime crawls, volume, attente et ETA depuis les statistiques live."""
+
+    def __init__(
+        self,
+        combination_generator: CombinationGenerator,
+        crawl_stats: CrawlStats,
+        admission_controller: AdmissionController,
+        result_cache: ResultCache | None = None,
+    ) -> None:
+        """Initialise estimateur avec dependances injectees."""
+        self._combination_generator = combination_generator
+        self._crawl_stats = crawl_stats
+        self._admission_controller = admission_controller
+        self._result_cache = result_cache
+        self._settings = get_settings()
+
+    async def estimate(self, request: SearchRequest) -> SearchEstimate:
+        """Estime la recherche sans crawler (couverture cache incluse)."""
+        combinations_total = request.count_combinations()
+        cached = 0
+        if request.mode == "progressive":
+            expected_crawls = min(
+                combinations_total, self._settings.PROGRESSIVE_CRAWL_BUDGET
+            )
+        else:
+            cached = await self._count_cached(request)
+            expected_crawls = combinations_total - cached
+            if request.mode == "calendar":
+                expected_crawls = len(request.segments_date_ranges) + math.ceil(
+                    expected_crawls * self._settings.PRICE_CALENDAR_CRAWL_RATIO
+                )
+
+        if request.complete_itineraries:
+            expected_crawls += min(combinations_total, TOP_RESULTS) * (
+                len(request.segments_date_ranges) - 1
+            )
+
+        latency_s = self._crawl_stats.mean_latency_s
+        capacity = self._admission_controller.capacity
+        queue_wait_s = self._admission_controller.queue_wait_s()
+        return SearchEstimate(
+            combinations_total=combinations_total,
+            cached_combinations=cached,
+            expected_crawls=expected_crawls,
+            expected_bytes=int(expected_crawls * self._crawl_stats.mean_size_bytes),
+            queue_wait_s=round(queue_wait_s, 1),
+            eta_s=round(
+                queue_wait_s + math.ceil(expected_crawls / capacity) * latency_s, 1
+            ),
+            mean_crawl_latency_s=round(latency_s, 2),
+        )
+
+    async def _count_cached(self, request: SearchRequest) -> int:
+        """Nombre de combinaisons dont le résultat est en cache."""
+        if self._result_cache is None:
+            return 0
+        combinations = self._combination_generator.generate_combinations(
+            request.segments_date_ranges, request.constraints
+        )
+        entries = await asyncio.gather(
+            *(
+                self._result_cache.get(
+                    generate_google_flights_url(
+                        request.template_url, combo.segment_dates
+                    )
+                )
+                for combo in combinations
+            )
+        )
+        return sum(entry is not None for entry in entries)
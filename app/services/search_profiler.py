@@ -0,0 +1,159 @@
+"""Profilage cProfile à la demande d'une recherche, stocké par search id."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import cProfile
+import io
+import logging
+import marshal
+import pstats
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Coroutine, Generator
+from functools import lru_cache
+from types import TracebackType
+from typing import Any
+
+from app.core import get_settings
+
+logger = logging.getLogger(__name__)
+
+_active_profile: contextvars.ContextVar[cProfile.Profile | None] = (
+    contextvars.ContextVar("active_profile", default=None)
+)
+_patched_loops: weakref.WeakSet[asyncio.AbstractEventLoop] = weakref.WeakSet()
+
+
+class ProfiledCoroutine[T](Coroutine[Any, Any, T]):
+    """Coroutine dont chaque étape (send/throw) s'exécute sous le profileur."""
+
+    def __init__(
+        self, coroutine: Coroutine[Any, Any, T], profiler: cProfile.Profile
+    ) -> None:
+        """Enveloppe la coroutine d'une tâche de la recherche profilée."""
+        self._coroutine = coroutine
+        self._profiler = profiler
+
+    def send(self, value: Any) -> Any:
+        """Étape de la tâche, profilée."""
+        self._profiler.enable()
+        try:
+            return self._coroutine.send(value)
+        finally:
+            self._profiler.disable()
+
+    def throw(
+        self,
+        typ: Any,
+        val: Any = None,
+        tb: TracebackType | None = None,
+    ) -> Any:
+        """Étape de la tâche reprise sur exception (annulation), profilée."""
+        self._profiler.enable()
+        try:
+            if val is None and tb is None:
+                return self._coroutine.throw(typ)
+            return self._coroutine.throw(typ, val, tb)
+        finally:
+            self._profiler.disable()
+
+    def close(self) -> None:
+        """Ferme la coroutine enveloppée."""
+        self._coroutine.close()
+
+    def __await__(self) -> Generator[Any, None, T]:
+        """Attente directe (hors tâche) : non profilée."""
+        return self._coroutine.__await__()
+
+
+def _install_task_factory(loop: asyncio.AbstractEventLoop) -> None:
+    """Enveloppe les tâches créées dans le contexte d'une recherche profilée."""
+    if loop in _patched_loops:
+        return
+    previous = loop.get_task_factory()
+
+    def task_factory(
+        loop: asyncio.AbstractEventLoop,
+        coroutine: Coroutine[Any, Any, Any],
+        **kwargs: Any,
+    ) -> asyncio.Future[Any]:
+        context = kwargs.get("context")
+        if context is None:
+            context = kwargs["context"] = contextvars.copy_context()
+        profiler = context.get(_active_profile)
+        if profiler is not None:
+            coroutine = ProfiledCoroutine(coroutine, profiler)
+        if previous is None:
+            return asyncio.Task(coroutine, loop=loop, **kwargs)
+        return previous(loop, coroutine, **kwargs)
+
+    loop.set_task_factory(task_factory)
+    _patched_loops.add(loop)
+
+
+class SearchProfiler:
+    """Profils CPU (cProfile, horloge process_time) limités à une recherche.
+
+    Le profileur n'est actif que pendant les étapes des tâches de la recherche
+    (tâche principale et sous-tâches héritant de son contexte) : le CPU des
+    autres recherches et des planificateurs de la même boucle n'y figure pas,
+    et plusieurs recherches peuvent être profilées en parallèle. L'horloge CPU
+    exclut le temps passé à attendre le réseau.
+    """
+
+    def __init__(self, *, max_profiles: int) -> None:
+        """Initialise stockage vide."""
+        self._max_profiles = max_profiles
+        self._profiles: OrderedDict[str, pstats.Stats] = OrderedDict()
+
+    async def run[T](self, search_id: str, coroutine: Coroutine[Any, Any, T]) -> T:
+        """Exécute la recherche dans une tâche profilée puis stocke le profil."""
+        loop = asyncio.get_running_loop()
+        _install_task_factory(loop)
+        profiler = cProfile.Profile(time.process_time)
+        context = contextvars.copy_context()
+        context.run(_active_profile.set, profiler)
+        try:
+            return await loop.create_task(coroutine, context=context)
+        finally:
+            self._store(search_id, profiler)
+
+    def pstats_dump(self, search_id: str) -> bytes | None:
+        """Profil au format fichier pstats (None si inconnu ou évincé)."""
+        stats = self._profiles.get(search_id)
+        return None if stats is None else marshal.dumps(stats.stats)  # type: ignore[attr-defined]
+
+    def report(
+        self, search_id: str, *, sort: str = "cumulative", limit: int = 50
+    ) -> str | None:
+        """Rapport texte pstats des `limit` fonctions les plus coûteuses."""
+        stats = self._profiles.get(search_id)
+        if stats is None:
+            return None
+        stream = io.StringIO()
+        stats.stream = stream  # type: ignore[attr-defined]
+        stats.sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+    def _store(self, search_id: str, profiler: cProfile.Profile) -> None:
+        """Conserve le profil (éviction LRU au-delà de max_profiles)."""
+        profiler.create_stats()
+        if not profiler.stats:
+            return
+        self._profiles[search_id] = pstats.Stats(profiler)
+        self._profiles.move_to_end(search_id)
+        while len(self._profiles) > self._max_profiles:
+            self._profiles.popitem(last=False)
+        logger.info("Search profile stored", extra={"search_id": search_id})
+
+
+@lru_cache
+def get_search_profiler() -> SearchProfiler | None:
+    """Retourne instance SearchProfiler partagée (None sans PROFILING_TOKEN)."""
+    settings = get_settings()
+    if settings.PROFILING_TOKEN is None:
+        return None
+    return SearchProfiler(max_profiles=settings.PROFILING_MAX_STORED)
@@ -3,31 +3,72 @@
 from __future__ import annotations
 
 import asyncio
+import itertools
 import logging
 import time
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
 from app.core import get_settings
 from app.exceptions import CaptchaDetectedError, NetworkError, ParsingError
 from app.models import (
+    BatchSearchResponse,
+    BatchStats,
+    CachedFlight,
     CombinationResult,
     DateCombination,
     FlightCombinationResult,
+    GoogleFlightDTO,
     SearchRequest,
     SearchResponse,
     SearchStats,
 )
-from app.types import CrawlResultTuple
-from app.utils import generate_google_flights_url
+from app.services.crawl_slots import CrawlGate, CrawlSlots, wait_for_slot
+from app.services.crawl_stats import summarize_timings
+from app.services.progressive_planner import ProgressivePlanner
+from app.services.response_cache import ResponseCache
+from app.services.search_trace import trace_instant, trace_lane, trace_span
+from app.utils import (
+    GoogleFlightsUrlError,
+    build_route_key,
+    generate_google_flights_url,
+)
 
 if TYPE_CHECKING:
+    from app.services.checkpoint_store import CheckpointStore
     from app.services.combination_generator import CombinationGenerator
-    from app.services.crawler_service import CrawlerService
+    from app.services.crawl_coalescer import CrawlCoalescer
+    from app.services.crawl_stats import CrawlTimings
+    from app.services.crawler_service import CrawlerService, CrawlResult
     from app.services.flight_parser import FlightParser
+    from app.services.itinerary_drilldown import ItineraryDrillDown
+    from app.services.metrics import PipelineMetrics
+    from app.services.prefetcher import Prefetcher
+    from app.services.price_calendar import PriceCalendarService
+    from app.services.price_history import PriceHistory
+    from app.services.result_cache import ResultCache
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class SearchProgress:
+    """Compteurs d'avancement d'une recherche (logs + SearchStats)."""
+
+    crawls_success: int = 0
+    crawls_failed: int = 0
+    cache_hits: int = 0
+    coalesced_crawls: int = 0
+    combinations_pruned: int = 0
+    verified_crawls: int = 0
+    crawls_cancelled: int = 0
+    combinations_total: int = 0
+    refinement_rounds: int = 0
+    drilldown_crawls: int = 0
+    combinations_resumed: int = 0
+    crawl_timings: list[CrawlTimings] = field(default_factory=list)
+
+
 class SearchService:
     """Service orchestration recherche vols multi-city."""
 
@@ -36,35 +77,254 @@ class SearchService:
         combination_generator: CombinationGenerator,
         crawler_service: CrawlerService,
         flight_parser: FlightParser,
+        result_cache: ResultCache | None = None,
+        crawl_coalescer: CrawlCoalescer[CachedFlight | None] | None = None,
+        price_calendar: PriceCalendarService | None = None,
+        price_history: PriceHistory | None = None,
+        itinerary_drilldown: ItineraryDrillDown | None = None,
+        prefetcher: Prefetcher | None = None,
+        checkpoint_store: CheckpointStore | None = None,
+        metrics: PipelineMetrics | None = None,
+        crawl_slots: CrawlSlots | None = None,
     ) -> None:
-        """Initialise service avec dependances injectees."""
+        """Initialise service avec dependances injectees.
+
+        crawl_slots : capacite de crawl partagee entre recherches (a defaut,
+        propre a cette instance, sans reserve interactive).
+        """
         self._combination_generator = combination_generator
         self._crawler_service = crawler_service
         self._flight_parser = flight_parser
+        self._result_cache = result_cache
+        self._crawl_coalescer = crawl_coalescer
+        self._price_calendar = price_calendar
+        self._price_history = price_history
+        self._itinerary_drilldown = itinerary_drilldown
+        self._prefetcher = prefetcher
+        self._checkpoint_store = checkpoint_store
+        self._metrics = metrics
         self._settings = get_settings()
+        self._crawl_slots = crawl_slots or CrawlSlots(self._settings.MAX_CONCURRENCY)
 
-    async def search_flights(self, request: SearchRequest) -> SearchResponse:
-        """Orchestre recherche complete multi-city avec ranking Top 10."""
+    async def search_flights(
+        self, request: SearchRequest, *, interactive: bool = True
+    ) -> SearchResponse:
+        """Orchestre recherche complete multi-city avec ranking Top 10.
+
+        interactive : acces aux creneaux de crawl reserves (petite recherche).
+        """
         start_time = time.time()
+        deadline = self._compute_deadline(request)
 
         logger.info(
             "Search started",
             extra={"segments_count": len(request.segments_date_ranges)},
         )
 
-        combinations = self._combination_generator.generate_combinations(
-            request.segments_date_ranges
+        await self._capture_session(deadline)
+
+        semaphore = self._crawl_slots.gate(interactive=interactive)
+        progress = SearchProgress()
+
+        checkpoint_key: str | None = None
+        if request.mode == "progressive":
+            combination_results = await self._crawl_progressively(
+                request, semaphore, progress, deadline=deadline
+            )
+        else:
+            if self._checkpoint_store is not None:
+                checkpoint_key = ResponseCache.hash_request(request)
+            combination_results = await self._crawl_generated_combinations(
+                request,
+                semaphore,
+                progress,
+                deadline=deadline,
+                checkpoint_key=checkpoint_key,
+            )
+
+        response = await self._build_response(
+            request,
+            combination_results,
+            semaphore,
+            progress,
+            deadline=deadline,
+            start_time=start_time,
         )
 
-        await self._crawler_service.get_google_session()
+        if (
+            self._checkpoint_store is not None
+            and checkpoint_key is not None
+            and progress.crawls_cancelled == 0
+        ):
+            await self._checkpoint_store.clear(checkpoint_key)
+        if self._metrics is not None:
+            self._metrics.search_duration.observe(
+                time.time() - start_time, request.mode
+            )
+        return response
+
+    async def search_batch(
+        self, requests: list[SearchRequest], *, interactive: bool = False
+    ) -> BatchSearchResponse:
+        """Execute un lot de recherches avec un plan de crawl commun.
+
+        Les URLs identiques entre requetes sont resolues une seule fois puis leurs
+        resultats redistribues au top 10 de chaque requete.
+        """
+        start_time = time.time()
+        deadlines = [
+            d for d in (self._compute_deadline(r) for r in requests) if d is not None
+        ]
+        deadline = min(deadlines) if deadlines else None
+
+        await self._capture_session(deadline)
+
+        semaphore = self._crawl_slots.gate(interactive=interactive)
+        progresses = [SearchProgress() for _ in requests]
+        fan_out: dict[str, list[tuple[int, DateCombination]]] = {}
+        plans = []
+        for index, request in enumerate(requests):
+            combinations = self._combination_generator.generate_combinations(
+                request.segments_date_ranges, request.constraints
+            )
+            progresses[index].combinations_total = len(combinations)
+            plans.append(self._prioritize_by_price_history(request, combinations))
+        for row in itertools.zip_longest(*plans):
+            for index, combo in enumerate(row):
+                if combo is not None:
+                    url = self._build_google_flights_url(requests[index], combo)
+                    fan_out.setdefault(url, []).append((index, combo))
+
+        resolved = await self._resolve_unique_urls(
+            list(fan_out), semaphore, deadline=deadline
+        )
+
+        results: list[list[CombinationResult]] = [[] for _ in requests]
+        route_keys = [self._route_key(request) for request in requests]
+        for url, targets in fan_out.items():
+            observed, url_progress = resolved.get(url, (None, None))
+            for index, combo in targets:
+                progress = progresses[index]
+                if url_progress is None:
+                    progress.crawls_cancelled += 1
+                    continue
+                progress.cache_hits += url_progress.cache_hits
+                progress.coalesced_crawls += url_progress.coalesced_crawls
+                if observed is None:
+                    progress.crawls_failed += 1
+                    continue
+                progress.crawls_success += 1
+                results[index].append(self._to_combination_result(combo, observed))
+                self._record_price(route_keys[index], combo, observed)
+
+        responses = await asyncio.gather(
+            *(
+                self._build_response(
+                    request,
+                    results[index],
+                    semaphore,
+                    progresses[index],
+                    deadline=deadline,
+                    start_time=start_time,
+                )
+                for index, request in enumerate(requests)
+            )
+        )
+
+        batch_stats = BatchStats(
+            requests_count=len(requests),
+            urls_total=sum(len(targets) for targets in fan_out.values()),
+            urls_unique=len(fan_out),
+            cache_hits=sum(p.cache_hits for _, p in resolved.values()),
+            crawls_failed=sum(obs is None for obs, _ in resolved.values()),
+            search_time_ms=int((time.time() - start_time) * 1000),
+        )
+        logger.info("Batch search completed", extra=batch_stats.model_dump())
+        if self._metrics is not None:
+            self._metrics.search_duration.observe(time.time() - start_time, "batch")
+        return BatchSearchResponse(responses=responses, batch_stats=batch_stats)
+
+    async def crawl_combinations(
+        self,
+        request: SearchRequest,
+        combinations: list[DateCombination],
+        *,
+        concurrency: int | None = None,
+        capture_session: bool = True,
+    ) -> list[CombinationResult]:
+        """Resout uniquement les combinaisons fournies (watches, prechargement).
+
+        Travail d'arriere-plan : jamais sur les creneaux reserves aux interactives.
+        """
+        if not combinations:
+            return []
+        deadline = self._compute_deadline(request)
+
+        if capture_session:
+            await self._capture_session(deadline)
 
-        crawl_results = await self._crawl_all_combinations(request, combinations)
+        semaphore = self._crawl_slots.gate(interactive=False, limit=concurrency)
+        progress = SearchProgress(combinations_total=len(combinations))
+        return await self._crawl_all_combinations(
+            request, combinations, semaphore, progress, deadline=deadline
+        )
 
-        combination_results = self._parse_all_results(crawl_results)
+    async def _resolve_unique_urls(
+        self,
+        urls: list[str],
+        semaphore: asyncio.Semaphore,
+        *,
+        deadline: float | None,
+    ) -> dict[str, tuple[CachedFlight | None, SearchProgress]]:
+        """Resout chaque URL une fois (absente du resultat si annulee a l'echeance)."""
+        resolved: dict[str, tuple[CachedFlight | None, SearchProgress]] = {}
+
+        async def resolve(url: str) -> None:
+            url_progress = SearchProgress()
+            observed = await self._resolve_best_flight(url, semaphore, url_progress)
+            resolved[url] = (observed, url_progress)
+
+        try:
+            if self._deadline_reached(deadline):
+                raise TimeoutError
+            async with asyncio.timeout_at(deadline), asyncio.TaskGroup() as tg:
+                for url in urls:
+                    tg.create_task(resolve(url))
+        except TimeoutError:
+            logger.warning(
+                "Batch deadline reached, returning partial results",
+                extra={"urls_resolved": len(resolved), "urls_total": len(urls)},
+            )
+        return resolved
+
+    async def _build_response(
+        self,
+        request: SearchRequest,
+        combination_results: list[CombinationResult],
+        semaphore: asyncio.Semaphore,
+        progress: SearchProgress,
+        *,
+        deadline: float | None,
+        start_time: float,
+    ) -> SearchResponse:
+        """Verifie fraicheur, classe le top 10, complete itineraires et stats."""
+        try:
+            async with asyncio.timeout_at(deadline):
+                combination_results = await self._verify_top_results_freshness(
+                    request, combination_results, semaphore, progress
+                )
+        except TimeoutError:
+            logger.warning("Search deadline reached during freshness verification")
 
         top_results = self._rank_and_select_top_10(combination_results)
 
-        flight_results = self._convert_to_flight_results(top_results)
+        itineraries: dict[tuple[str, ...], list[GoogleFlightDTO]] = {}
+        if request.complete_itineraries:
+            itineraries = await self._complete_itineraries(
+                request, top_results, semaphore, progress, deadline=deadline
+            )
+
+        flight_results = self._convert_to_flight_results(top_results, itineraries)
 
         search_time_ms = int((time.time() - start_time) * 1000)
 
@@ -82,89 +342,511 @@ class SearchService:
                 total_results=len(flight_results),
                 search_time_ms=search_time_ms,
                 segments_count=len(request.segments_date_ranges),
+                cache_hits=progress.cache_hits,
+                coalesced_crawls=progress.coalesced_crawls,
+                combinations_pruned=progress.combinations_pruned,
+                verified_crawls=progress.verified_crawls,
+                combinations_total=progress.combinations_total,
+                combinations_crawled=progress.crawls_success + progress.crawls_failed,
+                crawls_cancelled=progress.crawls_cancelled,
+                crawls_failed=progress.crawls_failed,
+                refinement_rounds=progress.refinement_rounds,
+                drilldown_crawls=progress.drilldown_crawls,
+                combinations_resumed=progress.combinations_resumed,
+                crawl_timings=(
+                    summarize_timings(progress.crawl_timings)
+                    if progress.crawl_timings
+                    else None
+                ),
             ),
         )
 
+    async def _crawl_generated_combinations(
+        self,
+        request: SearchRequest,
+        semaphore: asyncio.Semaphore,
+        progress: SearchProgress,
+        *,
+        deadline: float | None,
+        checkpoint_key: str | None = None,
+    ) -> list[CombinationResult]:
+        """Crawle le produit cartesien (pre-tri calendar optionnel).
+
+        Les combinaisons deja resolues par une execution interrompue de la meme
+        requete (point de reprise) ne sont pas recrawlees.
+        """
+        combinations = self._combination_generator.generate_combinations(
+            request.segments_date_ranges, request.constraints
+        )
+        progress.combinations_total = len(combinations)
+
+        if request.mode == "calendar":
+            try:
+                async with asyncio.timeout_at(deadline):
+                    combinations = await self._select_by_price_calendar(
+                        request, combinations, semaphore, progress
+                    )
+            except TimeoutError:
+                logger.warning("Search deadline reached during price calendar")
+        resumed, combinations = await self._resume_from_checkpoint(
+            checkpoint_key, combinations, progress
+        )
+        combinations = self._prioritize_by_price_history(request, combinations)
+        return resumed + await self._crawl_all_combinations(
+            request,
+            combinations,
+            semaphore,
+            progress,
+            deadline=deadline,
+            checkpoint_key=checkpoint_key,
+        )
+
+    async def _resume_from_checkpoint(
+        self,
+        checkpoint_key: str | None,
+        combinations: list[DateCombination],
+        progress: SearchProgress,
+    ) -> tuple[list[CombinationResult], list[DateCombination]]:
+        """Separe combinaisons deja resolues (point de reprise) et restantes."""
+        if self._checkpoint_store is None or checkpoint_key is None:
+            return [], combinations
+        restored = await self._checkpoint_store.load(checkpoint_key)
+        if not restored:
+            return [], combinations
+
+        resumed: list[CombinationResult] = []
+        remaining: list[DateCombination] = []
+        for combo in combinations:
+            observed = restored.get(tuple(combo.segment_dates))
+            if observed is None:
+                remaining.append(combo)
+            else:
+                resumed.append(self._to_combination_result(combo, observed))
+        progress.combinations_resumed += len(resumed)
+        logger.info(
+            "Search resumed from checkpoint",
+            extra={"resumed": len(resumed), "remaining": len(remaining)},
+        )
+        return resumed, remaining
+
+    async def _crawl_progressively(
+        self,
+        request: SearchRequest,
+        semaphore: asyncio.Semaphore,
+        progress: SearchProgress,
+        *,
+        deadline: float | None,
+    ) -> list[CombinationResult]:
+        """Treillis clairseme puis raffinement autour des moins chers (budget borne)."""
+        planner = ProgressivePlanner(
+            self._combination_generator.segment_dates(
+                request.segments_date_ranges, request.constraints
+            ),
+            budget=self._settings.PROGRESSIVE_CRAWL_BUDGET,
+            stride=self._settings.PROGRESSIVE_LATTICE_STRIDE,
+            refine_top_k=self._settings.PROGRESSIVE_REFINE_TOP_K,
+            constraints=request.constraints,
+        )
+        progress.combinations_total = planner.total_combinations
+
+        results: list[CombinationResult] = []
+        combinations = planner.initial_round()
+        while combinations:
+            combinations = self._prioritize_by_price_history(request, combinations)
+            results.extend(
+                await self._crawl_all_combinations(
+                    request, combinations, semaphore, progress, deadline=deadline
+                )
+            )
+            if progress.crawls_cancelled:
+                break
+            combinations = planner.next_round(results)
+
+        progress.refinement_rounds = planner.rounds
+        logger.info(
+            "Progressive search completed",
+            extra={
+                "rounds": planner.rounds,
+                "combinations_total": progress.combinations_total,
+                "crawl_budget_left": planner.remaining_budget,
+            },
+        )
+        return results
+
     async def _crawl_all_combinations(
         self,
         request: SearchRequest,
         combinations: list[DateCombination],
-    ) -> list[CrawlResultTuple]:
-        """Crawle toutes les combinaisons en parallele avec TaskGroup."""
-        semaphore = asyncio.Semaphore(self._settings.MAX_CONCURRENCY)
-        results: list[CrawlResultTuple] = []
+        semaphore: asyncio.Semaphore,
+        progress: SearchProgress,
+        *,
+        deadline: float | None = None,
+        checkpoint_key: str | None = None,
+    ) -> list[CombinationResult]:
+        """Crawle et parse toutes les combinaisons en parallele avec TaskGroup.
+
+        A l'echeance (horloge de la boucle), les crawls en cours sont annules et
+        seuls les resultats deja parses sont retournes.
+        """
+        results: list[CombinationResult] = []
+        route_key = self._route_key(request)
+        resolved_before = progress.crawls_success + progress.crawls_failed
 
         async def crawl_with_limit(combo: DateCombination) -> None:
-            async with semaphore:
-                url = self._build_google_flights_url(request, combo)
-                try:
-                    result = await self._crawler_service.crawl_google_flights(
-                        url,
-                        use_proxy=True,
-                    )
-                    results.append((combo, result))
-                except (CaptchaDetectedError, NetworkError) as e:
-                    logger.warning(
-                        "Crawl failed",
-                        extra={"url": url, "error": str(e)},
-                    )
-                    results.append((combo, None))
+            url = self._build_google_flights_url(request, combo)
+            with trace_lane(" ".join(combo.segment_dates)):
+                observed = await self._resolve_best_flight(url, semaphore, progress)
+            if observed is None:
+                progress.crawls_failed += 1
+                return
+            progress.crawls_success += 1
+            results.append(self._to_combination_result(combo, observed))
+            self._record_price(route_key, combo, observed)
+            if self._checkpoint_store is not None and checkpoint_key is not None:
+                self._checkpoint_store.record(checkpoint_key, combo, observed)
+
+        try:
+            if self._deadline_reached(deadline):
+                raise TimeoutError
+            async with asyncio.timeout_at(deadline), asyncio.TaskGroup() as tg:
+                for combo in combinations:
+                    tg.create_task(crawl_with_limit(combo))
+        except TimeoutError:
+            resolved = progress.crawls_success + progress.crawls_failed
+            progress.crawls_cancelled += len(combinations) - (
+                resolved - resolved_before
+            )
+            logger.warning(
+                "Search deadline reached, returning partial results",
+                extra={
+                    "crawls_success": progress.crawls_success,
+                    "crawls_cancelled": progress.crawls_cancelled,
+                },
+            )
 
-        async with asyncio.TaskGroup() as tg:
-            for combo in combinations:
-                tg.create_task(crawl_with_limit(combo))
+        logger.info(
+            "Crawling completed",
+            extra={
+                "crawls_success": progress.crawls_success,
+                "crawls_failed": progress.crawls_failed,
+                "cache_hits": progress.cache_hits,
+                "coalesced_crawls": progress.coalesced_crawls,
+            },
+        )
 
         return results
 
-    def _build_google_flights_url(
-        self, request: SearchRequest, combination: DateCombination
-    ) -> str:
-        """Genere URL Google Flights en remplacant dates dans template."""
-        return generate_google_flights_url(
-            request.template_url, combination.segment_dates
+    async def _capture_session(self, deadline: float | None) -> None:
+        """Complete le pool de sessions dans le budget de la recherche.
+
+        Echeance atteinte pendant la capture : les crawls suivants sont annules
+        et la recherche retourne un resultat partiel.
+        """
+        try:
+            async with asyncio.timeout_at(deadline):
+                with trace_span("session", "search"):
+                    await self._crawler_service.get_google_session()
+        except TimeoutError:
+            logger.warning("Search deadline reached during session capture")
+
+    @staticmethod
+    def _deadline_reached(deadline: float | None) -> bool:
+        """Echeance deja depassee (aucun crawl a lancer)."""
+        return deadline is not None and asyncio.get_running_loop().time() >= deadline
+
+    @staticmethod
+    def _compute_deadline(request: SearchRequest) -> float | None:
+        """Echeance absolue (horloge boucle asyncio) depuis deadline_ms."""
+        if request.deadline_ms is None:
+            return None
+        return asyncio.get_running_loop().time() + request.deadline_ms / 1000
+
+    def _prioritize_by_price_history(
+        self, request: SearchRequest, combinations: list[DateCombination]
+    ) -> list[DateCombination]:
+        """Ordonne les crawls par prix attendu (historique) : moins cher d'abord."""
+        route_key = self._route_key(request)
+        if route_key is None or self._price_history is None:
+            return combinations
+        return self._price_history.prioritize(route_key, combinations)
+
+    def _record_price(
+        self,
+        route_key: str | None,
+        combination: DateCombination,
+        observed: CachedFlight,
+    ) -> None:
+        """Alimente l'historique de prix (un crawl n'est compte qu'une fois)."""
+        if route_key is not None and self._price_history is not None:
+            self._price_history.record(
+                route_key,
+                combination,
+                observed.best_flight.price,
+                observed_at=observed.cached_at,
+            )
+
+    def _route_key(self, request: SearchRequest) -> str | None:
+        """Cle d'itineraire de l'historique de prix (None si indisponible)."""
+        if self._price_history is None:
+            return None
+        try:
+            return build_route_key(request.template_url)
+        except GoogleFlightsUrlError:
+            return None
+
+    async def _select_by_price_calendar(
+        self,
+        request: SearchRequest,
+        combinations: list[DateCombination],
+        semaphore: asyncio.Semaphore,
+        progress: SearchProgress,
+    ) -> list[DateCombination]:
+        """Pre-crawl grilles de prix et ne garde que les combinaisons prometteuses.
+
+        Les grilles passent par les memes creneaux que les combinaisons.
+        """
+        if self._price_calendar is None:
+            logger.warning("Price calendar unavailable, falling back to exhaustive")
+            return combinations
+
+        selected = await self._price_calendar.select_promising(
+            request.template_url, combinations, semaphore
         )
+        progress.combinations_pruned += len(combinations) - len(selected)
+        return selected
 
-    def _parse_all_results(
+    async def _verify_top_results_freshness(
         self,
-        crawl_results: list[CrawlResultTuple],
+        request: SearchRequest,
+        results: list[CombinationResult],
+        semaphore: asyncio.Semaphore,
+        progress: SearchProgress,
     ) -> list[CombinationResult]:
-        """Parse tous les resultats de crawl."""
-        combination_results: list[CombinationResult] = []
-        crawls_success = 0
-        crawls_failed = 0
+        """Recrawle les top-k servis depuis un cache trop ancien puis re-classe.
+
+        Repete jusqu'a ce que le top-k ne contienne que des prix frais : un prix
+        non reverifiable (crawl en echec) est retire du classement.
+        """
+        top_k = self._settings.FRESHNESS_VERIFY_TOP_K
+        max_age_s = self._settings.FRESHNESS_MAX_AGE_S
+        if self._result_cache is None or top_k == 0:
+            return results
+
+        results = list(results)
+        now = time.time()
+        while True:
+            ranked = sorted(results, key=lambda r: r.best_flight.price)[:top_k]
+            stale = [
+                r
+                for r in ranked
+                if r.observed_at is not None and now - r.observed_at > max_age_s
+            ]
+            if not stale:
+                return results
 
-        for combo, result in crawl_results:
-            if result is None or not result.success:
-                crawls_failed += 1
-                continue
-
-            try:
-                flights = self._flight_parser.parse(result.html)
+            logger.info(
+                "Verifying stale top results",
+                extra={"stale_count": len(stale), "max_age_s": max_age_s},
+            )
+            refreshed = await asyncio.gather(
+                *(self._reverify(request, r, semaphore, progress) for r in stale)
+            )
+            progress.verified_crawls += len(stale)
+
+            stale_ids = {id(r) for r in stale}
+            results = [r for r in results if id(r) not in stale_ids]
+            results.extend(
+                self._to_combination_result(r.date_combination, observed)
+                for r, observed in zip(stale, refreshed, strict=True)
+                if observed is not None
+            )
 
-                if not flights:
-                    crawls_failed += 1
-                    continue
+    async def _reverify(
+        self,
+        request: SearchRequest,
+        result: CombinationResult,
+        semaphore: asyncio.Semaphore,
+        progress: SearchProgress,
+    ) -> CachedFlight | None:
+        """Recrawle une combinaison servie depuis le cache (sans le cache)."""
+        dates = result.date_combination.segment_dates
+        with trace_lane(f"verify {' '.join(dates)}"):
+            return await self._resolve_best_flight(
+                self._build_google_flights_url(request, result.date_combination),
+                semaphore,
+                progress,
+                use_cache=False,
+            )
 
-                combination_results.append(
-                    CombinationResult(
-                        date_combination=combo,
-                        best_flight=flights[0],
-                    )
+    async def _resolve_best_flight(
+        self,
+        url: str,
+        semaphore: asyncio.Semaphore,
+        progress: SearchProgress,
+        *,
+        use_cache: bool = True,
+    ) -> CachedFlight | None:
+        """Retourne meilleur vol horodate (cache, crawl partage ou nouveau crawl)."""
+        if use_cache and self._result_cache is not None:
+            cached = await self._result_cache.get(url)
+            if cached is not None:
+                progress.cache_hits += 1
+                self._count_cache_hit()
+                trace_instant("cache_hit", "search")
+                if self._prefetcher is not None:
+                    self._prefetcher.record_hit(url)
+                return cached
+
+        if self._crawl_coalescer is None:
+            return await self._fetch_best_flight(url, semaphore, progress)
+
+        # Crawl partage : creneau pris hors du plafond du premier demandeur,
+        # compteurs propres reportes sur celui qui l'a lance.
+        interactive = isinstance(semaphore, CrawlGate) and semaphore.interactive
+        shared_progress = SearchProgress()
+        observed, coalesced = await self._crawl_coalescer.run(
+            url,
+            lambda: self._fetch_best_flight(
+                url, self._crawl_slots.gate(interactive=interactive), shared_progress
+            ),
+        )
+        if coalesced:
+            progress.coalesced_crawls += 1
+            trace_instant("coalesced", "search")
+        else:
+            progress.cache_hits += shared_progress.cache_hits
+            progress.crawl_timings.extend(shared_progress.crawl_timings)
+        return observed
+
+    async def _fetch_best_flight(
+        self,
+        url: str,
+        semaphore: asyncio.Semaphore,
+        progress: SearchProgress,
+    ) -> CachedFlight | None:
+        """Crawle une URL sous lease distribue et alimente le cache de resultats.
+
+        Le lease n'est pris qu'une fois le creneau obtenu : une URL encore en file
+        ne bloque pas les autres replicas. Lease detenu ailleurs : le creneau est
+        rendu le temps d'attendre le resultat de l'autre replica.
+        """
+        if self._result_cache is None:
+            best_flight = await self._crawl_when_slot_free(url, semaphore, progress)
+            if best_flight is None:
+                return None
+            return CachedFlight(best_flight=best_flight, cached_at=time.time())
+
+        queued_at = await wait_for_slot(semaphore, self._metrics)
+        try:
+            lease_token = await self._result_cache.acquire_lease(url)
+        except BaseException:
+            semaphore.release()
+            raise
+        if lease_token is None:
+            semaphore.release()
+            cached = await self._result_cache.wait_for_result(url)
+            if cached is not None:
+                progress.cache_hits += 1
+                self._count_cache_hit()
+                trace_instant("cache_hit", "search", shared_lease=True)
+                return cached
+            queued_at = await wait_for_slot(semaphore, self._metrics)
+
+        try:
+            best_flight = await self._crawl_and_parse(
+                url, progress, queue_wait_s=time.monotonic() - queued_at
+            )
+            if best_flight is None:
+                return None
+            return await self._result_cache.set(
+                url, best_flight, lease_token=lease_token
+            )
+        finally:
+            semaphore.release()
+            if lease_token is not None:
+                await self._result_cache.release_lease(url, lease_token)
+
+    async def _crawl_when_slot_free(
+        self, url: str, semaphore: asyncio.Semaphore, progress: SearchProgress
+    ) -> GoogleFlightDTO | None:
+        """Attend un creneau du semaphore puis crawle."""
+        queued_at = await wait_for_slot(semaphore, self._metrics)
+        try:
+            return await self._crawl_and_parse(
+                url, progress, queue_wait_s=time.monotonic() - queued_at
+            )
+        finally:
+            semaphore.release()
+
+    def _count_cache_hit(self) -> None:
+        """Compte un resultat servi par le cache de resultats."""
+        if self._metrics is not None:
+            self._metrics.cache_hits.inc("result")
+
+    async def _crawl_and_parse(
+        self, url: str, progress: SearchProgress, *, queue_wait_s: float = 0.0
+    ) -> GoogleFlightDTO | None:
+        """Crawle une URL et retourne le meilleur vol parse (None si echec)."""
+        try:
+            with trace_span("crawl", "search"):
+                result = await self._crawler_service.crawl_google_flights(
+                    url,
+                    use_proxy=True,
                 )
-                crawls_success += 1
-            except ParsingError as e:
-                logger.warning("Parsing failed", extra={"error": str(e)})
-                crawls_failed += 1
+        except (CaptchaDetectedError, NetworkError) as e:
+            logger.warning(
+                "Crawl failed",
+                extra={"url": url, "error": str(e)},
+            )
+            if self._metrics is not None:
+                self._metrics.queue_wait.observe(queue_wait_s)
+            return None
+
+        parse_start = time.monotonic()
+        with trace_span("parse", "search") as span:
+            best_flight = self._parse_crawl_result(result)
+            span["found"] = best_flight is not None
+        if result.success:
+            result.timings.queue_wait_s += queue_wait_s
+            result.timings.parse_s = time.monotonic() - parse_start
+            progress.crawl_timings.append(result.timings)
+            queue_wait_s = result.timings.queue_wait_s
+            if self._metrics is not None:
+                self._metrics.parse_duration.observe(result.timings.parse_s)
+        if self._metrics is not None:
+            self._metrics.queue_wait.observe(queue_wait_s)
+        return best_flight
 
-        logger.info(
-            "Crawling completed",
-            extra={
-                "crawls_success": crawls_success,
-                "crawls_failed": crawls_failed,
-            },
+    def _build_google_flights_url(
+        self, request: SearchRequest, combination: DateCombination
+    ) -> str:
+        """Genere URL Google Flights en remplacant dates dans template."""
+        return generate_google_flights_url(
+            request.template_url, combination.segment_dates
         )
 
-        return combination_results
+    def _parse_crawl_result(self, result: CrawlResult) -> GoogleFlightDTO | None:
+        """Parse un resultat de crawl et retourne le meilleur vol."""
+        if not result.success:
+            return None
+
+        try:
+            flights = self._flight_parser.parse(result.html)
+        except ParsingError as e:
+            logger.warning("Parsing failed", extra={"error": str(e)})
+            return None
+
+        return flights[0] if flights else None
+
+    def _to_combination_result(
+        self, combination: DateCombination, observed: CachedFlight
+    ) -> CombinationResult:
+        """Construit CombinationResult depuis un meilleur vol horodate."""
+        return CombinationResult(
+            date_combination=combination,
+            best_flight=observed.best_flight,
+            observed_at=observed.cached_at,
+        )
 
     def _rank_and_select_top_10(
         self, results: list[CombinationResult]
@@ -190,14 +872,43 @@ class SearchService:
 
         return top_10
 
+    async def _complete_itineraries(
+        self,
+        request: SearchRequest,
+        top_results: list[CombinationResult],
+        semaphore: asyncio.Semaphore,
+        progress: SearchProgress,
+        *,
+        deadline: float | None,
+    ) -> dict[tuple[str, ...], list[GoogleFlightDTO]]:
+        """Complete les vols des segments 2..N des top resultats (drill-down)."""
+        if self._itinerary_drilldown is None or not top_results:
+            return {}
+        try:
+            async with asyncio.timeout_at(deadline):
+                itineraries, crawls = await self._itinerary_drilldown.complete(
+                    request.template_url, top_results, semaphore
+                )
+        except TimeoutError:
+            logger.warning("Search deadline reached during itinerary drill-down")
+            return {}
+        progress.drilldown_crawls += crawls
+        return itineraries
+
     def _convert_to_flight_results(
-        self, combination_results: list[CombinationResult]
+        self,
+        combination_results: list[CombinationResult],
+        itineraries: dict[tuple[str, ...], list[GoogleFlightDTO]] | None = None,
     ) -> list[FlightCombinationResult]:
         """Convertit CombinationResult en FlightCombinationResult pour response."""
+        itineraries = itineraries or {}
         return [
             FlightCombinationResult(
                 segment_dates=combo_result.date_combination.segment_dates,
-                flights=[combo_result.best_flight],
+                flights=itineraries.get(
+                    tuple(combo_result.date_combination.segment_dates),
+                    [combo_result.best_flight],
+                ),
             )
             for combo_result in combination_results
         ]
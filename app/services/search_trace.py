@@ -0,0 +1,190 @@
+"""Timeline d'une recherche au format Chrome trace-event (Perfetto, chrome://tracing)."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any
+
+from app.core import get_settings
+
+TRACE_PID = 1
+SEARCH_LANE = 0
+
+_active_trace: ContextVar[SearchTrace | None] = ContextVar("search_trace", default=None)
+_active_lane: ContextVar[int] = ContextVar("search_trace_lane", default=SEARCH_LANE)
+
+
+class SearchTrace:
+    """Événements d'une recherche tracée, une ligne (tid) par combinaison.
+
+    La trace active et la ligne courante sont portées par des ContextVar : les
+    tâches d'une recherche en héritent, les autres recherches ne voient rien.
+    """
+
+    def __init__(self, search_id: str) -> None:
+        """Initialise trace vide, horloge relative au début de la recherche."""
+        self.search_id = search_id
+        self._origin = time.monotonic()
+        self._events: list[dict[str, Any]] = []
+        self._lanes = SEARCH_LANE
+        self._name_lane(SEARCH_LANE, "search")
+
+    def new_lane(self, name: str) -> int:
+        """Nouvelle ligne de la timeline (combinaison, doublon hedgé)."""
+        self._lanes += 1
+        self._name_lane(self._lanes, name)
+        return self._lanes
+
+    def complete(
+        self,
+        name: str,
+        category: str,
+        start: float,
+        end: float,
+        args: dict[str, Any],
+    ) -> None:
+        """Ajoute un intervalle (horloge time.monotonic) sur la ligne courante."""
+        self._events.append(
+            {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": self._us(start),
+                "dur": round((end - start) * 1e6),
+                "pid": TRACE_PID,
+                "tid": _active_lane.get(),
+                "args": args,
+            }
+        )
+
+    def instant(self, name: str, category: str, args: dict[str, Any]) -> None:
+        """Ajoute un événement ponctuel sur la ligne courante."""
+        self._events.append(
+            {
+                "name": name,
+                "cat": category,
+                "ph": "i",
+                "s": "t",
+                "ts": self._us(time.monotonic()),
+                "pid": TRACE_PID,
+                "tid": _active_lane.get(),
+                "args": args,
+            }
+        )
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """Document JSON trace-event (format objet)."""
+        return {
+            "traceEvents": list(self._events),
+            "displayTimeUnit": "ms",
+            "otherData": {"search_id": self.search_id},
+        }
+
+    def _name_lane(self, lane: int, name: str) -> None:
+        """Métadonnée thread_name affichée en tête de ligne."""
+        self._events.append(
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": TRACE_PID,
+                "tid": lane,
+                "args": {"name": name},
+            }
+        )
+
+    def _us(self, instant: float) -> int:
+        """Microsecondes depuis le début de la trace."""
+        return round((instant - self._origin) * 1e6)
+
+
+@contextmanager
+def tracing(trace: SearchTrace | None) -> Iterator[None]:
+    """Active la trace pour le bloc (et ses tâches), couvert par un span search."""
+    if trace is None:
+        yield
+        return
+    token = _active_trace.set(trace)
+    start = time.monotonic()
+    try:
+        yield
+    finally:
+        trace.complete("search", "search", start, time.monotonic(), {})
+        _active_trace.reset(token)
+
+
+@contextmanager
+def trace_lane(name: str) -> Iterator[None]:
+    """Place les événements du bloc sur une nouvelle ligne (sans effet hors trace)."""
+    trace = _active_trace.get()
+    if trace is None:
+        yield
+        return
+    token = _active_lane.set(trace.new_lane(name))
+    try:
+        yield
+    finally:
+        _active_lane.reset(token)
+
+
+@contextmanager
+def trace_span(name: str, category: str, **args: Any) -> Iterator[dict[str, Any]]:
+    """Intervalle couvrant le bloc ; le dict retourné complète ses arguments."""
+    trace = _active_trace.get()
+    if trace is None:
+        yield {}
+        return
+    start = time.monotonic()
+    try:
+        yield args
+    except BaseException as e:
+        args["error"] = type(e).__name__
+        raise
+    finally:
+        trace.complete(name, category, start, time.monotonic(), args)
+
+
+def trace_interval(
+    name: str, category: str, start: float, end: float, **args: Any
+) -> None:
+    """Intervalle déjà mesuré (time.monotonic), sans effet hors trace."""
+    trace = _active_trace.get()
+    if trace is not None:
+        trace.complete(name, category, start, end, args)
+
+
+def trace_instant(name: str, category: str, **args: Any) -> None:
+    """Événement ponctuel, sans effet hors trace."""
+    trace = _active_trace.get()
+    if trace is not None:
+        trace.instant(name, category, args)
+
+
+class TraceStore:
+    """Dernières traces conservées en mémoire par search id (éviction LRU)."""
+
+    def __init__(self, max_traces: int) -> None:
+        """Initialise stockage vide."""
+        self._max_traces = max_traces
+        self._traces: OrderedDict[str, SearchTrace] = OrderedDict()
+
+    def save(self, trace: SearchTrace) -> None:
+        """Conserve la trace (évince la plus ancienne au-delà de max_traces)."""
+        self._traces[trace.search_id] = trace
+        self._traces.move_to_end(trace.search_id)
+        while len(self._traces) > self._max_traces:
+            self._traces.popitem(last=False)
+
+    def get(self, search_id: str) -> SearchTrace | None:
+        """Trace de la recherche (None si inconnue ou évincée)."""
+        return self._traces.get(search_id)
+
+
+@lru_cache
+def get_trace_store() -> TraceStore:
+    """Retourne instance TraceStore partagée (singleton via lru_cache)."""
+    return TraceStore(get_settings().TRACE_MAX_STORED)
@@ -0,0 +1,199 @@
+"""Pool de sessions Google : cookies liés à la sortie proxy qui les a obtenus."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import secrets
+import time
+from collections.abc import Collection, Coroutine
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
+
+from app.core import get_settings
+
+if TYPE_CHECKING:
+    from playwright.async_api import Cookie
+
+    from app.models import ProxyConfig
+
+logger = logging.getLogger(__name__)
+
+REFRESH_AGE_RATIO = 0.8
+
+
+@dataclass
+class CrawlSession:
+    """Cookies de consentement + proxy (sticky session) utilisés pour les capturer."""
+
+    session_id: str
+    proxy: ProxyConfig | None
+    cookies: list[Cookie]
+    captured_at: float
+    inflight: int = 0
+    crawls: int = 0
+    consecutive_failures: int = 0
+    degraded: bool = False
+    recapturing: bool = False
+
+    @classmethod
+    def create(cls, proxy: ProxyConfig | None, cookies: list[Cookie]) -> CrawlSession:
+        """Nouvelle session capturée maintenant."""
+        return cls(
+            session_id=secrets.token_hex(4),
+            proxy=proxy,
+            cookies=cookies,
+            captured_at=time.monotonic(),
+        )
+
+    @property
+    def proxied(self) -> bool:
+        """Session capturée via un proxy."""
+        return self.proxy is not None
+
+
+class SessionPool:
+    """Sessions partagées entre recherches, crawls ordonnancés sur la moins chargée.
+
+    Un crawl réutilise les cookies sur le proxy qui les a capturés : pas de
+    changement de sortie entre consentement et crawl. Une session bloquée
+    (429/403/captcha), en échecs répétés ou proche de son âge maximal est
+    recapturée en tâche de fond pendant que les crawls utilisent les autres.
+    """
+
+    def __init__(self, *, size: int, max_failures: int, max_age_s: float) -> None:
+        """Initialise pool vide avec taille cible et critères de dégradation."""
+        self._size = size
+        self._max_failures = max_failures
+        self._max_age_s = max_age_s
+        self._sessions: list[CrawlSession] = []
+        self._tasks: set[asyncio.Task[None]] = set()
+        self.capture_lock = asyncio.Lock()
+
+    @property
+    def sessions(self) -> list[CrawlSession]:
+        """Sessions actuellement dans le pool."""
+        return list(self._sessions)
+
+    def missing(self, *, proxied: bool) -> int:
+        """Nombre de sessions utilisables manquantes pour atteindre la taille cible."""
+        now = time.monotonic()
+        usable = sum(
+            1
+            for s in self._sessions
+            if s.proxied == proxied and (self._is_usable(s, now) or s.recapturing)
+        )
+        return max(0, self._size - usable)
+
+    def available(self, *, proxied: bool) -> int:
+        """Nombre de sessions utilisables immédiatement."""
+        now = time.monotonic()
+        return sum(
+            1
+            for s in self._sessions
+            if s.proxied == proxied and self._is_usable(s, now)
+        )
+
+    def add(self, session: CrawlSession) -> None:
+        """Ajoute une session, en retirant les sessions inutilisables et inactives."""
+        now = time.monotonic()
+        self._sessions = [
+            s
+            for s in self._sessions
+            if self._is_usable(s, now) or s.recapturing or s.inflight
+        ]
+        self._sessions.append(session)
+        logger.info(
+            "Session added to pool",
+            extra={
+                "session_id": session.session_id,
+                "proxy_host": session.proxy.host if session.proxy else "no_proxy",
+                "cookies_count": len(session.cookies),
+                "sessions_count": len(self._sessions),
+            },
+        )
+
+    def replace(self, old: CrawlSession, new: CrawlSession) -> None:
+        """Remplace une session recapturée."""
+        self.remove(old)
+        self.add(new)
+
+    def remove(self, session: CrawlSession) -> None:
+        """Retire une session du pool (sans effet si absente)."""
+        if session in self._sessions:
+            self._sessions.remove(session)
+
+    def acquire(
+        self, *, proxied: bool, exclude: Collection[str] = ()
+    ) -> CrawlSession | None:
+        """Session utilisable la moins chargée, hors `exclude` (None si aucune)."""
+        now = time.monotonic()
+        candidates = [
+            s
+            for s in self._sessions
+            if s.proxied == proxied
+            and s.session_id not in exclude
+            and self._is_usable(s, now)
+        ]
+        if not candidates:
+            return None
+        session = min(candidates, key=lambda s: (s.inflight, s.crawls))
+        session.inflight += 1
+        return session
+
+    def release(self, session: CrawlSession) -> None:
+        """Libère la session à la fin d'une tentative de crawl."""
+        session.inflight = max(0, session.inflight - 1)
+        session.crawls += 1
+
+    def record_success(self, session: CrawlSession) -> None:
+        """Crawl réussi : remet le compteur d'échecs à zéro."""
+        session.consecutive_failures = 0
+
+    def record_failure(self, session: CrawlSession, *, blocked: bool) -> None:
+        """Échec de crawl : dégradée si bloquée ou après max_failures échecs."""
+        session.consecutive_failures += 1
+        if blocked or session.consecutive_failures >= self._max_failures:
+            if not session.degraded:
+                logger.warning(
+                    "Session degraded",
+                    extra={
+                        "session_id": session.session_id,
+                        "blocked": blocked,
+                        "consecutive_failures": session.consecutive_failures,
+                    },
+                )
+            session.degraded = True
+
+    def needs_recapture(self) -> list[CrawlSession]:
+        """Sessions dégradées ou proches d'expirer, sans recapture en cours."""
+        now = time.monotonic()
+        refresh_age_s = self._max_age_s * REFRESH_AGE_RATIO
+        return [
+            s
+            for s in self._sessions
+            if not s.recapturing
+            and (s.degraded or now - s.captured_at >= refresh_age_s)
+        ]
+
+    def spawn(self, coroutine: Coroutine[Any, Any, None]) -> None:
+        """Lance une capture en tâche de fond (référence conservée)."""
+        task = asyncio.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _is_usable(self, session: CrawlSession, now: float) -> bool:
+        """Session non dégradée et plus jeune que max_age_s."""
+        return not session.degraded and now - session.captured_at < self._max_age_s
+
+
+@lru_cache
+def get_session_pool() -> SessionPool:
+    """Retourne instance SessionPool partagée (singleton via lru_cache)."""
+    settings = get_settings()
+    return SessionPool(
+        size=settings.SESSION_POOL_SIZE,
+        max_failures=settings.SESSION_MAX_FAILURES,
+        max_age_s=settings.SESSION_MAX_AGE_S,
+    )
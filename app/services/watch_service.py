@@ -0,0 +1,355 @@
+"""Surveillance des prix : recherches rejouées avec re-crawl incrémental."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import secrets
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import date
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+import httpx
+from pydantic import HttpUrl
+
+from app.core import get_settings
+from app.exceptions import AdmissionRejectedError, WatchLimitReachedError
+from app.models import (
+    DateCombination,
+    PriceChangeEvent,
+    WatchRequest,
+    WatchStatus,
+)
+from app.models.watch import is_public_address
+from app.services.admission_controller import get_admission_controller
+from app.services.combination_generator import CombinationGenerator
+
+if TYPE_CHECKING:
+    from app.services.admission_controller import AdmissionController
+    from app.services.search_service import SearchService
+
+logger = logging.getLogger(__name__)
+
+type ComboKey = tuple[str, ...]
+
+
+@dataclass
+class TrackedPrice:
+    """Dernier meilleur prix connu d'une combinaison."""
+
+    price: float
+    observed_at: float
+
+
+@dataclass
+class Watch:
+    """Watch enregistrée : requête, prix connus et flux d'événements borné."""
+
+    watch_id: str
+    request: WatchRequest
+    next_run_at: float
+    max_events: int
+    runs: int = 0
+    last_run_at: float | None = None
+    last_run_recrawled: int = 0
+    last_run_reused: int = 0
+    prices: dict[ComboKey, TrackedPrice] = field(default_factory=dict)
+    events: deque[PriceChangeEvent] = field(init=False)
+    next_seq: int = 1
+
+    def __post_init__(self) -> None:
+        """Initialise le flux avec sa capacité maximale."""
+        self.events = deque(maxlen=self.max_events)
+
+
+async def resolve_host(host: str, port: int) -> list[str]:
+    """Adresses IP résolues d'un hôte (DNS non bloquant)."""
+    infos = await asyncio.get_running_loop().getaddrinfo(host, port)
+    return [str(info[4][0]) for info in infos]
+
+
+def departure_ttl_s(
+    segment_dates: list[str],
+    *,
+    today: date,
+    min_s: float,
+    max_s: float,
+    per_day_s: float,
+) -> float:
+    """TTL d'un prix selon l'approche du départ (premier segment).
+
+    Les prix proches du départ bougent vite : TTL = jours restants x per_day_s,
+    borné entre min_s et max_s.
+    """
+    days = (date.fromisoformat(segment_dates[0]) - today).days
+    return min(max_s, max(min_s, days * per_day_s))
+
+
+class WatchService:
+    """Rejoue les watches échues en ne recrawlant que les prix expirés.
+
+    Chaque exécution compare les nouveaux prix aux précédents et émet des
+    événements de variation (flux de polling + webhook optionnel) : le coût d'une
+    watch suit le renouvellement des données, pas le nombre de combinaisons.
+    """
+
+    def __init__(
+        self,
+        combination_generator: CombinationGenerator,
+        *,
+        max_watches: int,
+        max_events: int,
+        ttl_min_s: float,
+        ttl_max_s: float,
+        ttl_per_day_s: float,
+        min_price_change: float,
+        webhook_timeout_s: float = 10.0,
+        admission_controller: AdmissionController | None = None,
+        http_client: httpx.AsyncClient | None = None,
+    ) -> None:
+        """Initialise service avec limites, TTL et client HTTP des webhooks."""
+        self._combination_generator = combination_generator
+        self._max_watches = max_watches
+        self._max_events = max_events
+        self._ttl_min_s = ttl_min_s
+        self._ttl_max_s = ttl_max_s
+        self._ttl_per_day_s = ttl_per_day_s
+        self._min_price_change = min_price_change
+        self._admission_controller = admission_controller
+        self._http_client = http_client or httpx.AsyncClient(timeout=webhook_timeout_s)
+        self._watches: dict[str, Watch] = {}
+
+    def create(self, request: WatchRequest) -> Watch:
+        """Enregistre une watch, exécutée au prochain passage du scheduler."""
+        if len(self._watches) >= self._max_watches:
+            raise WatchLimitReachedError(self._max_watches)
+        watch = Watch(
+            watch_id=secrets.token_hex(8),
+            request=request,
+            next_run_at=time.time(),
+            max_events=self._max_events,
+        )
+        self._watches[watch.watch_id] = watch
+        logger.info(
+            "Watch created",
+            extra={"watch_id": watch.watch_id, "interval_s": request.interval_s},
+        )
+        return watch
+
+    def get(self, watch_id: str) -> Watch | None:
+        """Retourne la watch ou None si inconnue."""
+        return self._watches.get(watch_id)
+
+    def delete(self, watch_id: str) -> bool:
+        """Supprime la watch, retourne False si inconnue."""
+        return self._watches.pop(watch_id, None) is not None
+
+    def status(self, watch: Watch) -> WatchStatus:
+        """Construit l'état exposé par l'API."""
+        return WatchStatus(
+            watch_id=watch.watch_id,
+            search=watch.request.search,
+            webhook_url=watch.request.webhook_url,
+            interval_s=watch.request.interval_s,
+            runs=watch.runs,
+            last_run_at=watch.last_run_at,
+            next_run_at=watch.next_run_at,
+            combinations_tracked=len(watch.prices),
+            last_run_recrawled=watch.last_run_recrawled,
+            last_run_reused=watch.last_run_reused,
+        )
+
+    def events_after(self, watch: Watch, after: int) -> list[PriceChangeEvent]:
+        """Événements du flux de numéro strictement supérieur à `after`."""
+        return [event for event in watch.events if event.seq > after]
+
+    async def run(
+        self, watch: Watch, search_service: SearchService
+    ) -> list[PriceChangeEvent]:
+        """Exécute la watch : re-crawl des prix expirés, diff puis notification."""
+        now = time.time()
+        today = date.today()
+        search = watch.request.search
+        combinations = [
+            combo
+            for combo in self._combination_generator.generate_combinations(
+                search.segments_date_ranges, search.constraints
+            )
+            if date.fromisoformat(combo.segment_dates[0]) >= today
+        ]
+        if not combinations:
+            self._watches.pop(watch.watch_id, None)
+            logger.info(
+                "Watch retired (all dates past)", extra={"watch_id": watch.watch_id}
+            )
+            return []
+        live_keys = {tuple(combo.segment_dates) for combo in combinations}
+        watch.prices = {k: v for k, v in watch.prices.items() if k in live_keys}
+
+        expired = [
+            combo
+            for combo in combinations
+            if self._is_expired(
+                watch.prices.get(tuple(combo.segment_dates)), combo, now
+            )
+        ]
+        if self._admission_controller is None:
+            results = await search_service.crawl_combinations(search, expired)
+        else:
+            async with self._admission_controller.reserve(len(expired)):
+                results = await search_service.crawl_combinations(search, expired)
+
+        events: list[PriceChangeEvent] = []
+        for result in results:
+            key = tuple(result.date_combination.segment_dates)
+            price = result.best_flight.price
+            observed_at = result.observed_at if result.observed_at is not None else now
+            previous = watch.prices.get(key)
+            watch.prices[key] = TrackedPrice(price=price, observed_at=observed_at)
+            if previous is None:
+                continue
+            if abs(price - previous.price) < max(self._min_price_change, 1e-9):
+                continue
+            events.append(
+                PriceChangeEvent(
+                    seq=watch.next_seq,
+                    watch_id=watch.watch_id,
+                    kind="price_drop" if price < previous.price else "price_rise",
+                    segment_dates=list(key),
+                    previous_price=previous.price,
+                    price=price,
+                    observed_at=observed_at,
+                )
+            )
+            watch.next_seq += 1
+
+        watch.events.extend(events)
+        watch.runs += 1
+        watch.last_run_at = now
+        watch.last_run_recrawled = len(expired)
+        watch.last_run_reused = len(combinations) - len(expired)
+        watch.next_run_at = now + watch.request.interval_s
+        logger.info(
+            "Watch run completed",
+            extra={
+                "watch_id": watch.watch_id,
+                "combinations_total": len(combinations),
+                "recrawled": watch.last_run_recrawled,
+                "reused": watch.last_run_reused,
+                "events": len(events),
+            },
+        )
+
+        if events and watch.request.webhook_url is not None:
+            await self._notify(watch, events)
+        return events
+
+    async def run_due(self, search_service: SearchService) -> int:
+        """Exécute séquentiellement les watches échues, retourne leur nombre."""
+        now = time.time()
+        due = [w for w in list(self._watches.values()) if w.next_run_at <= now]
+        ran = 0
+        for watch in due:
+            if watch.watch_id not in self._watches:
+                continue
+            try:
+                await self.run(watch, search_service)
+            except AdmissionRejectedError as e:
+                watch.next_run_at = time.time() + e.retry_after_s
+                logger.info(
+                    "Watch run postponed by admission control",
+                    extra={
+                        "watch_id": watch.watch_id,
+                        "retry_after_s": e.retry_after_s,
+                    },
+                )
+                continue
+            ran += 1
+        return ran
+
+    async def run_scheduler(
+        self, search_service: SearchService, *, poll_interval_s: float
+    ) -> None:
+        """Boucle d'exécution des watches (tâche de fond du lifespan)."""
+        while True:
+            try:
+                await self.run_due(search_service)
+            except Exception:
+                logger.exception("Watch scheduler iteration failed")
+            await asyncio.sleep(poll_interval_s)
+
+    async def close(self) -> None:
+        """Ferme le client HTTP des webhooks."""
+        await self._http_client.aclose()
+
+    def _is_expired(
+        self, tracked: TrackedPrice | None, combo: DateCombination, now: float
+    ) -> bool:
+        """Prix inconnu ou plus ancien que son TTL de départ."""
+        if tracked is None:
+            return True
+        ttl_s = departure_ttl_s(
+            combo.segment_dates,
+            today=date.today(),
+            min_s=self._ttl_min_s,
+            max_s=self._ttl_max_s,
+            per_day_s=self._ttl_per_day_s,
+        )
+        return now - tracked.observed_at >= ttl_s
+
+    async def _notify(self, watch: Watch, events: list[PriceChangeEvent]) -> None:
+        """POST des événements vers le webhook (échec journalisé, flux conservé).
+
+        L'hôte est résolu avant l'envoi : un nom public pointant vers une
+        adresse interne (SSRF, DNS rebinding) est refusé.
+        """
+        webhook_url = watch.request.webhook_url
+        if webhook_url is None:
+            return
+        if not await self._resolves_public(webhook_url):
+            logger.warning(
+                "Watch webhook host rejected",
+                extra={"watch_id": watch.watch_id, "host": webhook_url.host},
+            )
+            return
+        url = str(webhook_url)
+        payload = {
+            "watch_id": watch.watch_id,
+            "events": [event.model_dump() for event in events],
+        }
+        try:
+            response = await self._http_client.post(url, json=payload)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.warning(
+                "Watch webhook delivery failed",
+                extra={"watch_id": watch.watch_id, "error": str(e)},
+            )
+
+    async def _resolves_public(self, url: HttpUrl) -> bool:
+        """Toutes les adresses résolues de l'hôte sont publiques."""
+        try:
+            addresses = await resolve_host(url.host or "", url.port or 443)
+        except OSError:
+            return False
+        return bool(addresses) and all(is_public_address(a) for a in addresses)
+
+
+@lru_cache
+def get_watch_service() -> WatchService:
+    """Retourne instance WatchService partagée (singleton via lru_cache)."""
+    settings = get_settings()
+    return WatchService(
+        CombinationGenerator(),
+        max_watches=settings.WATCH_MAX_WATCHES,
+        max_events=settings.WATCH_MAX_EVENTS,
+        ttl_min_s=settings.WATCH_TTL_MIN_S,
+        ttl_max_s=settings.WATCH_TTL_MAX_S,
+        ttl_per_day_s=settings.WATCH_TTL_PER_DAY_S,
+        min_price_change=settings.WATCH_MIN_PRICE_CHANGE,
+        webhook_timeout_s=settings.WATCH_WEBHOOK_TIMEOUT_S,
+        admission_controller=get_admission_controller(),
+    )
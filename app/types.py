@@ -11,11 +11,8 @@ if TYPE_CHECKING:
     from tenacity.stop import StopBaseT
     from tenacity.wait import WaitBaseT
 
-    from app.models.request import DateCombination
-    from app.services.crawler_service import CrawlResult
 
-
-type CrawlResultTuple = tuple[DateCombination, CrawlResult | None]
+type RespValue = bytes | int | str | list[RespValue] | None
 
 
 class TenacityRetryConfig(TypedDict):
@@ -8,12 +8,21 @@ from app.utils.browser_fingerprint import (
 )
 from app.utils.google_flights_url import (
     GoogleFlightsUrlError,
+    build_route_key,
     generate_google_flights_url,
 )
+from app.utils.metrics import Counter, Gauge, Histogram, MetricsRegistry
+from app.utils.rolling_window import RollingWindow
 
 __all__ = [
+    "Counter",
+    "Gauge",
     "GoogleFlightsUrlError",
+    "Histogram",
+    "MetricsRegistry",
+    "RollingWindow",
     "build_browser_config_from_fingerprint",
+    "build_route_key",
     "generate_google_flights_url",
     "get_base_browser_config",
     "get_static_headers",
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import base64
 import binascii
+import hashlib
 import re
 from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
 
@@ -65,3 +66,23 @@ def generate_google_flights_url(template_url: str, new_dates: list[str]) -> str:
     )
 
     return new_url
+
+
+def build_route_key(template_url: str) -> str:
+    """
+    Construit une clé d'itinéraire stable (dates neutralisées dans tfs) pour l'URL.
+    """
+    parsed = urlparse(template_url)
+    tfs_values = parse_qs(parsed.query).get("tfs")
+    if not tfs_values:
+        msg = "Paramètre 'tfs' manquant dans l'URL template"
+        raise GoogleFlightsUrlError(msg)
+
+    try:
+        tfs_decoded = base64.urlsafe_b64decode(tfs_values[0] + "==")
+    except (ValueError, TypeError, binascii.Error) as e:
+        msg = f"Erreur décodage base64 du paramètre tfs: {e}"
+        raise GoogleFlightsUrlError(msg) from e
+
+    route = re.sub(rb"20\d{2}-\d{2}-\d{2}", b"0000-00-00", tfs_decoded)
+    return hashlib.sha256(route).hexdigest()[:16]
@@ -0,0 +1,219 @@
+"""Métriques en mémoire (compteurs, jauges, histogrammes) au format Prometheus."""
+
+from __future__ import annotations
+
+import math
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import ClassVar
+
+type LabelValues = tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    """Valeur au format texte Prometheus (+Inf, entiers sans décimales)."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    """Échappe une valeur de label (antislash, guillemet, saut de ligne)."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """Bloc {name="value",...} (vide sans label)."""
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)
+    )
+    return "{" + pairs + "}"
+
+
+class Metric(ABC):
+    """Métrique nommée avec labels positionnels (ordre de labelnames)."""
+
+    type_name: ClassVar[str]
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str]) -> None:
+        """Initialise métrique sans série."""
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+
+    @abstractmethod
+    def samples(self) -> list[str]:
+        """Lignes d'échantillons de la métrique."""
+
+    def render(self) -> list[str]:
+        """Lignes HELP, TYPE et échantillons."""
+        return [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} {self.type_name}",
+            *self.samples(),
+        ]
+
+
+class _ScalarMetric(Metric):
+    """Une valeur par combinaison de labels (base des compteurs et jauges)."""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str]) -> None:
+        """Initialise métrique sans série."""
+        super().__init__(name, help_text, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def value(self, *labels: str) -> float:
+        """Valeur courante de la série (0 si absente)."""
+        return self._values.get(labels, 0.0)
+
+    def samples(self) -> list[str]:
+        """Une ligne par série."""
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} "
+            f"{_format_value(value)}"
+            for labels, value in sorted(self._values.items())
+        ]
+
+
+class Counter(_ScalarMetric):
+    """Compteur monotone par combinaison de labels."""
+
+    type_name = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        """Incrémente la série des labels donnés (ValueError si amount < 0)."""
+        if amount < 0:
+            raise ValueError(f"Counter {self.name} cannot decrease")
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+
+class Gauge(_ScalarMetric):
+    """Valeur instantanée pouvant monter et descendre."""
+
+    type_name = "gauge"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        """Augmente la série des labels donnés."""
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        """Diminue la série des labels donnés."""
+        self._values[labels] = self._values.get(labels, 0.0) - amount
+
+    def set(self, value: float, *labels: str) -> None:
+        """Fixe la valeur de la série."""
+        self._values[labels] = value
+
+    def clear(self) -> None:
+        """Supprime toutes les séries (jauges recalculées à chaque collecte)."""
+        self._values.clear()
+
+
+@dataclass
+class _HistogramSeries:
+    """Comptes par bucket (non cumulés), somme et nombre d'observations."""
+
+    counts: list[int]
+    sum: float = 0.0
+    count: int = 0
+
+
+class Histogram(Metric):
+    """Histogramme à buckets fixes (bornes supérieures inclusives, le)."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str],
+        buckets: Sequence[float],
+    ) -> None:
+        """Initialise histogramme avec bornes triées (+Inf ajouté)."""
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[LabelValues, _HistogramSeries] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Ajoute une observation à la série des labels donnés."""
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = _HistogramSeries(
+                counts=[0] * (len(self.buckets) + 1)
+            )
+        series.counts[bisect_left(self.buckets, value)] += 1
+        series.sum += value
+        series.count += 1
+
+    def count(self, *labels: str) -> int:
+        """Nombre d'observations de la série (0 si absente)."""
+        series = self._series.get(labels)
+        return 0 if series is None else series.count
+
+    def samples(self) -> list[str]:
+        """Buckets cumulés, somme et nombre par série."""
+        names = (*self.labelnames, "le")
+        bounds = [_format_value(b) for b in (*self.buckets, math.inf)]
+        lines: list[str] = []
+        for labels, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(bounds, series.counts, strict=True):
+                cumulative += bucket_count
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(names, (*labels, bound))} "
+                    f"{cumulative}"
+                )
+            suffix = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{suffix} {_format_value(series.sum)}")
+            lines.append(f"{self.name}_count{suffix} {series.count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Ensemble de métriques rendu au format texte d'exposition Prometheus."""
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self) -> None:
+        """Initialise registre vide."""
+        self._metrics: dict[str, Metric] = {}
+
+    def counter(
+        self, name: str, help_text: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        """Déclare un compteur."""
+        return self._register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Déclare une jauge."""
+        return self._register(Gauge(name, help_text, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        *,
+        buckets: Sequence[float],
+    ) -> Histogram:
+        """Déclare un histogramme."""
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def render(self) -> str:
+        """Texte d'exposition de toutes les métriques."""
+        lines = [line for metric in self._metrics.values() for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+    def _register[M: Metric](self, metric: M) -> M:
+        """Ajoute la métrique (nom unique)."""
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
@@ -0,0 +1,147 @@
+"""Client asynchrone minimal pour le protocole Redis (RESP2)."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from urllib.parse import urlparse
+
+from app.types import RespValue
+
+
+class RespError(Exception):
+    """Erreur renvoyée par le serveur (réponse RESP '-ERR ...')."""
+
+
+class RespClient:
+    """Client RESP2 mono-connexion (GET/SET/DEL/PING) sans dépendance externe."""
+
+    def __init__(self, url: str, *, timeout_s: float = 1.0) -> None:
+        """Initialise client depuis URL redis://[:password@]host:port[/db]."""
+        parsed = urlparse(url)
+        if parsed.scheme != "redis":
+            raise ValueError(f"Unsupported URL scheme for RESP client: {url}")
+        self._host = parsed.hostname or "localhost"
+        self._port = parsed.port or 6379
+        self._password = parsed.password
+        self._db = int(parsed.path.lstrip("/") or 0)
+        self._timeout_s = timeout_s
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._lock = asyncio.Lock()
+
+    async def execute(self, *args: str | bytes | int | float) -> RespValue:
+        """Envoie une commande et retourne la réponse décodée."""
+        async with self._lock:
+            try:
+                return await asyncio.wait_for(
+                    self._execute_unlocked(*args), timeout=self._timeout_s
+                )
+            except RespError:
+                raise
+            except BaseException:
+                await self._close_unlocked()
+                raise
+
+    async def get(self, key: str) -> bytes | None:
+        """Commande GET."""
+        value = await self.execute("GET", key)
+        return value if isinstance(value, bytes) else None
+
+    async def set(
+        self,
+        key: str,
+        value: str | bytes,
+        *,
+        px: int | None = None,
+        nx: bool = False,
+    ) -> bool:
+        """Commande SET avec expiration PX et condition NX optionnelles."""
+        args: list[str | bytes | int] = ["SET", key, value]
+        if px is not None:
+            args.extend(["PX", px])
+        if nx:
+            args.append("NX")
+        return await self.execute(*args) == "OK"
+
+    async def delete(self, *keys: str) -> int:
+        """Commande DEL, retourne nombre de clés supprimées."""
+        deleted = await self.execute("DEL", *keys)
+        return deleted if isinstance(deleted, int) else 0
+
+    async def ping(self) -> bool:
+        """Commande PING."""
+        return await self.execute("PING") == "PONG"
+
+    async def close(self) -> None:
+        """Ferme la connexion courante."""
+        async with self._lock:
+            await self._close_unlocked()
+
+    async def _execute_unlocked(self, *args: str | bytes | int | float) -> RespValue:
+        """Exécute une commande (lock déjà acquis), connexion lazy."""
+        if self._reader is None or self._writer is None:
+            self._reader, self._writer = await self._connect()
+        self._writer.write(self._encode_command(args))
+        await self._writer.drain()
+        return await self._read_reply(self._reader)
+
+    async def _connect(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        """Ouvre la connexion TCP puis AUTH/SELECT si nécessaires."""
+        reader, writer = await asyncio.open_connection(self._host, self._port)
+        if self._password:
+            writer.write(self._encode_command(("AUTH", self._password)))
+            await writer.drain()
+            await self._read_reply(reader)
+        if self._db:
+            writer.write(self._encode_command(("SELECT", self._db)))
+            await writer.drain()
+            await self._read_reply(reader)
+        return reader, writer
+
+    async def _close_unlocked(self) -> None:
+        """Ferme la connexion sans acquérir le lock."""
+        writer = self._writer
+        self._reader = None
+        self._writer = None
+        if writer is not None:
+            writer.close()
+            with contextlib.suppress(OSError, ConnectionError):
+                await writer.wait_closed()
+
+    @staticmethod
+    def _encode_command(args: tuple[str | bytes | int | float, ...]) -> bytes:
+        """Encode une commande en tableau RESP de bulk strings."""
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(f"${len(data)}\r\n".encode() + data + b"\r\n")
+        return b"".join(parts)
+
+    @classmethod
+    async def _read_reply(cls, reader: asyncio.StreamReader) -> RespValue:
+        """Lit et décode une réponse RESP2."""
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by RESP server")
+        prefix, payload = line[:1], line[1:-2]
+
+        if prefix == b"+":
+            return payload.decode()
+        if prefix == b"-":
+            raise RespError(payload.decode())
+        if prefix == b":":
+            return int(payload)
+        if prefix == b"$":
+            length = int(payload)
+            if length == -1:
+                return None
+            data = await reader.readexactly(length + 2)
+            return data[:-2]
+        if prefix == b"*":
+            count = int(payload)
+            if count == -1:
+                return None
+            return [await cls._read_reply(reader) for _ in range(count)]
+
+        raise RespError(f"Unexpected RESP reply prefix: {prefix!r}")
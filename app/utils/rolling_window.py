@@ -0,0 +1,36 @@
+"""Fenêtre glissante de mesures (moyenne, percentiles)."""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+
+
+class RollingWindow:
+    """Conserve les N dernières valeurs observées."""
+
+    def __init__(self, size: int) -> None:
+        """Initialise fenêtre de taille fixe."""
+        self._values: deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        """Nombre de valeurs dans la fenêtre."""
+        return len(self._values)
+
+    def add(self, value: float) -> None:
+        """Ajoute une valeur (évince la plus ancienne si pleine)."""
+        self._values.append(value)
+
+    def mean(self) -> float | None:
+        """Moyenne des valeurs (None si vide)."""
+        if not self._values:
+            return None
+        return sum(self._values) / len(self._values)
+
+    def percentile(self, q: float) -> float | None:
+        """Percentile q (0-100) par rang le plus proche (None si vide)."""
+        if not self._values:
+            return None
+        ordered = sorted(self._values)
+        rank = max(1, math.ceil(q / 100 * len(ordered)))
+        return ordered[min(rank, len(ordered)) - 1]
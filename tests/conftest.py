@@ -6,12 +6,25 @@ from fastapi.testclient import TestClient
 from app.api.routes import get_search_service
 from app.core import Settings, get_logger, get_settings, setup_logger
 from app.main import app
+from app.services import (
+    AdmissionController,
+    CrawlStats,
+    PipelineMetrics,
+    ResponseCache,
+    ResultCache,
+    get_admission_controller,
+    get_crawl_stats,
+    get_pipeline_metrics,
+    get_response_cache,
+    get_result_cache,
+)
 
 # Load fixtures modules
 pytest_plugins = [
     "tests.fixtures.factories",
     "tests.fixtures.mocks",
     "tests.fixtures.helpers",
+    "tests.fixtures.resp_server",
 ]
 
 
@@ -25,8 +38,53 @@ def test_settings() -> Settings:
     )
 
 
+@pytest.fixture
+def response_cache() -> ResponseCache:
+    """ResponseCache isolé par test (fenêtres 60s fraîche / 300s stale)."""
+    return ResponseCache(fresh_s=60, stale_s=300)
+
+
+@pytest.fixture
+def result_cache() -> ResultCache:
+    """ResultCache local isolé par test (TTL 60s)."""
+    return ResultCache(ttl_s=60)
+
+
+@pytest.fixture
+def crawl_stats() -> CrawlStats:
+    """CrawlStats isolé par test (latence 1s, page 100 ko par défaut)."""
+    return CrawlStats(default_latency_s=1.0, default_size_bytes=100_000)
+
+
+@pytest.fixture
+def pipeline_metrics() -> PipelineMetrics:
+    """PipelineMetrics isolé par test."""
+    return PipelineMetrics()
+
+
+@pytest.fixture
+def admission_controller(crawl_stats: CrawlStats) -> AdmissionController:
+    """AdmissionController isolé par test (capacité 10)."""
+    return AdmissionController(
+        crawl_stats,
+        capacity=10,
+        max_completion_s=120.0,
+        interactive_max_crawls=30,
+        interactive_reserve=0.2,
+        max_inflight_crawls=5000,
+        progressive_budget=200,
+    )
+
+
 @pytest.fixture(scope="function")
-def client(test_settings: Settings) -> TestClient:
+def client(
+    test_settings: Settings,
+    response_cache: ResponseCache,
+    admission_controller: AdmissionController,
+    crawl_stats: CrawlStats,
+    result_cache: ResultCache,
+    pipeline_metrics: PipelineMetrics,
+) -> TestClient:
     """TestClient FastAPI avec Settings + Logger override + cache clear."""
     get_settings.cache_clear()
     get_logger.cache_clear()
@@ -35,6 +93,11 @@ def client(test_settings: Settings) -> TestClient:
 
     app.dependency_overrides[get_settings] = lambda: test_settings
     app.dependency_overrides[get_logger] = lambda: test_logger
+    app.dependency_overrides[get_response_cache] = lambda: response_cache
+    app.dependency_overrides[get_admission_controller] = lambda: admission_controller
+    app.dependency_overrides[get_crawl_stats] = lambda: crawl_stats
+    app.dependency_overrides[get_result_cache] = lambda: result_cache
+    app.dependency_overrides[get_pipeline_metrics] = lambda: pipeline_metrics
 
     yield TestClient(app)
 
@@ -44,7 +107,15 @@ def client(test_settings: Settings) -> TestClient:
 
 
 @pytest.fixture
-def client_with_mock_search(test_settings: Settings, mock_search_service):
+def client_with_mock_search(
+    test_settings: Settings,
+    mock_search_service,
+    response_cache: ResponseCache,
+    admission_controller: AdmissionController,
+    crawl_stats: CrawlStats,
+    result_cache: ResultCache,
+    pipeline_metrics: PipelineMetrics,
+):
     """TestClient avec mock SearchService."""
     get_settings.cache_clear()
     get_logger.cache_clear()
@@ -54,6 +125,11 @@ def client_with_mock_search(test_settings: Settings, mock_search_service):
     app.dependency_overrides[get_settings] = lambda: test_settings
     app.dependency_overrides[get_logger] = lambda: test_logger
     app.dependency_overrides[get_search_service] = lambda: mock_search_service
+    app.dependency_overrides[get_response_cache] = lambda: response_cache
+    app.dependency_overrides[get_admission_controller] = lambda: admission_controller
+    app.dependency_overrides[get_crawl_stats] = lambda: crawl_stats
+    app.dependency_overrides[get_result_cache] = lambda: result_cache
+    app.dependency_overrides[get_pipeline_metrics] = lambda: pipeline_metrics
 
     yield TestClient(app)
 
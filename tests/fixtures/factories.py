@@ -213,3 +213,22 @@ def google_flights_html_factory():
         return flights_html
 
     return _create
+
+
+@pytest.fixture
+def google_flights_calendar_html_factory():
+    """Factory pour générer HTML grille de prix Google Flights (data-iso)."""
+
+    def _create(prices):
+        """Génère HTML calendrier depuis dict {date ISO: prix | None}."""
+        cells_html = ""
+        for iso_date, price in prices.items():
+            price_html = f"<span>{int(price)} €</span>" if price is not None else ""
+            cells_html += f"""
+        <div role="gridcell" data-iso="{iso_date}">
+            <div aria-label="{iso_date}">{iso_date[-2:]}</div>{price_html}
+        </div>
+        """
+        return f"<html><body><div role='grid'>{cells_html}</div></body></html>"
+
+    return _create
@@ -5,6 +5,8 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
 from app.models import (
+    BatchSearchResponse,
+    BatchStats,
     DateCombination,
     FlightCombinationResult,
     ProxyConfig,
@@ -25,6 +27,7 @@ def mock_async_web_crawler():
             mock_crawler.arun.side_effect = side_effect
         elif mock_result:
             mock_crawler.arun.return_value = mock_result
+        mock_crawler.crawler_strategy = MagicMock()
         mock_crawler.__aenter__ = AsyncMock(return_value=mock_crawler)
         mock_crawler.__aexit__ = AsyncMock(return_value=None)
         return mock_crawler
@@ -83,7 +86,7 @@ def mock_search_service(flight_dto_factory):
     service = MagicMock()
     start_date = get_future_date(1)
 
-    async def mock_search(request):
+    async def mock_search(request, interactive=True):
         results = [
             FlightCombinationResult(
                 segment_dates=[
@@ -115,7 +118,20 @@ def mock_search_service(flight_dto_factory):
             ),
         )
 
+    async def mock_search_batch(requests, interactive=False):
+        responses = [await mock_search(request) for request in requests]
+        return BatchSearchResponse(
+            responses=responses,
+            batch_stats=BatchStats(
+                requests_count=len(requests),
+                urls_total=len(requests) * 10,
+                urls_unique=10,
+                search_time_ms=100,
+            ),
+        )
+
     service.search_flights = mock_search
+    service.search_batch = mock_search_batch
     return service
 
 
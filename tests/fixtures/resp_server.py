@@ -0,0 +1,105 @@
+"""Serveur RESP in-process (stand-in Redis) pour tests du cache partagé."""
+
+import asyncio
+import time
+
+import pytest
+
+
+class InProcessRespServer:
+    """Sous-ensemble Redis en mémoire : PING, GET, SET [PX|EX] [NX], DEL, EXISTS."""
+
+    def __init__(self) -> None:
+        self._data: dict[bytes, tuple[bytes, float | None]] = {}
+        self._server: asyncio.Server | None = None
+        self._writers: set[asyncio.StreamWriter] = set()
+        self.commands: list[bytes] = []
+        self.port = 0
+
+    @property
+    def url(self) -> str:
+        return f"redis://127.0.0.1:{self.port}/0"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._writers):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def get_value(self, key: str) -> bytes | None:
+        item = self._data.get(key.encode())
+        if item is None or (item[1] is not None and item[1] <= time.monotonic()):
+            return None
+        return item[0]
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self._writers.add(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                count = int(line[1:-2])
+                args = []
+                for _ in range(count):
+                    length = int((await reader.readline())[1:-2])
+                    args.append((await reader.readexactly(length + 2))[:-2])
+                writer.write(self._dispatch(args))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    def _dispatch(self, args: list[bytes]) -> bytes:
+        command = args[0].upper()
+        self.commands.append(command)
+        if command == b"PING":
+            return b"+PONG\r\n"
+        if command == b"SELECT":
+            return b"+OK\r\n"
+        if command == b"GET":
+            value = self.get_value(args[1].decode())
+            if value is None:
+                return b"$-1\r\n"
+            return f"${len(value)}\r\n".encode() + value + b"\r\n"
+        if command == b"SET":
+            return self._set(args[1], args[2], [a.upper() for a in args[3:]], args[3:])
+        if command in (b"DEL", b"EXISTS"):
+            found = [k for k in args[1:] if self.get_value(k.decode()) is not None]
+            if command == b"DEL":
+                for key in found:
+                    del self._data[key]
+            return f":{len(found)}\r\n".encode()
+        return b"-ERR unknown command\r\n"
+
+    def _set(
+        self, key: bytes, value: bytes, options: list[bytes], raw: list[bytes]
+    ) -> bytes:
+        expires_at: float | None = None
+        if b"PX" in options:
+            expires_at = time.monotonic() + int(raw[options.index(b"PX") + 1]) / 1000
+        if b"EX" in options:
+            expires_at = time.monotonic() + int(raw[options.index(b"EX") + 1])
+        if b"NX" in options and self.get_value(key.decode()) is not None:
+            return b"$-1\r\n"
+        self._data[key] = (value, expires_at)
+        return b"+OK\r\n"
+
+
+@pytest.fixture
+async def resp_server():
+    """Serveur RESP in-process démarré sur un port libre."""
+    server = InProcessRespServer()
+    await server.start()
+    yield server
+    await server.stop()
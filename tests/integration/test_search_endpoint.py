@@ -1,7 +1,26 @@
 """Tests integration endpoint search."""
 
+from unittest.mock import MagicMock
+
+import pytest
 from fastapi.testclient import TestClient
+from pydantic import SecretStr
 
+from app.core import Settings, get_settings
+from app.main import app
+from app.services import (
+    CombinationGenerator,
+    CrawlStats,
+    CrawlTimings,
+    PipelineMetrics,
+    Prefetcher,
+    ResultCache,
+    SearchProfiler,
+    TraceStore,
+    get_prefetcher,
+    get_search_profiler,
+    get_trace_store,
+)
 from tests.fixtures.helpers import (
     SEARCH_FLIGHTS_ENDPOINT,
     TEMPLATE_URL,
@@ -121,3 +140,300 @@ def test_end_to_end_openapi_schema_includes_endpoint(
     post_spec = endpoint["post"]
     assert "requestBody" in post_spec
     assert "responses" in post_spec
+
+
+def test_end_to_end_repeated_request_served_from_response_cache(
+    client_with_mock_search: TestClient, search_request_factory
+) -> None:
+    """Requete identique renvoyee depuis le cache avec headers de fraicheur."""
+    request_data = search_request_factory(as_dict=True)
+
+    first = client_with_mock_search.post(SEARCH_FLIGHTS_ENDPOINT, json=request_data)
+    second = client_with_mock_search.post(SEARCH_FLIGHTS_ENDPOINT, json=request_data)
+
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.headers["Age"] == "0"
+    assert "stale-while-revalidate=300" in second.headers["Cache-Control"]
+    assert second.json() == first.json()
+
+
+def test_end_to_end_idempotency_key_reused_with_other_body_returns_422(
+    client_with_mock_search: TestClient, search_request_factory
+) -> None:
+    """Idempotency-Key reutilisee avec un autre body retourne 422."""
+    headers = {"Idempotency-Key": "partner-42"}
+    client_with_mock_search.post(
+        SEARCH_FLIGHTS_ENDPOINT,
+        json=search_request_factory(as_dict=True),
+        headers=headers,
+    )
+
+    response = client_with_mock_search.post(
+        SEARCH_FLIGHTS_ENDPOINT,
+        json=search_request_factory(days_segment1=4, as_dict=True),
+        headers=headers,
+    )
+
+    assert response.status_code == 422
+
+
+def test_end_to_end_overloaded_fleet_returns_429_with_retry_after(
+    client_with_mock_search: TestClient, admission_controller, search_request_factory
+) -> None:
+    """Flotte saturee : 429 + Retry-After, recherche non lancee."""
+    admission_controller.inflight_searches = 1
+    admission_controller.inflight_crawls = 1200
+
+    response = client_with_mock_search.post(
+        SEARCH_FLIGHTS_ENDPOINT, json=search_request_factory(as_dict=True)
+    )
+
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_end_to_end_estimate_returns_eta_without_crawling(
+    client_with_mock_search: TestClient, search_request_factory
+) -> None:
+    """Endpoint estimate : ETA, crawls et volume attendus depuis stats live."""
+    response = client_with_mock_search.post(
+        f"{SEARCH_FLIGHTS_ENDPOINT}/estimate",
+        json=search_request_factory(days_segment1=4, days_segment2=3, as_dict=True),
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["combinations_total"] == 20
+    assert data["expected_crawls"] == 20
+    assert data["expected_bytes"] == 20 * 100_000
+    assert data["eta_s"] == 2.0
+
+
+def test_end_to_end_estimate_validates_request(
+    client_with_mock_search: TestClient,
+) -> None:
+    """Endpoint estimate : requete invalide retourne 422."""
+    response = client_with_mock_search.post(
+        f"{SEARCH_FLIGHTS_ENDPOINT}/estimate",
+        json={"template_url": TEMPLATE_URL, "segments_date_ranges": []},
+    )
+
+    assert response.status_code == 422
+
+
+def test_end_to_end_batch_search_returns_one_response_per_request(
+    client_with_mock_search: TestClient, search_request_factory
+) -> None:
+    """Endpoint batch : une SearchResponse par requete, stats du plan commun."""
+    requests = [
+        search_request_factory(as_dict=True),
+        search_request_factory(days_segment1=3, as_dict=True),
+    ]
+
+    response = client_with_mock_search.post(
+        f"{SEARCH_FLIGHTS_ENDPOINT}/batch", json={"requests": requests}
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["responses"]) == 2
+    assert data["batch_stats"]["requests_count"] == 2
+
+
+def test_end_to_end_batch_search_rejects_non_exhaustive_mode(
+    client_with_mock_search: TestClient, search_request_factory
+) -> None:
+    """Endpoint batch : mode autre qu'exhaustive ou lot vide retourne 422."""
+    request = search_request_factory(as_dict=True) | {"mode": "calendar"}
+
+    response = client_with_mock_search.post(
+        f"{SEARCH_FLIGHTS_ENDPOINT}/batch", json={"requests": [request]}
+    )
+    empty = client_with_mock_search.post(
+        f"{SEARCH_FLIGHTS_ENDPOINT}/batch", json={"requests": []}
+    )
+
+    assert response.status_code == 422
+    assert empty.status_code == 422
+
+
+def test_prefetch_stats_endpoint_counts_searched_routes(
+    client_with_mock_search: TestClient, search_request_factory
+) -> None:
+    """Recherche comptabilisee dans la popularite des itineraires."""
+    prefetcher = Prefetcher(
+        CombinationGenerator(),
+        ResultCache(ttl_s=60),
+        MagicMock(),
+        CrawlStats(default_latency_s=1.0),
+        top_routes=5,
+        daily_crawl_budget=100,
+        daily_bytes_budget=10**9,
+    )
+    app.dependency_overrides[get_prefetcher] = lambda: prefetcher
+
+    client_with_mock_search.post(
+        SEARCH_FLIGHTS_ENDPOINT, json=search_request_factory(as_dict=True)
+    )
+    response = client_with_mock_search.get("/api/v1/prefetch/stats")
+
+    assert response.status_code == 200
+    assert response.json()["routes_tracked"] == 1
+    assert response.json()["crawl_budget"] == 100
+
+
+def test_hedging_stats_endpoint(client: TestClient, crawl_stats: CrawlStats) -> None:
+    """Taux de doublons et de victoires calcules sur les crawls partages."""
+    for _ in range(20):
+        crawl_stats.record(2.0, size_bytes=1000)
+    assert crawl_stats.try_hedge(0.1)
+    crawl_stats.record_hedge_win()
+
+    response = client.get("/api/v1/hedging/stats")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "crawls": 20,
+        "hedges": 1,
+        "hedge_rate": 0.05,
+        "hedge_wins": 1,
+        "win_rate": 1.0,
+        "hedge_after_s": 2.0,
+    }
+
+
+def test_crawl_timings_endpoint(client: TestClient, crawl_stats: CrawlStats) -> None:
+    """Decomposition moyenne des derniers crawls reussis."""
+    crawl_stats.record_timings(CrawlTimings(navigation_s=2.0, parse_s=0.1, bytes=100))
+    crawl_stats.record_timings(CrawlTimings(navigation_s=4.0, parse_s=0.3, bytes=300))
+
+    response = client.get("/api/v1/crawls/timings")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["crawls"] == 2
+    assert data["navigation_s"] == 3.0
+    assert data["parse_s"] == 0.2
+    assert data["bytes_total"] == 400
+
+
+def test_metrics_endpoint_prometheus_text(
+    client_with_mock_search: TestClient,
+    pipeline_metrics: PipelineMetrics,
+    search_request_factory,
+) -> None:
+    """Format texte Prometheus, hit du cache de reponses compte."""
+    request_data = search_request_factory(
+        days_segment1=2, days_segment2=2, as_dict=True
+    )
+    client_with_mock_search.post(SEARCH_FLIGHTS_ENDPOINT, json=request_data)
+    client_with_mock_search.post(SEARCH_FLIGHTS_ENDPOINT, json=request_data)
+    pipeline_metrics.crawl_duration.observe(4.2, "success")
+
+    response = client_with_mock_search.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE flight_crawl_duration_seconds histogram" in response.text
+    assert 'flight_crawl_duration_seconds_count{outcome="success"} 1' in response.text
+    assert 'flight_cache_hits_total{cache="response"} 1' in response.text
+
+
+def test_traced_search_exposes_chrome_trace(
+    client_with_mock_search: TestClient, search_request_factory
+) -> None:
+    """?trace=true : hors cache de reponses, trace recuperable par X-Search-Id."""
+    trace_store = TraceStore(max_traces=10)
+    app.dependency_overrides[get_trace_store] = lambda: trace_store
+    request_data = search_request_factory(
+        days_segment1=2, days_segment2=2, as_dict=True
+    )
+
+    response = client_with_mock_search.post(
+        f"{SEARCH_FLIGHTS_ENDPOINT}?trace=true", json=request_data
+    )
+
+    assert response.status_code == 200
+    assert response.headers["X-Cache"] == "BYPASS"
+    search_id = response.headers["X-Search-Id"]
+    trace = client_with_mock_search.get(f"/api/v1/traces/{search_id}")
+    assert trace.status_code == 200
+    assert trace.json()["otherData"] == {"search_id": search_id}
+    assert any(e["name"] == "search" for e in trace.json()["traceEvents"])
+
+
+def test_untraced_search_has_no_trace(
+    client_with_mock_search: TestClient, search_request_factory
+) -> None:
+    """Sans opt-in : X-Search-Id present, aucune trace conservee."""
+    app.dependency_overrides[get_trace_store] = lambda: TraceStore(max_traces=10)
+    request_data = search_request_factory(
+        days_segment1=2, days_segment2=2, as_dict=True
+    )
+
+    response = client_with_mock_search.post(SEARCH_FLIGHTS_ENDPOINT, json=request_data)
+    search_id = response.headers["X-Search-Id"]
+
+    assert client_with_mock_search.get(f"/api/v1/traces/{search_id}").status_code == 404
+
+
+@pytest.fixture
+def search_profiler(
+    client_with_mock_search: TestClient, test_settings: Settings
+) -> SearchProfiler:
+    """Profilage active (jeton secret-token), stockage isole par test."""
+    settings = test_settings.model_copy(
+        update={"PROFILING_TOKEN": SecretStr("secret-token")}
+    )
+    profiler = SearchProfiler(max_profiles=5)
+    app.dependency_overrides[get_settings] = lambda: settings
+    app.dependency_overrides[get_search_profiler] = lambda: profiler
+    return profiler
+
+
+def test_profiled_search_retrievable_by_search_id(
+    client_with_mock_search: TestClient, search_profiler, search_request_factory
+) -> None:
+    """X-Profile-Token valide : profil texte et pstats sur /api/v1/profiles/{id}."""
+    headers = {"X-Profile-Token": "secret-token"}
+    request_data = search_request_factory(
+        days_segment1=2, days_segment2=2, as_dict=True
+    )
+
+    response = client_with_mock_search.post(
+        SEARCH_FLIGHTS_ENDPOINT, json=request_data, headers=headers
+    )
+
+    assert response.status_code == 200
+    assert response.headers["X-Cache"] == "BYPASS"
+    url = f"/api/v1/profiles/{response.headers['X-Search-Id']}"
+    report = client_with_mock_search.get(url, headers=headers)
+    assert report.status_code == 200
+    assert "function calls" in report.text
+    dump = client_with_mock_search.get(f"{url}?format=pstats", headers=headers)
+    assert dump.headers["content-type"] == "application/octet-stream"
+    assert client_with_mock_search.get(url).status_code == 403
+    assert (
+        client_with_mock_search.get(
+            "/api/v1/profiles/unknown", headers=headers
+        ).status_code
+        == 404
+    )
+
+
+def test_invalid_profile_token_rejected(
+    client_with_mock_search: TestClient, search_profiler, search_request_factory
+) -> None:
+    """Jeton invalide : 403 sans lancer la recherche."""
+    request_data = search_request_factory(
+        days_segment1=2, days_segment2=2, as_dict=True
+    )
+
+    response = client_with_mock_search.post(
+        SEARCH_FLIGHTS_ENDPOINT,
+        json=request_data,
+        headers={"X-Profile-Token": "wrong"},
+    )
+
+    assert response.status_code == 403
@@ -0,0 +1,66 @@
+"""Tests integration endpoints price watch."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import CombinationGenerator, WatchService, get_watch_service
+
+WATCHES_ENDPOINT = "/api/v1/watches"
+
+
+@pytest.fixture
+def watch_client(client: TestClient) -> TestClient:
+    """TestClient avec WatchService isole (1 watch max)."""
+    watch_service = WatchService(
+        CombinationGenerator(),
+        max_watches=1,
+        max_events=100,
+        ttl_min_s=1800,
+        ttl_max_s=86400,
+        ttl_per_day_s=1800,
+        min_price_change=1.0,
+    )
+    app.dependency_overrides[get_watch_service] = lambda: watch_service
+    return client
+
+
+def test_watch_lifecycle(watch_client: TestClient, search_request_factory) -> None:
+    """Creation 201, etat, flux vide puis suppression 204."""
+    response = watch_client.post(
+        WATCHES_ENDPOINT, json={"search": search_request_factory(as_dict=True)}
+    )
+
+    assert response.status_code == 201
+    watch_id = response.json()["watch_id"]
+    assert response.json()["runs"] == 0
+
+    status = watch_client.get(f"{WATCHES_ENDPOINT}/{watch_id}")
+    events = watch_client.get(f"{WATCHES_ENDPOINT}/{watch_id}/events?after=0")
+    assert status.status_code == 200
+    assert events.json() == {"watch_id": watch_id, "events": [], "next_after": 0}
+
+    assert watch_client.delete(f"{WATCHES_ENDPOINT}/{watch_id}").status_code == 204
+    assert watch_client.get(f"{WATCHES_ENDPOINT}/{watch_id}").status_code == 404
+
+
+def test_watch_limit_and_mode_validation(
+    watch_client: TestClient, search_request_factory
+) -> None:
+    """Mode non exhaustive ou webhook interne 422, limite atteinte 429."""
+    search = search_request_factory(as_dict=True)
+
+    calendar = watch_client.post(
+        WATCHES_ENDPOINT, json={"search": search | {"mode": "calendar"}}
+    )
+    internal_webhook = watch_client.post(
+        WATCHES_ENDPOINT,
+        json={"search": search, "webhook_url": "https://169.254.169.254/hook"},
+    )
+    first = watch_client.post(WATCHES_ENDPOINT, json={"search": search})
+    second = watch_client.post(WATCHES_ENDPOINT, json={"search": search})
+
+    assert calendar.status_code == 422
+    assert internal_webhook.status_code == 422
+    assert first.status_code == 201
+    assert second.status_code == 429
@@ -0,0 +1,60 @@
+"""Tests unitaires AdaptiveTimeouts."""
+
+import pytest
+
+from app.services import AdaptiveTimeouts
+
+
+@pytest.fixture
+def timeouts() -> AdaptiveTimeouts:
+    """p99 x 2, borne [5s, 40s], 10 mesures minimum."""
+    return AdaptiveTimeouts(
+        defaults={"navigation": 30.0, "selector_wait": 30.0, "crawl": 40.0},
+        factor=2.0,
+        floor_s=5.0,
+        ceiling_s=40.0,
+        min_samples=10,
+    )
+
+
+def test_static_timeout_until_enough_samples(timeouts) -> None:
+    """Moins de min_samples mesures : timeout statique."""
+    for _ in range(9):
+        timeouts.record("fast", "crawl", 6.0)
+
+    assert timeouts.timeout_s("fast", "crawl") == 40.0
+
+
+def test_timeout_derived_per_proxy_with_pool_fallback(timeouts) -> None:
+    """Timeout du proxy selon ses mesures, proxy inconnu : fenetre du pool."""
+    for _ in range(10):
+        timeouts.record("fast", "crawl", 6.0)
+        timeouts.record("slow", "crawl", 15.0)
+
+    assert timeouts.timeout_s("fast", "crawl") == 12.0
+    assert timeouts.timeout_s("slow", "crawl") == 30.0
+    assert timeouts.timeout_s("new", "crawl") == 30.0
+    assert timeouts.timeout_s("fast", "navigation") == 30.0
+
+
+def test_timeout_clamped_between_floor_and_ceiling(timeouts) -> None:
+    """Percentile x factor borne par floor_s et ceiling_s."""
+    for _ in range(10):
+        timeouts.record("fast", "navigation", 1.0)
+        timeouts.record("slow", "navigation", 35.0)
+
+    assert timeouts.timeout_s("fast", "navigation") == 5.0
+    assert timeouts.timeout_s("slow", "navigation") == 40.0
+
+
+def test_stats_expose_observed_percentile_and_timeout(timeouts) -> None:
+    """Stats par proxy et pool : mesures, percentile observe, timeout applique."""
+    for _ in range(10):
+        timeouts.record(None, "crawl", 8.0)
+
+    stats = {(s.proxy, s.stage): s for s in timeouts.stats()}
+
+    assert stats["direct", "crawl"].samples == 10
+    assert stats["direct", "crawl"].observed_s == 8.0
+    assert stats["direct", "crawl"].timeout_s == 16.0
+    assert stats["pool", "crawl"].timeout_s == 16.0
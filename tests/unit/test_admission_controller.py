@@ -0,0 +1,101 @@
+"""Tests unitaires AdmissionController et CrawlStats."""
+
+import pytest
+
+from app.exceptions import AdmissionRejectedError
+from app.services import AdmissionController, CrawlStats
+
+
+@pytest.fixture
+def crawl_stats() -> CrawlStats:
+    """Latence moyenne observee 2s."""
+    stats = CrawlStats(default_latency_s=10.0)
+    stats.record(1.0, size_bytes=1000)
+    stats.record(3.0, size_bytes=None)
+    return stats
+
+
+@pytest.fixture
+def controller(crawl_stats) -> AdmissionController:
+    """Capacite 10 crawls paralleles, duree projetee max 60s."""
+    return AdmissionController(
+        crawl_stats,
+        capacity=10,
+        max_completion_s=60.0,
+        interactive_max_crawls=9,
+        interactive_reserve=0.5,
+        max_inflight_crawls=400,
+        progressive_budget=20,
+    )
+
+
+def test_crawl_stats_mean_latency_defaults_without_samples():
+    """Latence par defaut tant qu'aucun crawl n'est mesure."""
+    stats = CrawlStats(default_latency_s=7.0)
+
+    assert stats.mean_latency_s == 7.0
+    stats.record(2.0, size_bytes=500)
+    assert stats.mean_latency_s == 2.0
+    assert stats.size_bytes.mean() == 500
+
+
+def test_estimate_crawls_uses_progressive_budget(controller, search_request_factory):
+    """Crawls estimes = combinaisons, bornes par le budget en mode progressive."""
+    request = search_request_factory(days_segment1=6, days_segment2=5)
+
+    assert controller.estimate_crawls(request) == 42
+    progressive = request.model_copy(update={"mode": "progressive"})
+    assert controller.estimate_crawls(progressive) == 20
+
+
+@pytest.mark.asyncio
+async def test_admit_idle_fleet_always_admits(controller, search_request_factory):
+    """Recherche seule admise meme si sa duree projetee depasse la limite."""
+    request = search_request_factory(
+        days_segment1=15, days_segment2=15, offset_segment2=20
+    )
+
+    async with controller.admit(request) as ticket:
+        assert ticket.crawls == 256
+        assert controller.inflight_crawls == 256
+
+    assert controller.inflight_crawls == 0
+    assert controller.inflight_searches == 0
+
+
+@pytest.mark.asyncio
+async def test_admit_rejects_large_search_but_keeps_reserve_for_interactive(
+    controller, search_request_factory
+):
+    """Grosse recherche rejetee (Retry-After), petite recherche encore admise."""
+    large = search_request_factory(
+        days_segment1=15, days_segment2=15, offset_segment2=20
+    )
+    small = search_request_factory(days_segment1=2, days_segment2=2)
+
+    async with controller.admit(search_request_factory(days_segment1=5)):
+        with pytest.raises(AdmissionRejectedError) as exc_info:
+            async with controller.admit(large):
+                pass
+        async with controller.admit(small) as ticket:
+            assert ticket.interactive
+
+    assert exc_info.value.reason == "projected_completion"
+    assert exc_info.value.retry_after_s >= 1
+
+
+@pytest.mark.asyncio
+async def test_admit_caps_inflight_crawls(controller, search_request_factory):
+    """Plafond de crawls en cours applique quelle que soit la duree projetee."""
+    controller._max_completion_s = 1e9
+    request = search_request_factory(
+        days_segment1=15, days_segment2=15, offset_segment2=20
+    )
+
+    async with controller.admit(request):
+        with pytest.raises(AdmissionRejectedError) as exc_info:
+            async with controller.admit(request):
+                pass
+
+    assert exc_info.value.reason == "inflight_limit"
+    assert controller.inflight_crawls == 0
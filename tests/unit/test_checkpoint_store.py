@@ -0,0 +1,90 @@
+"""Tests unitaires CheckpointStore (SQLite, ecritures groupees)."""
+
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+from app.models import CachedFlight, DateCombination
+from app.services import CheckpointStore
+
+
+def combo(day: int) -> DateCombination:
+    """Combinaison 2 segments en mars 2026."""
+    return DateCombination(segment_dates=[f"2026-03-{day:02d}", "2026-03-20"])
+
+
+def stored_rows(path) -> int:
+    """Nombre de lignes ecrites sur disque (connexion independante)."""
+    with sqlite3.connect(path) as connection:
+        return connection.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0]
+
+
+@pytest.fixture
+def observed(flight_dto_factory) -> CachedFlight:
+    """Meilleur vol horodate."""
+    return CachedFlight(best_flight=flight_dto_factory(price=420.0), cached_at=1.0)
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_survives_restart(tmp_path, observed):
+    """Resultats relus par une nouvelle instance sur le meme fichier."""
+    path = tmp_path / "checkpoints.sqlite3"
+    store = CheckpointStore(str(path))
+    store.record("search", combo(1), observed)
+    store.record("search", combo(2), observed)
+    store.record("other", combo(3), observed)
+    await store.close()
+
+    restarted = CheckpointStore(str(path))
+    restored = await restarted.load("search")
+
+    assert restored == {
+        ("2026-03-01", "2026-03-20"): observed,
+        ("2026-03-02", "2026-03-20"): observed,
+    }
+    await restarted.close()
+
+
+@pytest.mark.asyncio
+async def test_record_buffers_writes_until_batch_full(tmp_path, observed):
+    """Aucune ecriture avant lot complet ou intervalle ecoule."""
+    path = tmp_path / "checkpoints.sqlite3"
+    store = CheckpointStore(str(path), flush_interval_s=60, flush_batch_size=3)
+
+    store.record("search", combo(1), observed)
+    store.record("search", combo(2), observed)
+    await asyncio.sleep(0.05)
+    assert stored_rows(path) == 0
+
+    store.record("search", combo(3), observed)
+    for _ in range(50):
+        await asyncio.sleep(0.01)
+        if stored_rows(path) == 3:
+            break
+    assert stored_rows(path) == 3
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_clear_removes_search_and_expired_entries(tmp_path, observed):
+    """Recherche terminee et entrees expirees supprimees, autres conservees."""
+    path = tmp_path / "checkpoints.sqlite3"
+    store = CheckpointStore(str(path), max_age_s=3600)
+    store.record("done", combo(1), observed)
+    store.record("running", combo(2), observed)
+    await store.flush()
+    with sqlite3.connect(path) as connection:
+        connection.execute(
+            "INSERT INTO checkpoints VALUES ('stale', '[]', '{}', ?)",
+            (time.time() - 7200,),
+        )
+
+    assert await store.load("stale") == {}
+    await store.clear("done")
+
+    assert await store.load("done") == {}
+    assert len(await store.load("running")) == 1
+    assert stored_rows(path) == 1
+    await store.close()
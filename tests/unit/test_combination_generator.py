@@ -5,7 +5,7 @@ from datetime import date
 
 import pytest
 
-from app.models import DateCombination, DateRange
+from app.models import CombinationConstraints, DateCombination, DateRange
 from app.services import CombinationGenerator
 from tests.fixtures.helpers import get_future_date
 
@@ -181,3 +181,41 @@ def test_generate_combinations_logging(combination_generator, three_segments, ca
         combination_generator.generate_combinations(three_segments)
 
     assert any("combinations generated" in r.message.lower() for r in caplog.records)
+
+
+def test_generate_combinations_constraints_prune_during_generation(
+    combination_generator, date_range_factory
+):
+    """Jours autorises, exclusions et nuits entre segments appliques."""
+    first = date_range_factory(start_offset=1, duration=13)
+    second = date_range_factory(start_offset=20, duration=13)
+    blackout = first.start
+    weekdays = [0, 4]
+    constraints = CombinationConstraints(
+        min_nights_between=20,
+        max_nights_between=24,
+        departure_weekdays=weekdays,
+        blackout_dates=[blackout],
+    )
+
+    combinations = combination_generator.generate_combinations(
+        [first, second], constraints
+    )
+
+    assert combinations
+    assert len(combinations) == constraints.count_combinations(
+        [first.dates(), second.dates()]
+    )
+    for combo in combinations:
+        out_date, back_date = (date.fromisoformat(d) for d in combo.segment_dates)
+        assert out_date.weekday() in weekdays
+        assert back_date.weekday() in weekdays
+        assert 20 <= (back_date - out_date).days <= 24
+        assert blackout not in combo.segment_dates
+
+
+def test_generate_combinations_without_constraints_unchanged(
+    combination_generator, two_segments
+):
+    """Sans contraintes : produit cartesien complet."""
+    assert len(combination_generator.generate_combinations(two_segments, None)) == 42
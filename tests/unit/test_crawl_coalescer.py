@@ -0,0 +1,129 @@
+"""Tests unitaires CrawlCoalescer (single-flight des crawls en cours)."""
+
+import asyncio
+import contextvars
+
+import pytest
+
+from app.services import CrawlCoalescer
+from tests.fixtures.helpers import BASE_URL
+
+
+@pytest.fixture
+def coalescer():
+    """Registre vide."""
+    return CrawlCoalescer()
+
+
+@pytest.fixture
+def slow_crawl():
+    """Factory de crawl bloque jusqu'a release, compte les executions."""
+    release = asyncio.Event()
+    calls = [0]
+
+    async def _crawl():
+        calls[0] += 1
+        await release.wait()
+        return "result"
+
+    return _crawl, release, calls
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requesters_share_single_crawl(coalescer, slow_crawl):
+    """Deux demandeurs concurrents -> un seul crawl, second marque coalesce."""
+    crawl, release, calls = slow_crawl
+
+    first = asyncio.create_task(coalescer.run(BASE_URL, crawl))
+    second = asyncio.create_task(coalescer.run(BASE_URL, crawl))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await first == ("result", False)
+    assert await second == ("result", True)
+    assert calls[0] == 1
+    assert coalescer.inflight_count == 0
+
+
+@pytest.mark.asyncio
+async def test_different_urls_not_coalesced(coalescer, slow_crawl):
+    """URLs differentes -> crawls independants."""
+    crawl, release, calls = slow_crawl
+
+    tasks = [
+        asyncio.create_task(coalescer.run(f"{BASE_URL}?i={i}", crawl)) for i in range(3)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert calls[0] == 3
+    assert all(coalesced is False for _, coalesced in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_requester_does_not_abort_shared_crawl(coalescer, slow_crawl):
+    """Annulation d'un demandeur n'annule pas le crawl attendu par l'autre."""
+    crawl, release, calls = slow_crawl
+
+    first = asyncio.create_task(coalescer.run(BASE_URL, crawl))
+    second = asyncio.create_task(coalescer.run(BASE_URL, crawl))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await second == ("result", True)
+    assert first.cancelled()
+    assert calls[0] == 1
+
+
+@pytest.mark.asyncio
+async def test_last_requester_cancel_aborts_shared_crawl(coalescer):
+    """Crawl partage annule quand plus aucun demandeur ne l'attend."""
+    crawl_cancelled = asyncio.Event()
+
+    async def crawl():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            crawl_cancelled.set()
+            raise
+
+    requester = asyncio.create_task(coalescer.run(BASE_URL, crawl))
+    await asyncio.sleep(0)
+    requester.cancel()
+    await asyncio.wait_for(crawl_cancelled.wait(), timeout=1)
+
+    assert coalescer.inflight_count == 0
+
+
+@pytest.mark.asyncio
+async def test_exception_propagated_to_all_requesters(coalescer):
+    """Erreur du crawl partage remontee a chaque demandeur."""
+
+    async def crawl():
+        await asyncio.sleep(0)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(
+        coalescer.run(BASE_URL, crawl),
+        coalescer.run(BASE_URL, crawl),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert coalescer.inflight_count == 0
+
+
+@pytest.mark.asyncio
+async def test_shared_crawl_runs_outside_requester_context(coalescer):
+    """Crawl partage : variables de contexte du premier demandeur non heritees."""
+    requester = contextvars.ContextVar("requester", default=None)
+
+    async def crawl():
+        return requester.get()
+
+    requester.set("first-search")
+
+    assert await coalescer.run(BASE_URL, crawl) == (None, False)
@@ -0,0 +1,106 @@
+"""Tests unitaires CrawlSlots (capacite de crawl partagee, reserve interactive)."""
+
+import asyncio
+
+import pytest
+
+from app.services import CrawlSlots
+
+
+async def _try_acquire(slots: CrawlSlots, *, interactive: bool) -> bool:
+    """Acquiert un creneau sans attendre (False si la classe est saturee)."""
+    try:
+        async with asyncio.timeout(0.01):
+            await slots.acquire(interactive=interactive)
+    except TimeoutError:
+        return False
+    return True
+
+
+@pytest.mark.asyncio
+async def test_background_cannot_take_reserved_slots():
+    """Arriere-plan plafonne a capacity - reserve ; la reserve reste interactive."""
+    slots = CrawlSlots(4, interactive_reserved=1)
+    for _ in range(3):
+        await slots.acquire(interactive=False)
+
+    assert not await _try_acquire(slots, interactive=False)
+    assert await _try_acquire(slots, interactive=True)
+    assert slots.in_use == 4
+    assert not await _try_acquire(slots, interactive=True)
+
+
+@pytest.mark.asyncio
+async def test_released_slot_handed_to_interactive_first():
+    """Creneau libere : recherche interactive servie avant l'arriere-plan."""
+    slots = CrawlSlots(2, interactive_reserved=1)
+    await slots.acquire(interactive=False)
+    await slots.acquire(interactive=True)
+    background = asyncio.create_task(slots.acquire(interactive=False))
+    interactive = asyncio.create_task(slots.acquire(interactive=True))
+    await asyncio.sleep(0)
+
+    slots.release()
+    await asyncio.sleep(0)
+
+    assert interactive.done()
+    assert not background.done()
+    background.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await background
+    assert slots.in_use == 2
+
+
+@pytest.mark.asyncio
+async def test_gates_share_global_capacity():
+    """Plusieurs recherches simultanees : MAX_CONCURRENCY crawls au total."""
+    slots = CrawlSlots(3)
+    running = peak = 0
+
+    async def crawl(gate: asyncio.Semaphore) -> None:
+        nonlocal running, peak
+        async with gate:
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.001)
+            running -= 1
+
+    gates = [slots.gate(interactive=True) for _ in range(4)]
+    await asyncio.gather(*(crawl(gate) for gate in gates for _ in range(3)))
+
+    assert peak == 3
+    assert slots.in_use == 0
+
+
+@pytest.mark.asyncio
+async def test_gate_local_limit_and_cancellation():
+    """Plafond local respecte ; attente annulee sans fuite de creneau."""
+    slots = CrawlSlots(4)
+    gate = slots.gate(interactive=False, limit=1)
+    await gate.acquire()
+    waiting = asyncio.create_task(gate.acquire())
+    await asyncio.sleep(0)
+
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    gate.release()
+
+    assert slots.in_use == 0
+    assert await _try_acquire(slots, interactive=False)
+
+
+@pytest.mark.asyncio
+async def test_try_acquire_never_waits_nor_jumps_queue():
+    """Prise sans attente : refusee si sature ou si des demandeurs attendent."""
+    slots = CrawlSlots(2, interactive_reserved=1)
+
+    assert slots.try_acquire(interactive=False)
+    assert not slots.try_acquire(interactive=False)
+    waiting = asyncio.create_task(slots.acquire(interactive=False))
+    await asyncio.sleep(0)
+
+    assert not slots.try_acquire(interactive=True)
+    slots.release()
+    await waiting
+    assert slots.in_use == 1
@@ -1,14 +1,31 @@
 """Tests unitaires CrawlerService."""
 
+import asyncio
 import logging
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from app.exceptions import CaptchaDetectedError, NetworkError
-from app.services import CrawlerService, ProxyService
+from app.services import (
+    AdaptiveTimeouts,
+    CrawlerService,
+    CrawlSlots,
+    CrawlStats,
+    PipelineMetrics,
+    ProxyService,
+    RateLimiter,
+    SearchTrace,
+    SessionPool,
+    tracing,
+)
+from app.services.crawler_service import GOOGLE_FLIGHTS_HOME_URL
+from app.services.proxy_service import proxy_key
+from app.services.session_pool import CrawlSession
 from tests.fixtures.helpers import BASE_URL
 
+FLIGHTS_URL = f"{BASE_URL}?tfs=CBwQAhoe"
+
 
 @pytest.fixture(autouse=True)
 def mock_settings(test_settings):
@@ -454,3 +471,532 @@ async def test_crawl_retry_with_proxy_rotation(
 
         assert result.success is True
         assert len(proxy_calls) >= 2
+
+
+@pytest.mark.asyncio
+async def test_crawl_records_latency_and_size_in_crawl_stats(
+    mock_crawl_result, mock_async_web_crawler
+):
+    """Latence et taille HTML de chaque crawl enregistrees dans CrawlStats."""
+    crawl_stats = CrawlStats(default_latency_s=10.0)
+    service = CrawlerService(crawl_stats=crawl_stats)
+    crawler = mock_async_web_crawler(mock_result=mock_crawl_result)
+
+    with patch("app.services.crawler_service.AsyncWebCrawler", return_value=crawler):
+        result = await service.crawl_google_flights(BASE_URL)
+
+    assert len(crawl_stats.latency_s) == 1
+    assert crawl_stats.size_bytes.mean() == len(result.html)
+
+
+@pytest.mark.asyncio
+async def test_crawl_429_puts_proxy_in_cooldown(
+    proxy_service_single, mock_async_web_crawler, mock_crawl_result_factory
+):
+    """429 signale au pool : proxy en cooldown, echec comptabilise."""
+    crawler_service = CrawlerService(proxy_service=proxy_service_single)
+    mock_result = mock_crawl_result_factory(success=False, html="", status_code=429)
+    crawler = mock_async_web_crawler(mock_result=mock_result)
+
+    with (
+        patch("app.services.crawler_service.AsyncWebCrawler", return_value=crawler),
+        pytest.raises(NetworkError),
+    ):
+        await crawler_service.crawl_google_flights(BASE_URL)
+
+    [stats] = proxy_service_single.stats()
+    assert stats.success_rate == 0.0
+    assert stats.cooldown_remaining_s > 0
+
+
+@pytest.mark.asyncio
+async def test_crawl_success_records_proxy_latency(
+    proxy_service_single, mock_crawl_result, mock_async_web_crawler
+):
+    """Crawl reussi : succes et latence enregistres pour le proxy utilise."""
+    crawler_service = CrawlerService(proxy_service=proxy_service_single)
+    crawler = mock_async_web_crawler(mock_result=mock_crawl_result)
+
+    with patch("app.services.crawler_service.AsyncWebCrawler", return_value=crawler):
+        await crawler_service.crawl_google_flights(BASE_URL)
+
+    [stats] = proxy_service_single.stats()
+    assert stats.requests == 1
+    assert stats.success_rate == 1.0
+    assert stats.latency_p50_s is not None
+
+
+@pytest.fixture
+def session_crawler(mock_proxy_pool, mock_crawl_result_factory, test_settings):
+    """CrawlerService (3 proxies, 1 session) dont arun simule capture puis crawls."""
+    proxy_service = ProxyService(mock_proxy_pool)
+    session_pool = SessionPool(size=1, max_failures=3, max_age_s=600.0)
+    crawler_service = CrawlerService(
+        proxy_service=proxy_service, session_pool=session_pool
+    )
+    flight_statuses: list[int] = []
+
+    async def arun(url, config):
+        if url == GOOGLE_FLIGHTS_HOME_URL:
+            crawler_service._captured_cookies = [{"name": "NID", "value": "abc"}]
+            return mock_crawl_result_factory(html="<html>Google Flights</html>")
+        status = flight_statuses.pop(0) if flight_statuses else 200
+        return mock_crawl_result_factory(
+            success=status == 200, html="<html>ok</html>", status_code=status
+        )
+
+    return crawler_service, session_pool, flight_statuses, arun
+
+
+@pytest.mark.asyncio
+async def test_crawl_reuses_session_proxy_and_cookies(
+    session_crawler, mock_async_web_crawler
+):
+    """Crawls envoyes via le proxy de capture, avec ses cookies."""
+    crawler_service, session_pool, _, arun = session_crawler
+    crawler = mock_async_web_crawler(side_effect=arun)
+
+    with (
+        patch("app.services.crawler_service.AsyncWebCrawler", return_value=crawler),
+        patch(
+            "app.services.crawler_service.build_browser_config_from_fingerprint"
+        ) as build_config,
+    ):
+        await crawler_service.get_google_session()
+        await crawler_service.get_google_session()
+        await crawler_service.crawl_google_flights(FLIGHTS_URL)
+        await crawler_service.crawl_google_flights(FLIGHTS_URL)
+
+    [session] = session_pool.sessions
+    assert session.crawls == 2
+    for call in build_config.call_args_list:
+        _, _, cookies, proxy_config = call.args
+        assert cookies == [{"name": "NID", "value": "abc"}]
+        assert proxy_config["username"] == session.proxy.username
+
+
+@pytest.mark.asyncio
+async def test_blocked_session_recaptured_in_background(
+    session_crawler, mock_async_web_crawler
+):
+    """429 : retry hors session, nouvelle session capturee en tache de fond."""
+    crawler_service, session_pool, flight_statuses, arun = session_crawler
+    crawler = mock_async_web_crawler(side_effect=arun)
+
+    with patch("app.services.crawler_service.AsyncWebCrawler", return_value=crawler):
+        await crawler_service.get_google_session()
+        [blocked] = session_pool.sessions
+        flight_statuses.append(429)
+        with patch("asyncio.sleep"):
+            result = await crawler_service.crawl_google_flights(FLIGHTS_URL)
+        await asyncio.gather(*session_pool._tasks)
+
+    assert result.success is True
+    [fresh] = session_pool.sessions
+    assert fresh is not blocked
+    assert fresh.proxy is not blocked.proxy
+
+
+@pytest.mark.asyncio
+async def test_crawl_without_session_sends_no_cookies(
+    session_crawler, mock_async_web_crawler
+):
+    """Retry hors session : autre sortie proxy, cookies de capture non envoyes."""
+    crawler_service, session_pool, flight_statuses, arun = session_crawler
+    crawler = mock_async_web_crawler(side_effect=arun)
+
+    with (
+        patch("app.services.crawler_service.AsyncWebCrawler", return_value=crawler),
+        patch(
+            "app.services.crawler_service.build_browser_config_from_fingerprint"
+        ) as build_config,
+    ):
+        await crawler_service.get_google_session()
+        [blocked] = session_pool.sessions
+        flight_statuses.append(429)
+        async with session_pool.capture_lock:
+            with patch("asyncio.sleep"):
+                await crawler_service.crawl_google_flights(FLIGHTS_URL)
+        await asyncio.gather(*session_pool._tasks)
+
+    (_, _, session_cookies, _), (_, _, cookies, proxy_config) = (
+        call.args for call in build_config.call_args_list
+    )
+    assert session_cookies == [{"name": "NID", "value": "abc"}]
+    assert cookies == []
+    assert proxy_config["username"] != blocked.proxy.username
+
+
+@pytest.mark.asyncio
+async def test_get_google_session_skips_lock_when_pool_full(
+    session_crawler, mock_async_web_crawler
+):
+    """Pool complet : pas d'attente derriere une recapture d'arriere-plan."""
+    crawler_service, session_pool, _, arun = session_crawler
+    crawler = mock_async_web_crawler(side_effect=arun)
+
+    with patch("app.services.crawler_service.AsyncWebCrawler", return_value=crawler):
+        await crawler_service.get_google_session()
+        async with session_pool.capture_lock:
+            await asyncio.wait_for(crawler_service.get_google_session(), 1)
+
+    assert len(session_pool.sessions) == 1
+
+
+@pytest.mark.asyncio
+async def test_crawl_paced_and_429_slows_proxy(
+    proxy_service_single, mock_async_web_crawler, mock_crawl_result_factory
+):
+    """Chaque tentative attend le rate limiter, un 429 reduit le debit du proxy."""
+    rate_limiter = MagicMock(spec=RateLimiter)
+    crawler_service = CrawlerService(
+        proxy_service=proxy_service_single, rate_limiter=rate_limiter
+    )
+    crawler = mock_async_web_crawler(
+        side_effect=[
+            mock_crawl_result_factory(success=False, html="", status_code=429),
+            mock_crawl_result_factory(),
+        ]
+    )
+
+    with (
+        patch("app.services.crawler_service.AsyncWebCrawler", return_value=crawler),
+        patch("asyncio.sleep"),
+    ):
+        result = await crawler_service.crawl_google_flights(FLIGHTS_URL)
+
+    assert result.success is True
+    [proxy] = proxy_service_single._proxy_pool
+    assert rate_limiter.acquire.await_count == 2
+    rate_limiter.acquire.assert_awaited_with(proxy)
+    rate_limiter.record_throttled.assert_called_once_with(proxy)
+    rate_limiter.record_success.assert_called_once_with(proxy)
+
+
+@pytest.fixture
+def hedging_crawler(test_settings, mock_crawl_result_factory):
+    """CrawlerService avec hedging actif, p90 observe 50ms, 1er crawl bloque."""
+    crawl_stats = CrawlStats(default_latency_s=1.0)
+    for _ in range(20):
+        crawl_stats.record(0.05, size_bytes=1000)
+    calls: list[str] = []
+
+    async def arun(url, config):
+        calls.append(url)
+        if len(calls) == 1:
+            await asyncio.sleep(0.5)
+            return mock_crawl_result_factory(html="<html>primary</html>")
+        return mock_crawl_result_factory(html="<html>hedge</html>")
+
+    def _create(
+        max_ratio: float,
+        metrics: PipelineMetrics | None = None,
+        **services,
+    ):
+        settings = test_settings.model_copy(
+            update={"HEDGE_ENABLED": True, "HEDGE_MAX_RATIO": max_ratio}
+        )
+        with patch("app.services.crawler_service.get_settings", return_value=settings):
+            service = CrawlerService(
+                crawl_stats=crawl_stats, metrics=metrics, **services
+            )
+            return service, crawl_stats, arun
+
+    return _create
+
+
+@pytest.mark.asyncio
+async def test_slow_crawl_hedged_and_hedge_wins(
+    hedging_crawler, mock_async_web_crawler
+):
+    """Crawl au-dela du p90 : doublon envoye, premier succes retourne."""
+    crawler_service, crawl_stats, arun = hedging_crawler(max_ratio=0.1)
+    crawler = mock_async_web_crawler(side_effect=arun)
+
+    with patch("app.services.crawler_service.AsyncWebCrawler", return_value=crawler):
+        result = await crawler_service.crawl_google_flights(FLIGHTS_URL)
+
+    assert result.html == "<html>hedge</html>"
+    assert crawl_stats.hedges == 1
+    assert crawl_stats.hedge_wins == 1
+
+
+@pytest.mark.asyncio
+async def test_hedge_not_counted_as_retry(
+    hedging_crawler, mock_async_web_crawler, pipeline_metrics
+):
+    """Doublon hedge : premiere tentative de sa branche, aucun retry compte."""
+    crawler_service, crawl_stats, arun = hedging_crawler(
+        max_ratio=0.1, metrics=pipeline_metrics
+    )
+    crawler = mock_async_web_crawler(side_effect=arun)
+    trace = SearchTrace("abc")
+
+    with (
+        patch("app.services.crawler_service.AsyncWebCrawler", return_value=crawler),
+        tracing(trace),
+    ):
+        await crawler_service.crawl_google_flights(FLIGHTS_URL)
+
+    events = trace.to_chrome_trace()["traceEvents"]
+    attempts = [e["args"]["attempt"] for e in events if e["name"] == "crawl_attempt"]
+    assert crawl_stats.hedges == 1
+    assert attempts == [1, 1]
+    assert pipeline_metrics.retries.value() == 0
+    assert not [e for e in events if e["name"] == "retry"]
+
+
+@pytest.mark.asyncio
+async def test_hedging_capped_by_max_ratio(hedging_crawler, mock_async_web_crawler):
+    """Plafond de doublons atteint : le crawl lent n'est pas duplique."""
+    crawler_service, crawl_stats, arun = hedging_crawler(max_ratio=0.0)
+    crawler = mock_async_web_crawler(side_effect=arun)
+
+    with patch("app.services.crawler_service.AsyncWebCrawler", return_value=crawler):
+        result = await crawler_service.crawl_google_flights(FLIGHTS_URL)
+
+    assert result.html == "<html>primary</html>"
+    assert crawl_stats.hedges == 0
+
+
+@pytest.mark.asyncio
+async def test_hedge_releases_its_crawl_slot(hedging_crawler, mock_async_web_crawler):
+    """Doublon lance sur un creneau libre, rendu a la fin du crawl."""
+    slots = CrawlSlots(2)
+    crawler_service, crawl_stats, arun = hedging_crawler(
+        max_ratio=0.1, crawl_slots=slots
+    )
+    crawler = mock_async_web_crawler(side_effect=arun)
+
+    with patch("app.services.crawler_service.AsyncWebCrawler", return_value=crawler):
+        result = await crawler_service.crawl_google_flights(FLIGHTS_URL)
+
+    assert result.html == "<html>hedge</html>"
+    assert crawl_stats.hedges == 1
+    assert slots.in_use == 0
+
+
+@pytest.mark.asyncio
+async def test_hedge_skipped_without_free_crawl_slot(
+    hedging_crawler, mock_async_web_crawler
+):
+    """Creneaux de crawl tous occupes : pas de doublon, crawl initial attendu."""
+    slots = CrawlSlots(1)
+    await slots.acquire(interactive=False)
+    crawler_service, crawl_stats, arun = hedging_crawler(
+        max_ratio=0.1, crawl_slots=slots
+    )
+    crawler = mock_async_web_crawler(side_effect=arun)
+
+    with patch("app.services.crawler_service.AsyncWebCrawler", return_value=crawler):
+        result = await crawler_service.crawl_google_flights(FLIGHTS_URL)
+
+    assert result.html == "<html>primary</html>"
+    assert crawl_stats.hedges == 0
+    assert slots.in_use == 1
+
+
+@pytest.mark.asyncio
+async def test_hedge_excludes_primary_session(hedging_crawler, mock_async_web_crawler):
+    """Doublon hedge : jamais sur la session du crawl initial."""
+    session_pool = SessionPool(size=2, max_failures=3, max_age_s=600.0)
+    primary, other = CrawlSession.create(None, []), CrawlSession.create(None, [])
+    other.inflight, other.crawls = 1, 5
+    session_pool.add(primary)
+    session_pool.add(other)
+    acquired: list[str] = []
+    acquire = session_pool.acquire
+
+    def spy_acquire(**kwargs):
+        session = acquire(**kwargs)
+        acquired.append(session.session_id)
+        return session
+
+    session_pool.acquire = spy_acquire
+    crawler_service, crawl_stats, arun = hedging_crawler(
+        max_ratio=0.1, session_pool=session_pool
+    )
+    crawler = mock_async_web_crawler(side_effect=arun)
+
+    with patch("app.services.crawler_service.AsyncWebCrawler", return_value=crawler):
+        await crawler_service.crawl_google_flights(FLIGHTS_URL)
+
+    assert crawl_stats.hedges == 1
+    assert acquired == [primary.session_id, other.session_id]
+
+
+@pytest.fixture
+def adaptive_timeouts() -> AdaptiveTimeouts:
+    """p99 x 2, borne [5s, 60s], 1 mesure suffit."""
+    return AdaptiveTimeouts(
+        defaults={"navigation": 30.0, "selector_wait": 30.0, "crawl": 40.0},
+        factor=2.0,
+        floor_s=5.0,
+        ceiling_s=60.0,
+        min_samples=1,
+    )
+
+
+@pytest.mark.asyncio
+async def test_crawl_records_stage_durations_for_adaptive_timeouts(
+    proxy_service_single, adaptive_timeouts, mock_async_web_crawler, mock_crawl_result
+):
+    """Hooks after_goto / before_return_html : durees par etape et par proxy."""
+    crawler_service = CrawlerService(
+        proxy_service=proxy_service_single, adaptive_timeouts=adaptive_timeouts
+    )
+
+    async def arun(url, config):
+        hooks = {
+            c.args[0]: c.args[1]
+            for c in crawler.crawler_strategy.set_hook.call_args_list
+        }
+        await hooks["after_goto"](MagicMock(), MagicMock(), url, MagicMock())
+        await hooks["before_return_html"](MagicMock(), MagicMock(), "<html></html>")
+        return mock_crawl_result
+
+    crawler = mock_async_web_crawler(side_effect=arun)
+    crawler.crawler_strategy = MagicMock()
+
+    with patch("app.services.crawler_service.AsyncWebCrawler", return_value=crawler):
+        await crawler_service.crawl_google_flights(FLIGHTS_URL)
+
+    stats = {(s.proxy, s.stage): s for s in adaptive_timeouts.stats()}
+    [proxy] = proxy_service_single._proxy_pool
+    for stage in ("navigation", "selector_wait", "crawl"):
+        assert stats[proxy_key(proxy), stage].samples == 1
+        assert stats["pool", stage].timeout_s == 5.0
+
+
+@pytest.mark.asyncio
+async def test_crawl_timeout_recorded_as_censored_sample(
+    adaptive_timeouts, mock_async_web_crawler
+):
+    """Timeout atteint : duree enregistree, timeout suivant derive (p99 x 2)."""
+    crawler_service = CrawlerService(adaptive_timeouts=adaptive_timeouts)
+    crawler = mock_async_web_crawler(side_effect=TimeoutError("Timeout"))
+
+    with (
+        patch("app.services.crawler_service.AsyncWebCrawler", return_value=crawler),
+        patch("asyncio.sleep"),
+        pytest.raises(NetworkError),
+    ):
+        await crawler_service.crawl_google_flights(FLIGHTS_URL, use_proxy=False)
+
+    assert adaptive_timeouts.timeout_s(None, "crawl") == 60.0
+    stats = {(s.proxy, s.stage): s for s in adaptive_timeouts.stats()}
+    assert stats["direct", "crawl"].samples == 3
+    assert stats["direct", "crawl"].observed_s == 60.0
+
+
+@pytest.mark.asyncio
+async def test_crawl_result_carries_timing_breakdown(
+    mock_async_web_crawler, mock_crawl_result, test_settings
+):
+    """CrawlResult : etapes decoupees par les hooks, octets recus, stats globales."""
+    crawl_stats = CrawlStats(default_latency_s=1.0)
+    crawler_service = CrawlerService(crawl_stats=crawl_stats)
+
+    async def arun(url, config):
+        hooks = {
+            c.args[0]: c.args[1]
+            for c in crawler.crawler_strategy.set_hook.call_args_list
+        }
+        await hooks["after_goto"](MagicMock(), MagicMock(), url, MagicMock())
+        await asyncio.sleep(0.02)
+        await hooks["before_return_html"](MagicMock(), MagicMock(), "<html></html>")
+        return mock_crawl_result
+
+    crawler = mock_async_web_crawler(side_effect=arun)
+
+    with patch("app.services.crawler_service.AsyncWebCrawler", return_value=crawler):
+        result = await crawler_service.crawl_google_flights(FLIGHTS_URL)
+
+    timings = result.timings
+    assert timings.bytes == len(mock_crawl_result.html)
+    assert timings.settle_s == pytest.approx(0.02, abs=0.015)
+    assert timings.selector_wait_s == 0.0
+    assert timings.captcha_check_s > 0
+    assert crawl_stats.timing_stats().crawls == 1
+
+
+@pytest.mark.asyncio
+async def test_crawl_feeds_pipeline_metrics(
+    mock_async_web_crawler, mock_crawl_result_factory
+):
+    """Codes HTTP par tentative, retries, issue du crawl, octets, jauges a zero."""
+    metrics = PipelineMetrics()
+    crawler_service = CrawlerService(metrics=metrics)
+    html = "<html><body>Valid content</body></html>"
+    crawler = mock_async_web_crawler(
+        side_effect=[
+            mock_crawl_result_factory(success=False, status_code=503),
+            mock_crawl_result_factory(html=html),
+        ]
+    )
+
+    with (
+        patch("app.services.crawler_service.AsyncWebCrawler", return_value=crawler),
+        patch("asyncio.sleep"),
+    ):
+        await crawler_service.crawl_google_flights(FLIGHTS_URL, use_proxy=False)
+
+    assert metrics.crawl_responses.value("503") == 1
+    assert metrics.crawl_responses.value("200") == 1
+    assert metrics.retries.value() == 1
+    assert metrics.crawl_duration.count("success") == 1
+    assert metrics.proxy_bytes.value("no_proxy") == len(html)
+    assert metrics.active_browsers.value() == 0
+    assert metrics.inflight_crawls.value() == 0
+
+
+@pytest.mark.asyncio
+async def test_captcha_counted_by_type(
+    mock_async_web_crawler, mock_crawl_result_factory
+):
+    """Captcha : compte par type, crawl termine en issue captcha."""
+    metrics = PipelineMetrics()
+    crawler_service = CrawlerService(metrics=metrics)
+    crawler = mock_async_web_crawler(
+        mock_result=mock_crawl_result_factory(html='<div class="g-recaptcha"></div>')
+    )
+
+    with (
+        patch("app.services.crawler_service.AsyncWebCrawler", return_value=crawler),
+        patch("asyncio.sleep"),
+        pytest.raises(CaptchaDetectedError),
+    ):
+        await crawler_service.crawl_google_flights(FLIGHTS_URL, use_proxy=False)
+
+    assert metrics.captchas.value("recaptcha") >= 1
+    assert metrics.crawl_duration.count("captcha") == 1
+
+
+@pytest.mark.asyncio
+async def test_traced_crawl_records_attempts_and_stages(
+    mock_async_web_crawler, mock_crawl_result_factory
+):
+    """Trace : une tentative par essai (code HTTP, proxy), retry et etapes."""
+    crawler_service = CrawlerService()
+    crawler = mock_async_web_crawler(
+        side_effect=[
+            mock_crawl_result_factory(success=False, status_code=503),
+            mock_crawl_result_factory(),
+        ]
+    )
+    trace = SearchTrace("abc")
+
+    with (
+        patch("app.services.crawler_service.AsyncWebCrawler", return_value=crawler),
+        patch("asyncio.sleep"),
+        tracing(trace),
+    ):
+        await crawler_service.crawl_google_flights(FLIGHTS_URL, use_proxy=False)
+
+    events = trace.to_chrome_trace()["traceEvents"]
+    attempts = [e["args"] for e in events if e["name"] == "crawl_attempt"]
+    assert [a["status_code"] for a in attempts] == [503, 200]
+    assert attempts[0]["error"] == "NetworkError"
+    assert {a["proxy_host"] for a in attempts} == {"no_proxy"}
+    names = {e["name"] for e in events}
+    assert {"retry", "pace", "browser_start", "navigation", "html"} <= names
@@ -0,0 +1,136 @@
+"""Tests unitaires ItineraryDrillDown."""
+
+import asyncio
+import re
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.exceptions import NetworkError
+from app.models import CombinationResult, DateCombination
+from app.services import CrawlResult, ItineraryDrillDown
+from tests.fixtures.helpers import TEMPLATE_URL, get_future_date
+
+LEG_DATES = [
+    [get_future_date(offset).isoformat() for offset in (1, 2)],
+    [get_future_date(offset).isoformat() for offset in (10, 11)],
+    [get_future_date(offset).isoformat() for offset in (20, 21)],
+]
+
+
+@pytest.fixture(autouse=True)
+def mock_url_generation():
+    """URL = dates jointes (template de test a 2 segments seulement)."""
+    with patch(
+        "app.services.itinerary_drilldown.generate_google_flights_url",
+        side_effect=lambda _, dates: "|".join(dates),
+    ):
+        yield
+
+
+@pytest.fixture
+def candidates(flight_dto_factory):
+    """4 combinaisons 3 segments partageant leurs prefixes 1-2."""
+    dates = [
+        [LEG_DATES[0][0], LEG_DATES[1][0], LEG_DATES[2][0]],
+        [LEG_DATES[0][0], LEG_DATES[1][0], LEG_DATES[2][1]],
+        [LEG_DATES[0][0], LEG_DATES[1][1], LEG_DATES[2][0]],
+        [LEG_DATES[0][1], LEG_DATES[1][0], LEG_DATES[2][0]],
+    ]
+    return [
+        CombinationResult(
+            date_combination=DateCombination(segment_dates=d),
+            best_flight=flight_dto_factory(price=500.0 + i),
+        )
+        for i, d in enumerate(dates)
+    ]
+
+
+@pytest.fixture
+def crawler_service():
+    """Crawler dont le HTML encode le segment selectionne (nb de clics + 1)."""
+    crawler = AsyncMock()
+
+    async def crawl(url, use_proxy=True, wait_for_selector=None, js_code=None):
+        leg = len(js_code) + 1
+        return CrawlResult(
+            success=True, html=f'<body data-drilldown-leg="{leg}">leg-{leg}</body>'
+        )
+
+    crawler.crawl_google_flights.side_effect = crawl
+    return crawler
+
+
+@pytest.fixture
+def flight_parser(flight_dto_factory):
+    """Parser retournant un vol dont la compagnie identifie le segment."""
+    parser = MagicMock()
+    parser.parse.side_effect = lambda html: [
+        flight_dto_factory(airline=re.search(r">(leg-\d+)<", html).group(1))
+    ]
+    return parser
+
+
+@pytest.mark.asyncio
+async def test_complete_shares_prefix_crawls(
+    crawler_service, flight_parser, candidates
+):
+    """Chaque prefixe crawle une fois : 3 noeuds segment 2 + 4 feuilles < 8 naifs."""
+    drilldown = ItineraryDrillDown(crawler_service, flight_parser)
+
+    itineraries, crawls = await drilldown.complete(
+        TEMPLATE_URL, candidates, asyncio.Semaphore(5)
+    )
+
+    assert crawls == 7
+    assert crawler_service.crawl_google_flights.call_count == 7
+    for candidate in candidates:
+        flights = itineraries[tuple(candidate.date_combination.segment_dates)]
+        assert [f.airline for f in flights[1:]] == ["leg-2", "leg-3"]
+        assert flights[0] == candidate.best_flight
+
+
+@pytest.mark.asyncio
+async def test_complete_truncates_itinerary_when_leg_fails(
+    crawler_service, flight_parser, candidates
+):
+    """Segment 2 introuvable : sous-arbre non crawle, itineraire tronque."""
+
+    async def crawl(url, use_proxy=True, wait_for_selector=None, js_code=None):
+        raise NetworkError(url)
+
+    crawler_service.crawl_google_flights.side_effect = crawl
+    drilldown = ItineraryDrillDown(crawler_service, flight_parser)
+
+    itineraries, crawls = await drilldown.complete(
+        TEMPLATE_URL, candidates, asyncio.Semaphore(5)
+    )
+
+    assert crawls == 3
+    assert all(len(flights) == 1 for flights in itineraries.values())
+
+
+@pytest.mark.asyncio
+async def test_leg_unset_when_selection_not_confirmed(
+    crawler_service, flight_parser, candidates
+):
+    """Clic jamais effectue (liste du segment 1 crawlee) : segment non retenu."""
+
+    async def crawl(url, use_proxy=True, wait_for_selector=None, js_code=None):
+        return CrawlResult(success=True, html="<body>leg-1</body>")
+
+    crawler_service.crawl_google_flights.side_effect = crawl
+    drilldown = ItineraryDrillDown(crawler_service, flight_parser)
+
+    itineraries, crawls = await drilldown.complete(
+        TEMPLATE_URL, candidates, asyncio.Semaphore(5)
+    )
+
+    assert crawls == 3
+    assert all(len(flights) == 1 for flights in itineraries.values())
+    flight_parser.parse.assert_not_called()
+    wait_for = crawler_service.crawl_google_flights.call_args.kwargs[
+        "wait_for_selector"
+    ]
+    assert wait_for.startswith("js:")
+    assert "drilldownLeg === '2'" in wait_for
@@ -2,6 +2,7 @@ import pytest
 from pydantic import ValidationError
 
 from app.models import (
+    CombinationConstraints,
     DateRange,
     FlightCombinationResult,
     SearchRequest,
@@ -480,3 +481,99 @@ def test_flight_stops_must_be_non_negative(flight_dto_factory):
     """stops doit être >= 0."""
     with pytest.raises(ValidationError):
         flight_dto_factory(stops=-1)
+
+
+def test_search_request_mode_defaults_to_exhaustive(search_request_factory):
+    """Mode par defaut exhaustive, calendar accepte, autre valeur rejetee."""
+    data = search_request_factory(as_dict=True)
+
+    assert SearchRequest(**data).mode == "exhaustive"
+    assert SearchRequest(**data, mode="calendar").mode == "calendar"
+    with pytest.raises(ValidationError):
+        SearchRequest(**data, mode="random")
+
+
+def test_search_request_deadline_ms_optional_and_positive(search_request_factory):
+    """deadline_ms optionnel, strictement positif et borne."""
+    data = search_request_factory(as_dict=True)
+
+    assert SearchRequest(**data).deadline_ms is None
+    assert SearchRequest(**data, deadline_ms=2000).deadline_ms == 2000
+    for invalid in (0, -1, 600_001):
+        with pytest.raises(ValidationError):
+            SearchRequest(**data, deadline_ms=invalid)
+
+
+def test_search_request_progressive_mode_allows_wide_ranges():
+    """Mode progressive : 60 jours par segment, limite 1000 combinaisons levee."""
+    segments = [
+        DateRange(
+            start=get_future_date(1).isoformat(), end=get_future_date(61).isoformat()
+        ),
+        DateRange(
+            start=get_future_date(70).isoformat(), end=get_future_date(130).isoformat()
+        ),
+    ]
+
+    request = SearchRequest(
+        template_url=TEMPLATE_URL, segments_date_ranges=segments, mode="progressive"
+    )
+
+    assert request.mode == "progressive"
+    with pytest.raises(ValidationError, match="Max 15 days per segment"):
+        SearchRequest(template_url=TEMPLATE_URL, segments_date_ranges=segments)
+    segments[0] = DateRange(
+        start=get_future_date(1).isoformat(), end=get_future_date(62).isoformat()
+    )
+    with pytest.raises(ValidationError, match="Max 60 days per segment"):
+        SearchRequest(
+            template_url=TEMPLATE_URL, segments_date_ranges=segments, mode="progressive"
+        )
+
+
+def test_search_request_combination_limit_checked_after_constraints():
+    """Limite 1000 appliquee apres elagage par contraintes."""
+    segments = [
+        DateRange(
+            start=get_future_date(1 + 20 * i).isoformat(),
+            end=get_future_date(11 + 20 * i).isoformat(),
+        )
+        for i in range(3)
+    ]
+    with pytest.raises(ValidationError, match="Too many combinations: 1331"):
+        SearchRequest(template_url=TEMPLATE_URL, segments_date_ranges=segments)
+
+    request = SearchRequest(
+        template_url=TEMPLATE_URL,
+        segments_date_ranges=segments,
+        constraints=CombinationConstraints(
+            min_nights_between=18, max_nights_between=22
+        ),
+    )
+
+    assert request.constraints is not None
+
+
+def test_combination_constraints_validation():
+    """Bornes de nuits coherentes, jours 0-6, dates ISO, au moins 1 combinaison."""
+    with pytest.raises(ValidationError):
+        CombinationConstraints(min_nights_between=5, max_nights_between=2)
+    with pytest.raises(ValidationError):
+        CombinationConstraints(departure_weekdays=[7])
+    with pytest.raises(ValidationError):
+        CombinationConstraints(blackout_dates=["2026-13-01"])
+    with pytest.raises(ValidationError, match="No date combination"):
+        SearchRequest(
+            template_url=TEMPLATE_URL,
+            segments_date_ranges=[
+                DateRange(
+                    start=get_future_date(1).isoformat(),
+                    end=get_future_date(2).isoformat(),
+                ),
+                DateRange(
+                    start=get_future_date(3).isoformat(),
+                    end=get_future_date(4).isoformat(),
+                ),
+            ],
+            constraints=CombinationConstraints(min_nights_between=10),
+        )
@@ -0,0 +1,150 @@
+"""Tests unitaires Prefetcher (popularite, budgets, cession aux recherches)."""
+
+import asyncio
+import base64
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.models import CombinationResult
+from app.services import CombinationGenerator, Prefetcher
+from app.utils import generate_google_flights_url
+
+OTHER_TEMPLATE_URL = (
+    "https://www.google.com/travel/flights?tfs="
+    + base64.urlsafe_b64encode(b"other-route 2026-03-01 2026-03-10").decode()
+)
+
+
+@pytest.fixture
+def make_prefetcher(result_cache, admission_controller, crawl_stats):
+    """Factory Prefetcher (cache, admission et stats isoles par test)."""
+
+    def _create(top_routes=5, daily_crawl_budget=100, daily_bytes_budget=10**9):
+        return Prefetcher(
+            CombinationGenerator(),
+            result_cache,
+            admission_controller,
+            crawl_stats,
+            top_routes=top_routes,
+            daily_crawl_budget=daily_crawl_budget,
+            daily_bytes_budget=daily_bytes_budget,
+            concurrency=2,
+        )
+
+    return _create
+
+
+def make_search_service(flight_dto_factory) -> MagicMock:
+    """SearchService mock : chaque combinaison crawlee avec succes."""
+    service = MagicMock()
+
+    async def crawl_combinations(request, combinations, **kwargs):
+        return [
+            CombinationResult(date_combination=c, best_flight=flight_dto_factory())
+            for c in combinations
+        ]
+
+    service.crawl_combinations = AsyncMock(side_effect=crawl_combinations)
+    return service
+
+
+def test_popular_requests_ranked_by_frequency(make_prefetcher, search_request_factory):
+    """Itineraires classes par frequence, limites a top_routes, progressive ignore."""
+    prefetcher = make_prefetcher(top_routes=1)
+    popular = search_request_factory()
+    other = search_request_factory().model_copy(
+        update={"template_url": OTHER_TEMPLATE_URL}
+    )
+
+    prefetcher.record_request(other)
+    prefetcher.record_request(popular)
+    prefetcher.record_request(popular)
+    prefetcher.record_request(popular.model_copy(update={"mode": "progressive"}))
+
+    assert prefetcher.popular_requests() == [popular]
+    assert prefetcher.stats().routes_tracked == 2
+
+
+@pytest.mark.asyncio
+async def test_run_once_prefetches_uncached_within_budget(
+    make_prefetcher, result_cache, search_request_factory, flight_dto_factory
+):
+    """Combinaisons deja en cache ignorees, arret au budget quotidien."""
+    prefetcher = make_prefetcher(daily_crawl_budget=2)
+    request = search_request_factory(days_segment1=1, days_segment2=1)
+    combinations = CombinationGenerator().generate_combinations(
+        request.segments_date_ranges
+    )
+    cached_url = generate_google_flights_url(
+        request.template_url, combinations[0].segment_dates
+    )
+    await result_cache.set(cached_url, flight_dto_factory())
+    prefetcher.record_request(request)
+    search_service = make_search_service(flight_dto_factory)
+
+    crawled = await prefetcher.run_once(search_service)
+
+    assert crawled == 2
+    crawled_combos = search_service.crawl_combinations.call_args.args[1]
+    assert combinations[0] not in crawled_combos
+    stats = prefetcher.stats()
+    assert stats.crawls_today == 2
+    assert stats.bytes_today == 200_000
+    assert stats.prefetched_total == 2
+
+
+@pytest.mark.asyncio
+async def test_record_hit_attributes_saved_latency_once(
+    make_prefetcher, search_request_factory, flight_dto_factory
+):
+    """Un hit par combinaison prechargee, latence moyenne epargnee."""
+    prefetcher = make_prefetcher()
+    request = search_request_factory(days_segment1=0, days_segment2=0)
+    prefetcher.record_request(request)
+    await prefetcher.run_once(make_search_service(flight_dto_factory))
+    url = generate_google_flights_url(
+        request.template_url,
+        [r.start for r in request.segments_date_ranges],
+    )
+
+    prefetcher.record_hit(url)
+    prefetcher.record_hit(url)
+    prefetcher.record_hit("https://unrelated")
+
+    stats = prefetcher.stats()
+    assert stats.hits == 1
+    assert stats.hit_rate == 1.0
+    assert stats.saved_latency_s == 1.0
+
+
+@pytest.mark.asyncio
+async def test_run_once_yields_to_admitted_search(
+    make_prefetcher, admission_controller, search_request_factory
+):
+    """Recherche admise pendant un prechargement : crawl annule immediatement."""
+    prefetcher = make_prefetcher()
+    prefetcher.record_request(search_request_factory())
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def crawl_forever(request, combinations, **kwargs):
+        started.set()
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    search_service = MagicMock()
+    search_service.crawl_combinations = crawl_forever
+    prefetch = asyncio.create_task(prefetcher.run_once(search_service))
+    await started.wait()
+
+    async with admission_controller.reserve(1):
+        crawled = await asyncio.wait_for(prefetch, timeout=1)
+        assert await prefetcher.run_once(search_service) == 0
+
+    assert crawled == 2
+    assert cancelled.is_set()
+    assert prefetcher.stats().yields == 1
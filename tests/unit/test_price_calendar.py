@@ -0,0 +1,187 @@
+"""Tests unitaires PriceCalendarParser et PriceCalendarService."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.exceptions import NetworkError, ParsingError
+from app.models import DateCombination
+from app.services import (
+    CrawlResult,
+    CrawlSlots,
+    PriceCalendarParser,
+    PriceCalendarService,
+)
+from tests.fixtures.helpers import TEMPLATE_URL, get_future_date
+
+
+@pytest.fixture(autouse=True)
+def mock_settings(test_settings):
+    """Mock get_settings pour tous les tests du module (CI compatibility)."""
+    with patch("app.services.price_calendar.get_settings", return_value=test_settings):
+        yield
+
+
+@pytest.fixture
+def segment_dates():
+    """Dates segment 1 (J+1..J+4) et segment 2 (J+20..J+21)."""
+    return (
+        [get_future_date(1 + i).isoformat() for i in range(4)],
+        [get_future_date(20 + i).isoformat() for i in range(2)],
+    )
+
+
+@pytest.fixture
+def combinations(segment_dates):
+    """Produit cartesien 4x2 = 8 combinaisons."""
+    first, second = segment_dates
+    return [DateCombination(segment_dates=[a, b]) for a in first for b in second]
+
+
+def test_parser_extracts_prices_by_date(google_flights_calendar_html_factory):
+    """Prix indicatifs extraits par date ISO, cellules sans prix ignorees."""
+    d1, d2, d3 = (get_future_date(i).isoformat() for i in (1, 2, 3))
+    html = google_flights_calendar_html_factory({d1: 523, d2: 1270, d3: None})
+
+    prices = PriceCalendarParser().parse(html)
+
+    assert prices == {d1: 523.0, d2: 1270.0}
+
+
+def test_parser_raises_when_no_priced_cell(google_flights_calendar_html_factory):
+    """Aucune cellule avec prix -> ParsingError."""
+    html = google_flights_calendar_html_factory({get_future_date(1).isoformat(): None})
+
+    with pytest.raises(ParsingError):
+        PriceCalendarParser().parse(html)
+
+
+def test_estimate_price_sums_segment_prices(combinations, segment_dates):
+    """Estimation = somme prix indicatifs, None si date inconnue."""
+    first, second = segment_dates
+    segment_prices = [{first[0]: 300.0}, {second[0]: 200.0}]
+
+    assert PriceCalendarService.estimate_price(combinations[0], segment_prices) == 500
+    assert PriceCalendarService.estimate_price(combinations[1], segment_prices) is None
+
+
+def test_filter_keeps_cheapest_fraction_with_margin(
+    test_settings, combinations, segment_dates
+):
+    """Garde ratio le moins cher + marge, ordonne par estimation croissante."""
+    first, second = segment_dates
+    segment_prices = [
+        {first[0]: 500.0, first[1]: 100.0, first[2]: 110.0, first[3]: 900.0},
+        {second[0]: 0.0, second[1]: 1000.0},
+    ]
+    settings = test_settings.model_copy(
+        update={
+            "PRICE_CALENDAR_CRAWL_RATIO": 0.125,
+            "PRICE_CALENDAR_SAFETY_MARGIN": 0.2,
+        }
+    )
+    with patch("app.services.price_calendar.get_settings", return_value=settings):
+        service = PriceCalendarService(crawler_service=AsyncMock())
+
+    selected = service.filter_by_estimate(combinations, segment_prices)
+
+    assert [c.segment_dates for c in selected] == [
+        [first[1], second[0]],
+        [first[2], second[0]],
+    ]
+
+
+def test_filter_keeps_unestimated_combinations(combinations, segment_dates):
+    """Combinaisons sans estimation conservees (jamais elaguees a l'aveugle)."""
+    first, second = segment_dates
+    service = PriceCalendarService(crawler_service=AsyncMock())
+
+    selected = service.filter_by_estimate(
+        combinations, [{first[0]: 100.0}, {second[0]: 100.0}]
+    )
+
+    assert combinations[0] in selected
+    assert len(selected) == len(combinations)
+
+
+@pytest.mark.asyncio
+async def test_select_promising_crawls_one_grid_per_segment(
+    combinations, segment_dates, google_flights_calendar_html_factory
+):
+    """Une grille crawlee par segment avec selecteur et JS dedies."""
+    first, second = segment_dates
+    grids = [
+        google_flights_calendar_html_factory(
+            {d: 100.0 * (i + 1) for i, d in enumerate(first)}
+        ),
+        google_flights_calendar_html_factory(dict.fromkeys(second, 50.0)),
+    ]
+    crawler = AsyncMock()
+    crawler.crawl_google_flights.side_effect = [
+        CrawlResult(success=True, html=html, status_code=200) for html in grids
+    ]
+    service = PriceCalendarService(crawler_service=crawler)
+
+    selected = await service.select_promising(
+        TEMPLATE_URL, combinations, asyncio.Semaphore(4)
+    )
+
+    assert crawler.crawl_google_flights.call_count == 2
+    call_kwargs = crawler.crawl_google_flights.call_args.kwargs
+    assert call_kwargs["wait_for_selector"] == "css:div[data-iso]"
+    assert call_kwargs["js_code"]
+    assert selected[0].segment_dates[0] == first[0]
+    assert len(selected) < len(combinations)
+
+
+@pytest.mark.asyncio
+async def test_select_promising_falls_back_when_grids_fail(combinations):
+    """Grilles indisponibles -> toutes combinaisons conservees."""
+    crawler = AsyncMock()
+    crawler.crawl_google_flights.side_effect = NetworkError(url="test")
+    service = PriceCalendarService(crawler_service=crawler)
+
+    selected = await service.select_promising(
+        TEMPLATE_URL, combinations, asyncio.Semaphore(4)
+    )
+
+    assert selected == combinations
+
+
+@pytest.mark.asyncio
+async def test_grid_crawls_wait_for_search_crawl_slots(
+    combinations, segment_dates, google_flights_calendar_html_factory, pipeline_metrics
+):
+    """Grilles crawlees sous les creneaux de la recherche, attente mesuree."""
+    first, second = segment_dates
+    slots = CrawlSlots(1)
+    running = peak = 0
+
+    async def crawl(url, **kwargs):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.001)
+        running -= 1
+        return CrawlResult(
+            success=True,
+            html=google_flights_calendar_html_factory(
+                dict.fromkeys(first + second, 50.0)
+            ),
+            status_code=200,
+        )
+
+    crawler = AsyncMock()
+    crawler.crawl_google_flights.side_effect = crawl
+    service = PriceCalendarService(crawler_service=crawler, metrics=pipeline_metrics)
+
+    await service.select_promising(
+        TEMPLATE_URL, combinations, slots.gate(interactive=True)
+    )
+
+    assert crawler.crawl_google_flights.call_count == 2
+    assert peak == 1
+    assert slots.in_use == 0
+    assert pipeline_metrics.queue_wait.count() == 2
+    assert pipeline_metrics.queued_combinations.value() == 0
@@ -0,0 +1,103 @@
+"""Tests unitaires PriceHistory et cle d'itineraire."""
+
+from datetime import date, timedelta
+
+import pytest
+
+from app.models import DateCombination
+from app.services import PriceHistory
+from app.utils import (
+    GoogleFlightsUrlError,
+    build_route_key,
+    generate_google_flights_url,
+)
+from tests.fixtures.helpers import TEMPLATE_URL
+
+TODAY = date(2026, 1, 5)  # lundi
+
+
+def combo(first_offset: int, second_offset: int) -> DateCombination:
+    """Combinaison 2 segments a J+offset depuis TODAY."""
+    return DateCombination(
+        segment_dates=[
+            (TODAY + timedelta(days=first_offset)).isoformat(),
+            (TODAY + timedelta(days=second_offset)).isoformat(),
+        ]
+    )
+
+
+def test_route_key_ignores_dates():
+    """Meme itineraire avec dates differentes : meme cle."""
+    other = generate_google_flights_url(TEMPLATE_URL, ["2026-03-10", "2026-03-20"])
+
+    assert build_route_key(other) == build_route_key(TEMPLATE_URL)
+
+
+def test_route_key_requires_tfs():
+    """URL sans tfs rejetee."""
+    with pytest.raises(GoogleFlightsUrlError):
+        build_route_key("https://www.google.com/travel/flights?hl=fr")
+
+
+def test_expected_price_unknown_route_is_none():
+    """Aucune estimation sans observation pour l'itineraire."""
+    assert PriceHistory().expected_price("route", combo(10, 20), today=TODAY) is None
+
+
+def test_expected_price_exact_observation():
+    """Combinaison deja observee : dernier prix retourne."""
+    history = PriceHistory()
+    history.record("route", combo(10, 20), 500.0, today=TODAY)
+    history.record("route", combo(10, 20), 450.0, today=TODAY)
+
+    assert history.expected_price("route", combo(10, 20), today=TODAY) == 450.0
+
+
+def test_same_observation_recorded_once():
+    """Observation resservie (meme horodatage) : moyennes inchangees."""
+    history = PriceHistory()
+    history.record("route", combo(10, 20), 500.0, observed_at=1.0, today=TODAY)
+    history.record("route", combo(10, 20), 500.0, observed_at=1.0, today=TODAY)
+    history.record("route", combo(10, 20), 300.0, observed_at=2.0, today=TODAY)
+
+    assert history._routes["route"].baseline.count == 2
+    assert history.expected_price("route", combo(10, 20), today=TODAY) == 300.0
+
+
+def test_expected_price_generalizes_by_weekday():
+    """Combinaison inedite estimee via jours de semaine deja observes."""
+    history = PriceHistory()
+    history.record("route", combo(1, 20), 300.0, today=TODAY)  # mardi
+    history.record("route", combo(4, 20), 900.0, today=TODAY)  # vendredi
+
+    tuesday = history.expected_price("route", combo(8, 20), today=TODAY)
+    friday = history.expected_price("route", combo(11, 20), today=TODAY)
+
+    assert tuesday is not None
+    assert friday is not None
+    assert tuesday < friday
+
+
+def test_prioritize_cheapest_first_unknown_last():
+    """Ordre par prix attendu croissant, itineraire inconnu : ordre conserve."""
+    history = PriceHistory()
+    cheap, expensive = combo(1, 20), combo(2, 20)
+    history.record("route", expensive, 800.0, today=TODAY)
+    history.record("route", cheap, 200.0, today=TODAY)
+    candidates = [combo(3, 21), expensive, combo(4, 22), cheap]
+
+    ordered = history.prioritize("route", candidates, today=TODAY)
+    expected = [history.expected_price("route", c, today=TODAY) for c in ordered]
+
+    assert ordered[0] == cheap
+    assert expected == sorted(expected)
+    assert history.prioritize("other", candidates, today=TODAY) == candidates
+
+
+def test_history_bounded_by_route_count():
+    """Itineraire le moins recent evince au-dela de max_routes."""
+    history = PriceHistory(max_routes=1)
+    history.record("a", combo(1, 20), 100.0, today=TODAY)
+    history.record("b", combo(1, 20), 100.0, today=TODAY)
+
+    assert history.expected_price("a", combo(1, 20), today=TODAY) is None
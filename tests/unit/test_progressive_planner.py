@@ -0,0 +1,110 @@
+"""Tests unitaires ProgressivePlanner."""
+
+from app.models import CombinationConstraints, CombinationResult
+from app.services import ProgressivePlanner
+from tests.fixtures.helpers import get_future_date
+
+
+def segment_dates(offset: int, days: int) -> list[str]:
+    """Dates ISO consecutives d'un segment."""
+    return [get_future_date(offset + i).isoformat() for i in range(days)]
+
+
+def results_priced_by(combinations, price_of, flight_dto_factory):
+    """CombinationResult avec prix calcule depuis la combinaison."""
+    return [
+        CombinationResult(
+            date_combination=combo,
+            best_flight=flight_dto_factory(price=price_of(combo)),
+        )
+        for combo in combinations
+    ]
+
+
+def test_initial_round_is_sparse_lattice():
+    """Une date sur 3 par segment, derniere date incluse."""
+    planner = ProgressivePlanner(
+        [segment_dates(1, 10), segment_dates(20, 7)], budget=200, stride=3
+    )
+
+    combinations = planner.initial_round()
+
+    first_dates = sorted({c.segment_dates[0] for c in combinations})
+    assert len(combinations) == 4 * 3
+    assert first_dates[0] == get_future_date(1).isoformat()
+    assert first_dates[-1] == get_future_date(10).isoformat()
+    assert planner.total_combinations == 70
+    assert planner.rounds == 1
+
+
+def test_initial_round_stride_widened_to_fit_budget():
+    """Treillis elargi pour tenir dans la moitie du budget sur 60 jours."""
+    planner = ProgressivePlanner(
+        [segment_dates(1, 61), segment_dates(70, 61), segment_dates(140, 61)],
+        budget=100,
+        stride=3,
+    )
+
+    combinations = planner.initial_round()
+
+    assert 0 < len(combinations) <= 50
+    assert planner.total_combinations == 61**3
+
+
+def test_initial_round_snapped_to_allowed_gaps(flight_dto_factory):
+    """Ecart impose d'une nuit : treillis recale, rounds suivants possibles."""
+    dates = segment_dates(1, 30)
+    planner = ProgressivePlanner(
+        [dates, dates],
+        budget=20,
+        stride=3,
+        constraints=CombinationConstraints(min_nights_between=1, max_nights_between=1),
+    )
+
+    combinations = planner.initial_round()
+    results = results_priced_by(combinations, lambda _: 100.0, flight_dto_factory)
+
+    assert planner.total_combinations == 29
+    assert combinations
+    assert all(
+        dates.index(second) == dates.index(first) + 1
+        for first, second in (c.segment_dates for c in combinations)
+    )
+    assert planner.next_round(results)
+
+
+def test_refinement_converges_to_cheapest_region(flight_dto_factory):
+    """Rounds successifs resserres autour du minimum, budget respecte."""
+    first, second = segment_dates(1, 30), segment_dates(40, 30)
+    target = (first[17], second[8])
+
+    def price_of(combo):
+        a, b = combo.segment_dates
+        return 100.0 + abs(first.index(a) - 17) * 10 + abs(second.index(b) - 8) * 10
+
+    planner = ProgressivePlanner([first, second], budget=120, stride=4)
+    results = []
+    combinations = planner.initial_round()
+    crawled = 0
+    while combinations:
+        crawled += len(combinations)
+        results.extend(results_priced_by(combinations, price_of, flight_dto_factory))
+        combinations = planner.next_round(results)
+
+    best = min(results, key=lambda r: r.best_flight.price)
+    assert tuple(best.date_combination.segment_dates) == target
+    assert crawled <= 120
+    assert planner.rounds > 1
+
+
+def test_next_round_empty_when_budget_exhausted(flight_dto_factory):
+    """Aucun nouveau round une fois le budget consomme."""
+    planner = ProgressivePlanner(
+        [segment_dates(1, 10), segment_dates(20, 10)], budget=4, stride=3
+    )
+    combinations = planner.initial_round()
+
+    results = results_priced_by(combinations, lambda _: 100.0, flight_dto_factory)
+
+    assert len(combinations) == 4
+    assert planner.next_round(results) == []
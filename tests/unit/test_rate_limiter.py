@@ -0,0 +1,106 @@
+"""Tests unitaires RateLimiter et TokenBucket."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services import RateLimiter
+from app.services.rate_limiter import TokenBucket
+
+
+@pytest.fixture
+def rate_limiter() -> RateLimiter:
+    """Global 100/s, 1 req/s par proxy (rafale 1), plancher 0.2/s."""
+    return RateLimiter(
+        global_rate_per_s=100.0,
+        global_burst=100,
+        proxy_rate_per_s=1.0,
+        proxy_burst=1,
+        min_proxy_rate_per_s=0.2,
+        increase_per_s=0.1,
+    )
+
+
+def test_token_bucket_burst_then_paced() -> None:
+    """Rafale servie immediatement, puis une requete toutes les 1/rate s."""
+    bucket = TokenBucket(rate_per_s=2.0, burst=2)
+
+    waits = [bucket.reserve() for _ in range(4)]
+
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] == pytest.approx(0.5, abs=0.01)
+    assert waits[3] == pytest.approx(1.0, abs=0.01)
+
+
+@pytest.mark.asyncio
+async def test_acquire_waits_for_proxy_bucket(rate_limiter, mock_proxy_pool) -> None:
+    """Bucket de la sortie epuise : attente, autres sorties non affectees."""
+    with patch("asyncio.sleep", new_callable=AsyncMock) as sleep:
+        assert await rate_limiter.acquire(mock_proxy_pool[0]) == 0.0
+        assert await rate_limiter.acquire(mock_proxy_pool[1]) == 0.0
+        waited = await rate_limiter.acquire(mock_proxy_pool[0])
+
+    assert waited == pytest.approx(1.0, abs=0.01)
+    sleep.assert_awaited_once_with(waited)
+
+
+@pytest.mark.asyncio
+async def test_rotating_gateway_only_paced_globally(mock_proxy_pool) -> None:
+    """Passerelle rotative : pas de bucket par sortie, debit global seul."""
+    gateway, sticky = mock_proxy_pool[0], mock_proxy_pool[1]
+    rate_limiter = RateLimiter(
+        global_rate_per_s=100.0,
+        global_burst=100,
+        proxy_rate_per_s=1.0,
+        proxy_burst=1,
+        min_proxy_rate_per_s=0.2,
+        increase_per_s=0.1,
+        rotating_gateways=[gateway],
+    )
+
+    with patch("asyncio.sleep", new_callable=AsyncMock):
+        gateway_waits = [await rate_limiter.acquire(gateway) for _ in range(5)]
+        sticky_waits = [await rate_limiter.acquire(sticky) for _ in range(2)]
+    rate_limiter.record_throttled(gateway)
+
+    assert gateway_waits == [0.0] * 5
+    assert sticky_waits[1] == pytest.approx(1.0, abs=0.01)
+    assert rate_limiter.proxy_rate_per_s(gateway) is None
+
+
+@pytest.mark.asyncio
+async def test_cancelled_wait_refunds_tokens(rate_limiter, mock_proxy_pool) -> None:
+    """Attente annulee : jetons rendus, l'appelant suivant n'attend pas plus."""
+    proxy = mock_proxy_pool[0]
+    await rate_limiter.acquire(proxy)
+    waiting = asyncio.create_task(rate_limiter.acquire(proxy))
+    await asyncio.sleep(0)
+
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    with patch("asyncio.sleep", new_callable=AsyncMock):
+        waited = await rate_limiter.acquire(proxy)
+
+    assert waited == pytest.approx(1.0, abs=0.01)
+
+
+def test_throttling_halves_rate_and_successes_recover(
+    rate_limiter, mock_proxy_pool
+) -> None:
+    """429 : debit divise par deux (plancher), succes : remontee additive."""
+    proxy = mock_proxy_pool[0]
+
+    for _ in range(4):
+        rate_limiter.record_throttled(proxy)
+    assert rate_limiter.proxy_rate_per_s(proxy) == 0.2
+
+    for _ in range(3):
+        rate_limiter.record_success(proxy)
+    assert rate_limiter.proxy_rate_per_s(proxy) == pytest.approx(0.5)
+
+    for _ in range(10):
+        rate_limiter.record_success(proxy)
+    assert rate_limiter.proxy_rate_per_s(proxy) == 1.0
+    assert rate_limiter.proxy_rate_per_s(mock_proxy_pool[1]) == 1.0
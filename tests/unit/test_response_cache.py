@@ -0,0 +1,279 @@
+"""Tests unitaires ResponseCache (memoisation stale-while-revalidate)."""
+
+import asyncio
+import time
+
+import pytest
+
+from app.exceptions import IdempotencyKeyReusedError
+from app.models import (
+    FlightCombinationResult,
+    SearchRequest,
+    SearchResponse,
+    SearchStats,
+)
+from app.services import ResponseCache
+
+
+@pytest.fixture
+def cache():
+    """Cache 60s frais / 300s stale."""
+    return ResponseCache(fresh_s=60, stale_s=300)
+
+
+@pytest.fixture
+def response_factory(flight_dto_factory):
+    """Factory SearchResponse (1 resultat par defaut)."""
+
+    def _create(search_time_ms=1, results_count=1, crawls_cancelled=0):
+        results = [
+            FlightCombinationResult(
+                segment_dates=["2026-01-01", "2026-01-15"],
+                flights=[flight_dto_factory()],
+            )
+            for _ in range(results_count)
+        ]
+        return SearchResponse(
+            results=results,
+            search_stats=SearchStats(
+                total_results=results_count,
+                search_time_ms=search_time_ms,
+                segments_count=2,
+                crawls_cancelled=crawls_cancelled,
+            ),
+        )
+
+    return _create
+
+
+@pytest.fixture
+def request_and_compute(search_request_factory, response_factory):
+    """SearchRequest + compute comptant ses appels."""
+    request = search_request_factory()
+    calls = [0]
+
+    async def compute():
+        calls[0] += 1
+        return response_factory(search_time_ms=calls[0])
+
+    return request, compute, calls
+
+
+def _age_entries(cache: ResponseCache, seconds: float) -> None:
+    """Vieillit artificiellement toutes les entrees."""
+    for entry in cache._entries.values():
+        entry.stored_at = time.time() - seconds
+
+
+def test_hash_request_canonical(search_request_factory):
+    """Hash identique pour requetes identiques (ordre des cles JSON ignore)."""
+    data = search_request_factory(as_dict=True)
+    reordered = {
+        "segments_date_ranges": [
+            {"end": seg["end"], "start": seg["start"]}
+            for seg in data["segments_date_ranges"]
+        ],
+        "template_url": data["template_url"],
+    }
+
+    assert ResponseCache.hash_request(
+        SearchRequest(**data)
+    ) == ResponseCache.hash_request(SearchRequest(**reordered))
+    assert ResponseCache.hash_request(
+        SearchRequest(**data)
+    ) != ResponseCache.hash_request(search_request_factory(days_segment1=3))
+
+
+@pytest.mark.asyncio
+async def test_miss_then_fresh_hit(cache, request_and_compute):
+    """Premier appel calcule, second servi depuis le cache."""
+    request, compute, calls = request_and_compute
+
+    first = await cache.get_or_compute(request, compute)
+    second = await cache.get_or_compute(request, compute)
+
+    assert first.status == "miss"
+    assert second.status == "hit"
+    assert second.response is first.response
+    assert calls[0] == 1
+
+
+@pytest.mark.asyncio
+async def test_bypass_computes_without_reading_or_storing(cache, request_and_compute):
+    """bypass : calcul systematique, reponse non memorisee."""
+    request, compute, calls = request_and_compute
+
+    await cache.get_or_compute(request, compute)
+    bypassed = await cache.get_or_compute(request, compute, bypass=True)
+    after = await cache.get_or_compute(request, compute)
+
+    assert bypassed.status == "bypass"
+    assert after.status == "hit"
+    assert after.response is not bypassed.response
+    assert calls[0] == 2
+
+
+@pytest.mark.asyncio
+async def test_stale_returns_stored_and_refreshes_in_background(
+    cache, request_and_compute
+):
+    """Fenetre stale : reponse stockee retournee puis rafraichie."""
+    request, compute, calls = request_and_compute
+    first = await cache.get_or_compute(request, compute)
+    _age_entries(cache, 120)
+
+    stale = await cache.get_or_compute(request, compute)
+    await asyncio.sleep(0.01)
+    refreshed = await cache.get_or_compute(request, compute)
+
+    assert stale.status == "stale"
+    assert stale.response is first.response
+    assert stale.age_s >= 120
+    assert refreshed.status == "hit"
+    assert refreshed.response.search_stats.search_time_ms == 2
+    assert calls[0] == 2
+
+
+@pytest.mark.asyncio
+async def test_stale_refresh_deduplicated(cache, request_and_compute):
+    """Plusieurs lectures stale -> un seul refresh arriere-plan."""
+    request, compute, calls = request_and_compute
+    await cache.get_or_compute(request, compute)
+    _age_entries(cache, 120)
+
+    for _ in range(3):
+        await cache.get_or_compute(request, compute)
+    await asyncio.sleep(0.01)
+
+    assert calls[0] == 2
+
+
+@pytest.mark.asyncio
+async def test_expired_entry_recomputed(cache, request_and_compute):
+    """Au-dela des fenetres fraiche + stale : recalcul synchrone."""
+    request, compute, calls = request_and_compute
+    await cache.get_or_compute(request, compute)
+    _age_entries(cache, 1000)
+
+    lookup = await cache.get_or_compute(request, compute)
+
+    assert lookup.status == "miss"
+    assert calls[0] == 2
+
+
+@pytest.mark.asyncio
+async def test_idempotency_key_reused_with_other_request_rejected(
+    cache, request_and_compute, search_request_factory
+):
+    """Idempotency-Key reutilisee avec une autre requete leve une erreur."""
+    request, compute, _ = request_and_compute
+    await cache.get_or_compute(request, compute, idempotency_key="abc")
+
+    with pytest.raises(IdempotencyKeyReusedError):
+        await cache.get_or_compute(
+            search_request_factory(days_segment1=4),
+            compute,
+            idempotency_key="abc",
+        )
+
+
+@pytest.mark.asyncio
+async def test_expired_idempotency_entry_reusable_with_other_request(
+    cache, request_and_compute, search_request_factory
+):
+    """Entree expiree : Idempotency-Key reutilisable pour une autre requete."""
+    request, compute, calls = request_and_compute
+    await cache.get_or_compute(request, compute, idempotency_key="abc")
+    _age_entries(cache, 1000)
+
+    lookup = await cache.get_or_compute(
+        search_request_factory(days_segment1=4), compute, idempotency_key="abc"
+    )
+
+    assert lookup.status == "miss"
+    assert calls[0] == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("results_count", "crawls_cancelled"),
+    [(0, 0), (1, 3)],
+    ids=["empty", "cancelled_crawls"],
+)
+async def test_partial_response_not_stored(
+    cache, search_request_factory, response_factory, results_count, crawls_cancelled
+):
+    """Reponse vide ou avec crawls annules (deadline) : jamais memorisee."""
+    request = search_request_factory()
+
+    async def compute():
+        return response_factory(
+            results_count=results_count, crawls_cancelled=crawls_cancelled
+        )
+
+    await cache.get_or_compute(request, compute)
+    lookup = await cache.get_or_compute(request, compute)
+
+    assert lookup.status == "miss"
+    assert cache._entries == {}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_compute(cache, request_and_compute):
+    """Misses concurrents d'une meme cle : un seul calcul partage."""
+    request, compute, calls = request_and_compute
+    release = asyncio.Event()
+
+    async def slow_compute():
+        await release.wait()
+        return await compute()
+
+    lookups = [
+        asyncio.create_task(cache.get_or_compute(request, slow_compute))
+        for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    first, second, third = await asyncio.gather(*lookups)
+
+    assert calls[0] == 1
+    assert first.response is second.response is third.response
+    assert {first.status, second.status, third.status} == {"miss"}
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_compute(
+    cache, request_and_compute
+):
+    """Annulation du premier appelant : le calcul partage se poursuit."""
+    request, compute, calls = request_and_compute
+    release = asyncio.Event()
+
+    async def slow_compute():
+        await release.wait()
+        return await compute()
+
+    leader = asyncio.create_task(cache.get_or_compute(request, slow_compute))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(cache.get_or_compute(request, slow_compute))
+    await asyncio.sleep(0)
+    leader.cancel()
+    release.set()
+    lookup = await follower
+
+    assert leader.cancelled()
+    assert lookup.status == "miss"
+    assert calls[0] == 1
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache_always_computes(request_and_compute):
+    """Fenetres a 0 : memoisation desactivee."""
+    cache = ResponseCache(fresh_s=0, stale_s=0)
+    request, compute, calls = request_and_compute
+
+    await cache.get_or_compute(request, compute)
+    lookup = await cache.get_or_compute(request, compute)
+
+    assert lookup.status == "miss"
+    assert calls[0] == 2
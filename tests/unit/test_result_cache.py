@@ -0,0 +1,204 @@
+"""Tests unitaires ResultCache (local + backend RESP partagé)."""
+
+import asyncio
+import logging
+import time
+
+import pytest
+
+from app.models import CachedFlight
+from app.services import ResultCache
+from app.services.result_cache import LEASE_KEY_PREFIX, RESULT_KEY_PREFIX
+from app.utils.resp_client import RespClient
+from tests.fixtures.helpers import BASE_URL
+
+
+@pytest.fixture
+def replicas(resp_server):
+    """Deux caches (replicas) partageant le meme serveur RESP."""
+    return (
+        ResultCache(ttl_s=60, remote=RespClient(resp_server.url)),
+        ResultCache(ttl_s=60, remote=RespClient(resp_server.url)),
+    )
+
+
+@pytest.mark.asyncio
+async def test_local_cache_set_then_get(flight_dto_factory):
+    """Cache local seul retourne le vol enregistre."""
+    cache = ResultCache(ttl_s=60)
+
+    await cache.set(BASE_URL, flight_dto_factory(price=750.0))
+    entry = await cache.get(BASE_URL)
+
+    assert entry is not None
+    assert entry.best_flight.price == 750.0
+    assert cache.remote_available is False
+
+
+@pytest.mark.asyncio
+async def test_local_cache_entry_expires(flight_dto_factory):
+    """Entree plus vieille que le TTL ignoree."""
+    cache = ResultCache(ttl_s=60)
+    entry = await cache.set(BASE_URL, flight_dto_factory())
+    entry.cached_at = time.time() - 120
+
+    assert await cache.get(BASE_URL) is None
+
+
+@pytest.mark.asyncio
+async def test_local_cache_lru_eviction(flight_dto_factory):
+    """Entrees les plus anciennes evincees au-dela de max_local_entries."""
+    cache = ResultCache(ttl_s=60, max_local_entries=2)
+
+    for i in range(3):
+        await cache.set(f"{BASE_URL}?i={i}", flight_dto_factory())
+
+    assert await cache.get(f"{BASE_URL}?i=0") is None
+    assert await cache.get(f"{BASE_URL}?i=2") is not None
+
+
+@pytest.mark.asyncio
+async def test_remote_cache_shared_between_replicas(
+    replicas, resp_server, flight_dto_factory
+):
+    """Resultat ecrit par un replica visible par l'autre via le backend."""
+    replica_a, replica_b = replicas
+
+    await replica_a.set(BASE_URL, flight_dto_factory(price=640.0))
+    entry = await replica_b.get(BASE_URL)
+
+    assert entry is not None
+    assert entry.best_flight.price == 640.0
+    stored = resp_server.get_value(RESULT_KEY_PREFIX + BASE_URL)
+    assert CachedFlight.model_validate_json(stored).best_flight.price == 640.0
+
+
+@pytest.mark.asyncio
+async def test_lease_exclusive_across_replicas(replicas, resp_server):
+    """Un seul replica obtient le lease, libere apres release."""
+    replica_a, replica_b = replicas
+
+    token = await replica_a.acquire_lease(BASE_URL)
+
+    assert token is not None
+    assert await replica_b.acquire_lease(BASE_URL) is None
+
+    await replica_a.release_lease(BASE_URL, token)
+
+    assert resp_server.get_value(LEASE_KEY_PREFIX + BASE_URL) is None
+    assert await replica_b.acquire_lease(BASE_URL) is not None
+
+
+@pytest.mark.asyncio
+async def test_release_lease_ignores_foreign_token(replicas, resp_server):
+    """Release avec token different ne supprime pas le lease."""
+    replica_a, replica_b = replicas
+    await replica_a.acquire_lease(BASE_URL)
+
+    await replica_b.release_lease(BASE_URL, "other-token")
+
+    assert resp_server.get_value(LEASE_KEY_PREFIX + BASE_URL) is not None
+
+
+@pytest.mark.asyncio
+async def test_wait_for_result_returns_other_replica_result(
+    replicas, flight_dto_factory
+):
+    """Replica en attente recoit le resultat du replica detenteur du lease."""
+    replica_a, replica_b = replicas
+    token = await replica_a.acquire_lease(BASE_URL)
+
+    async def finish_crawl():
+        await asyncio.sleep(0.05)
+        await replica_a.set(
+            BASE_URL, flight_dto_factory(price=555.0), lease_token=token
+        )
+        await replica_a.release_lease(BASE_URL, token)
+
+    task = asyncio.create_task(finish_crawl())
+    entry = await replica_b.wait_for_result(BASE_URL, timeout_s=2, poll_interval_s=0.02)
+    await task
+
+    assert entry is not None
+    assert entry.best_flight.price == 555.0
+
+
+@pytest.mark.asyncio
+async def test_wait_for_result_ignores_entry_being_refreshed(
+    replicas, flight_dto_factory
+):
+    """Entree anterieure a l'attente (locale) ignoree : seul le rafraichissement compte."""
+    replica_a, replica_b = replicas
+    stale = await replica_b.set(BASE_URL, flight_dto_factory(price=100.0))
+    stale.cached_at = time.time() - 30
+    token = await replica_a.acquire_lease(BASE_URL)
+
+    async def refresh():
+        await asyncio.sleep(0.05)
+        await replica_a.set(
+            BASE_URL, flight_dto_factory(price=555.0), lease_token=token
+        )
+        await replica_a.release_lease(BASE_URL, token)
+
+    task = asyncio.create_task(refresh())
+    entry = await replica_b.wait_for_result(BASE_URL, timeout_s=2, poll_interval_s=0.02)
+    await task
+
+    assert entry is not None
+    assert entry.best_flight.price == 555.0
+
+
+@pytest.mark.asyncio
+async def test_wait_for_result_tolerates_clock_skew(replicas, flight_dto_factory):
+    """Horloge du detenteur en retard : entree reconnue par son lease."""
+    replica_a, replica_b = replicas
+    token = await replica_a.acquire_lease(BASE_URL)
+
+    async def finish_crawl():
+        await asyncio.sleep(0.05)
+        entry = CachedFlight(
+            best_flight=flight_dto_factory(price=555.0),
+            cached_at=time.time() - 20,
+            lease_token=token,
+        )
+        await replica_a._remote_set(BASE_URL, entry)
+
+    task = asyncio.create_task(finish_crawl())
+    entry = await replica_b.wait_for_result(BASE_URL, timeout_s=2, poll_interval_s=0.02)
+    await task
+
+    assert entry is not None
+    assert entry.best_flight.price == 555.0
+
+
+@pytest.mark.asyncio
+async def test_wait_for_result_none_when_lease_released_without_result(replicas):
+    """Lease libere sans resultat (crawl echoue) retourne None."""
+    replica_a, replica_b = replicas
+    token = await replica_a.acquire_lease(BASE_URL)
+    await replica_a.release_lease(BASE_URL, token)
+
+    entry = await replica_b.wait_for_result(BASE_URL, timeout_s=1, poll_interval_s=0.01)
+
+    assert entry is None
+
+
+@pytest.mark.asyncio
+async def test_unreachable_backend_degrades_to_local_only(
+    resp_server, flight_dto_factory, caplog
+):
+    """Backend injoignable : warning, lease accorde et cache local utilise."""
+    url = resp_server.url
+    await resp_server.stop()
+    cache = ResultCache(ttl_s=60, remote=RespClient(url, timeout_s=0.5))
+
+    with caplog.at_level(logging.WARNING):
+        token = await cache.acquire_lease(BASE_URL)
+        await cache.set(BASE_URL, flight_dto_factory(price=420.0))
+        entry = await cache.get(BASE_URL)
+
+    assert token is not None
+    assert entry is not None
+    assert entry.best_flight.price == 420.0
+    assert cache.remote_available is False
+    assert any("local-only" in record.message for record in caplog.records)
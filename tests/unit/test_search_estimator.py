@@ -0,0 +1,85 @@
+"""Tests unitaires SearchEstimator."""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.services import CombinationGenerator, SearchEstimator
+from app.utils import generate_google_flights_url
+
+
+@pytest.fixture(autouse=True)
+def mock_settings(test_settings):
+    """Mock get_settings pour tous les tests du module (CI compatibility)."""
+    with patch(
+        "app.services.search_estimator.get_settings", return_value=test_settings
+    ):
+        yield
+
+
+@pytest.fixture
+def search_estimator(crawl_stats, admission_controller, result_cache):
+    """SearchEstimator avec statistiques et cache isoles."""
+    return SearchEstimator(
+        combination_generator=CombinationGenerator(),
+        crawl_stats=crawl_stats,
+        admission_controller=admission_controller,
+        result_cache=result_cache,
+    )
+
+
+@pytest.mark.asyncio
+async def test_estimate_uses_live_latency_and_size(
+    search_estimator, crawl_stats, search_request_factory
+):
+    """ETA et volume calcules depuis latences et tailles mesurees."""
+    crawl_stats.record(4.0, size_bytes=200_000)
+    request = search_request_factory(days_segment1=4, days_segment2=3)
+
+    estimate = await search_estimator.estimate(request)
+
+    assert estimate.combinations_total == 20
+    assert estimate.expected_crawls == 20
+    assert estimate.expected_bytes == 20 * 200_000
+    assert estimate.queue_wait_s == 0
+    assert estimate.eta_s == 2 * 4.0
+
+
+@pytest.mark.asyncio
+async def test_estimate_excludes_cached_combinations(
+    search_estimator, result_cache, flight_dto_factory, search_request_factory
+):
+    """Combinaisons en cache non comptees dans les crawls attendus."""
+    request = search_request_factory(days_segment1=1, days_segment2=1)
+    first = CombinationGenerator().generate_combinations(request.segments_date_ranges)[
+        0
+    ]
+    await result_cache.set(
+        generate_google_flights_url(request.template_url, first.segment_dates),
+        flight_dto_factory(),
+    )
+
+    estimate = await search_estimator.estimate(request)
+
+    assert estimate.cached_combinations == 1
+    assert estimate.expected_crawls == 3
+
+
+@pytest.mark.asyncio
+async def test_estimate_includes_queue_wait_and_mode_specific_crawls(
+    search_estimator, admission_controller, search_request_factory
+):
+    """Attente due aux crawls en cours, crawls calendar et progressive bornes."""
+    admission_controller.inflight_crawls = 50
+    request = search_request_factory(days_segment1=9, days_segment2=9)
+
+    calendar = await search_estimator.estimate(
+        request.model_copy(update={"mode": "calendar"})
+    )
+    progressive = await search_estimator.estimate(
+        request.model_copy(update={"mode": "progressive"})
+    )
+
+    assert calendar.queue_wait_s == 5.0
+    assert calendar.expected_crawls == 2 + 10
+    assert progressive.expected_crawls == 100
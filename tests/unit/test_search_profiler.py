@@ -0,0 +1,105 @@
+"""Tests unitaires SearchProfiler."""
+
+import asyncio
+import pstats
+from unittest.mock import patch
+
+import pytest
+
+from app.core import Settings
+from app.services import SearchProfiler, get_search_profiler
+
+
+def _parse_heavy_page() -> int:
+    """Charge CPU identifiable dans le profil."""
+    return sum(len(str(i)) for i in range(20_000))
+
+
+async def _profiled_search() -> int:
+    """Recherche simulee : charge CPU dans une sous-tache et apres une attente."""
+    task = asyncio.create_task(asyncio.to_thread(int))
+    await asyncio.sleep(0)
+    await task
+    return await asyncio.create_task(_parse_in_subtask())
+
+
+async def _parse_in_subtask() -> int:
+    """Sous-tache de la recherche (herite du contexte profile)."""
+    await asyncio.sleep(0)
+    return _parse_heavy_page()
+
+
+def _concurrent_work() -> int:
+    """Charge CPU d'une autre recherche, absente du profil."""
+    return sum(len(str(i)) for i in range(20_000))
+
+
+async def _other_search(stop: asyncio.Event) -> None:
+    """Recherche concurrente non profilee sur la meme boucle."""
+    while not stop.is_set():
+        _concurrent_work()
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_profile_report_and_pstats_dump(tmp_path) -> None:
+    """Profil stocke par search id : rapport texte et fichier pstats relisible."""
+    profiler = SearchProfiler(max_profiles=5)
+
+    assert await profiler.run("abc", _profiled_search()) > 0
+
+    report = profiler.report("abc")
+    assert report is not None
+    assert "_parse_heavy_page" in report
+    dump = profiler.pstats_dump("abc")
+    assert dump is not None
+    path = tmp_path / "abc.pstats"
+    path.write_bytes(dump)
+    functions = {name for _, _, name in pstats.Stats(str(path)).stats}
+    assert "_parse_heavy_page" in functions
+    assert profiler.report("unknown") is None
+
+
+@pytest.mark.asyncio
+async def test_profile_excludes_concurrent_tasks() -> None:
+    """Taches concurrentes de la boucle hors du profil, profils paralleles."""
+    profiler = SearchProfiler(max_profiles=5)
+    stop = asyncio.Event()
+    other = asyncio.create_task(_other_search(stop))
+
+    await asyncio.gather(
+        profiler.run("first", _profiled_search()),
+        profiler.run("second", _profiled_search()),
+    )
+    stop.set()
+    await other
+
+    for search_id in ("first", "second"):
+        report = profiler.report(search_id)
+        assert report is not None
+        assert "_parse_heavy_page" in report
+        assert "_concurrent_work" not in report
+
+
+@pytest.mark.asyncio
+async def test_oldest_profile_evicted() -> None:
+    """Au-dela de max_profiles, le plus ancien profil est evince."""
+    profiler = SearchProfiler(max_profiles=1)
+    for search_id in ("a", "b"):
+        await profiler.run(search_id, _profiled_search())
+
+    assert profiler.pstats_dump("a") is None
+    assert profiler.pstats_dump("b") is not None
+
+
+def test_profiling_disabled_without_token() -> None:
+    """PROFILING_TOKEN absent : pas de profiler partage."""
+    settings = Settings(
+        DECODO_USERNAME="customer-test-country-FR", DECODO_PASSWORD="test_password"
+    )
+    get_search_profiler.cache_clear()
+    try:
+        with patch("app.services.search_profiler.get_settings", return_value=settings):
+            assert get_search_profiler() is None
+    finally:
+        get_search_profiler.cache_clear()
@@ -1,16 +1,42 @@
 """Tests unitaires SearchService async."""
 
+import asyncio
 import logging
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from app.exceptions import CaptchaDetectedError, NetworkError
-from app.models import SearchResponse
-from app.services import SearchService
+from app.models import (
+    CachedFlight,
+    CombinationConstraints,
+    DateRange,
+    SearchRequest,
+    SearchResponse,
+)
+from app.services import (
+    CheckpointStore,
+    CombinationGenerator,
+    CrawlCoalescer,
+    CrawlResult,
+    CrawlSlots,
+    CrawlTimings,
+    PipelineMetrics,
+    PriceHistory,
+    ResponseCache,
+    ResultCache,
+    SearchService,
+    SearchTrace,
+    tracing,
+)
+from app.services.search_service import SearchProgress
+from app.utils import build_route_key
+from app.utils.resp_client import RespClient
 from tests.fixtures.helpers import (
+    TEMPLATE_URL,
     assert_results_sorted_by_price,
     create_date_combinations,
+    get_future_date,
 )
 
 
@@ -418,3 +444,760 @@ async def test_search_flights_less_than_10_results(
     response = await service.search_flights(valid_search_request)
 
     assert len(response.results) == 5
+
+
+@pytest.mark.asyncio
+async def test_search_flights_serves_cached_combinations(
+    mock_combination_generator,
+    mock_crawler_service,
+    flight_parser_mock_10_flights_factory,
+    flight_dto_factory,
+    valid_search_request,
+    mock_generate_google_flights_url,
+):
+    """Combinaisons en cache non recrawlees et comptees dans search_stats."""
+    mock_combination_generator.generate_combinations.return_value = (
+        create_date_combinations(3)
+    )
+    result_cache = ResultCache(ttl_s=60)
+    await result_cache.set(
+        mock_generate_google_flights_url.return_value,
+        flight_dto_factory(price=321.0),
+    )
+    service = SearchService(
+        combination_generator=mock_combination_generator,
+        crawler_service=mock_crawler_service,
+        flight_parser=flight_parser_mock_10_flights_factory,
+        result_cache=result_cache,
+    )
+
+    response = await service.search_flights(valid_search_request)
+
+    mock_crawler_service.crawl_google_flights.assert_not_called()
+    assert response.search_stats.cache_hits == 3
+    assert all(r.flights[0].price == 321.0 for r in response.results)
+
+
+@pytest.mark.asyncio
+async def test_search_flights_attributes_cache_hits_to_prefetcher(
+    mock_combination_generator,
+    mock_crawler_service,
+    flight_parser_mock_10_flights_factory,
+    flight_dto_factory,
+    valid_search_request,
+    mock_generate_google_flights_url,
+):
+    """Hit cache signale au prefetcher (attribution de la latence epargnee)."""
+    mock_combination_generator.generate_combinations.return_value = (
+        create_date_combinations(2)
+    )
+    url = mock_generate_google_flights_url.return_value
+    result_cache = ResultCache(ttl_s=60)
+    await result_cache.set(url, flight_dto_factory(price=321.0))
+    prefetcher = MagicMock()
+    service = SearchService(
+        combination_generator=mock_combination_generator,
+        crawler_service=mock_crawler_service,
+        flight_parser=flight_parser_mock_10_flights_factory,
+        result_cache=result_cache,
+        prefetcher=prefetcher,
+    )
+
+    await service.search_flights(valid_search_request)
+
+    assert prefetcher.record_hit.call_args_list == [((url,),), ((url,),)]
+
+
+@pytest.mark.asyncio
+async def test_search_flights_populates_result_cache(
+    mock_combination_generator,
+    mock_crawler_service,
+    flight_parser_mock_10_flights_factory,
+    valid_search_request,
+):
+    """Meilleur vol parse enregistre dans le cache de resultats."""
+    combinations = create_date_combinations(2)
+    mock_combination_generator.generate_combinations.return_value = combinations
+    result_cache = ResultCache(ttl_s=60)
+    service = SearchService(
+        combination_generator=mock_combination_generator,
+        crawler_service=mock_crawler_service,
+        flight_parser=flight_parser_mock_10_flights_factory,
+        result_cache=result_cache,
+    )
+
+    response = await service.search_flights(valid_search_request)
+
+    url = service._build_google_flights_url(valid_search_request, combinations[0])
+    entry = await result_cache.get(url)
+    assert entry is not None
+    assert entry.best_flight.price == 1000.0
+    assert response.search_stats.cache_hits == 0
+
+
+@pytest.mark.asyncio
+async def test_search_flights_takes_lease_only_once_slot_acquired(
+    mock_combination_generator,
+    mock_crawler_service,
+    mock_crawl_result,
+    flight_parser_mock_10_flights_factory,
+    valid_search_request,
+    resp_server,
+):
+    """URL encore en file : aucun lease distribue pris pour elle."""
+    combinations = create_date_combinations(2)
+    mock_combination_generator.generate_combinations.return_value = combinations
+    result_cache = ResultCache(ttl_s=60, remote=RespClient(resp_server.url))
+    crawling = asyncio.Event()
+    proceed = asyncio.Event()
+
+    async def blocking_crawl(url, use_proxy=True):
+        crawling.set()
+        await proceed.wait()
+        return mock_crawl_result
+
+    mock_crawler_service.crawl_google_flights.side_effect = blocking_crawl
+    service = SearchService(
+        combination_generator=mock_combination_generator,
+        crawler_service=mock_crawler_service,
+        flight_parser=flight_parser_mock_10_flights_factory,
+        result_cache=result_cache,
+        crawl_slots=CrawlSlots(1),
+    )
+    urls = [
+        service._build_google_flights_url(valid_search_request, combination)
+        for combination in combinations
+    ]
+
+    search = asyncio.create_task(service.search_flights(valid_search_request))
+    await crawling.wait()
+    holders = [await result_cache._remote_lease_token(url) for url in urls]
+    proceed.set()
+    response = await search
+
+    assert sum(holder is not None for holder in holders) == 1
+    assert len(response.results) == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_searches_coalesce_identical_crawls(
+    mock_combination_generator,
+    mock_crawler_service,
+    mock_crawl_result,
+    flight_parser_mock_10_flights_factory,
+    valid_search_request,
+):
+    """Deux recherches concurrentes partagent les crawls des memes URLs."""
+    mock_combination_generator.generate_combinations.return_value = (
+        create_date_combinations(4)
+    )
+
+    async def slow_crawl(url, use_proxy=True):
+        await asyncio.sleep(0.01)
+        return mock_crawl_result
+
+    mock_crawler_service.crawl_google_flights.side_effect = slow_crawl
+    coalescer = CrawlCoalescer()
+    services = [
+        SearchService(
+            combination_generator=mock_combination_generator,
+            crawler_service=mock_crawler_service,
+            flight_parser=flight_parser_mock_10_flights_factory,
+            crawl_coalescer=coalescer,
+        )
+        for _ in range(2)
+    ]
+
+    responses = await asyncio.gather(
+        *(service.search_flights(valid_search_request) for service in services)
+    )
+
+    assert mock_crawler_service.crawl_google_flights.call_count == 4
+    assert sum(r.search_stats.coalesced_crawls for r in responses) == 4
+    assert all(len(r.results) == 4 for r in responses)
+
+
+@pytest.mark.asyncio
+async def test_coalesced_crawl_independent_of_first_requester(
+    mock_combination_generator,
+    mock_crawler_service,
+    mock_crawl_result,
+    flight_parser_mock_10_flights_factory,
+):
+    """Crawl partage hors du semaphore du premier demandeur, compteurs par demandeur."""
+    crawling = asyncio.Event()
+
+    async def slow_crawl(url, use_proxy=True):
+        crawling.set()
+        await asyncio.sleep(0.01)
+        return mock_crawl_result
+
+    mock_crawler_service.crawl_google_flights.side_effect = slow_crawl
+    slots = CrawlSlots(2)
+    service = SearchService(
+        combination_generator=mock_combination_generator,
+        crawler_service=mock_crawler_service,
+        flight_parser=flight_parser_mock_10_flights_factory,
+        crawl_coalescer=CrawlCoalescer(),
+        crawl_slots=slots,
+    )
+    saturated = asyncio.Semaphore(0)
+    first_progress, second_progress = SearchProgress(), SearchProgress()
+
+    first = asyncio.create_task(
+        service._resolve_best_flight(TEMPLATE_URL, saturated, first_progress)
+    )
+    async with asyncio.timeout(1):
+        await crawling.wait()
+    second = await service._resolve_best_flight(
+        TEMPLATE_URL, slots.gate(interactive=True), second_progress
+    )
+
+    assert second is not None
+    assert (await first) == second
+    assert mock_crawler_service.crawl_google_flights.call_count == 1
+    assert len(first_progress.crawl_timings) == 1
+    assert (first_progress.coalesced_crawls, second_progress.coalesced_crawls) == (0, 1)
+    assert second_progress.crawl_timings == []
+    assert slots.in_use == 0
+
+
+@pytest.mark.asyncio
+async def test_search_flights_verifies_stale_cached_top_results(
+    mock_combination_generator,
+    mock_crawler_service,
+    flight_parser_mock_10_flights_factory,
+    flight_dto_factory,
+    valid_search_request,
+):
+    """Top resultats issus d'un cache trop ancien recrawles et re-classes."""
+    combinations = create_date_combinations(3)
+    mock_combination_generator.generate_combinations.return_value = combinations
+    result_cache = ResultCache(ttl_s=3600)
+    service = SearchService(
+        combination_generator=mock_combination_generator,
+        crawler_service=mock_crawler_service,
+        flight_parser=flight_parser_mock_10_flights_factory,
+        result_cache=result_cache,
+    )
+    for i, combo in enumerate(combinations):
+        url = service._build_google_flights_url(valid_search_request, combo)
+        entry = await result_cache.set(url, flight_dto_factory(price=100.0 + i))
+        entry.cached_at -= 1200
+
+    response = await service.search_flights(valid_search_request)
+
+    assert mock_crawler_service.crawl_google_flights.call_count == 3
+    assert response.search_stats.cache_hits == 3
+    assert response.search_stats.verified_crawls == 3
+    assert all(r.flights[0].price == 1000.0 for r in response.results)
+
+
+@pytest.mark.asyncio
+async def test_search_flights_skips_verification_for_fresh_cache(
+    mock_combination_generator,
+    mock_crawler_service,
+    flight_parser_mock_10_flights_factory,
+    flight_dto_factory,
+    valid_search_request,
+    mock_generate_google_flights_url,
+):
+    """Entrees cache recentes servies sans recrawl de verification."""
+    mock_combination_generator.generate_combinations.return_value = (
+        create_date_combinations(2)
+    )
+    result_cache = ResultCache(ttl_s=3600)
+    await result_cache.set(
+        mock_generate_google_flights_url.return_value, flight_dto_factory(price=99.0)
+    )
+    service = SearchService(
+        combination_generator=mock_combination_generator,
+        crawler_service=mock_crawler_service,
+        flight_parser=flight_parser_mock_10_flights_factory,
+        result_cache=result_cache,
+    )
+
+    response = await service.search_flights(valid_search_request)
+
+    mock_crawler_service.crawl_google_flights.assert_not_called()
+    assert response.search_stats.verified_crawls == 0
+
+
+@pytest.mark.asyncio
+async def test_search_flights_calendar_mode_crawls_selected_only(
+    mock_combination_generator,
+    mock_crawler_service,
+    flight_parser_mock_10_flights_factory,
+    search_request_factory,
+):
+    """Mode calendar : seules les combinaisons retenues sont crawlees."""
+    combinations = create_date_combinations(10)
+    mock_combination_generator.generate_combinations.return_value = combinations
+    price_calendar = AsyncMock()
+    price_calendar.select_promising.return_value = combinations[:2]
+    service = SearchService(
+        combination_generator=mock_combination_generator,
+        crawler_service=mock_crawler_service,
+        flight_parser=flight_parser_mock_10_flights_factory,
+        price_calendar=price_calendar,
+    )
+    request = search_request_factory().model_copy(update={"mode": "calendar"})
+
+    response = await service.search_flights(request)
+
+    assert mock_crawler_service.crawl_google_flights.call_count == 2
+    assert response.search_stats.combinations_pruned == 8
+
+
+@pytest.mark.asyncio
+async def test_search_flights_exhaustive_mode_skips_calendar(
+    search_service, valid_search_request, mock_crawler_service
+):
+    """Mode exhaustive (defaut) : comportement inchange, pas de pre-crawl."""
+    price_calendar = AsyncMock()
+    search_service._price_calendar = price_calendar
+
+    response = await search_service.search_flights(valid_search_request)
+
+    price_calendar.select_promising.assert_not_called()
+    assert mock_crawler_service.crawl_google_flights.call_count == 10
+    assert response.search_stats.combinations_pruned == 0
+
+
+@pytest.mark.asyncio
+async def test_search_flights_crawls_historically_cheapest_first(
+    mock_combination_generator,
+    mock_crawler_service,
+    mock_crawl_result,
+    flight_parser_mock_10_flights_factory,
+    valid_search_request,
+):
+    """Combinaisons ordonnees par prix historique, prix observes enregistres."""
+    combinations = create_date_combinations(4)
+    mock_combination_generator.generate_combinations.return_value = combinations
+    history = PriceHistory()
+    route_key = build_route_key(valid_search_request.template_url)
+    for price, combo in zip([400.0, 300.0, 200.0, 100.0], combinations, strict=True):
+        history.record(route_key, combo, price)
+    crawled: list[str] = []
+
+    async def record_crawl(url, use_proxy=True):
+        crawled.append(url)
+        return mock_crawl_result
+
+    mock_crawler_service.crawl_google_flights.side_effect = record_crawl
+    service = SearchService(
+        combination_generator=mock_combination_generator,
+        crawler_service=mock_crawler_service,
+        flight_parser=flight_parser_mock_10_flights_factory,
+        price_history=history,
+    )
+
+    with patch(
+        "app.services.search_service.generate_google_flights_url",
+        side_effect=lambda _, dates: "|".join(dates),
+    ):
+        await service.search_flights(valid_search_request)
+
+    assert crawled == ["|".join(c.segment_dates) for c in reversed(combinations)]
+    assert history.expected_price(route_key, combinations[0]) == 1000.0
+
+
+@pytest.mark.asyncio
+async def test_search_flights_cache_hits_not_recorded_twice(
+    mock_combination_generator,
+    mock_crawler_service,
+    mock_crawl_result,
+    flight_parser_mock_10_flights_factory,
+    valid_search_request,
+    result_cache,
+):
+    """Recherche repetee servie par le cache : historique alimente une fois."""
+    combinations = create_date_combinations(3)
+    mock_combination_generator.generate_combinations.return_value = combinations
+    mock_crawler_service.crawl_google_flights.return_value = mock_crawl_result
+    history = PriceHistory()
+    service = SearchService(
+        combination_generator=mock_combination_generator,
+        crawler_service=mock_crawler_service,
+        flight_parser=flight_parser_mock_10_flights_factory,
+        result_cache=result_cache,
+        price_history=history,
+    )
+
+    with patch(
+        "app.services.search_service.generate_google_flights_url",
+        side_effect=lambda _, dates: "|".join(dates),
+    ):
+        await service.search_flights(valid_search_request)
+        second = await service.search_flights(valid_search_request)
+
+    route_key = build_route_key(valid_search_request.template_url)
+    assert second.search_stats.cache_hits == 3
+    assert history._routes[route_key].baseline.count == 3
+
+
+@pytest.mark.asyncio
+async def test_search_flights_deadline_returns_partial_results(
+    mock_combination_generator,
+    mock_crawler_service,
+    mock_crawl_result,
+    flight_parser_mock_10_flights_factory,
+    search_request_factory,
+):
+    """Deadline atteinte : crawls en cours annules, resultats partiels valides."""
+    combinations = create_date_combinations(4)
+    mock_combination_generator.generate_combinations.return_value = combinations
+    stuck_url = "|".join(combinations[3].segment_dates)
+
+    async def crawl(url, use_proxy=True):
+        if url == stuck_url:
+            await asyncio.sleep(60)
+        return mock_crawl_result
+
+    mock_crawler_service.crawl_google_flights.side_effect = crawl
+    service = SearchService(
+        combination_generator=mock_combination_generator,
+        crawler_service=mock_crawler_service,
+        flight_parser=flight_parser_mock_10_flights_factory,
+    )
+    request = search_request_factory().model_copy(update={"deadline_ms": 50})
+
+    with patch(
+        "app.services.search_service.generate_google_flights_url",
+        side_effect=lambda _, dates: "|".join(dates),
+    ):
+        response = await asyncio.wait_for(service.search_flights(request), 5)
+
+    stats = response.search_stats
+    assert len(response.results) == 3
+    assert stats.combinations_total == 4
+    assert stats.combinations_crawled == 3
+    assert stats.crawls_cancelled == 1
+    assert stats.crawls_failed == 0
+
+
+@pytest.mark.asyncio
+async def test_crawl_combinations_leaves_interactive_reserve_free(
+    mock_combination_generator,
+    mock_crawler_service,
+    mock_crawl_result,
+    flight_parser_mock_10_flights_factory,
+    valid_search_request,
+):
+    """Travail d'arriere-plan : creneaux reserves laisses aux interactives."""
+    slots = CrawlSlots(3, interactive_reserved=1)
+    running = peak = 0
+
+    async def crawl(url, use_proxy=True):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.001)
+        running -= 1
+        return mock_crawl_result
+
+    mock_crawler_service.crawl_google_flights.side_effect = crawl
+    service = SearchService(
+        combination_generator=mock_combination_generator,
+        crawler_service=mock_crawler_service,
+        flight_parser=flight_parser_mock_10_flights_factory,
+        crawl_slots=slots,
+    )
+
+    results = await service.crawl_combinations(
+        valid_search_request, create_date_combinations(6)
+    )
+
+    assert len(results) == 6
+    assert peak == 2
+    assert slots.in_use == 0
+
+
+@pytest.mark.asyncio
+async def test_search_flights_deadline_covers_session_capture(
+    search_service, search_request_factory, mock_crawler_service
+):
+    """Capture de session lente : bornee par la deadline, crawls annules."""
+
+    async def slow_capture():
+        await asyncio.sleep(60)
+
+    mock_crawler_service.get_google_session.side_effect = slow_capture
+    request = search_request_factory().model_copy(update={"deadline_ms": 50})
+
+    response = await asyncio.wait_for(search_service.search_flights(request), 5)
+
+    mock_crawler_service.crawl_google_flights.assert_not_called()
+    assert response.results == []
+    assert response.search_stats.crawls_cancelled == 10
+
+
+@pytest.mark.asyncio
+async def test_search_flights_without_deadline_reports_full_coverage(
+    search_service, valid_search_request, mock_crawler_service
+):
+    """Sans deadline : toutes les combinaisons resolues, aucune annulation."""
+    mock_crawler_service.crawl_google_flights.side_effect = [
+        NetworkError("https://example.com"),
+        *[mock_crawler_service.crawl_google_flights.return_value] * 9,
+    ]
+
+    response = await search_service.search_flights(valid_search_request)
+
+    stats = response.search_stats
+    assert stats.combinations_total == 10
+    assert stats.combinations_crawled == 10
+    assert stats.crawls_failed == 1
+    assert stats.crawls_cancelled == 0
+
+
+@pytest.mark.asyncio
+async def test_search_flights_progressive_mode_bounded_by_budget(
+    mock_crawler_service,
+    flight_parser_mock_10_flights_factory,
+    test_settings,
+):
+    """Mode progressive : crawls bornes par le budget, couverture reportee."""
+    request = SearchRequest(
+        template_url=TEMPLATE_URL,
+        segments_date_ranges=[
+            DateRange(
+                start=get_future_date(1).isoformat(),
+                end=get_future_date(40).isoformat(),
+            ),
+            DateRange(
+                start=get_future_date(50).isoformat(),
+                end=get_future_date(89).isoformat(),
+            ),
+        ],
+        mode="progressive",
+    )
+    settings = test_settings.model_copy(update={"PROGRESSIVE_CRAWL_BUDGET": 30})
+    combination_generator = CombinationGenerator()
+    service = SearchService(
+        combination_generator=combination_generator,
+        crawler_service=mock_crawler_service,
+        flight_parser=flight_parser_mock_10_flights_factory,
+    )
+    service._settings = settings
+
+    response = await service.search_flights(request)
+
+    stats = response.search_stats
+    assert mock_crawler_service.crawl_google_flights.call_count == 30
+    assert stats.combinations_total == 40 * 40
+    assert stats.combinations_crawled == 30
+    assert stats.refinement_rounds > 1
+    assert len(response.results) == 10
+
+
+@pytest.mark.asyncio
+async def test_search_flights_passes_constraints_to_generator(
+    search_service, mock_combination_generator, search_request_factory
+):
+    """Contraintes de la requete transmises au generateur de combinaisons."""
+    constraints = CombinationConstraints(min_nights_between=1)
+    request = search_request_factory().model_copy(update={"constraints": constraints})
+
+    await search_service.search_flights(request)
+
+    mock_combination_generator.generate_combinations.assert_called_once_with(
+        request.segments_date_ranges, constraints
+    )
+
+
+@pytest.mark.asyncio
+async def test_search_flights_complete_itineraries_fills_all_legs(
+    search_service, search_request_factory, flight_dto_factory
+):
+    """complete_itineraries : vols de tous les segments pour les top resultats."""
+    drilldown = AsyncMock()
+
+    async def complete(template_url, top_results, semaphore):
+        return {
+            tuple(r.date_combination.segment_dates): [
+                r.best_flight,
+                flight_dto_factory(airline="Leg Two"),
+            ]
+            for r in top_results
+        }, 4
+
+    drilldown.complete.side_effect = complete
+    search_service._itinerary_drilldown = drilldown
+    request = search_request_factory().model_copy(update={"complete_itineraries": True})
+
+    response = await search_service.search_flights(request)
+
+    assert all(len(r.flights) == 2 for r in response.results)
+    assert response.search_stats.drilldown_crawls == 4
+
+
+@pytest.mark.asyncio
+async def test_search_flights_skips_drilldown_by_default(
+    search_service, valid_search_request
+):
+    """Sans complete_itineraries : un seul vol par resultat, aucun drill-down."""
+    drilldown = AsyncMock()
+    search_service._itinerary_drilldown = drilldown
+
+    response = await search_service.search_flights(valid_search_request)
+
+    drilldown.complete.assert_not_called()
+    assert all(len(r.flights) == 1 for r in response.results)
+
+
+@pytest.mark.asyncio
+async def test_search_batch_crawls_shared_urls_once(
+    mock_crawler_service, flight_parser_mock_10_flights_factory, search_request_factory
+):
+    """Lot : URLs communes crawlees une fois puis redistribuees a chaque requete."""
+    service = SearchService(
+        combination_generator=CombinationGenerator(),
+        crawler_service=mock_crawler_service,
+        flight_parser=flight_parser_mock_10_flights_factory,
+    )
+    wide = search_request_factory(days_segment1=2, days_segment2=2)
+    narrow = search_request_factory(days_segment1=1, days_segment2=1)
+
+    with patch(
+        "app.services.search_service.generate_google_flights_url",
+        side_effect=lambda _, dates: "|".join(dates),
+    ):
+        response = await service.search_batch([wide, narrow])
+
+    assert mock_crawler_service.crawl_google_flights.call_count == 9
+    assert response.batch_stats.urls_total == 9 + 4
+    assert response.batch_stats.urls_unique == 9
+    assert [len(r.results) for r in response.responses] == [9, 4]
+    assert response.responses[1].search_stats.combinations_crawled == 4
+
+
+@pytest.mark.asyncio
+async def test_search_flights_resumes_from_checkpoint(
+    tmp_path,
+    mock_crawler_service,
+    flight_parser_mock_10_flights_factory,
+    flight_dto_factory,
+    search_request_factory,
+):
+    """Recherche reprise : seules les combinaisons restantes sont crawlees."""
+    request = search_request_factory(days_segment1=1, days_segment2=1)
+    combinations = CombinationGenerator().generate_combinations(
+        request.segments_date_ranges
+    )
+    store = CheckpointStore(str(tmp_path / "checkpoints.sqlite3"))
+    checkpoint_key = ResponseCache.hash_request(request)
+    for combo in combinations[:2]:
+        store.record(
+            checkpoint_key,
+            combo,
+            CachedFlight(best_flight=flight_dto_factory(price=50.0), cached_at=1.0),
+        )
+    service = SearchService(
+        combination_generator=CombinationGenerator(),
+        crawler_service=mock_crawler_service,
+        flight_parser=flight_parser_mock_10_flights_factory,
+        checkpoint_store=store,
+    )
+
+    response = await service.search_flights(request)
+
+    assert mock_crawler_service.crawl_google_flights.call_count == 2
+    assert response.search_stats.combinations_resumed == 2
+    assert response.results[0].flights[0].price == 50.0
+    assert await store.load(checkpoint_key) == {}
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_search_stats_aggregate_crawl_timings(
+    mock_combination_generator,
+    flight_parser_mock_10_flights_factory,
+    valid_search_request,
+):
+    """SearchStats : decomposition moyenne des crawls, attente et parsing inclus."""
+    mock_combination_generator.generate_combinations.return_value = (
+        create_date_combinations(4)
+    )
+    crawler = AsyncMock()
+    crawler.crawl_google_flights.side_effect = lambda url, **kwargs: CrawlResult(
+        success=True,
+        html="<html>0123456789</html>",
+        timings=CrawlTimings(navigation_s=2.0, settle_s=5.0, bytes=24),
+    )
+    service = SearchService(
+        combination_generator=mock_combination_generator,
+        crawler_service=crawler,
+        flight_parser=flight_parser_mock_10_flights_factory,
+    )
+
+    response = await service.search_flights(valid_search_request)
+
+    timings = response.search_stats.crawl_timings
+    assert timings is not None
+    assert timings.crawls == 4
+    assert timings.navigation_s == 2.0
+    assert timings.settle_s == 5.0
+    assert timings.bytes_total == 96
+    assert timings.parse_s >= 0
+
+
+@pytest.mark.asyncio
+async def test_search_flights_feeds_pipeline_metrics(
+    mock_combination_generator,
+    mock_crawler_service,
+    flight_parser_mock_10_flights_factory,
+    flight_dto_factory,
+    valid_search_request,
+    mock_generate_google_flights_url,
+):
+    """Duree de recherche, parsing, attente et hits du cache de resultats."""
+    mock_combination_generator.generate_combinations.return_value = (
+        create_date_combinations(3)
+    )
+    mock_crawler_service.crawl_google_flights.return_value = CrawlResult(
+        success=True, html="<html></html>"
+    )
+    result_cache = ResultCache(ttl_s=60)
+    metrics = PipelineMetrics()
+    service = SearchService(
+        combination_generator=mock_combination_generator,
+        crawler_service=mock_crawler_service,
+        flight_parser=flight_parser_mock_10_flights_factory,
+        result_cache=result_cache,
+        metrics=metrics,
+    )
+
+    await service.search_flights(valid_search_request)
+
+    assert metrics.search_duration.count(valid_search_request.mode) == 1
+    assert metrics.parse_duration.count() == 1
+    assert metrics.queue_wait.count() == 1
+    assert metrics.cache_hits.value("result") == 2
+    assert metrics.queued_combinations.value() == 0
+
+
+@pytest.mark.asyncio
+async def test_traced_search_records_lane_per_combination(
+    search_service, mock_combination_generator, valid_search_request
+):
+    """Recherche tracee : une ligne par combinaison (attente, crawl, parsing)."""
+    mock_combination_generator.generate_combinations.return_value = (
+        create_date_combinations(3)
+    )
+    trace = SearchTrace("abc")
+
+    with tracing(trace):
+        await search_service.search_flights(valid_search_request)
+
+    events = trace.to_chrome_trace()["traceEvents"]
+    lanes = [e for e in events if e["ph"] == "M" and e["tid"] != 0]
+    assert len(lanes) == 3
+    for lane in lanes:
+        names = {
+            e["name"] for e in events if e["ph"] == "X" and e["tid"] == lane["tid"]
+        }
+        assert names == {"queued", "crawl", "parse"}
+    root = {e["name"] for e in events if e["ph"] == "X" and e["tid"] == 0}
+    assert root == {"session", "search"}
@@ -0,0 +1,73 @@
+"""Tests unitaires SearchTrace et TraceStore."""
+
+import asyncio
+
+import pytest
+
+from app.services import SearchTrace, TraceStore, tracing
+from app.services.search_trace import trace_instant, trace_lane, trace_span
+
+
+def _events(trace: SearchTrace, phase: str) -> list[dict]:
+    """Evenements d'une phase (X, i, M) de la trace."""
+    return [e for e in trace.to_chrome_trace()["traceEvents"] if e["ph"] == phase]
+
+
+def test_spans_recorded_only_inside_tracing() -> None:
+    """Hors bloc tracing : aucun evenement ; dedans : intervalles et instants."""
+    trace = SearchTrace("abc")
+    with trace_span("crawl", "search") as span:
+        span["ignored"] = True
+
+    with tracing(trace):
+        with trace_span("crawl", "search", attempt=1) as span:
+            span["status_code"] = 200
+        trace_instant("cache_hit", "search")
+
+    spans = {e["name"]: e for e in _events(trace, "X")}
+    assert set(spans) == {"crawl", "search"}
+    assert spans["crawl"]["args"] == {"attempt": 1, "status_code": 200}
+    assert spans["crawl"]["dur"] >= 0
+    assert [e["name"] for e in _events(trace, "i")] == ["cache_hit"]
+    assert trace.to_chrome_trace()["otherData"] == {"search_id": "abc"}
+
+
+def test_span_records_error_type() -> None:
+    """Exception dans le bloc : span conserve avec le type d'erreur."""
+    trace = SearchTrace("abc")
+
+    with tracing(trace), pytest.raises(TimeoutError), trace_span("crawl", "crawl"):
+        raise TimeoutError
+
+    [span] = [e for e in _events(trace, "X") if e["name"] == "crawl"]
+    assert span["args"] == {"error": "TimeoutError"}
+
+
+@pytest.mark.asyncio
+async def test_lanes_isolated_per_task() -> None:
+    """Chaque tache ouvre sa ligne (tid nommee) ; la ligne parente est inchangee."""
+    trace = SearchTrace("abc")
+
+    async def combination(name: str) -> None:
+        with trace_lane(name), trace_span("crawl", "search"):
+            await asyncio.sleep(0)
+
+    with tracing(trace):
+        await asyncio.gather(combination("a"), combination("b"))
+        trace_instant("done", "search")
+
+    lanes = {e["args"]["name"]: e["tid"] for e in _events(trace, "M")}
+    assert lanes == {"search": 0, "a": 1, "b": 2}
+    crawl_tids = sorted(e["tid"] for e in _events(trace, "X") if e["name"] == "crawl")
+    assert crawl_tids == [1, 2]
+    assert _events(trace, "i")[0]["tid"] == 0
+
+
+def test_trace_store_evicts_oldest() -> None:
+    """Au-dela de max_traces, la plus ancienne trace est evincee."""
+    store = TraceStore(max_traces=2)
+    for search_id in ("a", "b", "c"):
+        store.save(SearchTrace(search_id))
+
+    assert store.get("a") is None
+    assert store.get("c") is not None
@@ -0,0 +1,81 @@
+"""Tests unitaires SessionPool."""
+
+import pytest
+
+from app.services import SessionPool
+from app.services.session_pool import CrawlSession
+
+
+@pytest.fixture
+def pool() -> SessionPool:
+    """Pool de 2 sessions, degradee apres 2 echecs, age max 100s."""
+    return SessionPool(size=2, max_failures=2, max_age_s=100.0)
+
+
+def test_acquire_least_loaded_session(pool, mock_proxy_pool) -> None:
+    """Crawls repartis sur la session la moins chargee."""
+    first = CrawlSession.create(mock_proxy_pool[0], [])
+    second = CrawlSession.create(mock_proxy_pool[1], [])
+    pool.add(first)
+    pool.add(second)
+
+    assert pool.acquire(proxied=True) is first
+    assert pool.acquire(proxied=True) is second
+    pool.release(first)
+    assert pool.acquire(proxied=True) is first
+    assert pool.acquire(proxied=False) is None
+
+
+def test_blocked_session_degraded_and_recaptured(pool, mock_proxy_pool) -> None:
+    """Blocage : session exclue et proposee a la recapture."""
+    session = CrawlSession.create(mock_proxy_pool[0], [])
+    pool.add(session)
+
+    pool.record_failure(session, blocked=True)
+
+    assert pool.acquire(proxied=True) is None
+    assert pool.missing(proxied=True) == 2
+    assert pool.needs_recapture() == [session]
+
+
+def test_repeated_failures_degrade_session(pool, mock_proxy_pool) -> None:
+    """max_failures echecs consecutifs degradent la session, un succes remet a zero."""
+    session = CrawlSession.create(mock_proxy_pool[0], [])
+    pool.add(session)
+
+    pool.record_failure(session, blocked=False)
+    pool.record_success(session)
+    pool.record_failure(session, blocked=False)
+    assert pool.available(proxied=True) == 1
+
+    pool.record_failure(session, blocked=False)
+    assert pool.available(proxied=True) == 0
+
+
+def test_aging_session_refreshed_before_expiry(pool, mock_proxy_pool) -> None:
+    """Session a 80% de son age max : encore utilisable mais recapturee."""
+    session = CrawlSession.create(mock_proxy_pool[0], [])
+    session.captured_at -= 85.0
+    pool.add(session)
+
+    assert pool.needs_recapture() == [session]
+    assert pool.available(proxied=True) == 1
+
+    session.captured_at -= 20.0
+    assert pool.available(proxied=True) == 0
+
+
+def test_add_prunes_unusable_sessions(pool, mock_proxy_pool) -> None:
+    """Ajout : sessions degradees inactives retirees, session en recapture gardee."""
+    degraded = CrawlSession.create(mock_proxy_pool[0], [])
+    recapturing = CrawlSession.create(mock_proxy_pool[1], [])
+    pool.add(degraded)
+    pool.add(recapturing)
+    pool.record_failure(degraded, blocked=True)
+    pool.record_failure(recapturing, blocked=True)
+    recapturing.recapturing = True
+
+    fresh = CrawlSession.create(mock_proxy_pool[2], [])
+    pool.add(fresh)
+
+    assert pool.sessions == [recapturing, fresh]
@@ -0,0 +1,267 @@
+"""Tests unitaires WatchService (re-crawl incremental, diff, notifications)."""
+
+import json
+import time
+from datetime import date, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+from pydantic import ValidationError
+
+from app.exceptions import WatchLimitReachedError
+from app.models import CombinationResult, WatchRequest
+from app.services import CombinationGenerator, WatchService
+from app.services import watch_service as watch_service_module
+from app.services.watch_service import departure_ttl_s
+
+TODAY = date(2026, 1, 5)
+
+
+def make_search_service(flight_dto_factory, prices: dict[str, float]) -> MagicMock:
+    """SearchService mock : prix par date du premier segment (modifiable)."""
+    service = MagicMock()
+
+    async def crawl_combinations(request, combinations):
+        return [
+            CombinationResult(
+                date_combination=combo,
+                best_flight=flight_dto_factory(price=prices[combo.segment_dates[0]]),
+                observed_at=time.time(),
+            )
+            for combo in combinations
+        ]
+
+    service.crawl_combinations = AsyncMock(side_effect=crawl_combinations)
+    return service
+
+
+@pytest.fixture
+def webhook_calls() -> list[dict]:
+    """Corps JSON recus par le webhook."""
+    return []
+
+
+@pytest.fixture
+def resolved_addresses(monkeypatch) -> list[str]:
+    """Adresses retournees par la resolution DNS simulee du webhook."""
+    addresses = ["93.184.216.34"]
+
+    async def resolve_host(host: str, port: int) -> list[str]:
+        return addresses
+
+    monkeypatch.setattr(watch_service_module, "resolve_host", resolve_host)
+    return addresses
+
+
+@pytest.fixture
+def watch_service(webhook_calls: list[dict], resolved_addresses) -> WatchService:
+    """WatchService avec transport HTTP et DNS simules (webhook)."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        webhook_calls.append(json.loads(request.content))
+        return httpx.Response(204)
+
+    return WatchService(
+        CombinationGenerator(),
+        max_watches=2,
+        max_events=100,
+        ttl_min_s=1800,
+        ttl_max_s=86400,
+        ttl_per_day_s=1800,
+        min_price_change=1.0,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+
+def test_departure_ttl_shrinks_close_to_departure():
+    """TTL proportionnel aux jours restants, borne min/max."""
+    kwargs = {"today": TODAY, "min_s": 1800, "max_s": 86400, "per_day_s": 1800}
+
+    def first(offset: int) -> list[str]:
+        return [(TODAY + timedelta(days=offset)).isoformat(), "2026-12-01"]
+
+    assert departure_ttl_s(first(0), **kwargs) == 1800
+    assert departure_ttl_s(first(10), **kwargs) == 18000
+    assert departure_ttl_s(first(200), **kwargs) == 86400
+
+
+@pytest.mark.asyncio
+async def test_run_recrawls_only_expired_prices(
+    watch_service, search_request_factory, flight_dto_factory
+):
+    """Second passage : seules les combinaisons au TTL expire sont recrawlees."""
+    request = search_request_factory(days_segment1=2, days_segment2=1)
+    prices = {day.isoformat(): 500.0 for day in request.segments_date_ranges[0].dates()}
+    search_service = make_search_service(flight_dto_factory, prices)
+    watch = watch_service.create(WatchRequest(search=request))
+
+    first_events = await watch_service.run(watch, search_service)
+    assert first_events == []
+    assert watch.last_run_recrawled == 6
+
+    await watch_service.run(watch, search_service)
+    assert watch.last_run_recrawled == 0
+    assert watch.last_run_reused == 6
+
+    expired_day = request.segments_date_ranges[0].start
+    for key, tracked in watch.prices.items():
+        if key[0] == expired_day:
+            tracked.observed_at = 0.0
+    await watch_service.run(watch, search_service)
+
+    recrawled = search_service.crawl_combinations.call_args.args[1]
+    assert {combo.segment_dates[0] for combo in recrawled} == {expired_day}
+    assert watch.last_run_recrawled == 2
+    assert watch_service.status(watch).runs == 3
+
+
+@pytest.mark.asyncio
+async def test_run_emits_price_change_events_and_webhook(
+    watch_service, webhook_calls, search_request_factory, flight_dto_factory
+):
+    """Variation de prix : evenement dans le flux et POST webhook."""
+    request = search_request_factory(days_segment1=0, days_segment2=0)
+    day = request.segments_date_ranges[0].start
+    prices = {day: 500.0}
+    search_service = make_search_service(flight_dto_factory, prices)
+    watch = watch_service.create(
+        WatchRequest(search=request, webhook_url="https://hooks.example.com/w")
+    )
+    await watch_service.run(watch, search_service)
+
+    prices[day] = 420.0
+    for tracked in watch.prices.values():
+        tracked.observed_at = 0.0
+    events = await watch_service.run(watch, search_service)
+
+    assert [(e.kind, e.previous_price, e.price) for e in events] == [
+        ("price_drop", 500.0, 420.0)
+    ]
+    assert watch_service.events_after(watch, 0) == events
+    assert watch_service.events_after(watch, events[-1].seq) == []
+    assert webhook_calls == [
+        {
+            "watch_id": watch.watch_id,
+            "events": [e.model_dump() for e in events],
+        }
+    ]
+
+
+@pytest.mark.asyncio
+async def test_run_ignores_changes_below_threshold(
+    watch_service, webhook_calls, search_request_factory, flight_dto_factory
+):
+    """Variation inferieure a min_price_change : aucun evenement."""
+    request = search_request_factory(days_segment1=0, days_segment2=0)
+    day = request.segments_date_ranges[0].start
+    prices = {day: 500.0}
+    search_service = make_search_service(flight_dto_factory, prices)
+    watch = watch_service.create(
+        WatchRequest(search=request, webhook_url="https://hooks.example.com/w")
+    )
+    await watch_service.run(watch, search_service)
+
+    prices[day] = 500.5
+    for tracked in watch.prices.values():
+        tracked.observed_at = 0.0
+
+    assert await watch_service.run(watch, search_service) == []
+    assert watch.prices[(day, request.segments_date_ranges[1].start)].price == 500.5
+    assert webhook_calls == []
+
+
+@pytest.mark.asyncio
+async def test_run_due_only_runs_due_watches(
+    watch_service, search_request_factory, flight_dto_factory
+):
+    """Watch executee puis reprogrammee apres interval_s."""
+    request = search_request_factory(days_segment1=0, days_segment2=0)
+    prices = {request.segments_date_ranges[0].start: 500.0}
+    search_service = make_search_service(flight_dto_factory, prices)
+    watch = watch_service.create(WatchRequest(search=request, interval_s=600))
+
+    assert await watch_service.run_due(search_service) == 1
+    assert await watch_service.run_due(search_service) == 0
+    assert watch.next_run_at == pytest.approx(watch.last_run_at + 600)
+
+
+def test_create_rejects_beyond_max_watches(watch_service, search_request_factory):
+    """Limite de watches actives atteinte : WatchLimitReachedError."""
+    request = WatchRequest(search=search_request_factory())
+    watch_service.create(request)
+    second = watch_service.create(request)
+    with pytest.raises(WatchLimitReachedError):
+        watch_service.create(request)
+
+    assert watch_service.delete(second.watch_id)
+    assert not watch_service.delete(second.watch_id)
+    watch_service.create(request)
+
+
+@pytest.mark.parametrize(
+    "webhook_url",
+    [
+        "http://hooks.example.com/w",
+        "https://127.0.0.1/w",
+        "https://10.0.0.8/w",
+        "https://169.254.169.254/latest/meta-data",
+        "https://[::1]/w",
+        "https://localhost/w",
+        "https://metadata.google.internal/w",
+    ],
+)
+def test_watch_request_rejects_non_public_webhooks(search_request_factory, webhook_url):
+    """Webhook non HTTPS ou vers un hote interne : ValidationError (SSRF)."""
+    with pytest.raises(ValidationError):
+        WatchRequest(search=search_request_factory(), webhook_url=webhook_url)
+
+
+@pytest.mark.asyncio
+async def test_run_skips_webhook_resolving_to_private_address(
+    watch_service,
+    webhook_calls,
+    resolved_addresses,
+    search_request_factory,
+    flight_dto_factory,
+):
+    """Nom public resolu vers une adresse privee : webhook non appele."""
+    request = search_request_factory(days_segment1=0, days_segment2=0)
+    day = request.segments_date_ranges[0].start
+    prices = {day: 500.0}
+    search_service = make_search_service(flight_dto_factory, prices)
+    watch = watch_service.create(
+        WatchRequest(search=request, webhook_url="https://hooks.example.com/w")
+    )
+    await watch_service.run(watch, search_service)
+    resolved_addresses[:] = ["93.184.216.34", "192.168.1.10"]
+
+    prices[day] = 420.0
+    for tracked in watch.prices.values():
+        tracked.observed_at = 0.0
+    events = await watch_service.run(watch, search_service)
+
+    assert len(events) == 1
+    assert watch_service.events_after(watch, 0) == events
+    assert webhook_calls == []
+
+
+@pytest.mark.asyncio
+async def test_run_retires_watch_once_all_dates_past(
+    watch_service, search_request_factory, flight_dto_factory, monkeypatch
+):
+    """Toutes les dates de depart passees : watch retiree sans crawl."""
+    request = search_request_factory(days_segment1=1, days_segment2=1)
+    search_service = make_search_service(flight_dto_factory, {})
+    watch = watch_service.create(WatchRequest(search=request))
+
+    class AfterTrip(date):
+        @classmethod
+        def today(cls):
+            return date(2100, 1, 1)
+
+    monkeypatch.setattr(watch_service_module, "date", AfterTrip)
+
+    assert await watch_service.run(watch, search_service) == []
+    assert watch_service.get(watch.watch_id) is None
+    search_service.crawl_combinations.assert_not_called()